@@ -1,8 +1,10 @@
+import json
 import logging
 import os
+import time
 
-from flask import Flask
-from flask_api.config.mysqlconnection import close_request_connection
+from flask import Flask, Request, g, jsonify, request
+from flask_api.config.mysqlconnection import DatabaseUnavailable, close_request_connection, get_request_query_stats
 
 log_level_name = os.getenv("LOG_LEVEL", "INFO").upper()
 log_level = getattr(logging, log_level_name, logging.INFO)
@@ -11,13 +13,82 @@ logging.basicConfig(
     format="%(asctime)s %(levelname)s %(name)s %(message)s",
 )
 
+
+class ApiRequest(Request):
+    # Views that stream uploads straight to their final directory set this before touching request.files.
+    file_stream_factory = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.file_stream_factory is not None:
+            return self.file_stream_factory(
+                total_content_length=total_content_length,
+                content_type=content_type,
+                filename=filename,
+                content_length=content_length,
+            )
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+
 app = Flask(__name__)
+app.request_class = ApiRequest
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-only-secret-key")
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SAMESITE"] = os.getenv("SESSION_COOKIE_SAMESITE", "Lax")
 app.config["SESSION_COOKIE_SECURE"] = os.getenv("SESSION_COOKIE_SECURE", "false").lower() == "true"
 
 
+def _get_int_env(name, default, minimum=0):
+    try:
+        return max(int(str(os.getenv(name, default)).strip()), minimum)
+    except (TypeError, ValueError):
+        return default
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started_at = time.perf_counter()
+
+
+@app.after_request
+def add_db_timing(response):
+    stats = get_request_query_stats()
+    started_at = g.get("request_started_at")
+    total_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else None
+    if os.getenv("DB_SERVER_TIMING_ENABLED", "true").lower() == "true":
+        timings = []
+        if stats is not None:
+            timings.append(f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries, {stats.rows} rows"')
+        if total_ms is not None:
+            timings.append(f"app;dur={total_ms:.1f}")
+        if timings:
+            response.headers.add("Server-Timing", ", ".join(timings))
+
+    if stats is not None:
+        # Many statements in one request is the usual sign of a per-row (N+1) lookup loop.
+        query_warn_count = _get_int_env("DB_REQUEST_QUERY_WARN_COUNT", 50)
+        if query_warn_count and stats.count >= query_warn_count:
+            level = logging.WARNING
+        elif os.getenv("DB_REQUEST_STATS_LOG", "false").lower() == "true":
+            level = logging.INFO
+        else:
+            level = logging.DEBUG
+        app.logger.log(
+            level,
+            json.dumps(
+                {
+                    "event": "request_db_stats",
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": request.endpoint,
+                    "status_code": response.status_code,
+                    "request_time_ms": round(total_ms, 2) if total_ms is not None else None,
+                    **stats.as_dict(),
+                }
+            ),
+        )
+    return response
+
+
 @app.after_request
 def add_cors_headers(response):
     response.headers["Access-Control-Allow-Origin"] = os.getenv("CORS_ALLOW_ORIGIN", "http://localhost:5173")
@@ -27,6 +98,15 @@ def add_cors_headers(response):
     return response
 
 
+@app.errorhandler(DatabaseUnavailable)
+def handle_database_unavailable(error):
+    app.logger.warning("database unavailable (%s): %s", type(error).__name__, error)
+    response = jsonify({"error": "database_unavailable"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(error.retry_after_seconds)
+    return response
+
+
 @app.teardown_appcontext
 def teardown_db_connection(exception):
     close_request_connection(exception=exception)
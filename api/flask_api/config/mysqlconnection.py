@@ -1,17 +1,69 @@
+from collections import deque
 from contextlib import contextmanager
+import json
+import logging
 import os
 from pathlib import Path
+import re
+import sys
+import threading
+import time
 
 import pymysql.cursors
 from dotenv import load_dotenv
-from flask import g, has_request_context
-
+from flask import g, has_app_context, has_request_context
 
 _API_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(_API_ROOT / ".env")
 
 _REQUEST_CONNECTION_KEY = "_mysql_connection"
 _REQUEST_TRANSACTION_DEPTH_KEY = "_mysql_transaction_depth"
+_REQUEST_QUERY_STATS_KEY = "_mysql_query_stats"
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseUnavailable(RuntimeError):
+    retry_after_seconds = 1
+
+
+class DatabasePoolTimeout(DatabaseUnavailable):
+    pass
+
+
+class DatabaseCircuitOpen(DatabaseUnavailable):
+    def __init__(self, message, retry_after_seconds=1):
+        super().__init__(message)
+        self.retry_after_seconds = max(int(retry_after_seconds + 0.999), 1)
+
+
+def _get_int_env(name, default, minimum=0):
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    try:
+        parsed = int(str(raw_value).strip())
+    except (TypeError, ValueError):
+        return default
+    return max(parsed, minimum)
+
+
+def _get_float_env(name, default, minimum=0.0):
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    try:
+        parsed = float(str(raw_value).strip())
+    except (TypeError, ValueError):
+        return default
+    return max(parsed, minimum)
+
+
+def _get_bool_env(name, default):
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    return str(raw_value).strip().lower() in {"1", "true", "yes", "on"}
 
 
 def connect_to_mysql():
@@ -24,16 +76,407 @@ def connect_to_mysql():
         charset="utf8mb4",
         cursorclass=pymysql.cursors.DictCursor,
         autocommit=False,
+        connect_timeout=_get_int_env("DB_CONNECT_TIMEOUT_SECONDS", 10, minimum=1),
     )
 
 
+class ConnectionPool:
+    def __init__(
+        self,
+        connect,
+        min_size=1,
+        max_size=10,
+        max_lifetime_seconds=1800.0,
+        checkout_timeout_seconds=5.0,
+        pre_ping=True,
+    ):
+        self._connect = connect
+        self.max_size = max(int(max_size), 1)
+        self.min_size = min(max(int(min_size), 0), self.max_size)
+        self.max_lifetime_seconds = float(max_lifetime_seconds)
+        self.checkout_timeout_seconds = float(checkout_timeout_seconds)
+        self.pre_ping = bool(pre_ping)
+        self._condition = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._created_at = {}
+        self._size = 0
+        self._in_use = 0
+        self._warmed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total_ms": 0.0,
+            "wait_time_max_ms": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+        }
+
+    def _open_connection(self):
+        connection = self._connect()
+        with self._condition:
+            self._created_at[id(connection)] = time.monotonic()
+            self._stats["created"] += 1
+        return connection
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _forget_locked(self, connection):
+        self._created_at.pop(id(connection), None)
+        self._size = max(self._size - 1, 0)
+        self._condition.notify()
+
+    def _is_expired(self, connection):
+        if self.max_lifetime_seconds <= 0:
+            return False
+        created_at = self._created_at.get(id(connection))
+        if created_at is None:
+            return False
+        return time.monotonic() - created_at >= self.max_lifetime_seconds
+
+    def _warm(self):
+        with self._condition:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+
+        opened = []
+        try:
+            for _ in range(missing):
+                opened.append(self._open_connection())
+        except Exception:
+            logger.warning("Database pool warm-up failed after %s connection(s).", len(opened), exc_info=True)
+        finally:
+            with self._condition:
+                self._size -= missing - len(opened)
+                self._idle.extend(opened)
+                self._condition.notify_all()
+
+    def _validate(self, connection):
+        if self._is_expired(connection):
+            with self._condition:
+                self._stats["recycled"] += 1
+            return False
+        if not self.pre_ping:
+            return True
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            with self._condition:
+                self._stats["ping_failures"] += 1
+            return False
+
+    def acquire(self):
+        if not self._warmed:
+            self._warm()
+
+        started_at = time.monotonic()
+        deadline = started_at + self.checkout_timeout_seconds
+        waited = False
+        while True:
+            connection = None
+            should_open = False
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise DatabasePoolTimeout(
+                            f"Timed out after {self.checkout_timeout_seconds:.2f}s waiting for a database connection."
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    connection = self._idle.pop()
+                else:
+                    self._size += 1
+                    should_open = True
+                self._in_use += 1
+
+            if should_open:
+                try:
+                    connection = self._open_connection()
+                except Exception:
+                    with self._condition:
+                        self._in_use -= 1
+                        self._size = max(self._size - 1, 0)
+                        self._condition.notify()
+                    raise
+            elif not self._validate(connection):
+                self._close_quietly(connection)
+                with self._condition:
+                    self._in_use -= 1
+                    self._forget_locked(connection)
+                continue
+
+            wait_ms = (time.monotonic() - started_at) * 1000
+            with self._condition:
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["waits"] += 1
+                self._stats["wait_time_total_ms"] += wait_ms
+                self._stats["wait_time_max_ms"] = max(self._stats["wait_time_max_ms"], wait_ms)
+            return connection
+
+    def release(self, connection, discard=False):
+        if connection is None:
+            return
+
+        if not discard and (self._is_expired(connection) or getattr(connection, "open", True) is False):
+            discard = True
+
+        if discard:
+            self._close_quietly(connection)
+            with self._condition:
+                self._in_use = max(self._in_use - 1, 0)
+                self._stats["discarded"] += 1
+                self._forget_locked(connection)
+            return
+
+        with self._condition:
+            self._in_use = max(self._in_use - 1, 0)
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            for connection in idle:
+                self._forget_locked(connection)
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def get_stats(self):
+        with self._condition:
+            checkouts = self._stats["checkouts"]
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": checkouts,
+                "waits": self._stats["waits"],
+                "wait_time_avg_ms": round(self._stats["wait_time_total_ms"] / checkouts, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self._stats["wait_time_max_ms"], 3),
+                "timeouts": self._stats["timeouts"],
+                "created": self._stats["created"],
+                "recycled": self._stats["recycled"],
+                "ping_failures": self._stats["ping_failures"],
+                "discarded": self._stats["discarded"],
+            }
+
+
+# Client-side codes for "cannot reach the server" (2003 connect, 2006 gone away, 2013 lost, 2055 lost
+# during a call). Server errors such as deadlocks or lock wait timeouts say nothing about availability.
+_UNREACHABLE_ERROR_CODES = {2003, 2006, 2013, 2055}
+
+
+def _is_server_unreachable(exception):
+    if isinstance(exception, pymysql.err.InterfaceError):
+        return True
+    return isinstance(exception, pymysql.err.OperationalError) and exception.args[:1] in {
+        (code,) for code in _UNREACHABLE_ERROR_CODES
+    }
+
+
+class CircuitBreaker:
+    # After repeated connection failures, callers fail fast for a cool-down period instead of each
+    # waiting out the connect timeout; then a single caller probes and closes the breaker on success.
+    def __init__(self, failure_threshold=3, open_seconds=5.0):
+        self.failure_threshold = max(int(failure_threshold), 0)
+        self.open_seconds = max(float(open_seconds), 0.0)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = None
+        self._probing = False
+        self._stats = {"opened": 0, "rejected": 0}
+
+    @property
+    def enabled(self):
+        return self.failure_threshold > 0 and self.open_seconds > 0
+
+    def before_call(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._open_until is None:
+                return
+            remaining = self._open_until - time.monotonic()
+            if remaining <= 0 and not self._probing:
+                self._probing = True
+                return
+            self._stats["rejected"] += 1
+        raise DatabaseCircuitOpen(
+            "Database circuit is open after repeated connection failures.",
+            retry_after_seconds=max(remaining, 1),
+        )
+
+    def record_success(self):
+        with self._lock:
+            was_open = self._open_until is not None
+            self._failures = 0
+            self._open_until = None
+            self._probing = False
+        if was_open:
+            logger.info(json.dumps({"event": "db_circuit_closed"}))
+
+    def record_failure(self, exception=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._failures += 1
+            failures = self._failures
+            # A failed probe re-opens at once; otherwise wait for the threshold.
+            should_open = self._probing or (self._open_until is None and failures >= self.failure_threshold)
+            self._probing = False
+            if should_open:
+                self._open_until = time.monotonic() + self.open_seconds
+                self._stats["opened"] += 1
+        if should_open:
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "db_circuit_opened",
+                        "consecutive_failures": failures,
+                        "open_seconds": self.open_seconds,
+                        "error": str(exception) if exception is not None else None,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+    def is_closed(self):
+        with self._lock:
+            return self._open_until is None
+
+    def release_probe(self):
+        # The probe ended for a reason unrelated to reachability (e.g. pool saturation); let another try.
+        with self._lock:
+            self._probing = False
+
+    def get_stats(self):
+        with self._lock:
+            if self._open_until is None:
+                state = "closed"
+            elif self._probing or self._open_until <= time.monotonic():
+                state = "half_open"
+            else:
+                state = "open"
+            return {
+                "enabled": self.enabled,
+                "state": state,
+                "consecutive_failures": self._failures,
+                **self._stats,
+            }
+
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_circuit_breaker = None
+
+
+def _is_pool_enabled():
+    return _get_bool_env("DB_POOL_ENABLED", True)
+
+
+def get_connection_pool():
+    global _pool, _pool_pid
+    current_pid = os.getpid()
+    with _pool_lock:
+        # Workers forked after the pool was created must not share parent sockets.
+        if _pool is None or _pool_pid != current_pid:
+            _pool = ConnectionPool(
+                connect=lambda: connect_to_mysql(),
+                min_size=_get_int_env("DB_POOL_MIN_SIZE", 1),
+                max_size=_get_int_env("DB_POOL_MAX_SIZE", 10, minimum=1),
+                max_lifetime_seconds=_get_float_env("DB_POOL_MAX_LIFETIME_SECONDS", 1800.0),
+                checkout_timeout_seconds=_get_float_env("DB_POOL_CHECKOUT_TIMEOUT_SECONDS", 5.0),
+                pre_ping=_get_bool_env("DB_POOL_PRE_PING", True),
+            )
+            _pool_pid = current_pid
+        return _pool
+
+
+def get_circuit_breaker():
+    global _circuit_breaker
+    with _pool_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker(
+                failure_threshold=_get_int_env("DB_CIRCUIT_FAILURE_THRESHOLD", 3),
+                open_seconds=_get_float_env("DB_CIRCUIT_OPEN_SECONDS", 5.0),
+            )
+        return _circuit_breaker
+
+
+def reset_connection_pool():
+    global _pool, _pool_pid, _circuit_breaker
+    with _pool_lock:
+        pool = _pool
+        _pool = None
+        _pool_pid = None
+        _circuit_breaker = None
+    if pool is not None:
+        pool.close_all()
+
+
+def get_pool_stats():
+    if not _is_pool_enabled():
+        return {"enabled": False, "circuit": get_circuit_breaker().get_stats()}
+    return {"enabled": True, **get_connection_pool().get_stats(), "circuit": get_circuit_breaker().get_stats()}
+
+
+def _acquire_connection():
+    breaker = get_circuit_breaker()
+    breaker.before_call()
+    try:
+        connection = get_connection_pool().acquire() if _is_pool_enabled() else connect_to_mysql()
+    except Exception as exc:
+        if _is_server_unreachable(exc):
+            breaker.record_failure(exc)
+        else:
+            breaker.release_probe()
+        raise
+    breaker.record_success()
+    return connection
+
+
+def _note_query_error(exception):
+    if _is_server_unreachable(exception):
+        get_circuit_breaker().record_failure(exception)
+    return _is_connection_error(exception)
+
+
+def _release_connection(connection, discard=False):
+    if not _is_pool_enabled():
+        connection.close()
+        return
+    get_connection_pool().release(connection, discard=discard)
+
+
+def _is_connection_error(exception):
+    return isinstance(exception, (pymysql.err.OperationalError, pymysql.err.InterfaceError))
+
+
 def _get_request_connection():
     if not has_request_context():
         return None
 
     connection = getattr(g, _REQUEST_CONNECTION_KEY, None)
     if connection is None:
-        connection = connect_to_mysql()
+        connection = _acquire_connection()
         setattr(g, _REQUEST_CONNECTION_KEY, connection)
         setattr(g, _REQUEST_TRANSACTION_DEPTH_KEY, 0)
     return connection
@@ -53,11 +496,12 @@ def _resolve_connection(connection=None):
     if request_connection is not None:
         return request_connection, False
 
-    return connect_to_mysql(), True
+    return _acquire_connection(), True
 
 
 def close_request_connection(exception=None):
-    if not has_request_context():
+    # Runs from teardown_appcontext, after Flask has already popped the request context.
+    if not has_app_context():
         return
 
     connection = getattr(g, _REQUEST_CONNECTION_KEY, None)
@@ -65,20 +509,133 @@ def close_request_connection(exception=None):
         return
 
     tx_depth = int(getattr(g, _REQUEST_TRANSACTION_DEPTH_KEY, 0) or 0)
+    discard = False
     try:
         if exception is not None or tx_depth > 0:
             connection.rollback()
+    except Exception:
+        discard = True
+        raise
     finally:
-        connection.close()
+        _release_connection(connection, discard=discard or _is_connection_error(exception))
         if hasattr(g, _REQUEST_CONNECTION_KEY):
             delattr(g, _REQUEST_CONNECTION_KEY)
         if hasattr(g, _REQUEST_TRANSACTION_DEPTH_KEY):
             delattr(g, _REQUEST_TRANSACTION_DEPTH_KEY)
 
 
+_SQL_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_SQL_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\b\d+(?:\.\d+)?\b")
+_SQL_VALUE_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_SQL_CASE_ARMS = re.compile(r"(?:WHEN \? THEN \? ?){2,}", re.IGNORECASE)
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    def __init__(self, keep_statements=False):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.statements = [] if keep_statements else None
+
+    def record(self, query, duration_ms, rows, is_slow=False):
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.rows += max(int(rows or 0), 0)
+        self.slow += 1 if is_slow else 0
+        if self.statements is not None:
+            self.statements.append(normalize_sql(query))
+
+    def as_dict(self):
+        return {
+            "query_count": self.count,
+            "db_time_ms": round(self.duration_ms, 2),
+            "db_rows": self.rows,
+            "slow_query_count": self.slow,
+        }
+
+
+_query_captures = threading.local()
+
+
+def normalize_sql(query):
+    # Literal values and placeholder lists collapse to "?" so one slow-log line covers every call
+    # of the same statement, however many ids it was given.
+    text = _SQL_STRING_LITERAL.sub("?", str(query or ""))
+    text = _SQL_PLACEHOLDER.sub("?", text)
+    text = _SQL_WHITESPACE.sub(" ", text).strip()
+    text = _SQL_VALUE_LIST.sub("?, ...", text)
+    text = _SQL_CASE_ARMS.sub("WHEN ? THEN ? ... ", text)
+    return text[:1000]
+
+
+def _query_call_site():
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    try:
+        filename = str(Path(frame.f_code.co_filename).resolve().relative_to(_API_ROOT))
+    except ValueError:
+        filename = frame.f_code.co_filename
+    return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def get_request_query_stats():
+    if not has_request_context():
+        return None
+    return getattr(g, _REQUEST_QUERY_STATS_KEY, None)
+
+
+@contextmanager
+def capture_queries():
+    # Collects every statement run on this thread while the block is active, in or out of a request.
+    stats = QueryStats(keep_statements=True)
+    active = getattr(_query_captures, "active", None)
+    if active is None:
+        active = _query_captures.active = []
+    active.append(stats)
+    try:
+        yield stats
+    finally:
+        active.remove(stats)
+
+
+def _record_query(query, started_at, rows):
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    slow_threshold_ms = _get_float_env("DB_SLOW_QUERY_MS", 500.0)
+    is_slow = slow_threshold_ms > 0 and duration_ms >= slow_threshold_ms
+
+    if has_request_context():
+        stats = getattr(g, _REQUEST_QUERY_STATS_KEY, None)
+        if stats is None:
+            stats = QueryStats()
+            setattr(g, _REQUEST_QUERY_STATS_KEY, stats)
+        stats.record(query, duration_ms, rows, is_slow)
+    for stats in getattr(_query_captures, "active", None) or ():
+        stats.record(query, duration_ms, rows, is_slow)
+
+    if is_slow:
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "db_slow_query",
+                    "duration_ms": round(duration_ms, 2),
+                    "threshold_ms": slow_threshold_ms,
+                    "rows": rows,
+                    "call_site": _query_call_site(),
+                    "statement": normalize_sql(query),
+                },
+                ensure_ascii=False,
+            )
+        )
+
+
 @contextmanager
 def db_transaction(connection=None):
-    resolved_connection, should_close = _resolve_connection(connection=connection)
+    resolved_connection, should_release = _resolve_connection(connection=connection)
     owns_request_depth = (
         connection is None
         and has_request_context()
@@ -89,6 +646,7 @@ def db_transaction(connection=None):
         current_depth = int(getattr(g, _REQUEST_TRANSACTION_DEPTH_KEY, 0) or 0)
         setattr(g, _REQUEST_TRANSACTION_DEPTH_KEY, current_depth + 1)
 
+    discard = False
     try:
         yield resolved_connection
         if owns_request_depth:
@@ -98,59 +656,95 @@ def db_transaction(connection=None):
                 resolved_connection.commit()
         else:
             resolved_connection.commit()
-    except Exception:
+    except Exception as exc:
+        discard = _note_query_error(exc)
         if owns_request_depth:
             setattr(g, _REQUEST_TRANSACTION_DEPTH_KEY, 0)
         resolved_connection.rollback()
         raise
     finally:
-        if should_close:
-            resolved_connection.close()
+        if should_release:
+            _release_connection(resolved_connection, discard=discard)
 
 
 def query_db(query, data=None, fetch="all", connection=None, auto_commit=True):
-    resolved_connection, should_close = _resolve_connection(connection=connection)
-    in_transaction = _in_request_transaction() and connection is None and not should_close
+    resolved_connection, should_release = _resolve_connection(connection=connection)
+    in_transaction = _in_request_transaction() and connection is None and not should_release
+    discard = False
+    started_at = time.perf_counter()
+    rows = 0
     try:
         with resolved_connection.cursor() as cursor:
             cursor.execute(query, data or ())
 
             if fetch == "one":
                 result = cursor.fetchone()
+                rows = 1 if result else 0
             elif fetch == "none":
                 result = cursor.lastrowid
+                rows = cursor.rowcount
             else:
                 result = cursor.fetchall()
+                rows = len(result or ())
+        _record_query(query, started_at, rows)
 
         if auto_commit and not in_transaction:
             resolved_connection.commit()
         return result
-    except Exception:
+    except Exception as exc:
+        discard = _note_query_error(exc)
         if not in_transaction:
             resolved_connection.rollback()
         raise
     finally:
-        if should_close:
-            resolved_connection.close()
+        if should_release:
+            _release_connection(resolved_connection, discard=discard)
 
 
 def query_db_many(query, rows, connection=None, auto_commit=True):
     if not rows:
         return 0
 
-    resolved_connection, should_close = _resolve_connection(connection=connection)
-    in_transaction = _in_request_transaction() and connection is None and not should_close
+    resolved_connection, should_release = _resolve_connection(connection=connection)
+    in_transaction = _in_request_transaction() and connection is None and not should_release
+    discard = False
+    started_at = time.perf_counter()
     try:
         with resolved_connection.cursor() as cursor:
             affected = cursor.executemany(query, rows)
+        _record_query(query, started_at, affected)
 
         if auto_commit and not in_transaction:
             resolved_connection.commit()
         return affected
-    except Exception:
+    except Exception as exc:
+        discard = _note_query_error(exc)
         if not in_transaction:
             resolved_connection.rollback()
         raise
     finally:
-        if should_close:
-            resolved_connection.close()
+        if should_release:
+            _release_connection(resolved_connection, discard=discard)
+
+
+def build_sequence_position_updates(table, column, ordered_ids, temp_offset=1000000):
+    # MySQL checks unique keys row by row inside a multi-row UPDATE, so rows are first parked above
+    # the live range and then moved to positions 1..N, keeping (scope, position) unique at every step.
+    ordered_ids = list(ordered_ids or [])
+    if not ordered_ids:
+        return []
+
+    params = {f"id_{index}": row_id for index, row_id in enumerate(ordered_ids, start=1)}
+    case_sql = " ".join(f"WHEN %(id_{index})s THEN {index}" for index in range(1, len(ordered_ids) + 1))
+    id_list_sql = ", ".join(f"%(id_{index})s" for index in range(1, len(ordered_ids) + 1))
+    return [
+        (f"UPDATE {table} SET {column} = {offset} + CASE id {case_sql} END WHERE id IN ({id_list_sql});", params)
+        for offset in (int(temp_offset), 0)
+    ]
+
+
+def update_sequence_positions(table, column, ordered_ids, connection=None, temp_offset=1000000):
+    statements = build_sequence_position_updates(table, column, ordered_ids, temp_offset=temp_offset)
+    for query, params in statements:
+        query_db(query, params, fetch="none", connection=connection, auto_commit=False)
+    return len(statements[0][1]) if statements else 0
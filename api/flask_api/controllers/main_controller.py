@@ -1,27 +1,143 @@
+import hashlib
 import hmac
+import mimetypes
 import os
-from datetime import datetime, timezone
 from functools import wraps
 from pathlib import Path
+from urllib.parse import quote
 
 import pymysql
-from flask import jsonify, request, send_from_directory, session
-from werkzeug.utils import secure_filename
+from flask import jsonify, request, session, stream_with_context
+from werkzeug.exceptions import NotFound, RequestEntityTooLarge
+from werkzeug.security import safe_join
+from werkzeug.utils import send_from_directory as send_asset_from_directory
 
 from flask_api import app
-from flask_api.config.mysqlconnection import query_db
+from flask_api.config.mysqlconnection import DatabaseUnavailable, get_pool_stats, query_db
 from flask_api.services.admin_audit_service import AdminAuditService
 from flask_api.services.admin_auth_service import AdminAuthService
 from flask_api.services.admin_media_service import AdminMediaService
 from flask_api.services.admin_menu_service import AdminMenuService
 from flask_api.services.admin_service_plan_service import AdminServicePlanService
+from flask_api.services.admin_user_cache import AdminUserCache
+from flask_api.services.cache_version_bus import CacheVersionBus
 from flask_api.services.gallery_service import GalleryService
+from flask_api.services.inquiry_email_dispatcher import InquiryEmailDispatcher
 from flask_api.services.inquiry_service import InquiryService
+from flask_api.services.last_known_good_store import LastKnownGoodStore
+from flask_api.services.media_upload_service import MediaUploadService
+from flask_api.services.media_variant_service import MediaVariantService
+from flask_api.services.menu_catalog_cache import MenuCatalogCache
 from flask_api.services.menu_service import MenuService
+from flask_api.services.public_media_cache import PublicMediaCache
+from flask_api.services.single_flight import SingleFlight, SingleFlightTimeout
 from flask_api.services.slide_service import SlideService
 
-
 SLIDES_ASSET_DIR = Path(__file__).resolve().parent.parent / "static" / "slides"
+ASSET_SERVE_MODES = ("flask", "x-sendfile", "x-accel-redirect")
+
+
+def _get_int_env(name, default, minimum=0):
+    try:
+        parsed = int(str(os.getenv(name, default)).strip())
+    except (TypeError, ValueError):
+        return default
+    return max(parsed, minimum)
+
+
+def _get_float_env(name, default, minimum=0.0):
+    try:
+        parsed = float(str(os.getenv(name, default)).strip())
+    except (TypeError, ValueError):
+        return default
+    return max(parsed, minimum)
+
+
+def _public_cache_control():
+    max_age = _get_int_env("PUBLIC_API_CACHE_MAX_AGE_SECONDS", 0)
+    stale_while_revalidate = _get_int_env("PUBLIC_API_STALE_WHILE_REVALIDATE_SECONDS", 0)
+    if max_age <= 0:
+        return "public, no-cache"
+    directives = ["public", f"max-age={max_age}"]
+    if stale_while_revalidate > 0:
+        directives.append(f"stale-while-revalidate={stale_while_revalidate}")
+    return ", ".join(directives)
+
+
+def _serialize_json_body(response_body):
+    body_bytes = app.json.response(response_body).get_data()
+    return body_bytes, hashlib.sha256(body_bytes).hexdigest()
+
+
+def _build_cached_json_body(cache, cache_key, load_body, flight_key):
+    cache_version = cache.get_version()
+    response_body, status_code = load_body()
+    if status_code != 200:
+        return response_body, status_code, None
+    serialized = _serialize_json_body(response_body)
+    cache.set(cache_key, serialized, cache_version)
+    LastKnownGoodStore.save(flight_key, *serialized)
+    return response_body, status_code, serialized
+
+
+def _refresh_cached_json_body(cache, cache_key, load_body, flight_key):
+    with app.app_context():
+        return _build_cached_json_body(cache, cache_key, load_body, flight_key)
+
+
+def _stale_json_response(fallback, warning):
+    response = app.response_class(fallback["body"], status=200, mimetype="application/json")
+    response.set_etag(fallback["etag"])
+    response.headers["Cache-Control"] = "public, no-cache"
+    response.headers["Age"] = str(int(fallback["age_seconds"]))
+    response.headers["Warning"] = warning
+    return response.make_conditional(request)
+
+
+def _cached_json_response(cache, cache_key, load_body):
+    serialized = cache.get(cache_key)
+    if serialized is None:
+        flight_key = f"{cache.__name__}:{cache_key}"
+        serialized = cache.get_stale(cache_key)
+        if serialized is not None:
+            SingleFlight.refresh_in_background(
+                flight_key, lambda: _refresh_cached_json_body(cache, cache_key, load_body, flight_key)
+            )
+        else:
+            fallback = LastKnownGoodStore.load(flight_key)
+            try:
+                if fallback is None:
+                    response_body, status_code, serialized = SingleFlight.run(
+                        flight_key, lambda: _build_cached_json_body(cache, cache_key, load_body, flight_key)
+                    )
+                else:
+                    # With something to fall back on, do not keep the client waiting on a slow database.
+                    response_body, status_code, serialized = SingleFlight.run(
+                        flight_key,
+                        lambda: _refresh_cached_json_body(cache, cache_key, load_body, flight_key),
+                        deadline_seconds=_get_float_env("PUBLIC_READ_DEADLINE_SECONDS", 2.0),
+                    )
+            except (pymysql.err.MySQLError, DatabaseUnavailable, SingleFlightTimeout) as exc:
+                if fallback is None:
+                    raise
+                app.logger.warning("serving last known good %s after %s: %s", flight_key, type(exc).__name__, exc)
+                return _stale_json_response(fallback, '111 - "Revalidation Failed"')
+            if status_code >= 500 and fallback is not None:
+                # A failed build (e.g. empty menu tables) is never saved, so the last good body still stands.
+                app.logger.warning("serving last known good %s after a %s build", flight_key, status_code)
+                return _stale_json_response(fallback, '111 - "Revalidation Failed"')
+            if serialized is None:
+                return jsonify(response_body), status_code
+
+    return _serialized_json_response(serialized)
+
+
+def _serialized_json_response(serialized):
+    body_bytes, etag = serialized
+    response = app.response_class(body_bytes, status=200, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = _public_cache_control()
+    return response.make_conditional(request)
 
 
 def _require_admin_token():
@@ -42,7 +158,7 @@ def _resolve_session_admin_user():
     if not admin_user_id:
         return None
 
-    user = AdminAuthService.get_user_by_id(admin_user_id)
+    user = AdminAuthService.get_session_user(admin_user_id)
     if not user or not bool(user.get("is_active", 0)):
         session.pop("admin_user_id", None)
         return None
@@ -75,48 +191,31 @@ def _bool_query_param(name, default=None):
     return default
 
 
-def _sanitize_upload_filename(filename):
-    safe_name = secure_filename(str(filename or "").strip())
-    if not safe_name:
-        safe_name = "upload"
-    stem, ext = os.path.splitext(safe_name)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-    stem = stem[:80] if stem else "upload"
-    candidate = f"{stem}-{timestamp}{ext.lower()}"
-
-    counter = 2
-    while (SLIDES_ASSET_DIR / candidate).exists():
-        candidate = f"{stem}-{timestamp}-{counter}{ext.lower()}"
-        counter += 1
-    return candidate
-
+def _load_audit_entity_state(entity_type, entity_id, action):
+    # Live state used as the starting point when rebuilding full before/after views of diff audit entries.
+    if action == "reorder":
+        if entity_type == "media":
+            return AdminAuditService.order_state(AdminMediaService._list_group_ids(is_slide=entity_id == "slides"))
+        if entity_type == "service_plan":
+            return AdminAuditService.order_state(AdminServicePlanService.list_section_plan_ids(entity_id))
+        return None
 
-def _find_service_plan_section(sections, section_id):
     try:
-        normalized_section_id = int(section_id)
+        normalized_entity_id = int(entity_id)
     except (TypeError, ValueError):
         return None
-
-    for section in sections or []:
-        try:
-            if int(section.get("id") or 0) == normalized_section_id:
-                return section
-        except (TypeError, ValueError):
-            continue
+    if entity_type == "media":
+        return AdminMediaService.get_media_by_id(normalized_entity_id)
+    if entity_type == "service_plan":
+        return AdminServicePlanService.get_service_plan_detail(normalized_entity_id)
+    if entity_type == "menu_item":
+        return AdminMenuService.get_menu_item_detail(normalized_entity_id)
+    if entity_type == "admin_user":
+        user = AdminAuthService.get_user_by_id(normalized_entity_id)
+        return AdminAuthService.to_public_user(user) if user else None
     return None
 
 
-def _serialize_service_plan_order(section):
-    return [
-        {
-            "id": row.get("id"),
-            "plan_key": row.get("plan_key"),
-            "sort_order": row.get("sort_order"),
-        }
-        for row in (section or {}).get("plans") or []
-    ]
-
-
 def _service_plan_schema_error_response(exc):
     if not AdminServicePlanService._is_missing_service_plan_tables_error(exc):
         return None
@@ -132,7 +231,11 @@ def api_health():
         if not db_ok:
             raise RuntimeError("Unexpected database health check result.")
 
-        return jsonify({"ok": True, "database": {"ok": True}}), 200
+        database_status = {"ok": True}
+        if _bool_query_param("details", default=False):
+            database_status["pool"] = get_pool_stats()
+            return jsonify({"ok": True, "database": database_status, "single_flight": SingleFlight.get_stats()}), 200
+        return jsonify({"ok": True, "database": database_status}), 200
     except Exception:
         app.logger.warning("api_health database check failed")
         return jsonify({"ok": False, "database": {"ok": False}, "error": "database_unavailable"}), 503
@@ -143,8 +246,11 @@ def get_slides():
     if request.method == "OPTIONS":
         return ("", 204)
 
-    slides = SlideService.get_active_slides()
-    return jsonify({"slides": slides}), 200
+    return _cached_json_response(
+        PublicMediaCache,
+        "response:slides",
+        lambda: ({"slides": SlideService.get_active_slides()}, 200),
+    )
 
 
 @app.route("/api/gallery", methods=["GET", "OPTIONS"])
@@ -152,13 +258,87 @@ def get_gallery():
     if request.method == "OPTIONS":
         return ("", 204)
 
-    gallery_items = GalleryService.get_gallery_items()
-    return jsonify({"media": gallery_items}), 200
+    return _cached_json_response(
+        PublicMediaCache,
+        "response:gallery",
+        lambda: ({"media": GalleryService.get_gallery_items()}, 200),
+    )
 
 
 @app.route("/api/assets/slides/<path:filename>", methods=["GET"])
 def get_slide_asset(filename):
-    return send_from_directory(SLIDES_ASSET_DIR, filename)
+    # Dot-prefixed entries are in-flight upload temp files, never public assets.
+    if any(part.startswith(".") for part in filename.split("/")):
+        raise NotFound()
+
+    immutable = MediaUploadService.is_content_hashed(filename)
+    max_age = (
+        _get_int_env("MEDIA_ASSET_IMMUTABLE_MAX_AGE_SECONDS", 31536000, minimum=1)
+        if immutable
+        else _get_int_env("MEDIA_ASSET_MAX_AGE_SECONDS", 0)
+    ) or None
+    serve_mode = (os.getenv("MEDIA_ASSET_SERVE_MODE") or "flask").strip().lower()
+    if serve_mode not in ASSET_SERVE_MODES:
+        serve_mode = "flask"
+
+    if serve_mode == "x-accel-redirect":
+        # Nginx streams the file (including Range requests) from an internal location.
+        asset_path = safe_join(str(SLIDES_ASSET_DIR), filename)
+        if asset_path is None or not os.path.isfile(asset_path):
+            raise NotFound()
+        accel_prefix = (os.getenv("MEDIA_ASSET_ACCEL_PREFIX") or "/_protected/slides/").rstrip("/")
+        response = app.response_class(b"", mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+        response.headers["X-Accel-Redirect"] = f"{accel_prefix}/{quote(filename)}"
+        if max_age:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+    else:
+        response = send_asset_from_directory(
+            SLIDES_ASSET_DIR,
+            filename,
+            request.environ,
+            max_age=max_age,
+            use_x_sendfile=serve_mode == "x-sendfile",
+            response_class=app.response_class,
+        )
+
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
+
+@app.before_request
+def start_inquiry_email_worker():
+    # Started by the first request each worker handles, so outbox rows left pending, mid-retry or stuck in
+    # sending by a restart are delivered without waiting for the next inquiry to wake the thread.
+    InquiryEmailDispatcher.ensure_started()
+
+
+@app.before_request
+def revalidate_local_caches():
+    # Static files and CORS preflights never read these caches.
+    if request.method == "OPTIONS" or request.endpoint == "get_slide_asset" or not CacheVersionBus.is_check_due():
+        return
+    try:
+        # A slow read must not hold up responses served from cache; past the deadline this request goes
+        # ahead on its current entries and the read still lands for the requests after it.
+        SingleFlight.run(
+            "cache_versions",
+            lambda: CacheVersionBus.revalidate((MenuCatalogCache, PublicMediaCache, AdminUserCache)),
+            deadline_seconds=_get_float_env("CACHE_VERSION_CHECK_DEADLINE_SECONDS", 0.25),
+        )
+    except SingleFlightTimeout:
+        app.logger.warning("cache version check passed its deadline; serving current cache entries")
+
+
+@app.after_request
+def publish_menu_catalog_snapshot(response):
+    # Admin writes in this request changed the catalog; rebuild the shared snapshot once for all workers.
+    if CacheVersionBus.pop_request_bumps() & set(MenuCatalogCache.VERSION_KEYS):
+        MenuService.publish_catalog_snapshot()
+    return response
 
 
 @app.route("/api/menus", methods=["GET", "OPTIONS"])
@@ -166,8 +346,14 @@ def get_menus():
     if request.method == "OPTIONS":
         return ("", 204)
 
-    response_body, status_code = MenuService.get_catalog()
-    return jsonify(response_body), status_code
+    if MenuService.get_catalog_source() != "db":
+        # Parsed, normalized and serialized once per version of the seed file; no cache or database involved.
+        serialized = MenuService.get_seed_catalog_body(_serialize_json_body)
+        if serialized is None:
+            return jsonify({"error": "Menu seed payload not found."}), 500
+        return _serialized_json_response(serialized)
+
+    return _cached_json_response(MenuCatalogCache, "response:db", MenuService.get_catalog)
 
 
 @app.route("/api/menu/general/groups", methods=["GET", "OPTIONS"])
@@ -221,11 +407,13 @@ def admin_menu_sync():
     apply_schema = bool(body.get("apply_schema", False))
     reset = bool(body.get("reset", False))
     seed = bool(body.get("seed", True))
+    dry_run = bool(body.get("dry_run", False))
 
     response_body, status_code = MenuService.run_menu_admin_task(
         apply_schema=apply_schema,
         reset=reset,
         seed=seed,
+        dry_run=dry_run,
     )
     return jsonify(response_body), status_code
 
@@ -284,7 +472,7 @@ def admin_auth_profile_update(admin_user=None):
         updated_user = response_body["user"]
         session["admin_user_id"] = updated_user.get("id")
         session.modified = True
-        AdminAuditService.log_change(
+        AdminAuditService.log_diff(
             admin_user_id=admin_user["id"],
             action="update",
             entity_type="admin_user",
@@ -341,7 +529,7 @@ def admin_auth_user_detail(user_id, admin_user=None):
         )
         updated_user = response_body.get("user") if isinstance(response_body, dict) else None
         if status_code < 400 and updated_user:
-            AdminAuditService.log_change(
+            AdminAuditService.log_diff(
                 admin_user_id=admin_user["id"],
                 action="update",
                 entity_type="admin_user",
@@ -379,12 +567,14 @@ def admin_menu_items(admin_user=None):
         return ("", 204)
 
     if request.method == "GET":
-        items = AdminMenuService.list_menu_items(
+        response_body, status_code = AdminMenuService.list_menu_items_page(
             search=request.args.get("search", ""),
             is_active=request.args.get("is_active"),
             limit=request.args.get("limit", 250),
+            after=request.args.get("after"),
+            include_total=bool(_bool_query_param("include_total", default=False)),
         )
-        return jsonify({"items": items}), 200
+        return jsonify(response_body), status_code
 
     body = request.get_json(silent=True) or {}
 
@@ -435,7 +625,7 @@ def admin_menu_item_detail(item_id, admin_user=None):
     response_body, status_code = AdminMenuService.update_menu_item(item_id, request.get_json(silent=True) or {})
     if status_code < 400:
         after = response_body.get("item")
-        AdminAuditService.log_change(
+        AdminAuditService.log_diff(
             admin_user_id=admin_user["id"],
             action="update",
             entity_type="menu_item",
@@ -520,7 +710,7 @@ def admin_service_plan_detail(plan_id, admin_user=None):
         )
         if status_code < 400:
             after = response_body.get("plan")
-            AdminAuditService.log_change(
+            AdminAuditService.log_diff(
                 admin_user_id=admin_user["id"],
                 action="update",
                 entity_type="service_plan",
@@ -546,35 +736,21 @@ def admin_service_plan_reorder(admin_user=None):
     try:
         request_body = request.get_json(silent=True) or {}
         section_id = request_body.get("section_id")
-        catalog_key = request_body.get("catalog_key", "")
-
-        before_response, _before_status = AdminServicePlanService.list_service_plan_sections(
-            catalog_key=catalog_key,
-            include_inactive=True,
-        )
-        before_section = _find_service_plan_section(before_response.get("sections"), section_id)
 
         response_body, status_code = AdminServicePlanService.reorder_service_plans(
             section_id,
             request_body.get("ordered_plan_ids"),
         )
         if status_code < 400:
-            after_response, _after_status = AdminServicePlanService.list_service_plan_sections(
-                catalog_key=catalog_key,
-                include_inactive=True,
-            )
-            after_section = _find_service_plan_section(after_response.get("sections"), section_id)
-            section_title = (
-                (after_section or {}).get("title") or (before_section or {}).get("title") or f"section {section_id}"
-            )
-            AdminAuditService.log_change(
+            section_title = response_body.get("section_title") or f"section {section_id}"
+            AdminAuditService.log_diff(
                 admin_user_id=admin_user["id"],
                 action="reorder",
                 entity_type="service_plan",
                 entity_id=section_id,
                 change_summary=f"Reordered service plans for '{section_title}'",
-                before=_serialize_service_plan_order(before_section),
-                after=_serialize_service_plan_order(after_section),
+                before=AdminAuditService.order_state(response_body.get("previous_plan_ids")),
+                after=AdminAuditService.order_state(response_body.get("ordered_plan_ids")),
             )
         return jsonify(response_body), status_code
     except pymysql.err.ProgrammingError as exc:
@@ -606,7 +782,14 @@ def admin_media_upload(admin_user=None):
     if request.method == "OPTIONS":
         return ("", 204)
 
-    uploaded_file = request.files.get("file")
+    # Stream the file part to disk under a byte cap instead of letting Werkzeug spool it first.
+    SLIDES_ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    request.max_content_length = MediaUploadService.max_request_bytes()
+    request.file_stream_factory = MediaUploadService.stream_factory(SLIDES_ASSET_DIR)
+    try:
+        uploaded_file = request.files.get("file")
+    except RequestEntityTooLarge:
+        return jsonify({"error": "Media file exceeds the upload size limit."}), 413
     if uploaded_file is None or not str(uploaded_file.filename or "").strip():
         return jsonify({"error": "Media file is required."}), 400
 
@@ -614,10 +797,11 @@ def admin_media_upload(admin_user=None):
     if media_type not in ("image", "video"):
         return jsonify({"error": "Unsupported file type. Allowed: image and video formats."}), 400
 
-    SLIDES_ASSET_DIR.mkdir(parents=True, exist_ok=True)
-    normalized_filename = _sanitize_upload_filename(uploaded_file.filename)
-    saved_path = SLIDES_ASSET_DIR / normalized_filename
-    uploaded_file.save(saved_path)
+    stored_filename, saved_path, deduplicated = MediaUploadService.store(
+        uploaded_file.stream,
+        SLIDES_ASSET_DIR,
+        os.path.splitext(str(uploaded_file.filename).strip())[1],
+    )
 
     create_payload = {
         "title": request.form.get("title"),
@@ -625,25 +809,36 @@ def admin_media_upload(admin_user=None):
         "is_slide": request.form.get("is_slide"),
         "is_active": request.form.get("is_active", "true"),
         "display_order": request.form.get("display_order"),
-        "image_url": f"/api/assets/slides/{normalized_filename}",
+        "image_url": f"/api/assets/slides/{stored_filename}",
         "media_type": media_type,
     }
     response_body, status_code = AdminMediaService.create_media_record(create_payload)
     if status_code >= 400:
-        try:
-            if saved_path.exists():
-                saved_path.unlink()
-        except Exception:
-            pass
+        # Files are content-addressed, so a concurrent upload of the same bytes may already point a row
+        # at this path even when this request wrote it; only remove a file no media row references.
+        if not deduplicated:
+            try:
+                if not AdminMediaService.is_image_url_referenced(create_payload["image_url"]):
+                    saved_path.unlink(missing_ok=True)
+            except Exception as exc:
+                app.logger.warning("could not remove unused upload %s: %s", saved_path, exc)
         return jsonify(response_body), status_code
 
     media_item = response_body.get("media", {})
+    response_body["deduplicated"] = deduplicated
+    has_variants = media_item.get("thumbnail_src") not in (None, media_item.get("image_url"))
+    if media_type == "image":
+        response_body["variants_pending"] = not has_variants and MediaVariantService.schedule(
+            media_item.get("id"),
+            saved_path,
+            "/api/assets/slides",
+        )
     AdminAuditService.log_change(
         admin_user_id=admin_user["id"],
         action="create",
         entity_type="media",
         entity_id=media_item.get("id"),
-        change_summary=f"Uploaded media '{media_item.get('title', normalized_filename)}'",
+        change_summary=f"Uploaded media '{media_item.get('title', stored_filename)}'",
         before=None,
         after=media_item,
     )
@@ -677,7 +872,7 @@ def admin_media_update(media_id, admin_user=None):
     response_body, status_code = AdminMediaService.update_media(media_id, request.get_json(silent=True) or {})
     if status_code < 400:
         after = response_body.get("media")
-        AdminAuditService.log_change(
+        AdminAuditService.log_diff(
             admin_user_id=admin_user["id"],
             action="update",
             entity_type="media",
@@ -695,18 +890,16 @@ def admin_media_reorder_slides(admin_user=None):
     if request.method == "OPTIONS":
         return ("", 204)
 
-    before = AdminMediaService.list_media(is_slide=True, limit=2000)
     response_body, status_code = AdminMediaService.reorder_slide_items(request.get_json(silent=True) or {})
     if status_code < 400:
-        after = response_body.get("slides") or []
-        AdminAuditService.log_change(
+        AdminAuditService.log_diff(
             admin_user_id=admin_user["id"],
             action="reorder",
             entity_type="media",
             entity_id="slides",
             change_summary="Reordered landing slides",
-            before=[{"id": row.get("id"), "display_order": row.get("display_order")} for row in before],
-            after=[{"id": row.get("id"), "display_order": row.get("display_order")} for row in after],
+            before=AdminAuditService.order_state(response_body.get("previous_ids")),
+            after=AdminAuditService.order_state(row.get("id") for row in response_body.get("slides") or []),
         )
     return jsonify(response_body), status_code
 
@@ -718,20 +911,17 @@ def admin_media_reorder(admin_user=None):
         return ("", 204)
 
     request_body = request.get_json(silent=True) or {}
-    is_slide_group = bool(AdminMediaService._to_bool(request_body.get("is_slide"), default=False))
-    before = AdminMediaService.list_media(is_slide=is_slide_group, limit=2000)
     response_body, status_code = AdminMediaService.reorder_media_items(request_body)
     if status_code < 400:
-        after = response_body.get("media") or []
         group_label = "slides" if bool(response_body.get("is_slide")) else "gallery"
-        AdminAuditService.log_change(
+        AdminAuditService.log_diff(
             admin_user_id=admin_user["id"],
             action="reorder",
             entity_type="media",
             entity_id=group_label,
             change_summary=f"Reordered {group_label}",
-            before=[{"id": row.get("id"), "display_order": row.get("display_order")} for row in before],
-            after=[{"id": row.get("id"), "display_order": row.get("display_order")} for row in after],
+            before=AdminAuditService.order_state(response_body.get("previous_ids")),
+            after=AdminAuditService.order_state(row.get("id") for row in response_body.get("media") or []),
         )
     return jsonify(response_body), status_code
 
@@ -742,8 +932,49 @@ def admin_audit_log(admin_user=None):
     if request.method == "OPTIONS":
         return ("", 204)
 
-    entries = AdminAuditService.get_recent_entries(limit=request.args.get("limit", 100))
-    return jsonify({"entries": entries}), 200
+    response_body, status_code = AdminAuditService.list_entries(
+        filters=request.args,
+        limit=request.args.get("limit", 100),
+        after=request.args.get("after"),
+        include_payloads=bool(_bool_query_param("include_payloads", default=False)),
+    )
+    return jsonify(response_body), status_code
+
+
+@app.route("/api/admin/audit/<int:entry_id>", methods=["GET", "OPTIONS"])
+@_require_admin_auth
+def admin_audit_entry(entry_id, admin_user=None):
+    if request.method == "OPTIONS":
+        return ("", 204)
+
+    response_body, status_code = AdminAuditService.get_entry(
+        entry_id,
+        load_current_state=_load_audit_entity_state if _bool_query_param("reconstruct", default=False) else None,
+    )
+    return jsonify(response_body), status_code
+
+
+@app.route("/api/admin/audit/export", methods=["GET", "OPTIONS"])
+@_require_admin_auth
+def admin_audit_export(admin_user=None):
+    if request.method == "OPTIONS":
+        return ("", 204)
+
+    export_format = str(request.args.get("format") or "ndjson").strip().lower()
+    chunks, status_code = AdminAuditService.export_entries(
+        filters=request.args,
+        export_format=export_format,
+        include_payloads=bool(_bool_query_param("include_payloads", default=True)),
+    )
+    if status_code >= 400:
+        return jsonify(chunks), status_code
+
+    response = app.response_class(stream_with_context(chunks), mimetype=AdminAuditService.EXPORT_FORMATS[export_format])
+    response.headers["Content-Disposition"] = f'attachment; filename="admin-audit-log.{export_format}"'
+    response.headers["Cache-Control"] = "no-store"
+    # Let nginx pass rows through as they are produced instead of spooling the whole export.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 @app.route("/api/inquiries", methods=["POST", "OPTIONS"])
@@ -760,4 +991,6 @@ def create_inquiry():
         client_ip=client_ip,
         user_agent=user_agent,
     )
+    if status_code == 201 and response_body.get("email_queued"):
+        InquiryEmailDispatcher.notify()
     return jsonify(response_body), status_code
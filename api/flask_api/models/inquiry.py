@@ -1,6 +1,7 @@
 import json
 
 from flask_api.config.mysqlconnection import db_transaction, query_db
+from flask_api.models.inquiry_email_outbox import InquiryEmailOutbox
 from flask_api.validators.inquiry_validators import (
     normalize_budget,
     normalize_email,
@@ -120,7 +121,7 @@ class Inquiry:
         }
         query_db(query, payload, fetch="none", connection=connection, auto_commit=False)
 
-    def save(self):
+    def save(self, build_outbox_messages=None):
         query = """
       INSERT INTO inquiries (
         full_name,
@@ -156,15 +157,29 @@ class Inquiry:
                 auto_commit=False,
             )
             self._save_structured_selections(connection=connection)
+            # Built once the row id exists so the messages and their log events can name it.
+            outbox_messages = build_outbox_messages(self) if build_outbox_messages else None
+            if outbox_messages:
+                InquiryEmailOutbox.enqueue(self.id, outbox_messages, connection=connection)
         return self.id
 
-    def update_email_sent(self, email_sent):
+    def update_email_sent(self, email_sent, connection=None):
         if not self.id:
             return None
+        self.email_sent = int(bool(email_sent))
+        return Inquiry.set_email_sent(self.id, self.email_sent, connection=connection)
+
+    @staticmethod
+    def set_email_sent(inquiry_id, email_sent, connection=None):
         query = """
       UPDATE inquiries
       SET email_sent = %(email_sent)s
       WHERE id = %(id)s;
     """
-        self.email_sent = int(bool(email_sent))
-        return query_db(query, {"id": self.id, "email_sent": self.email_sent}, fetch="none")
+        return query_db(
+            query,
+            {"id": inquiry_id, "email_sent": int(bool(email_sent))},
+            fetch="none",
+            connection=connection,
+            auto_commit=connection is None,
+        )
@@ -0,0 +1,120 @@
+from email import message_from_string, policy
+
+from flask_api.config.mysqlconnection import db_transaction, query_db, query_db_many
+
+
+class InquiryEmailOutbox:
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    @staticmethod
+    def enqueue(inquiry_id, messages, connection=None):
+        rows = [
+            {
+                "inquiry_id": inquiry_id,
+                "email_type": entry["email_type"],
+                "recipient": str(entry["message"].get("To") or ""),
+                "message_mime": entry["message"].as_string(),
+            }
+            for entry in messages or []
+        ]
+        return query_db_many(
+            """
+      INSERT INTO inquiry_email_outbox (inquiry_id, email_type, recipient, message_mime)
+      VALUES (%(inquiry_id)s, %(email_type)s, %(recipient)s, %(message_mime)s);
+      """,
+            rows,
+            connection=connection,
+            auto_commit=False,
+        )
+
+    @staticmethod
+    def parse_message(message_mime):
+        return message_from_string(message_mime or "", policy=policy.default)
+
+    @staticmethod
+    def claim_batch(limit=20, lock_timeout_seconds=300):
+        # SKIP LOCKED keeps concurrent gunicorn workers from claiming the same rows; rows stuck in
+        # "sending" past the lock timeout (worker crashed mid-batch) become claimable again.
+        with db_transaction() as connection:
+            rows = query_db(
+                """
+        SELECT id, inquiry_id, email_type, recipient, message_mime, attempts
+        FROM inquiry_email_outbox
+        WHERE (status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP)
+          OR (status = 'sending' AND locked_at < CURRENT_TIMESTAMP - INTERVAL %(lock_timeout_seconds)s SECOND)
+        ORDER BY id ASC
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED;
+        """,
+                {"limit": int(limit), "lock_timeout_seconds": int(lock_timeout_seconds)},
+                connection=connection,
+                auto_commit=False,
+            )
+            if not rows:
+                return []
+
+            payload = {}
+            tokens = []
+            for index, row in enumerate(rows):
+                token = f"outbox_id_{index}"
+                payload[token] = row["id"]
+                tokens.append(f"%({token})s")
+            query_db(
+                f"""
+        UPDATE inquiry_email_outbox
+        SET status = 'sending', locked_at = CURRENT_TIMESTAMP, attempts = attempts + 1
+        WHERE id IN ({", ".join(tokens)});
+        """,
+                payload,
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+        for row in rows:
+            row["attempts"] = int(row.get("attempts") or 0) + 1
+        return rows
+
+    @staticmethod
+    def mark_sent(outbox_row, connection=None):
+        return query_db(
+            """
+      UPDATE inquiry_email_outbox
+      SET status = 'sent', sent_at = CURRENT_TIMESTAMP, locked_at = NULL, last_error_code = NULL
+      WHERE id = %(id)s;
+      """,
+            {"id": outbox_row["id"]},
+            fetch="none",
+            connection=connection,
+            auto_commit=connection is None,
+        )
+
+    @staticmethod
+    def mark_retry(outbox_row, delay_seconds, error_code):
+        return query_db(
+            """
+      UPDATE inquiry_email_outbox
+      SET
+        status = 'pending',
+        next_attempt_at = CURRENT_TIMESTAMP + INTERVAL %(delay_seconds)s SECOND,
+        locked_at = NULL,
+        last_error_code = %(error_code)s
+      WHERE id = %(id)s;
+      """,
+            {"id": outbox_row["id"], "delay_seconds": int(delay_seconds), "error_code": error_code},
+            fetch="none",
+        )
+
+    @staticmethod
+    def mark_failed(outbox_row, error_code):
+        return query_db(
+            """
+      UPDATE inquiry_email_outbox
+      SET status = 'failed', locked_at = NULL, last_error_code = %(error_code)s
+      WHERE id = %(id)s;
+      """,
+            {"id": outbox_row["id"], "error_code": error_code},
+            fetch="none",
+        )
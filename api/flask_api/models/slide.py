@@ -1,3 +1,5 @@
+import json
+
 from flask_api.config.mysqlconnection import query_db
 
 
@@ -12,6 +14,7 @@ class Slide:
         display_order,
         is_slide=True,
         media_type="image",
+        image_variants=None,
     ):
         self.id = slide_id
         self.title = title
@@ -21,6 +24,7 @@ class Slide:
         self.display_order = display_order
         self.is_slide = bool(is_slide)
         self.media_type = media_type or "image"
+        self.image_variants = image_variants
 
     def to_dict(self):
         normalized_title = str(self.title or "").strip()
@@ -38,6 +42,45 @@ class Slide:
             "caption": normalized_caption,
             "is_slide": self.is_slide,
             "media_type": self.media_type,
+            **self.variant_fields(self.image_url, self.image_variants),
+        }
+
+    @staticmethod
+    def parse_image_variants(raw_value):
+        if isinstance(raw_value, (bytes, bytearray)):
+            raw_value = raw_value.decode("utf-8")
+        if isinstance(raw_value, str):
+            try:
+                raw_value = json.loads(raw_value)
+            except ValueError:
+                return None
+        return raw_value if isinstance(raw_value, dict) else None
+
+    @classmethod
+    def variant_fields(cls, image_url, raw_value):
+        image_variants = cls.parse_image_variants(raw_value) or {}
+        variants = [
+            variant
+            for variant in image_variants.get("variants") or []
+            if isinstance(variant, dict) and variant.get("url") and variant.get("format")
+        ]
+        srcset_by_format = {}
+        for variant in sorted(variants, key=lambda entry: int(entry.get("width") or 0)):
+            srcset_by_format.setdefault(variant["format"], []).append(f"{variant['url']} {int(variant['width'])}w")
+        primary_format = variants[0]["format"] if variants else None
+        thumbnail_src = next(
+            (
+                variant["url"]
+                for variant in sorted(variants, key=lambda entry: int(entry.get("width") or 0))
+                if variant["format"] == primary_format
+            ),
+            None,
+        )
+        return {
+            "thumbnail_src": thumbnail_src or image_url,
+            "srcset": ", ".join(srcset_by_format.get(primary_format) or []),
+            "srcset_by_format": {key: ", ".join(entries) for key, entries in srcset_by_format.items()},
+            "variants": variants,
         }
 
     @classmethod
@@ -48,6 +91,7 @@ class Slide:
             title,
             caption,
             image_url,
+            image_variants,
             media_type,
             alt_text,
             display_order,
@@ -68,6 +112,7 @@ class Slide:
                 display_order=row["display_order"],
                 is_slide=row.get("is_slide", 1),
                 media_type=row.get("media_type", "image"),
+                image_variants=row.get("image_variants"),
             )
             for row in rows
         ]
@@ -84,6 +129,7 @@ class Slide:
             title,
             caption,
             image_url,
+            image_variants,
             media_type,
             alt_text,
             display_order,
@@ -1,9 +1,36 @@
+import csv
+import io
 import json
+from datetime import datetime, timedelta, timezone
 
 from flask_api.config.mysqlconnection import query_db
+from flask_api.services.keyset_cursor import KeysetCursor
 
 
 class AdminAuditService:
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+    EXPORT_BATCH_SIZE = 500
+    PAYLOAD_SNAPSHOT = "snapshot"
+    # before_json/after_json hold only the keys that changed; for reorders the keys are entity ids and
+    # the values their 1-based positions, so a move of two items stores two keys rather than both lists.
+    PAYLOAD_DIFF = "diff"
+    EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+    EXPORT_COLUMNS = (
+        "id",
+        "created_at",
+        "admin_user_id",
+        "admin_username",
+        "admin_display_name",
+        "action",
+        "entity_type",
+        "entity_id",
+        "change_summary",
+        "payload_format",
+        "before_json",
+        "after_json",
+    )
+
     @staticmethod
     def _json_dump(value):
         if value is None:
@@ -21,6 +48,7 @@ class AdminAuditService:
         before=None,
         after=None,
         connection=None,
+        payload_format=PAYLOAD_SNAPSHOT,
     ):
         try:
             normalized_admin_id = int(admin_user_id)
@@ -35,6 +63,7 @@ class AdminAuditService:
         entity_type,
         entity_id,
         change_summary,
+        payload_format,
         before_json,
         after_json
       )
@@ -44,6 +73,7 @@ class AdminAuditService:
         %(entity_type)s,
         %(entity_id)s,
         %(change_summary)s,
+        %(payload_format)s,
         %(before_json)s,
         %(after_json)s
       );
@@ -54,6 +84,7 @@ class AdminAuditService:
                 "entity_type": str(entity_type or "").strip()[:64],
                 "entity_id": str(entity_id)[:128] if entity_id is not None else None,
                 "change_summary": (str(change_summary).strip()[:255] if change_summary else None),
+                "payload_format": payload_format,
                 "before_json": cls._json_dump(before),
                 "after_json": cls._json_dump(after),
             },
@@ -63,20 +94,226 @@ class AdminAuditService:
         )
 
     @staticmethod
-    def get_recent_entries(limit=100):
+    def order_state(ordered_ids):
+        return {str(entity_id): position for position, entity_id in enumerate(ordered_ids or [], start=1)}
+
+    @staticmethod
+    def diff_states(before, after):
+        before = before or {}
+        after = after or {}
+        changed_keys = [key for key in {**before, **after} if before.get(key) != after.get(key)]
+        return (
+            {key: before.get(key) for key in changed_keys},
+            {key: after.get(key) for key in changed_keys},
+        )
+
+    @classmethod
+    def log_diff(
+        cls,
+        admin_user_id,
+        action,
+        entity_type,
+        entity_id=None,
+        change_summary=None,
+        before=None,
+        after=None,
+        connection=None,
+    ):
+        before_changes, after_changes = cls.diff_states(before, after)
+        return cls.log_change(
+            admin_user_id=admin_user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            change_summary=change_summary,
+            before=before_changes,
+            after=after_changes,
+            connection=connection,
+            payload_format=cls.PAYLOAD_DIFF,
+        )
+
+    @staticmethod
+    def _to_int(value, default=None, minimum=None, maximum=None):
         try:
-            normalized_limit = max(1, min(int(limit), 500))
+            parsed = int(value)
         except (TypeError, ValueError):
-            normalized_limit = 100
+            return default
+        if minimum is not None:
+            parsed = max(parsed, minimum)
+        if maximum is not None:
+            parsed = min(parsed, maximum)
+        return parsed
 
-        rows = query_db(
-            """
+    @staticmethod
+    def _json_load(value):
+        if not isinstance(value, (str, bytes)):
+            return value
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+    @staticmethod
+    def _parse_timestamp(value):
+        text = str(value or "").strip()
+        if not text:
+            return None, False
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None, False
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        # A bare date means the whole day, so an upper bound widens to the next midnight.
+        return parsed, len(text) == 10
+
+    @classmethod
+    def _build_filter_conditions(cls, filters):
+        filters = filters or {}
+        conditions = []
+        payload = {}
+
+        for key in ("entity_type", "action"):
+            value = str(filters.get(key) or "").strip()
+            if value:
+                conditions.append(f"l.{key} = %({key})s")
+                payload[key] = value[:64]
+
+        entity_id = str(filters.get("entity_id") or "").strip()
+        if entity_id:
+            # Equality on (entity_type, entity_id) keeps lookups on idx_admin_audit_entity.
+            conditions.append("l.entity_id = %(entity_id)s")
+            payload["entity_id"] = entity_id[:128]
+
+        if str(filters.get("admin_user_id") or "").strip():
+            admin_user_id = cls._to_int(filters.get("admin_user_id"))
+            if not admin_user_id or admin_user_id < 1:
+                return None, None, "admin_user_id must be a positive integer."
+            conditions.append("l.admin_user_id = %(admin_user_id)s")
+            payload["admin_user_id"] = admin_user_id
+
+        if str(filters.get("from") or "").strip():
+            date_from, _ = cls._parse_timestamp(filters.get("from"))
+            if date_from is None:
+                return None, None, "from must be an ISO 8601 date or timestamp."
+            conditions.append("l.created_at >= %(date_from)s")
+            payload["date_from"] = date_from
+
+        if str(filters.get("to") or "").strip():
+            date_to, is_date_only = cls._parse_timestamp(filters.get("to"))
+            if date_to is None:
+                return None, None, "to must be an ISO 8601 date or timestamp."
+            if is_date_only:
+                conditions.append("l.created_at < %(date_to)s")
+                payload["date_to"] = date_to + timedelta(days=1)
+            else:
+                conditions.append("l.created_at <= %(date_to)s")
+                payload["date_to"] = date_to
+
+        return conditions, payload, None
+
+    @classmethod
+    def _decode_after(cls, after):
+        cursor = KeysetCursor.decode(after, expected_length=2)
+        if not cursor or not isinstance(cursor[0], str):
+            return None
+        after_id = cls._to_int(cursor[1], minimum=1)
+        try:
+            after_created_at = datetime.fromisoformat(cursor[0])
+        except ValueError:
+            return None
+        return (after_created_at, after_id) if after_id else None
+
+    @staticmethod
+    def _fetch_rows(conditions, payload, page_size, after_key=None, include_payloads=False):
+        conditions = list(conditions)
+        params = dict(payload)
+        if after_key:
+            conditions.append(
+                "(l.created_at < %(after_created_at)s OR (l.created_at = %(after_created_at)s AND l.id < %(after_id)s))"
+            )
+            params["after_created_at"], params["after_id"] = after_key
+        params["page_size"] = page_size
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # The list view leaves the JSON blobs behind; reorder entries carry whole lists in them.
+        payload_columns = "l.before_json, l.after_json," if include_payloads else ""
+        query = f"""
       SELECT
         l.id,
+        l.admin_user_id,
         l.action,
         l.entity_type,
         l.entity_id,
         l.change_summary,
+        l.payload_format,
+        {payload_columns}
+        l.created_at,
+        u.username,
+        u.display_name
+      FROM admin_audit_log l
+      JOIN admin_users u ON u.id = l.admin_user_id
+      {where_clause}
+      ORDER BY l.created_at DESC, l.id DESC
+      LIMIT %(page_size)s;
+      """
+        return query_db(query, params) or []
+
+    @classmethod
+    def _serialize_entry(cls, row, include_payloads=False):
+        created_at = row.get("created_at")
+        entry = {
+            "id": row.get("id"),
+            "admin_user_id": row.get("admin_user_id"),
+            "action": row.get("action"),
+            "entity_type": row.get("entity_type"),
+            "entity_id": row.get("entity_id"),
+            "change_summary": row.get("change_summary"),
+            "payload_format": row.get("payload_format") or cls.PAYLOAD_SNAPSHOT,
+            "created_at": created_at.isoformat() if hasattr(created_at, "isoformat") else None,
+            "admin_username": row.get("username"),
+            "admin_display_name": row.get("display_name"),
+        }
+        if include_payloads:
+            entry["before_json"] = row.get("before_json")
+            entry["after_json"] = row.get("after_json")
+        return entry
+
+    @classmethod
+    def list_entries(cls, filters=None, limit=100, after=None, include_payloads=False):
+        normalized_limit = cls._to_int(limit, default=cls.DEFAULT_PAGE_SIZE, minimum=1, maximum=cls.MAX_PAGE_SIZE)
+        conditions, payload, error = cls._build_filter_conditions(filters)
+        if error:
+            return {"error": error}, 400
+
+        after_key = None
+        if str(after or "").strip():
+            after_key = cls._decode_after(after)
+            if not after_key:
+                return {"error": "Invalid cursor."}, 400
+
+        rows = cls._fetch_rows(conditions, payload, normalized_limit + 1, after_key, include_payloads)
+        has_more = len(rows) > normalized_limit
+        rows = rows[:normalized_limit]
+        last_row = rows[-1] if rows else None
+        next_cursor = None
+        if has_more and last_row and hasattr(last_row.get("created_at"), "isoformat"):
+            next_cursor = KeysetCursor.encode(last_row["created_at"].isoformat(), last_row.get("id"))
+        return {
+            "entries": [cls._serialize_entry(row, include_payloads) for row in rows],
+            "next_cursor": next_cursor,
+        }, 200
+
+    @classmethod
+    def get_entry(cls, entry_id, load_current_state=None):
+        query = """
+      SELECT
+        l.id,
+        l.admin_user_id,
+        l.action,
+        l.entity_type,
+        l.entity_id,
+        l.change_summary,
+        l.payload_format,
         l.before_json,
         l.after_json,
         l.created_at,
@@ -84,28 +321,125 @@ class AdminAuditService:
         u.display_name
       FROM admin_audit_log l
       JOIN admin_users u ON u.id = l.admin_user_id
-      ORDER BY l.created_at DESC, l.id DESC
-      LIMIT %(limit)s;
-      """,
-            {"limit": normalized_limit},
-        )
+      WHERE l.id = %(id)s
+      LIMIT 1;
+      """
+        row = query_db(query, {"id": entry_id}, fetch="one")
+        if not row:
+            return {"error": "Audit entry not found."}, 404
+        entry = cls._serialize_entry(row, include_payloads=True)
+        if load_current_state is not None:
+            entry["before_state"], entry["after_state"] = cls._reconstruct_states(row, load_current_state)
+        return {"entry": entry}, 200
+
+    @classmethod
+    def _as_state(cls, value):
+        value = cls._json_load(value)
+        if isinstance(value, list):
+            # Snapshots written before diff payloads stored reorders as ordered lists of rows.
+            return cls.order_state([row.get("id") for row in value if isinstance(row, dict)])
+        return dict(value) if isinstance(value, dict) else None
+
+    @classmethod
+    def _iter_later_entries(cls, row):
+        query = """
+      SELECT l.id, l.payload_format, l.before_json, l.created_at
+      FROM admin_audit_log l
+      WHERE l.entity_type = %(entity_type)s
+        AND l.entity_id = %(entity_id)s
+        AND (l.action = 'reorder') = %(is_reorder)s
+        AND (l.created_at > %(after_created_at)s OR (l.created_at = %(after_created_at)s AND l.id > %(after_id)s))
+      ORDER BY l.created_at ASC, l.id ASC
+      LIMIT %(page_size)s;
+      """
+        params = {
+            "entity_type": row.get("entity_type"),
+            "entity_id": row.get("entity_id"),
+            "is_reorder": row.get("action") == "reorder",
+            "after_created_at": row.get("created_at"),
+            "after_id": row.get("id"),
+            "page_size": cls.EXPORT_BATCH_SIZE,
+        }
+        while True:
+            rows = query_db(query, params) or []
+            yield from rows
+            if len(rows) < cls.EXPORT_BATCH_SIZE:
+                return
+            params["after_created_at"], params["after_id"] = rows[-1].get("created_at"), rows[-1].get("id")
+
+    @classmethod
+    def _reconstruct_states(cls, row, load_current_state):
+        before_changes = cls._as_state(row.get("before_json"))
+        if row.get("payload_format") != cls.PAYLOAD_DIFF:
+            return before_changes, cls._as_state(row.get("after_json"))
+
+        # Start from the nearest later full snapshot (or the live entity when there is none) and undo
+        # every later diff, newest first, to get back to the state this entry produced.
+        later_diffs = []
+        state = None
+        for later_row in cls._iter_later_entries(row):
+            if later_row.get("payload_format") == cls.PAYLOAD_DIFF:
+                later_diffs.append(cls._as_state(later_row.get("before_json")) or {})
+                continue
+            state = cls._as_state(later_row.get("before_json"))
+            if state is None:
+                return None, None
+            break
+        else:
+            state = load_current_state(row.get("entity_type"), row.get("entity_id"), row.get("action"))
+            if state is None:
+                return None, None
+
+        after_state = dict(state)
+        for changes in reversed(later_diffs):
+            after_state.update(changes)
+        return {**after_state, **(before_changes or {})}, after_state
 
-        payload = []
+    @classmethod
+    def _iter_export_rows(cls, conditions, payload, include_payloads):
+        # Walk the range one keyset batch at a time so only EXPORT_BATCH_SIZE rows are ever held in memory.
+        after_key = None
+        while True:
+            rows = cls._fetch_rows(conditions, payload, cls.EXPORT_BATCH_SIZE, after_key, include_payloads)
+            for row in rows:
+                yield row
+            if len(rows) < cls.EXPORT_BATCH_SIZE:
+                return
+            after_key = (rows[-1].get("created_at"), rows[-1].get("id"))
+
+    @classmethod
+    def _export_ndjson(cls, rows, include_payloads):
         for row in rows:
-            payload.append(
-                {
-                    "id": row.get("id"),
-                    "action": row.get("action"),
-                    "entity_type": row.get("entity_type"),
-                    "entity_id": row.get("entity_id"),
-                    "change_summary": row.get("change_summary"),
-                    "before_json": row.get("before_json"),
-                    "after_json": row.get("after_json"),
-                    "created_at": (
-                        row.get("created_at").isoformat() if hasattr(row.get("created_at"), "isoformat") else None
-                    ),
-                    "admin_username": row.get("username"),
-                    "admin_display_name": row.get("display_name"),
-                }
-            )
-        return payload
+            entry = cls._serialize_entry(row, include_payloads)
+            if include_payloads:
+                entry["before_json"] = cls._json_load(entry["before_json"])
+                entry["after_json"] = cls._json_load(entry["after_json"])
+            yield json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+    @classmethod
+    def _export_csv(cls, rows, include_payloads):
+        columns = [column for column in cls.EXPORT_COLUMNS if include_payloads or not column.endswith("_json")]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(cls._serialize_entry(row, include_payloads))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @classmethod
+    def export_entries(cls, filters=None, export_format="ndjson", include_payloads=True):
+        normalized_format = str(export_format or "ndjson").strip().lower()
+        if normalized_format not in cls.EXPORT_FORMATS:
+            return {"error": f"format must be one of: {', '.join(cls.EXPORT_FORMATS)}."}, 400
+        conditions, payload, error = cls._build_filter_conditions(filters)
+        if error:
+            return {"error": error}, 400
+
+        rows = cls._iter_export_rows(conditions, payload, include_payloads)
+        if normalized_format == "csv":
+            return cls._export_csv(rows, include_payloads), 200
+        return cls._export_ndjson(rows, include_payloads), 200
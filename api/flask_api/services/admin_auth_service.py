@@ -1,6 +1,8 @@
 import re
 
-from flask_api.config.mysqlconnection import query_db
+from flask_api.config.mysqlconnection import db_transaction, query_db
+from flask_api.services.admin_user_cache import AdminUserCache
+from flask_api.services.cache_version_bus import CacheVersionBus
 from werkzeug.security import check_password_hash, generate_password_hash
 
 
@@ -153,6 +155,24 @@ class AdminAuthService:
             fetch="one",
         )
 
+    @classmethod
+    def get_session_user(cls, admin_user_id):
+        try:
+            normalized_id = int(admin_user_id)
+        except (TypeError, ValueError):
+            return None
+
+        cache_key = f"user:{normalized_id}"
+        cached_user = AdminUserCache.get(cache_key)
+        if cached_user is not None:
+            return dict(cached_user)
+
+        cache_version = AdminUserCache.get_version()
+        user = cls.get_user_by_id(normalized_id)
+        if user:
+            AdminUserCache.set(cache_key, dict(user), cache_version)
+        return user
+
     @staticmethod
     def get_user_with_password_by_id(admin_user_id):
         try:
@@ -219,15 +239,20 @@ class AdminAuthService:
         if not check_password_hash(password_hash, str(password)):
             return None
 
-        query_db(
-            """
+        with db_transaction() as connection:
+            query_db(
+                """
       UPDATE admin_users
       SET last_login_at = CURRENT_TIMESTAMP
       WHERE id = %(id)s;
       """,
-            {"id": user["id"]},
-            fetch="none",
-        )
+                {"id": user["id"]},
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            CacheVersionBus.bump(CacheVersionBus.ADMIN_USERS, connection=connection)
+        AdminUserCache.invalidate()
         return cls.get_user_by_id(user["id"])
 
     @classmethod
@@ -294,8 +319,10 @@ class AdminAuthService:
 
         if is_password_change_requested:
             update_payload["password_hash"] = generate_password_hash(new_password)
-            query_db(
-                """
+        with db_transaction() as connection:
+            if is_password_change_requested:
+                query_db(
+                    """
       UPDATE admin_users
       SET
         username = %(username)s,
@@ -304,12 +331,14 @@ class AdminAuthService:
         updated_at = CURRENT_TIMESTAMP
       WHERE id = %(id)s;
       """,
-                update_payload,
-                fetch="none",
-            )
-        else:
-            query_db(
-                """
+                    update_payload,
+                    fetch="none",
+                    connection=connection,
+                    auto_commit=False,
+                )
+            else:
+                query_db(
+                    """
       UPDATE admin_users
       SET
         username = %(username)s,
@@ -317,10 +346,14 @@ class AdminAuthService:
         updated_at = CURRENT_TIMESTAMP
       WHERE id = %(id)s;
       """,
-                update_payload,
-                fetch="none",
-            )
+                    update_payload,
+                    fetch="none",
+                    connection=connection,
+                    auto_commit=False,
+                )
+            CacheVersionBus.bump(CacheVersionBus.ADMIN_USERS, connection=connection)
 
+        AdminUserCache.invalidate()
         updated_user = cls.get_user_by_id(current_user["id"])
         return {"user": cls.to_public_user(updated_user)}, 200
 
@@ -547,8 +580,9 @@ class AdminAuthService:
         if next_access_tier != cls.ACCESS_TIER_MANAGER:
             next_can_manage_admin_users = False
 
-        query_db(
-            """
+        with db_transaction() as connection:
+            query_db(
+                """
       UPDATE admin_users
       SET
         access_tier = %(access_tier)s,
@@ -557,15 +591,19 @@ class AdminAuthService:
         updated_at = CURRENT_TIMESTAMP
       WHERE id = %(id)s;
       """,
-            {
-                "id": target["id"],
-                "access_tier": next_access_tier,
-                "is_active": 1 if bool(next_is_active) else 0,
-                "can_manage_admin_users": 1 if next_can_manage_admin_users else 0,
-            },
-            fetch="none",
-        )
+                {
+                    "id": target["id"],
+                    "access_tier": next_access_tier,
+                    "is_active": 1 if bool(next_is_active) else 0,
+                    "can_manage_admin_users": 1 if next_can_manage_admin_users else 0,
+                },
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            CacheVersionBus.bump(CacheVersionBus.ADMIN_USERS, connection=connection)
 
+        AdminUserCache.invalidate()
         updated = cls.get_user_by_id(target["id"])
         return {"user": cls._to_managed_user(updated)}, 200
 
@@ -613,15 +651,20 @@ class AdminAuthService:
         if active_remaining <= 0:
             return {"error": "At least one active admin account is required."}, 400
 
-        query_db(
-            """
+        with db_transaction() as connection:
+            query_db(
+                """
       DELETE FROM admin_users
       WHERE id = %(id)s
       LIMIT 1;
       """,
-            {"id": target["id"]},
-            fetch="none",
-        )
+                {"id": target["id"]},
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            CacheVersionBus.bump(CacheVersionBus.ADMIN_USERS, connection=connection)
+        AdminUserCache.invalidate()
         return {
             "ok": True,
             "deleted_user_id": target.get("id"),
@@ -1,4 +1,7 @@
-from flask_api.config.mysqlconnection import db_transaction, query_db
+from flask_api.config.mysqlconnection import db_transaction, query_db, update_sequence_positions
+from flask_api.models.slide import Slide
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.public_media_cache import PublicMediaCache
 
 
 class AdminMediaService:
@@ -49,31 +52,7 @@ class AdminMediaService:
         if not normalized_ids:
             return
 
-        for index, slide_id in enumerate(normalized_ids, start=1):
-            query_db(
-                """
-        UPDATE slides
-        SET display_order = %(temp_order)s
-        WHERE id = %(id)s;
-        """,
-                {"temp_order": 1000000 + index, "id": slide_id},
-                fetch="none",
-                connection=connection,
-                auto_commit=False,
-            )
-
-        for index, slide_id in enumerate(normalized_ids, start=1):
-            query_db(
-                """
-        UPDATE slides
-        SET display_order = %(display_order)s
-        WHERE id = %(id)s;
-        """,
-                {"display_order": index, "id": slide_id},
-                fetch="none",
-                connection=connection,
-                auto_commit=False,
-            )
+        update_sequence_positions("slides", "display_order", normalized_ids, connection=connection)
 
     @classmethod
     def _list_group_ids(cls, is_slide, connection=None):
@@ -167,6 +146,7 @@ class AdminMediaService:
         title,
         caption,
         image_url,
+        image_variants,
         media_type,
         alt_text,
         display_order,
@@ -193,6 +173,7 @@ class AdminMediaService:
                 "alt_text": str(row.get("alt_text") or "").strip(),
                 "src": row.get("image_url"),
                 "image_url": row.get("image_url"),
+                "thumbnail_src": Slide.variant_fields(row.get("image_url"), row.get("image_variants"))["thumbnail_src"],
                 "media_type": row.get("media_type") or "image",
                 "display_order": row.get("display_order"),
                 "is_slide": bool(row.get("is_slide", 0)),
@@ -220,6 +201,7 @@ class AdminMediaService:
         title,
         caption,
         image_url,
+        image_variants,
         media_type,
         alt_text,
         display_order,
@@ -243,6 +225,7 @@ class AdminMediaService:
             "alt_text": str(row.get("alt_text") or "").strip(),
             "src": row.get("image_url"),
             "image_url": row.get("image_url"),
+            "thumbnail_src": Slide.variant_fields(row.get("image_url"), row.get("image_variants"))["thumbnail_src"],
             "media_type": row.get("media_type") or "image",
             "display_order": row.get("display_order"),
             "is_slide": bool(row.get("is_slide", 0)),
@@ -251,6 +234,20 @@ class AdminMediaService:
             "updated_at": row.get("updated_at").isoformat() if hasattr(row.get("updated_at"), "isoformat") else None,
         }
 
+    @staticmethod
+    def is_image_url_referenced(image_url):
+        row = query_db(
+            """
+      SELECT id
+      FROM slides
+      WHERE image_url = %(image_url)s
+      LIMIT 1;
+      """,
+            {"image_url": image_url},
+            fetch="one",
+        )
+        return bool(row)
+
     @classmethod
     def create_media_record(cls, payload):
         image_url = str((payload or {}).get("image_url") or "").strip()
@@ -325,7 +322,9 @@ class AdminMediaService:
                 cls._resequence_group(is_slide=True, connection=connection)
             else:
                 cls._resequence_group(is_slide=False, connection=connection, leading_ids=[slide_id])
+            CacheVersionBus.bump(CacheVersionBus.MEDIA, connection=connection)
 
+        PublicMediaCache.invalidate()
         created = cls.get_media_by_id(slide_id)
         return {"media": created}, 201
 
@@ -397,7 +396,9 @@ class AdminMediaService:
             else:
                 cls._resequence_group(is_slide=False, connection=connection)
             cls._resequence_group(is_slide=True, connection=connection)
+            CacheVersionBus.bump(CacheVersionBus.MEDIA, connection=connection)
 
+        PublicMediaCache.invalidate()
         updated = cls.get_media_by_id(normalized_media_id)
         return {"media": updated}, 200
 
@@ -424,7 +425,9 @@ class AdminMediaService:
                 auto_commit=False,
             )
             cls._resequence_group(is_slide=bool(existing.get("is_slide")), connection=connection)
+            CacheVersionBus.bump(CacheVersionBus.MEDIA, connection=connection)
 
+        PublicMediaCache.invalidate()
         return {
             "ok": True,
             "deleted_media_id": normalized_media_id,
@@ -438,7 +441,10 @@ class AdminMediaService:
         response_body, status_code = cls.reorder_media_items(body)
         if status_code >= 400:
             return response_body, status_code
-        return {"slides": response_body.get("media") or []}, 200
+        return {
+            "slides": response_body.get("media") or [],
+            "previous_ids": response_body.get("previous_ids") or [],
+        }, 200
 
     @classmethod
     def reorder_media_items(cls, payload):
@@ -492,7 +498,9 @@ class AdminMediaService:
             requested_set = set(requested_present)
             ordered_ids = requested_present + [media_id for media_id in current_ids if media_id not in requested_set]
             cls._apply_display_order_sequence(ordered_ids, connection=connection)
+            CacheVersionBus.bump(CacheVersionBus.MEDIA, connection=connection)
 
+        PublicMediaCache.invalidate()
         media_items = [cls.get_media_by_id(media_id) for media_id in ordered_ids]
         media_items = [row for row in media_items if row]
-        return {"media": media_items, "is_slide": bool(target_is_slide)}, 200
+        return {"media": media_items, "is_slide": bool(target_is_slide), "previous_ids": current_ids}, 200
@@ -2,6 +2,9 @@ import re
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 from flask_api.config.mysqlconnection import db_transaction, query_db, query_db_many
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.keyset_cursor import KeysetCursor
+from flask_api.services.menu_catalog_cache import MenuCatalogCache
 
 
 class AdminMenuService:
@@ -148,14 +151,47 @@ class AdminMenuService:
             return default
         return amount
 
+    @staticmethod
+    def _escape_like(value):
+        return str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
     @classmethod
     def list_menu_items(cls, search="", is_active=None, limit=250):
+        response_body, _status_code = cls.list_menu_items_page(search=search, is_active=is_active, limit=limit)
+        return response_body.get("items", [])
+
+    @classmethod
+    def list_menu_items_page(cls, search="", is_active=None, limit=250, after=None, include_total=False):
         normalized_limit = cls._to_int(limit, default=250, minimum=1, maximum=1000)
         normalized_search = str(search or "").strip().lower()
         is_active_filter = cls._decode_is_active_filter(is_active)
 
+        conditions = []
+        payload = {}
+        if is_active_filter is not None:
+            conditions.append("is_active = %(is_active)s")
+            payload["is_active"] = is_active_filter
+        if normalized_search:
+            conditions.append("(item_name LIKE %(search)s OR item_key LIKE %(search)s)")
+            payload["search"] = f"%{cls._escape_like(normalized_search)}%"
+        filter_conditions = list(conditions)
+
+        if str(after or "").strip():
+            cursor = KeysetCursor.decode(after, expected_length=2)
+            after_id = cls._to_int(cursor[1], minimum=1) if cursor else None
+            if not cursor or not isinstance(cursor[0], str) or not after_id:
+                return {"error": "Invalid cursor."}, 400
+            conditions.append("(item_name > %(after_name)s OR (item_name = %(after_name)s AND id > %(after_id)s))")
+            payload["after_name"] = cursor[0]
+            payload["after_id"] = after_id
+
+        # Page over items in the derived table (served in order by uq_menu_items_name) and only then
+        # join type assignments, so each request touches at most limit + 1 items. `limit` counts items;
+        # an item assigned to both menu types comes back as two entries, and a page never splits one.
+        payload["page_size"] = normalized_limit + 1
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         rows = query_db(
-            """
+            f"""
       SELECT
         i.id,
         mt.type_key AS menu_type,
@@ -169,58 +205,78 @@ class AdminMenuService:
         g.id AS group_id,
         g.group_key,
         g.group_name AS group_title
-      FROM menu_items i
+      FROM (
+        SELECT id, item_key, item_name, is_active, tray_price_half, tray_price_full, created_at, updated_at
+        FROM menu_items
+        {where_clause}
+        ORDER BY item_name ASC, id ASC
+        LIMIT %(page_size)s
+      ) i
       LEFT JOIN menu_item_type_groups mitg ON mitg.menu_item_id = i.id AND mitg.is_active = 1
       LEFT JOIN menu_types mt ON mt.id = mitg.menu_type_id
       LEFT JOIN menu_groups g ON g.id = mitg.menu_group_id
       ORDER BY i.item_name ASC, i.id ASC, mt.sort_order ASC, mt.id ASC;
-      """
+      """,
+            payload,
         )
 
-        filtered = []
-        for row in rows:
-            menu_type = str(row.get("menu_type") or "").strip().lower()
-            is_active_value = bool(row.get("is_active", 0))
-            half_price = row.get("tray_price_half")
-            if half_price is None:
-                half_price = row.get("half_tray_price")
-            full_price = row.get("tray_price_full")
-            if full_price is None:
-                full_price = row.get("full_tray_price")
-            if is_active_filter is not None and int(is_active_value) != is_active_filter:
-                continue
-            if normalized_search:
-                haystack = f"{row.get('item_name', '')} {row.get('item_key', '')}".lower()
-                if normalized_search not in haystack:
-                    continue
-
-            normalized_type = menu_type if menu_type in ("regular", "formal") else None
-            encoded_item_id = cls._encode_item_id(normalized_type or "regular", row.get("id"))
-            encoded_group_id = (
+        rows_by_item = {}
+        for row in rows or []:
+            rows_by_item.setdefault(row.get("id"), []).append(row)
+        item_row_groups = list(rows_by_item.values())
+        has_more = len(item_row_groups) > normalized_limit
+        item_row_groups = item_row_groups[:normalized_limit]
+
+        items = [cls._serialize_menu_item_list_row(row) for item_rows in item_row_groups for row in item_rows]
+        last_row = item_row_groups[-1][-1] if item_row_groups else None
+
+        response_body = {
+            "items": items,
+            "next_cursor": (
+                KeysetCursor.encode(last_row.get("item_name"), last_row.get("id")) if has_more and last_row else None
+            ),
+        }
+        if include_total:
+            count_where = f"WHERE {' AND '.join(filter_conditions)}" if filter_conditions else ""
+            count_row = query_db(
+                f"SELECT COUNT(*) AS total FROM menu_items {count_where};",
+                {key: value for key, value in payload.items() if key in ("is_active", "search")},
+                fetch="one",
+            )
+            response_body["total"] = int((count_row or {}).get("total") or 0)
+        return response_body, 200
+
+    @classmethod
+    def _serialize_menu_item_list_row(cls, row):
+        menu_type = str(row.get("menu_type") or "").strip().lower()
+        half_price = row.get("tray_price_half")
+        if half_price is None:
+            half_price = row.get("half_tray_price")
+        full_price = row.get("tray_price_full")
+        if full_price is None:
+            full_price = row.get("full_tray_price")
+
+        normalized_type = menu_type if menu_type in ("regular", "formal") else None
+        return {
+            "id": cls._encode_item_id(normalized_type or "regular", row.get("id")),
+            "menu_type": normalized_type,
+            "menu_types": [normalized_type] if normalized_type else [],
+            "item_key": row.get("item_key"),
+            "item_name": row.get("item_name"),
+            "is_active": bool(row.get("is_active", 0)),
+            "group_id": (
                 cls._encode_group_id(normalized_type, row.get("group_id"))
                 if normalized_type and row.get("group_id")
                 else None
-            )
-            filtered.append(
-                {
-                    "id": encoded_item_id,
-                    "menu_type": normalized_type,
-                    "menu_types": [normalized_type] if normalized_type else [],
-                    "item_key": row.get("item_key"),
-                    "item_name": row.get("item_name"),
-                    "is_active": is_active_value,
-                    "group_id": encoded_group_id,
-                    "group_key": row.get("group_key"),
-                    "group_title": row.get("group_title"),
-                    "tray_price_half": (cls._serialize_price(half_price) if normalized_type == "regular" else None),
-                    "tray_price_full": (cls._serialize_price(full_price) if normalized_type == "regular" else None),
-                    "option_group_count": 1 if row.get("group_id") else 0,
-                    "created_at": cls._to_iso(row.get("created_at")),
-                    "updated_at": cls._to_iso(row.get("updated_at")),
-                }
-            )
-
-        return filtered[:normalized_limit]
+            ),
+            "group_key": row.get("group_key"),
+            "group_title": row.get("group_title"),
+            "tray_price_half": (cls._serialize_price(half_price) if normalized_type == "regular" else None),
+            "tray_price_full": (cls._serialize_price(full_price) if normalized_type == "regular" else None),
+            "option_group_count": 1 if row.get("group_id") else 0,
+            "created_at": cls._to_iso(row.get("created_at")),
+            "updated_at": cls._to_iso(row.get("updated_at")),
+        }
 
     @classmethod
     def _build_unassigned_item_detail(cls, menu_type, row_id, raw_row):
@@ -780,7 +836,9 @@ class AdminMenuService:
                 type_id_map=type_id_map,
                 connection=connection,
             )
+            CacheVersionBus.bump(CacheVersionBus.MENU, connection=connection)
 
+        MenuCatalogCache.invalidate()
         primary_menu_type = "formal" if type_keys == ["formal"] else "regular"
         encoded_id = cls._encode_item_id(primary_menu_type, inserted_row_id)
         created = cls.get_menu_item_detail(encoded_id)
@@ -952,7 +1010,9 @@ class AdminMenuService:
                 type_id_map=type_id_map,
                 connection=connection,
             )
+            CacheVersionBus.bump(CacheVersionBus.MENU, connection=connection)
 
+        MenuCatalogCache.invalidate()
         if not next_type_keys:
             raw_row = cls._fetch_raw_item_row(row_id=row_id, connection=None) or {}
             updated = cls._build_unassigned_item_detail(menu_type, row_id, raw_row)
@@ -986,7 +1046,9 @@ class AdminMenuService:
                 connection=connection,
                 auto_commit=False,
             )
+            CacheVersionBus.bump(CacheVersionBus.MENU, connection=connection)
 
+        MenuCatalogCache.invalidate()
         return {
             "ok": True,
             "deleted_item_id": item_id,
@@ -1,10 +1,13 @@
+import json
 import re
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 import pymysql
 
-from flask_api.config.mysqlconnection import db_transaction, query_db, query_db_many
+from flask_api.config.mysqlconnection import db_transaction, query_db, query_db_many, update_sequence_positions
 from flask_api.models.menu import Menu
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.menu_catalog_cache import MenuCatalogCache
 
 
 class ServicePlanValidationError(ValueError):
@@ -927,6 +930,45 @@ class AdminServicePlanService:
             f"Included Items: {conflict_preview}"
         )
 
+    @classmethod
+    def _constraint_entry(cls, row):
+        return {
+            "selection_key": row.get("selection_key"),
+            "min_select": cls._to_int(row.get("min_select"), minimum=0),
+            "max_select": cls._to_int(row.get("max_select"), minimum=0),
+        }
+
+    @classmethod
+    def _detail_entry(cls, row):
+        return {
+            "detail_text": str(row.get("detail_text") or "").strip(),
+            "sort_order": cls._to_int(row.get("sort_order"), default=0, minimum=0),
+        }
+
+    @classmethod
+    def _selection_group_entry(cls, row):
+        return {
+            "group_key": row.get("group_key"),
+            "group_title": str(row.get("group_title") or "").strip(),
+            "source_type": str(row.get("source_type") or "").strip() or "custom_options",
+            "menu_group_key": str(row.get("menu_group_key") or "").strip() or None,
+            "min_select": cls._to_int(row.get("min_select"), minimum=0),
+            "max_select": cls._to_int(row.get("max_select"), minimum=0),
+            "sort_order": cls._to_int(row.get("sort_order"), default=0, minimum=0),
+            "is_active": bool(row.get("is_active", 0)),
+            "options": [],
+        }
+
+    @classmethod
+    def _selection_option_entry(cls, row, sort_order_field="sort_order", is_active_field="is_active"):
+        return {
+            "option_key": row.get("option_key"),
+            "option_label": str(row.get("option_label") or "").strip(),
+            "menu_item_id": cls._to_int(row.get("menu_item_id"), minimum=1),
+            "sort_order": cls._to_int(row.get(sort_order_field), default=0, minimum=0),
+            "is_active": bool(row.get(is_active_field, 0)),
+        }
+
     @classmethod
     def _fetch_plan_constraints(cls, plan_ids):
         normalized_ids = [cls._to_int(plan_id, minimum=1) for plan_id in plan_ids or []]
@@ -951,13 +993,7 @@ class AdminServicePlanService:
         )
         grouped = {}
         for row in rows:
-            grouped.setdefault(row.get("service_plan_id"), []).append(
-                {
-                    "selection_key": row.get("selection_key"),
-                    "min_select": cls._to_int(row.get("min_select"), minimum=0),
-                    "max_select": cls._to_int(row.get("max_select"), minimum=0),
-                }
-            )
+            grouped.setdefault(row.get("service_plan_id"), []).append(cls._constraint_entry(row))
         return grouped
 
     @classmethod
@@ -984,12 +1020,7 @@ class AdminServicePlanService:
         )
         grouped = {}
         for row in rows:
-            grouped.setdefault(row.get("service_plan_id"), []).append(
-                {
-                    "detail_text": str(row.get("detail_text") or "").strip(),
-                    "sort_order": cls._to_int(row.get("sort_order"), default=0, minimum=0),
-                }
-            )
+            grouped.setdefault(row.get("service_plan_id"), []).append(cls._detail_entry(row))
         return grouped
 
     @classmethod
@@ -1040,58 +1071,19 @@ class AdminServicePlanService:
             grouped.setdefault(service_plan_id, [])
             current_group = group_index.get(row.get("group_id"))
             if current_group is None:
-                current_group = {
-                    "group_key": row.get("group_key"),
-                    "group_title": str(row.get("group_title") or "").strip(),
-                    "source_type": str(row.get("source_type") or "").strip() or "custom_options",
-                    "menu_group_key": str(row.get("menu_group_key") or "").strip() or None,
-                    "min_select": cls._to_int(row.get("min_select"), minimum=0),
-                    "max_select": cls._to_int(row.get("max_select"), minimum=0),
-                    "sort_order": cls._to_int(row.get("sort_order"), default=0, minimum=0),
-                    "is_active": bool(row.get("is_active", 0)),
-                    "options": [],
-                }
+                current_group = cls._selection_group_entry(row)
                 grouped[service_plan_id].append(current_group)
                 group_index[row.get("group_id")] = current_group
             if row.get("option_id"):
                 current_group["options"].append(
-                    {
-                        "option_key": row.get("option_key"),
-                        "option_label": str(row.get("option_label") or "").strip(),
-                        "menu_item_id": cls._to_int(row.get("menu_item_id"), minimum=1),
-                        "sort_order": cls._to_int(row.get("option_sort_order"), default=0, minimum=0),
-                        "is_active": bool(row.get("option_is_active", 0)),
-                    }
+                    cls._selection_option_entry(
+                        row,
+                        sort_order_field="option_sort_order",
+                        is_active_field="option_is_active",
+                    )
                 )
         return grouped
 
-    @classmethod
-    def _fetch_include_keys(cls, section_ids):
-        normalized_ids = [cls._to_int(section_id, minimum=1) for section_id in section_ids or []]
-        normalized_ids = [section_id for section_id in normalized_ids if section_id]
-        if not normalized_ids:
-            return {}
-
-        payload = {}
-        tokens = []
-        for index, section_id in enumerate(normalized_ids):
-            token = f"section_id_{index}"
-            payload[token] = section_id
-            tokens.append(f"%({token})s")
-        rows = query_db(
-            f"""
-      SELECT section_id, menu_group_key, sort_order
-      FROM service_section_menu_groups
-      WHERE section_id IN ({", ".join(tokens)})
-      ORDER BY section_id ASC, sort_order ASC, id ASC;
-      """,
-            payload,
-        )
-        grouped = {}
-        for row in rows:
-            grouped.setdefault(row.get("section_id"), []).append(row.get("menu_group_key"))
-        return grouped
-
     @classmethod
     def _serialize_plan_row(cls, row, constraints=None, details=None, selection_groups=None):
         is_active = bool(row.get("is_active", 0))
@@ -1371,21 +1363,73 @@ class AdminServicePlanService:
                     auto_commit=False,
                 )
 
+    @staticmethod
+    def _decode_json_list(value):
+        if value in (None, ""):
+            return []
+        if isinstance(value, (bytes, bytearray)):
+            value = value.decode("utf-8")
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return []
+        return [entry for entry in value if isinstance(entry, dict)] if isinstance(value, list) else []
+
     @classmethod
-    def list_service_plan_sections(cls, catalog_key="", include_inactive=True):
-        try:
-            normalized_catalog = cls._normalize_catalog_key(catalog_key)
-            conditions = []
-            payload = {}
-            if normalized_catalog:
-                conditions.append("s.catalog_key = %(catalog_key)s")
-                payload["catalog_key"] = normalized_catalog
-            if not cls._to_bool(include_inactive, default=True):
-                conditions.extend(["s.is_active = 1", "(p.id IS NULL OR p.is_active = 1)"])
-            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-
-            rows = query_db(
-                f"""
+    def _ordered_json_entries(cls, value, *sort_fields):
+        return sorted(
+            cls._decode_json_list(value),
+            key=lambda entry: tuple(cls._to_int(entry.get(field), default=0) for field in sort_fields),
+        )
+
+    @classmethod
+    def _decode_plan_children(cls, row):
+        constraints = [
+            cls._constraint_entry(entry)
+            for entry in sorted(
+                cls._decode_json_list(row.get("constraints_json")),
+                # Matches the case-insensitive collation order the per-plan query gets from ORDER BY.
+                key=lambda entry: (
+                    str(entry.get("selection_key") or "").lower(),
+                    cls._to_int(entry.get("id"), default=0),
+                ),
+            )
+        ]
+        details = [
+            cls._detail_entry(entry) for entry in cls._ordered_json_entries(row.get("details_json"), "sort_order", "id")
+        ]
+        selection_groups = []
+        for group_entry in cls._ordered_json_entries(row.get("selection_groups_json"), "sort_order", "id"):
+            selection_group = cls._selection_group_entry(group_entry)
+            selection_group["options"] = [
+                cls._selection_option_entry(option_entry)
+                for option_entry in cls._ordered_json_entries(group_entry.get("options"), "sort_order", "id")
+            ]
+            selection_groups.append(selection_group)
+        return constraints, details, selection_groups
+
+    @classmethod
+    def _load_service_plan_sections(cls, catalog_keys=None, include_inactive=True):
+        conditions = []
+        payload = {}
+        normalized_catalogs = [cls._normalize_catalog_key(catalog_key) for catalog_key in catalog_keys or []]
+        normalized_catalogs = [catalog_key for catalog_key in normalized_catalogs if catalog_key]
+        if normalized_catalogs:
+            tokens = []
+            for index, catalog_key in enumerate(normalized_catalogs):
+                token = f"catalog_key_{index}"
+                payload[token] = catalog_key
+                tokens.append(f"%({token})s")
+            conditions.append(f"s.catalog_key IN ({', '.join(tokens)})")
+        if not cls._to_bool(include_inactive, default=True):
+            conditions.extend(["s.is_active = 1", "(p.id IS NULL OR p.is_active = 1)"])
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # One round trip: child rows are folded into JSON arrays per plan/section and ordered in Python,
+        # since JSON_ARRAYAGG does not guarantee element order.
+        rows = query_db(
+            f"""
       SELECT
         s.id AS section_id,
         s.catalog_key,
@@ -1408,57 +1452,138 @@ class AdminServicePlanService:
         p.sort_order,
         p.is_active,
         p.created_at,
-        p.updated_at
+        p.updated_at,
+        (
+          SELECT JSON_ARRAYAGG(
+            JSON_OBJECT('id', m.id, 'menu_group_key', m.menu_group_key, 'sort_order', m.sort_order)
+          )
+          FROM service_section_menu_groups m
+          WHERE m.section_id = s.id
+        ) AS include_keys_json,
+        (
+          SELECT JSON_ARRAYAGG(
+            JSON_OBJECT(
+              'id', c.id,
+              'selection_key', c.selection_key,
+              'min_select', c.min_select,
+              'max_select', c.max_select
+            )
+          )
+          FROM service_plan_constraints c
+          WHERE c.service_plan_id = p.id
+        ) AS constraints_json,
+        (
+          SELECT JSON_ARRAYAGG(JSON_OBJECT('id', d.id, 'detail_text', d.detail_text, 'sort_order', d.sort_order))
+          FROM service_plan_details d
+          WHERE d.service_plan_id = p.id
+        ) AS details_json,
+        (
+          SELECT JSON_ARRAYAGG(
+            JSON_OBJECT(
+              'id', g.id,
+              'group_key', g.group_key,
+              'group_title', g.group_title,
+              'source_type', g.source_type,
+              'menu_group_key', g.menu_group_key,
+              'min_select', g.min_select,
+              'max_select', g.max_select,
+              'sort_order', g.sort_order,
+              'is_active', g.is_active,
+              'options', (
+                SELECT JSON_ARRAYAGG(
+                  JSON_OBJECT(
+                    'id', o.id,
+                    'option_key', o.option_key,
+                    'option_label', o.option_label,
+                    'menu_item_id', o.menu_item_id,
+                    'sort_order', o.sort_order,
+                    'is_active', o.is_active
+                  )
+                )
+                FROM service_plan_selection_options o
+                WHERE o.selection_group_id = g.id
+              )
+            )
+          )
+          FROM service_plan_selection_groups g
+          WHERE g.service_plan_id = p.id
+        ) AS selection_groups_json
       FROM service_plan_sections s
       LEFT JOIN service_plans p ON p.section_id = s.id
       {where_clause}
       ORDER BY s.catalog_key ASC, s.sort_order ASC, p.sort_order ASC, p.id ASC;
       """,
-                payload,
-            )
+            payload,
+        )
 
-            section_map = {}
-            section_ids = [row.get("section_id") for row in rows if row.get("section_id")]
-            plan_ids = [row.get("id") for row in rows if row.get("id")]
-            constraints_by_plan_id = cls._fetch_plan_constraints(plan_ids)
-            details_by_plan_id = cls._fetch_plan_details(plan_ids)
-            selection_groups_by_plan_id = cls._fetch_plan_selection_groups(plan_ids)
-            include_keys_by_section_id = cls._fetch_include_keys(section_ids)
-            for row in rows:
-                section_id = row.get("section_id")
-                section = section_map.setdefault(
-                    section_id,
-                    {
-                        "id": section_id,
-                        "catalog_key": row.get("catalog_key"),
-                        "section_key": row.get("section_key"),
-                        "section_type": row.get("section_type"),
-                        "public_section_id": row.get("public_section_id"),
-                        "title": row.get("section_title"),
-                        "note": str(row.get("section_note") or "").strip() or None,
-                        "sort_order": row.get("section_sort_order"),
-                        "is_active": bool(row.get("section_is_active", 0)),
-                        "include_keys": include_keys_by_section_id.get(section_id, []),
-                        "plans": [],
-                    },
-                )
-                if not row.get("id"):
-                    continue
-                plan_id = row.get("id")
-                section["plans"].append(
-                    cls._serialize_plan_row(
-                        row,
-                        constraints=constraints_by_plan_id.get(plan_id, []),
-                        details=details_by_plan_id.get(plan_id, []),
-                        selection_groups=selection_groups_by_plan_id.get(plan_id, []),
-                    )
+        section_map = {}
+        for row in rows:
+            section_id = row.get("section_id")
+            section = section_map.get(section_id)
+            if section is None:
+                section = {
+                    "id": section_id,
+                    "catalog_key": row.get("catalog_key"),
+                    "section_key": row.get("section_key"),
+                    "section_type": row.get("section_type"),
+                    "public_section_id": row.get("public_section_id"),
+                    "title": row.get("section_title"),
+                    "note": str(row.get("section_note") or "").strip() or None,
+                    "sort_order": row.get("section_sort_order"),
+                    "is_active": bool(row.get("section_is_active", 0)),
+                    "include_keys": [
+                        entry.get("menu_group_key")
+                        for entry in cls._ordered_json_entries(row.get("include_keys_json"), "sort_order", "id")
+                    ],
+                    "plans": [],
+                }
+                section_map[section_id] = section
+            if not row.get("id"):
+                continue
+            constraints, details, selection_groups = cls._decode_plan_children(row)
+            section["plans"].append(
+                cls._serialize_plan_row(
+                    row,
+                    constraints=constraints,
+                    details=details,
+                    selection_groups=selection_groups,
                 )
-            return {"sections": list(section_map.values())}, 200
+            )
+        return list(section_map.values())
+
+    @classmethod
+    def list_service_plan_sections(cls, catalog_key="", include_inactive=True):
+        try:
+            normalized_catalog = cls._normalize_catalog_key(catalog_key)
+            sections = cls._load_service_plan_sections(
+                catalog_keys=[normalized_catalog] if normalized_catalog else None,
+                include_inactive=include_inactive,
+            )
+            return {"sections": sections}, 200
         except pymysql.err.ProgrammingError as exc:
             if cls._is_missing_service_plan_tables_error(exc):
                 return cls._missing_tables_response()
             raise
 
+    @classmethod
+    def list_public_service_plan_catalogs(cls, catalog_keys=VALID_CATALOG_KEYS):
+        normalized_catalogs = [cls._normalize_catalog_key(catalog_key) for catalog_key in catalog_keys or []]
+        normalized_catalogs = [catalog_key for catalog_key in normalized_catalogs if catalog_key]
+        if not normalized_catalogs:
+            return {"catalogs": {}}, 200
+
+        try:
+            sections = cls._load_service_plan_sections(catalog_keys=normalized_catalogs, include_inactive=False)
+        except pymysql.err.ProgrammingError as exc:
+            if cls._is_missing_service_plan_tables_error(exc):
+                return cls._missing_tables_response()
+            raise
+
+        catalogs = {catalog_key: [] for catalog_key in normalized_catalogs}
+        for section in sections:
+            catalogs.setdefault(section.get("catalog_key"), []).append(section)
+        return {"catalogs": catalogs}, 200
+
     @classmethod
     def get_service_plan_detail(cls, plan_id):
         plan_row = cls._get_plan_row(plan_id)
@@ -1575,9 +1700,11 @@ class AdminServicePlanService:
                     normalized_write_payload["selection_groups"],
                     connection,
                 )
+                CacheVersionBus.bump(CacheVersionBus.SERVICE_PLANS, connection=connection)
             except ServicePlanValidationError as error:
                 return cls._validation_response(error)
 
+        MenuCatalogCache.invalidate()
         return {"plan": cls.get_service_plan_detail(inserted_plan_id)}, 201
 
     @classmethod
@@ -1658,9 +1785,11 @@ class AdminServicePlanService:
                         normalized_write_payload["selection_groups"],
                         connection,
                     )
+                CacheVersionBus.bump(CacheVersionBus.SERVICE_PLANS, connection=connection)
             except ServicePlanValidationError as error:
                 return cls._validation_response(error)
 
+        MenuCatalogCache.invalidate()
         return {"plan": cls.get_service_plan_detail(plan_row.get("id"))}, 200
 
     @classmethod
@@ -1693,6 +1822,8 @@ class AdminServicePlanService:
                     connection=connection,
                     auto_commit=False,
                 )
+            CacheVersionBus.bump(CacheVersionBus.SERVICE_PLANS, connection=connection)
+        MenuCatalogCache.invalidate()
         return {"ok": True, "deleted_plan_id": normalized_plan_id, "plan_key": plan_row.get("plan_key")}, 200
 
     @classmethod
@@ -1707,17 +1838,7 @@ class AdminServicePlanService:
             return {"error": "ordered_plan_ids is required."}, 400
 
         with db_transaction() as connection:
-            current_rows = query_db(
-                """
-        SELECT id
-        FROM service_plans
-        WHERE section_id = %(section_id)s
-        ORDER BY sort_order ASC, id ASC;
-        """,
-                {"section_id": normalized_section_id},
-                connection=connection,
-                auto_commit=False,
-            )
+            current_rows = cls._list_section_plan_rows(normalized_section_id, connection=connection)
             current_ids = [row.get("id") for row in current_rows]
             if not current_ids:
                 return {"error": "Service plan section has no plans to reorder."}, 404
@@ -1730,21 +1851,38 @@ class AdminServicePlanService:
                     ordered_ids.append(plan_id_value)
                     seen.add(plan_id_value)
 
-            for index, plan_id_value in enumerate(ordered_ids, start=1):
-                query_db(
-                    "UPDATE service_plans SET sort_order = %(sort_order)s WHERE id = %(plan_id)s;",
-                    {"sort_order": 1000000 + index, "plan_id": plan_id_value},
-                    fetch="none",
-                    connection=connection,
-                    auto_commit=False,
-                )
-            for index, plan_id_value in enumerate(ordered_ids, start=1):
-                query_db(
-                    "UPDATE service_plans SET sort_order = %(sort_order)s WHERE id = %(plan_id)s;",
-                    {"sort_order": index, "plan_id": plan_id_value},
-                    fetch="none",
-                    connection=connection,
-                    auto_commit=False,
-                )
+            update_sequence_positions("service_plans", "sort_order", ordered_ids, connection=connection)
+            CacheVersionBus.bump(CacheVersionBus.SERVICE_PLANS, connection=connection)
 
-        return {"ok": True, "ordered_plan_ids": ordered_ids}, 200
+        MenuCatalogCache.invalidate()
+        return {
+            "ok": True,
+            "ordered_plan_ids": ordered_ids,
+            "previous_plan_ids": current_ids,
+            "section_title": current_rows[0].get("section_title"),
+        }, 200
+
+    @classmethod
+    def _list_section_plan_rows(cls, section_id, connection=None):
+        return (
+            query_db(
+                """
+      SELECT p.id, s.title AS section_title
+      FROM service_plans p
+      JOIN service_plan_sections s ON s.id = p.section_id
+      WHERE p.section_id = %(section_id)s
+      ORDER BY p.sort_order ASC, p.id ASC;
+      """,
+                {"section_id": section_id},
+                connection=connection,
+                auto_commit=connection is None,
+            )
+            or []
+        )
+
+    @classmethod
+    def list_section_plan_ids(cls, section_id):
+        normalized_section_id = cls._to_int(section_id, minimum=1)
+        if not normalized_section_id:
+            return []
+        return [row.get("id") for row in cls._list_section_plan_rows(normalized_section_id)]
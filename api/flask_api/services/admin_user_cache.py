@@ -0,0 +1,17 @@
+import threading
+
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.versioned_cache import VersionedCache
+
+
+class AdminUserCache(VersionedCache):
+    ENABLED_ENV = "ADMIN_USER_CACHE_ENABLED"
+    TTL_ENV = "ADMIN_USER_CACHE_TTL_SECONDS"
+    DEFAULT_TTL_SECONDS = 10.0
+    VERSION_KEYS = (CacheVersionBus.ADMIN_USERS,)
+    # Operators set the TTL to 0 to stop caching authorization data, not to cache it forever.
+    ZERO_TTL_DISABLES = True
+
+    _lock = threading.Lock()
+    _version = 0
+    _entries = {}
@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import g, has_request_context
+
+from flask_api.config.mysqlconnection import get_circuit_breaker, query_db
+
+logger = logging.getLogger(__name__)
+
+
+class CacheVersionBus:
+    # Writers bump a named counter in cache_versions inside their transaction; every worker polls the
+    # counters it caches against and drops its local entries when one moves, so caches stay coherent
+    # across gunicorn processes without a separate invalidation service.
+    MENU = "menu"
+    SERVICE_PLANS = "service_plans"
+    MEDIA = "media"
+    ADMIN_USERS = "admin_users"
+
+    ENABLED_ENV = "CACHE_VERSION_BUS_ENABLED"
+    CHECK_INTERVAL_ENV = "CACHE_VERSION_CHECK_INTERVAL_SECONDS"
+    DEFAULT_CHECK_INTERVAL_SECONDS = 1.0
+    REQUEST_BUMPS_KEY = "cache_version_bumps"
+
+    _lock = threading.Lock()
+    _seen = {}
+    _checked_at = None
+    _subscribers = []
+
+    @staticmethod
+    def _get_bool_env(name, default):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        return str(raw_value).strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _get_float_env(name, default, minimum=0.0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = float(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def is_enabled(cls):
+        return cls._get_bool_env(cls.ENABLED_ENV, True)
+
+    @classmethod
+    def subscribe(cls, names, callback):
+        # callback(connection) runs inside every bump of one of names, so state derived from those rows
+        # (the shared catalog snapshot) changes in the same commit as the write and the counter.
+        cls._subscribers.append((frozenset(names), callback))
+
+    @classmethod
+    def bump(cls, *names, connection=None):
+        names = sorted({str(name) for name in names if name})
+        if not names:
+            return
+        if has_request_context():
+            bumped = getattr(g, cls.REQUEST_BUMPS_KEY, None) or set()
+            bumped.update(names)
+            setattr(g, cls.REQUEST_BUMPS_KEY, bumped)
+        for subscribed_names, callback in cls._subscribers:
+            if subscribed_names.intersection(names):
+                callback(connection)
+        if not cls.is_enabled():
+            return
+
+        # Callers bump last in their transaction so the counter row lock is held only until commit.
+        placeholders = ", ".join(["(%s, 1)"] * len(names))
+        query_db(
+            f"""
+      INSERT INTO cache_versions (cache_key, version)
+      VALUES {placeholders}
+      ON DUPLICATE KEY UPDATE version = version + 1;
+      """,
+            tuple(names),
+            fetch="none",
+            connection=connection,
+            auto_commit=connection is None,
+        )
+
+    @classmethod
+    def pop_request_bumps(cls):
+        if not has_request_context():
+            return set()
+        return set(g.pop(cls.REQUEST_BUMPS_KEY, None) or ())
+
+    @classmethod
+    def read_versions(cls, names):
+        names = sorted({str(name) for name in names if name})
+        rows = query_db(
+            f"SELECT cache_key, version FROM cache_versions WHERE cache_key IN ({', '.join(['%s'] * len(names))});",
+            tuple(names),
+        )
+        current = {name: 0 for name in names}
+        current.update({row["cache_key"]: int(row["version"]) for row in rows or []})
+        return current
+
+    @classmethod
+    def get_seen_total(cls, names):
+        # Counters only grow, so their sum orders readings: state built from a smaller total predates
+        # a write this worker has already seen. None until this worker has read every counter.
+        with cls._lock:
+            if any(name not in cls._seen for name in names):
+                return None
+            return sum(cls._seen[name] for name in names)
+
+    @classmethod
+    def is_check_due(cls):
+        # Lets the request hook skip the poll outright: nothing is due yet, or the database circuit is
+        # open or probing and the read would only wait out the connect timeout.
+        if not cls.is_enabled() or not get_circuit_breaker().is_closed():
+            return False
+        interval_seconds = cls._get_float_env(cls.CHECK_INTERVAL_ENV, cls.DEFAULT_CHECK_INTERVAL_SECONDS)
+        with cls._lock:
+            return cls._checked_at is None or time.monotonic() - cls._checked_at >= interval_seconds
+
+    @classmethod
+    def revalidate(cls, caches, force=False):
+        if not cls.is_enabled():
+            return []
+
+        interval_seconds = cls._get_float_env(cls.CHECK_INTERVAL_ENV, cls.DEFAULT_CHECK_INTERVAL_SECONDS)
+        now = time.monotonic()
+        with cls._lock:
+            if not force and cls._checked_at is not None and now - cls._checked_at < interval_seconds:
+                return []
+            # Claimed before the read so concurrent requests in this worker do not all poll at once.
+            cls._checked_at = now
+
+        names = sorted({name for cache in caches for name in cache.VERSION_KEYS})
+        try:
+            current = cls.read_versions(names)
+        except Exception as exc:
+            cls._log_event(logging.WARNING, "cache_version_check_failed", error=str(exc))
+            return []
+
+        with cls._lock:
+            # Without an earlier reading there is no way to tell what is stale, so treat every key as changed.
+            changed = [name for name in names if cls._seen.get(name) != current[name]]
+            cls._seen.update(current)
+
+        # Counters are recorded even while the caches are empty (after a restart or an invalidation), so
+        # the entries filled next are checked against this reading instead of being dropped as unknown.
+        # Empty caches are still invalidated: that bumps their local version so a build already in
+        # flight from before the change is not stored.
+        if changed:
+            for cache in caches:
+                if set(cache.VERSION_KEYS) & set(changed):
+                    cache.invalidate()
+            cls._log_event(logging.DEBUG, "cache_versions_changed", keys=changed)
+        return changed
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._seen.clear()
+            cls._checked_at = None
@@ -36,7 +36,6 @@ class GalleryService:
                 {
                     "id": row.get("id"),
                     "src": row.get("image_url"),
-                    "thumbnail_src": row.get("image_url"),
                     "title": title,
                     "slide_title": title,
                     "caption": caption,
@@ -47,6 +46,7 @@ class GalleryService:
                     "display_order": row.get("display_order"),
                     "is_slide": bool(row.get("is_slide", 0)),
                     "media_type": row.get("media_type") or "image",
+                    **Slide.variant_fields(row.get("image_url"), row.get("image_variants")),
                 }
             )
         return gallery_items
@@ -1,13 +1,20 @@
 import hashlib
+import json
+import logging
 import os
 import re
 import socket
 import threading
 import time
-from collections import defaultdict, deque
 
+from flask_api.services.inquiry_abuse_state import (
+    MemoryAbuseStateStore,
+    MySQLAbuseStateStore,
+    SQLiteAbuseStateStore,
+)
 from flask_api.validators.inquiry_validators import normalize_email, normalize_phone
 
+logger = logging.getLogger(__name__)
 URL_REGEX = re.compile(r"(https?://|www\.)", re.IGNORECASE)
 DEFAULT_BLOCKED_DOMAINS = {
     "mailinator.com",
@@ -19,10 +26,15 @@ DEFAULT_BLOCKED_DOMAINS = {
 
 
 class InquiryAbuseGuard:
+    STATE_BACKENDS = {
+        "memory": MemoryAbuseStateStore,
+        "mysql": MySQLAbuseStateStore,
+        "sqlite": SQLiteAbuseStateStore,
+    }
+
     _lock = threading.Lock()
-    _ip_events = defaultdict(deque)
-    _recent_submission_keys = {}
-    _blocked_events = deque()
+    _state_store = None
+    _fallback_store = MemoryAbuseStateStore()
 
     @staticmethod
     def _get_int_env(name, default):
@@ -48,30 +60,56 @@ class InquiryAbuseGuard:
         return hashlib.sha256(str(value or "").encode("utf-8")).hexdigest()[:12]
 
     @classmethod
-    def _trim_state_locked(cls, now_epoch):
-        cleanup_before = now_epoch - 86400
-        for key in list(cls._ip_events.keys()):
-            events = cls._ip_events[key]
-            while events and events[0] < cleanup_before:
-                events.popleft()
-            if not events:
-                del cls._ip_events[key]
+    def _state_backend(cls):
+        backend = os.getenv("INQUIRY_ABUSE_STATE_BACKEND", "memory").strip().lower()
+        return backend if backend in cls.STATE_BACKENDS else "memory"
 
-        for key, timestamp in list(cls._recent_submission_keys.items()):
-            if timestamp < cleanup_before:
-                del cls._recent_submission_keys[key]
+    @classmethod
+    def get_state_store(cls):
+        backend = cls._state_backend()
+        sqlite_path = os.getenv("INQUIRY_ABUSE_STATE_SQLITE_PATH") or None
+        with cls._lock:
+            store = cls._state_store
+            if (
+                store is None
+                or store.backend != backend
+                or (backend == "sqlite" and sqlite_path and store.path != sqlite_path)
+            ):
+                store = SQLiteAbuseStateStore(sqlite_path) if backend == "sqlite" else cls.STATE_BACKENDS[backend]()
+                cls._state_store = store
+            return store
 
-        while cls._blocked_events and cls._blocked_events[0] < now_epoch - 3600:
-            cls._blocked_events.popleft()
+    @classmethod
+    def reset_state(cls):
+        with cls._lock:
+            cls._state_store = None
+            cls._fallback_store = MemoryAbuseStateStore()
 
     @classmethod
-    def _record_blocked_locked(cls, now_epoch):
-        cls._blocked_events.append(now_epoch)
+    def _call_state(cls, method_name, *args):
+        store = cls.get_state_store()
+        try:
+            return getattr(store, method_name)(*args)
+        except Exception as exc:
+            # Keep enforcing limits per worker rather than rejecting inquiries when shared state is down.
+            logger.warning(
+                json.dumps(
+                    {
+                        "event": "inquiry_abuse_state_unavailable",
+                        "backend": store.backend,
+                        "operation": method_name,
+                        "exception_type": type(exc).__name__,
+                    }
+                )
+            )
+            return getattr(cls._fallback_store, method_name)(*args)
+
+    @classmethod
+    def _record_blocked(cls, now_epoch):
         alert_threshold = cls._get_int_env("INQUIRY_ABUSE_ALERT_THRESHOLD_PER_MINUTE", 10)
         window_seconds = cls._get_int_env("INQUIRY_ABUSE_ALERT_WINDOW_SECONDS", 60)
-        while cls._blocked_events and cls._blocked_events[0] < now_epoch - window_seconds:
-            cls._blocked_events.popleft()
-        return len(cls._blocked_events) >= max(alert_threshold, 1)
+        blocked_count = cls._call_state("record_blocked", now_epoch, window_seconds)
+        return blocked_count >= max(alert_threshold, 1)
 
     @classmethod
     def evaluate(cls, inquiry, raw_payload, client_ip="", user_agent=""):
@@ -95,9 +133,7 @@ class InquiryAbuseGuard:
         honeypot_field = os.getenv("INQUIRY_INTEGRITY_FIELD", "company_website")
         honeypot_value = str(raw_payload.get(honeypot_field, "") or "").strip()
         if honeypot_value:
-            with cls._lock:
-                cls._trim_state_locked(now_epoch)
-                response["alert"] = cls._record_blocked_locked(now_epoch)
+            response["alert"] = cls._record_blocked(now_epoch)
             response.update(
                 {
                     "allow": False,
@@ -110,36 +146,18 @@ class InquiryAbuseGuard:
 
         minute_limit = cls._get_int_env("INQUIRY_RATE_LIMIT_PER_IP_PER_MINUTE", 3)
         hour_limit = cls._get_int_env("INQUIRY_RATE_LIMIT_PER_IP_PER_HOUR", 12)
-        with cls._lock:
-            cls._trim_state_locked(now_epoch)
-            events = cls._ip_events[client_ip]
-            while events and events[0] < now_epoch - 3600:
-                events.popleft()
-            minute_count = sum(1 for timestamp in events if timestamp >= now_epoch - 60)
-            hour_count = len(events)
-            if minute_count >= max(minute_limit, 1):
-                response["alert"] = cls._record_blocked_locked(now_epoch)
-                response.update(
-                    {
-                        "allow": False,
-                        "status_code": 429,
-                        "warning": "Please wait before submitting another inquiry.",
-                        "warning_code": "rate_limit_minute",
-                    }
-                )
-                return response
-            if hour_count >= max(hour_limit, 1):
-                response["alert"] = cls._record_blocked_locked(now_epoch)
-                response.update(
-                    {
-                        "allow": False,
-                        "status_code": 429,
-                        "warning": "Please wait before submitting another inquiry.",
-                        "warning_code": "rate_limit_hour",
-                    }
-                )
-                return response
-            events.append(now_epoch)
+        rate_limit_code = cls._call_state("reserve_ip_slot", client_ip, now_epoch, minute_limit, hour_limit)
+        if rate_limit_code:
+            response["alert"] = cls._record_blocked(now_epoch)
+            response.update(
+                {
+                    "allow": False,
+                    "status_code": 429,
+                    "warning": "Please wait before submitting another inquiry.",
+                    "warning_code": rate_limit_code,
+                }
+            )
+            return response
 
         max_links = cls._get_int_env("INQUIRY_MAX_LINKS", 2)
         combined_text = " ".join(
@@ -150,9 +168,7 @@ class InquiryAbuseGuard:
             ]
         )
         if len(URL_REGEX.findall(combined_text)) > max(max_links, 0):
-            with cls._lock:
-                cls._trim_state_locked(now_epoch)
-                response["alert"] = cls._record_blocked_locked(now_epoch)
+            response["alert"] = cls._record_blocked(now_epoch)
             response.update(
                 {
                     "allow": False,
@@ -163,34 +179,13 @@ class InquiryAbuseGuard:
             )
             return response
 
-        duplicate_window = cls._get_int_env("INQUIRY_DUPLICATE_WINDOW_SECONDS", 900)
-        duplicate_key = cls._build_duplicate_key(inquiry)
-        response["meta"]["duplicate_key"] = duplicate_key or None
-        if duplicate_key.strip("|"):
-            with cls._lock:
-                cls._trim_state_locked(now_epoch)
-                last_timestamp = cls._recent_submission_keys.get(duplicate_key)
-                if last_timestamp is not None and (now_epoch - last_timestamp) < max(duplicate_window, 0):
-                    response["alert"] = cls._record_blocked_locked(now_epoch)
-                    response.update(
-                        {
-                            "allow": False,
-                            "status_code": 202,
-                            "warning_code": "duplicate_submission_window",
-                            "silent_accept": True,
-                        }
-                    )
-                    return response
-
         email = normalize_email(inquiry.email) or ""
         email_domain = email.split("@", 1)[1] if "@" in email else ""
         response["meta"]["email_domain"] = email_domain
 
         blocked_domains = cls._get_list_env("INQUIRY_BLOCKED_EMAIL_DOMAINS", DEFAULT_BLOCKED_DOMAINS)
         if email_domain and email_domain in blocked_domains:
-            with cls._lock:
-                cls._trim_state_locked(now_epoch)
-                response["alert"] = cls._record_blocked_locked(now_epoch)
+            response["alert"] = cls._record_blocked(now_epoch)
             response.update(
                 {
                     "allow": False,
@@ -203,9 +198,7 @@ class InquiryAbuseGuard:
 
         allowed_domains = cls._get_list_env("INQUIRY_ALLOWED_EMAIL_DOMAINS")
         if email_domain and allowed_domains and email_domain not in allowed_domains:
-            with cls._lock:
-                cls._trim_state_locked(now_epoch)
-                response["alert"] = cls._record_blocked_locked(now_epoch)
+            response["alert"] = cls._record_blocked(now_epoch)
             response.update(
                 {
                     "allow": False,
@@ -220,9 +213,7 @@ class InquiryAbuseGuard:
             try:
                 socket.getaddrinfo(email_domain, None)
             except socket.gaierror:
-                with cls._lock:
-                    cls._trim_state_locked(now_epoch)
-                    response["alert"] = cls._record_blocked_locked(now_epoch)
+                response["alert"] = cls._record_blocked(now_epoch)
                 response.update(
                     {
                         "allow": False,
@@ -233,6 +224,25 @@ class InquiryAbuseGuard:
                 )
                 return response
 
+        # Claimed last so rejected payloads never hold the key; the claim is the duplicate check,
+        # so two identical concurrent submissions cannot both pass it.
+        duplicate_window = cls._get_int_env("INQUIRY_DUPLICATE_WINDOW_SECONDS", 900)
+        duplicate_key = cls._build_duplicate_key(inquiry)
+        response["meta"]["duplicate_key"] = duplicate_key or None
+        if duplicate_key.strip("|"):
+            if not cls._call_state("claim_submission", duplicate_key, now_epoch, max(duplicate_window, 0)):
+                response["alert"] = cls._record_blocked(now_epoch)
+                response.update(
+                    {
+                        "allow": False,
+                        "status_code": 202,
+                        "warning_code": "duplicate_submission_window",
+                        "silent_accept": True,
+                    }
+                )
+                return response
+            response["meta"]["duplicate_claimed_at"] = now_epoch
+
         return response
 
     @staticmethod
@@ -247,12 +257,13 @@ class InquiryAbuseGuard:
         )
 
     @classmethod
-    def record_successful_submission(cls, duplicate_key):
-        duplicate_key = str(duplicate_key or "").strip()
-        if not duplicate_key or not duplicate_key.strip("|"):
+    def release_duplicate_claim(cls, meta):
+        # Frees the key claimed by evaluate when the inquiry was not stored, so a corrected resend is not
+        # swallowed as a duplicate. Only the claim's own timestamp is released, never a newer one.
+        meta = meta or {}
+        duplicate_key = str(meta.get("duplicate_key") or "").strip()
+        claimed_at = meta.get("duplicate_claimed_at")
+        if not duplicate_key.strip("|") or claimed_at is None:
             return
 
-        now_epoch = time.time()
-        with cls._lock:
-            cls._trim_state_locked(now_epoch)
-            cls._recent_submission_keys[duplicate_key] = now_epoch
+        cls._call_state("release_submission", duplicate_key, claimed_at)
@@ -0,0 +1,487 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict, deque
+
+from flask_api.config.mysqlconnection import db_transaction, query_db
+
+STATE_RETENTION_SECONDS = 86400
+IP_WINDOW_SECONDS = 3600
+BLOCKED_RETENTION_SECONDS = 3600
+CLEANUP_INTERVAL_SECONDS = 60
+
+
+def _state_key(value):
+    # Duplicate keys carry email/phone; shared stores only ever see a digest.
+    return hashlib.sha256(str(value or "").encode("utf-8")).hexdigest()
+
+
+def _rate_limit_code(minute_count, hour_count, minute_limit, hour_limit):
+    if minute_count >= max(minute_limit, 1):
+        return "rate_limit_minute"
+    if hour_count >= max(hour_limit, 1):
+        return "rate_limit_hour"
+    return None
+
+
+class _BucketedWindow:
+    # Fixed-width buckets with a running total: adding and expiring are amortized O(1) and the
+    # bucket count is bounded by window / width. Buckets are kept while any part of them overlaps
+    # the window, so counts can lead the exact sliding window by up to one bucket width.
+    __slots__ = ("window_seconds", "bucket_seconds", "buckets", "total")
+
+    def __init__(self, window_seconds, bucket_seconds):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buckets = deque()
+        self.total = 0
+
+    def expire(self, now_epoch):
+        window_start = now_epoch - self.window_seconds
+        while self.buckets and self.buckets[0][0] + self.bucket_seconds <= window_start:
+            self.total -= self.buckets.popleft()[1]
+        return self.total
+
+    def add(self, now_epoch):
+        bucket_start = int(now_epoch // self.bucket_seconds) * self.bucket_seconds
+        if self.buckets and self.buckets[-1][0] == bucket_start:
+            self.buckets[-1][1] += 1
+        else:
+            self.buckets.append([bucket_start, 1])
+        self.total += 1
+
+
+class _IpWindow:
+    __slots__ = ("minute", "hour", "last_seen")
+
+    def __init__(self):
+        self.minute = _BucketedWindow(60, 1)
+        self.hour = _BucketedWindow(IP_WINDOW_SECONDS, 60)
+        self.last_seen = 0.0
+
+
+class MemoryAbuseStateStore:
+    backend = "memory"
+    MAX_KEYS_ENV = "INQUIRY_ABUSE_STATE_MAX_KEYS"
+    DEFAULT_MAX_KEYS = 50000
+
+    def __init__(self, max_keys=None):
+        if max_keys is None:
+            try:
+                max_keys = int(os.getenv(self.MAX_KEYS_ENV, str(self.DEFAULT_MAX_KEYS)))
+            except (TypeError, ValueError):
+                max_keys = self.DEFAULT_MAX_KEYS
+        self.max_keys = max(int(max_keys), 1)
+        self._lock = threading.Lock()
+        # Both maps are kept in last-touched order, so expiry only ever inspects the oldest end and
+        # the same ordering doubles as the LRU eviction queue once max_keys is reached.
+        self._ip_windows = OrderedDict()
+        self._recent_submission_keys = OrderedDict()
+        self._blocked_events = _BucketedWindow(BLOCKED_RETENTION_SECONDS, 1)
+        self.evicted_keys = 0
+
+    def _expire_locked(self, now_epoch):
+        ip_cutoff = now_epoch - IP_WINDOW_SECONDS
+        while self._ip_windows:
+            oldest = next(iter(self._ip_windows.values()))
+            if oldest.last_seen >= ip_cutoff:
+                break
+            self._ip_windows.popitem(last=False)
+
+        submission_cutoff = now_epoch - STATE_RETENTION_SECONDS
+        while self._recent_submission_keys:
+            if next(iter(self._recent_submission_keys.values())) >= submission_cutoff:
+                break
+            self._recent_submission_keys.popitem(last=False)
+
+    def _evict_locked(self, entries):
+        while len(entries) > self.max_keys:
+            entries.popitem(last=False)
+            self.evicted_keys += 1
+
+    def reserve_ip_slot(self, client_ip, now_epoch, minute_limit, hour_limit):
+        with self._lock:
+            self._expire_locked(now_epoch)
+            window = self._ip_windows.pop(client_ip, None) or _IpWindow()
+            window.last_seen = now_epoch
+            self._ip_windows[client_ip] = window
+            self._evict_locked(self._ip_windows)
+
+            code = _rate_limit_code(
+                window.minute.expire(now_epoch),
+                window.hour.expire(now_epoch),
+                minute_limit,
+                hour_limit,
+            )
+            if code is None:
+                window.minute.add(now_epoch)
+                window.hour.add(now_epoch)
+            return code
+
+    def claim_submission(self, duplicate_key, now_epoch, window_seconds):
+        with self._lock:
+            self._expire_locked(now_epoch)
+            last_seen = self._recent_submission_keys.get(duplicate_key)
+            if last_seen is not None and (now_epoch - last_seen) < window_seconds:
+                return False
+            self._recent_submission_keys.pop(duplicate_key, None)
+            self._recent_submission_keys[duplicate_key] = now_epoch
+            self._evict_locked(self._recent_submission_keys)
+            return True
+
+    def release_submission(self, duplicate_key, claimed_at):
+        with self._lock:
+            if self._recent_submission_keys.get(duplicate_key) == claimed_at:
+                del self._recent_submission_keys[duplicate_key]
+
+    def record_blocked(self, now_epoch, window_seconds):
+        with self._lock:
+            self._blocked_events.window_seconds = max(window_seconds, 1)
+            self._blocked_events.expire(now_epoch)
+            self._blocked_events.add(now_epoch)
+            return self._blocked_events.total
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "tracked_ips": len(self._ip_windows),
+                "tracked_submissions": len(self._recent_submission_keys),
+                "max_keys": self.max_keys,
+                "evicted_keys": self.evicted_keys,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._ip_windows.clear()
+            self._recent_submission_keys.clear()
+            self._blocked_events = _BucketedWindow(BLOCKED_RETENTION_SECONDS, 1)
+            self.evicted_keys = 0
+
+
+class MySQLAbuseStateStore:
+    backend = "mysql"
+
+    def __init__(self):
+        self._cleanup_lock = threading.Lock()
+        self._next_cleanup_at = 0.0
+
+    def _maybe_cleanup(self, now_epoch):
+        with self._cleanup_lock:
+            if now_epoch < self._next_cleanup_at:
+                return
+            self._next_cleanup_at = now_epoch + CLEANUP_INTERVAL_SECONDS
+        cleanup_before = now_epoch - STATE_RETENTION_SECONDS
+        query_db(
+            "DELETE FROM inquiry_abuse_events WHERE occurred_at < %(cleanup_before)s;",
+            {"cleanup_before": cleanup_before},
+            fetch="none",
+        )
+        query_db(
+            "DELETE FROM inquiry_abuse_keys WHERE last_seen_at < %(cleanup_before)s;",
+            {"cleanup_before": cleanup_before},
+            fetch="none",
+        )
+
+    def reserve_ip_slot(self, client_ip, now_epoch, minute_limit, hour_limit):
+        self._maybe_cleanup(now_epoch)
+        payload = {
+            "key_hash": _state_key(client_ip),
+            "now_epoch": now_epoch,
+            "minute_start": now_epoch - 60,
+            "hour_start": now_epoch - IP_WINDOW_SECONDS,
+        }
+        with db_transaction() as connection:
+            # The per-IP key row is the mutex: every worker counting this IP queues on its row lock.
+            query_db(
+                """
+        INSERT INTO inquiry_abuse_keys (key_scope, key_hash, last_seen_at)
+        VALUES ('ip', %(key_hash)s, %(now_epoch)s)
+        ON DUPLICATE KEY UPDATE key_hash = key_hash;
+        """,
+                payload,
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            query_db(
+                """
+        SELECT key_hash
+        FROM inquiry_abuse_keys
+        WHERE key_scope = 'ip' AND key_hash = %(key_hash)s
+        FOR UPDATE;
+        """,
+                payload,
+                fetch="one",
+                connection=connection,
+                auto_commit=False,
+            )
+            counts = (
+                query_db(
+                    """
+        SELECT
+          COALESCE(SUM(occurred_at >= %(minute_start)s), 0) AS minute_count,
+          COUNT(*) AS hour_count
+        FROM inquiry_abuse_events
+        WHERE event_scope = 'ip' AND event_key = %(key_hash)s AND occurred_at >= %(hour_start)s;
+        """,
+                    payload,
+                    fetch="one",
+                    connection=connection,
+                    auto_commit=False,
+                )
+                or {}
+            )
+            code = _rate_limit_code(
+                int(counts.get("minute_count") or 0),
+                int(counts.get("hour_count") or 0),
+                minute_limit,
+                hour_limit,
+            )
+            if code is not None:
+                return code
+            query_db(
+                """
+        INSERT INTO inquiry_abuse_events (event_scope, event_key, occurred_at)
+        VALUES ('ip', %(key_hash)s, %(now_epoch)s);
+        """,
+                payload,
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            query_db(
+                """
+        UPDATE inquiry_abuse_keys
+        SET last_seen_at = %(now_epoch)s
+        WHERE key_scope = 'ip' AND key_hash = %(key_hash)s;
+        """,
+                payload,
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+        return None
+
+    def claim_submission(self, duplicate_key, now_epoch, window_seconds):
+        payload = {
+            "key_hash": _state_key(duplicate_key),
+            "now_epoch": now_epoch,
+            "window_start": now_epoch - window_seconds,
+        }
+        with db_transaction() as connection:
+            # The upsert only moves last_seen_at forward once the window has lapsed, and it holds the
+            # row lock until commit, so exactly one concurrent submission reads back its own timestamp.
+            query_db(
+                """
+        INSERT INTO inquiry_abuse_keys (key_scope, key_hash, last_seen_at)
+        VALUES ('submission', %(key_hash)s, %(now_epoch)s)
+        ON DUPLICATE KEY UPDATE
+          last_seen_at = IF(last_seen_at <= %(window_start)s, VALUES(last_seen_at), last_seen_at);
+        """,
+                payload,
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            row = query_db(
+                """
+        SELECT last_seen_at
+        FROM inquiry_abuse_keys
+        WHERE key_scope = 'submission' AND key_hash = %(key_hash)s
+        FOR UPDATE;
+        """,
+                payload,
+                fetch="one",
+                connection=connection,
+                auto_commit=False,
+            )
+        return row is not None and float(row.get("last_seen_at") or 0) == now_epoch
+
+    def release_submission(self, duplicate_key, claimed_at):
+        query_db(
+            """
+      DELETE FROM inquiry_abuse_keys
+      WHERE key_scope = 'submission' AND key_hash = %(key_hash)s AND last_seen_at = %(claimed_at)s;
+      """,
+            {"key_hash": _state_key(duplicate_key), "claimed_at": claimed_at},
+            fetch="none",
+        )
+
+    def record_blocked(self, now_epoch, window_seconds):
+        with db_transaction() as connection:
+            query_db(
+                """
+        INSERT INTO inquiry_abuse_events (event_scope, event_key, occurred_at)
+        VALUES ('blocked', '', %(now_epoch)s);
+        """,
+                {"now_epoch": now_epoch},
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+            row = query_db(
+                """
+        SELECT COUNT(*) AS blocked_count
+        FROM inquiry_abuse_events
+        WHERE event_scope = 'blocked' AND event_key = '' AND occurred_at >= %(window_start)s;
+        """,
+                {"window_start": now_epoch - window_seconds},
+                fetch="one",
+                connection=connection,
+                auto_commit=False,
+            )
+        return int((row or {}).get("blocked_count") or 0)
+
+    def reset(self):
+        query_db("DELETE FROM inquiry_abuse_events;", fetch="none")
+        query_db("DELETE FROM inquiry_abuse_keys;", fetch="none")
+
+
+class SQLiteAbuseStateStore:
+    backend = "sqlite"
+    SCHEMA_STATEMENTS = (
+        """
+    CREATE TABLE IF NOT EXISTS inquiry_abuse_events (
+      event_scope TEXT NOT NULL,
+      event_key TEXT NOT NULL,
+      occurred_at REAL NOT NULL
+    );
+    """,
+        """
+    CREATE INDEX IF NOT EXISTS idx_inquiry_abuse_events_scope_key_time
+    ON inquiry_abuse_events (event_scope, event_key, occurred_at);
+    """,
+        """
+    CREATE TABLE IF NOT EXISTS inquiry_abuse_keys (
+      key_scope TEXT NOT NULL,
+      key_hash TEXT NOT NULL,
+      last_seen_at REAL NOT NULL,
+      PRIMARY KEY (key_scope, key_hash)
+    );
+    """,
+    )
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(tempfile.gettempdir(), "postcatering-inquiry-abuse.sqlite3")
+        self._local = threading.local()
+        self._cleanup_lock = threading.Lock()
+        self._next_cleanup_at = 0.0
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forked workers.
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and getattr(self._local, "pid", None) == os.getpid():
+            return connection
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL;")
+        connection.execute("PRAGMA synchronous=NORMAL;")
+        for statement in self.SCHEMA_STATEMENTS:
+            connection.execute(statement)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _write(self, callback):
+        connection = self._connection()
+        # BEGIN IMMEDIATE takes the database write lock up front so check-then-insert is atomic
+        # across every process sharing the file.
+        connection.execute("BEGIN IMMEDIATE;")
+        try:
+            result = callback(connection)
+        except Exception:
+            connection.execute("ROLLBACK;")
+            raise
+        connection.execute("COMMIT;")
+        return result
+
+    def _maybe_cleanup(self, connection, now_epoch):
+        with self._cleanup_lock:
+            if now_epoch < self._next_cleanup_at:
+                return
+            self._next_cleanup_at = now_epoch + CLEANUP_INTERVAL_SECONDS
+        cleanup_before = now_epoch - STATE_RETENTION_SECONDS
+        connection.execute("DELETE FROM inquiry_abuse_events WHERE occurred_at < ?;", (cleanup_before,))
+        connection.execute("DELETE FROM inquiry_abuse_keys WHERE last_seen_at < ?;", (cleanup_before,))
+
+    def reserve_ip_slot(self, client_ip, now_epoch, minute_limit, hour_limit):
+        key_hash = _state_key(client_ip)
+
+        def reserve(connection):
+            self._maybe_cleanup(connection, now_epoch)
+            minute_count, hour_count = connection.execute(
+                """
+        SELECT COALESCE(SUM(occurred_at >= ?), 0), COUNT(*)
+        FROM inquiry_abuse_events
+        WHERE event_scope = 'ip' AND event_key = ? AND occurred_at >= ?;
+        """,
+                (now_epoch - 60, key_hash, now_epoch - IP_WINDOW_SECONDS),
+            ).fetchone()
+            code = _rate_limit_code(int(minute_count or 0), int(hour_count or 0), minute_limit, hour_limit)
+            if code is None:
+                connection.execute(
+                    "INSERT INTO inquiry_abuse_events (event_scope, event_key, occurred_at) VALUES ('ip', ?, ?);",
+                    (key_hash, now_epoch),
+                )
+            return code
+
+        return self._write(reserve)
+
+    def claim_submission(self, duplicate_key, now_epoch, window_seconds):
+        key_hash = _state_key(duplicate_key)
+
+        def claim(connection):
+            row = connection.execute(
+                "SELECT last_seen_at FROM inquiry_abuse_keys WHERE key_scope = 'submission' AND key_hash = ?;",
+                (key_hash,),
+            ).fetchone()
+            if row is not None and (now_epoch - float(row[0])) < window_seconds:
+                return False
+            connection.execute(
+                """
+        INSERT INTO inquiry_abuse_keys (key_scope, key_hash, last_seen_at)
+        VALUES ('submission', ?, ?)
+        ON CONFLICT (key_scope, key_hash) DO UPDATE SET last_seen_at = excluded.last_seen_at;
+        """,
+                (key_hash, now_epoch),
+            )
+            return True
+
+        return self._write(claim)
+
+    def release_submission(self, duplicate_key, claimed_at):
+        key_hash = _state_key(duplicate_key)
+        self._write(
+            lambda connection: connection.execute(
+                """
+        DELETE FROM inquiry_abuse_keys
+        WHERE key_scope = 'submission' AND key_hash = ? AND last_seen_at = ?;
+        """,
+                (key_hash, claimed_at),
+            )
+        )
+
+    def record_blocked(self, now_epoch, window_seconds):
+        def record(connection):
+            connection.execute(
+                "INSERT INTO inquiry_abuse_events (event_scope, event_key, occurred_at) VALUES ('blocked', '', ?);",
+                (now_epoch,),
+            )
+            return connection.execute(
+                """
+        SELECT COUNT(*)
+        FROM inquiry_abuse_events
+        WHERE event_scope = 'blocked' AND event_key = '' AND occurred_at >= ?;
+        """,
+                (now_epoch - window_seconds,),
+            ).fetchone()[0]
+
+        return int(self._write(record) or 0)
+
+    def reset(self):
+        def clear(connection):
+            connection.execute("DELETE FROM inquiry_abuse_events;")
+            connection.execute("DELETE FROM inquiry_abuse_keys;")
+
+        self._write(clear)
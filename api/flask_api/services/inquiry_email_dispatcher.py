@@ -0,0 +1,219 @@
+import logging
+import os
+import smtplib
+import threading
+
+from flask_api.config.mysqlconnection import db_transaction
+from flask_api.models.inquiry import Inquiry
+from flask_api.models.inquiry_email_outbox import InquiryEmailOutbox
+from flask_api.services.inquiry_service import InquiryService
+
+
+class InquiryEmailDispatcher:
+    PERMANENT_FAILURE_CODES = {"smtp_recipient_refused"}
+    SESSION_FAILURE_TYPES = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+    _lock = threading.Lock()
+    _thread = None
+    _thread_pid = None
+    _wake_event = threading.Event()
+    _stop_event = threading.Event()
+
+    @staticmethod
+    def _get_int_env(name, default, minimum=0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = int(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _get_bool_env(name, default):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        return str(raw_value).strip().lower() in {"1", "true", "yes", "on"}
+
+    @classmethod
+    def is_worker_enabled(cls):
+        return cls._get_bool_env("INQUIRY_EMAIL_WORKER_ENABLED", True)
+
+    @classmethod
+    def _retry_delay_seconds(cls, attempts):
+        base_delay = cls._get_int_env("INQUIRY_EMAIL_RETRY_BASE_SECONDS", 30, minimum=1)
+        max_delay = cls._get_int_env("INQUIRY_EMAIL_RETRY_MAX_SECONDS", 3600, minimum=1)
+        return min(base_delay * (2 ** max(int(attempts) - 1, 0)), max_delay)
+
+    @classmethod
+    def _open_session(cls, smtp_config):
+        if not smtp_config.get("smtp_host") or not smtp_config.get("smtp_username"):
+            raise smtplib.SMTPException("SMTP configuration is incomplete.")
+
+        server = smtplib.SMTP(
+            smtp_config["smtp_host"],
+            smtp_config["smtp_port"],
+            timeout=cls._get_int_env("INQUIRY_EMAIL_SMTP_TIMEOUT_SECONDS", 20, minimum=1),
+        )
+        try:
+            if smtp_config["smtp_use_tls"]:
+                server.starttls()
+            server.login(smtp_config["smtp_username"], smtp_config["smtp_password"])
+        except Exception:
+            cls._close_session(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close_session(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _record_sent(outbox_row):
+        with db_transaction() as connection:
+            InquiryEmailOutbox.mark_sent(outbox_row, connection=connection)
+            if outbox_row.get("email_type") == "owner_notification":
+                Inquiry.set_email_sent(outbox_row["inquiry_id"], True, connection=connection)
+
+    @classmethod
+    def _handle_failure(cls, outbox_row, exc):
+        diagnosis = InquiryService._diagnose_smtp_failure(exc)
+        reason_code = diagnosis["reason_code"]
+        max_attempts = cls._get_int_env("INQUIRY_EMAIL_MAX_ATTEMPTS", 8, minimum=1)
+        if reason_code in cls.PERMANENT_FAILURE_CODES or outbox_row["attempts"] >= max_attempts:
+            InquiryEmailOutbox.mark_failed(outbox_row, reason_code)
+            InquiryService._log_event(
+                logging.ERROR,
+                "inquiry_email_outbox_failed",
+                outbox_id=outbox_row["id"],
+                inquiry_id=outbox_row["inquiry_id"],
+                email_type=outbox_row["email_type"],
+                attempts=outbox_row["attempts"],
+                reason_code=reason_code,
+                exception_type=type(exc).__name__,
+            )
+            return
+
+        delay_seconds = cls._retry_delay_seconds(outbox_row["attempts"])
+        InquiryEmailOutbox.mark_retry(outbox_row, delay_seconds, reason_code)
+        InquiryService._log_event(
+            logging.WARNING,
+            "inquiry_email_outbox_retry_scheduled",
+            outbox_id=outbox_row["id"],
+            inquiry_id=outbox_row["inquiry_id"],
+            email_type=outbox_row["email_type"],
+            attempts=outbox_row["attempts"],
+            retry_in_seconds=delay_seconds,
+            reason_code=reason_code,
+            exception_type=type(exc).__name__,
+        )
+
+    @classmethod
+    def deliver_pending_batch(cls, batch_size=None):
+        rows = InquiryEmailOutbox.claim_batch(
+            limit=batch_size or cls._get_int_env("INQUIRY_EMAIL_BATCH_SIZE", 20, minimum=1),
+            lock_timeout_seconds=cls._get_int_env("INQUIRY_EMAIL_LOCK_TIMEOUT_SECONDS", 300, minimum=30),
+        )
+        result = {"claimed": len(rows), "sent": 0, "deferred": 0}
+        if not rows:
+            return result
+
+        smtp_config = InquiryService._get_smtp_config()
+        server = None
+        try:
+            for index, outbox_row in enumerate(rows):
+                if server is None:
+                    try:
+                        server = cls._open_session(smtp_config)
+                    except Exception as exc:
+                        # Without a session nothing else in this batch can go out; defer it all.
+                        for pending_row in rows[index:]:
+                            cls._handle_failure(pending_row, exc)
+                        result["deferred"] += len(rows) - index
+                        break
+
+                try:
+                    server.send_message(InquiryEmailOutbox.parse_message(outbox_row["message_mime"]))
+                except Exception as exc:
+                    cls._handle_failure(outbox_row, exc)
+                    result["deferred"] += 1
+                    if isinstance(exc, cls.SESSION_FAILURE_TYPES):
+                        cls._close_session(server)
+                        server = None
+                    continue
+
+                cls._record_sent(outbox_row)
+                result["sent"] += 1
+                InquiryService._log_event(
+                    logging.INFO,
+                    "inquiry_email_sent",
+                    outbox_id=outbox_row["id"],
+                    inquiry_id=outbox_row["inquiry_id"],
+                    email_type=outbox_row["email_type"],
+                    attempts=outbox_row["attempts"],
+                    smtp_host=smtp_config["smtp_host"],
+                )
+        finally:
+            if server is not None:
+                cls._close_session(server)
+        return result
+
+    @classmethod
+    def _run(cls):
+        poll_seconds = cls._get_int_env("INQUIRY_EMAIL_WORKER_POLL_SECONDS", 30, minimum=1)
+        while not cls._stop_event.is_set():
+            try:
+                result = cls.deliver_pending_batch()
+            except Exception as exc:
+                InquiryService._log_event(
+                    logging.WARNING,
+                    "inquiry_email_outbox_batch_failed",
+                    exception_type=type(exc).__name__,
+                    error_message=str(exc),
+                )
+                result = {"claimed": 0}
+            if result["claimed"] and not cls._stop_event.is_set():
+                continue
+            cls._wake_event.wait(poll_seconds)
+            cls._wake_event.clear()
+
+    @classmethod
+    def ensure_started(cls):
+        if not cls.is_worker_enabled():
+            return False
+
+        # Runs before every request; once this worker's thread is up, skip the lock.
+        thread = cls._thread
+        if thread is not None and cls._thread_pid == os.getpid() and thread.is_alive():
+            return True
+
+        with cls._lock:
+            current_pid = os.getpid()
+            if cls._thread is not None and cls._thread.is_alive() and cls._thread_pid == current_pid:
+                return True
+            cls._stop_event.clear()
+            cls._thread = threading.Thread(target=cls._run, name="inquiry-email-outbox", daemon=True)
+            cls._thread_pid = current_pid
+            cls._thread.start()
+            return True
+
+    @classmethod
+    def notify(cls):
+        if cls.ensure_started():
+            cls._wake_event.set()
+
+    @classmethod
+    def stop(cls, timeout=5):
+        with cls._lock:
+            thread = cls._thread
+            cls._thread = None
+            cls._thread_pid = None
+        cls._stop_event.set()
+        cls._wake_event.set()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
@@ -465,12 +465,26 @@ class InquiryService:
         return message
 
     @staticmethod
-    def _send_inquiry_notifications(inquiry, submitted_at_utc):
-        smtp_host = os.getenv("SMTP_HOST")
-        smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        smtp_username = os.getenv("SMTP_USERNAME")
-        smtp_password = os.getenv("SMTP_PASSWORD")
-        smtp_use_tls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+    def _email_delivery_mode():
+        mode = str(os.getenv("INQUIRY_EMAIL_DELIVERY_MODE", "outbox") or "").strip().lower()
+        return mode if mode in {"outbox", "inline"} else "outbox"
+
+    @staticmethod
+    def _get_smtp_config():
+        return {
+            "smtp_host": os.getenv("SMTP_HOST"),
+            "smtp_port": int(os.getenv("SMTP_PORT", "587")),
+            "smtp_username": os.getenv("SMTP_USERNAME"),
+            "smtp_password": os.getenv("SMTP_PASSWORD"),
+            "smtp_use_tls": os.getenv("SMTP_USE_TLS", "true").lower() == "true",
+        }
+
+    @staticmethod
+    def _build_inquiry_notifications(inquiry, submitted_at_utc):
+        smtp_config = InquiryService._get_smtp_config()
+        smtp_host = smtp_config["smtp_host"]
+        smtp_username = smtp_config["smtp_username"]
+        smtp_password = smtp_config["smtp_password"]
         inquiry_to_email = os.getenv("INQUIRY_TO_EMAIL")
         inquiry_from_email = os.getenv("INQUIRY_FROM_EMAIL", smtp_username or "")
         reply_to_email = os.getenv("INQUIRY_REPLY_TO_EMAIL", inquiry_to_email or "")
@@ -488,8 +502,8 @@ class InquiryService:
             )
             warning = "Inquiry saved, but email notification is not configured."
             return {
-                "owner_email_sent": False,
-                "confirmation_email_sent": False,
+                "smtp_config": smtp_config,
+                "messages": [],
                 "warning_messages": [warning],
                 "warning_codes": ["email_config_incomplete"],
             }
@@ -503,59 +517,37 @@ class InquiryService:
             )
             warning = "Inquiry saved, but owner email destination is not configured."
             return {
-                "owner_email_sent": False,
-                "confirmation_email_sent": False,
+                "smtp_config": smtp_config,
+                "messages": [],
                 "warning_messages": [warning],
                 "warning_codes": ["owner_email_config_incomplete"],
             }
 
-        smtp_config = {
-            "smtp_host": smtp_host,
-            "smtp_port": smtp_port,
-            "smtp_username": smtp_username,
-            "smtp_password": smtp_password,
-            "smtp_use_tls": smtp_use_tls,
-        }
-        warning_messages = []
-        warning_codes = []
-
-        owner_email = InquiryService._build_owner_email(
-            inquiry=inquiry,
-            submitted_at_utc=submitted_at_utc,
-            inquiry_from_email=inquiry_from_email,
-            inquiry_to_email=inquiry_to_email,
-        )
-        owner_email_sent, owner_warning, owner_code = InquiryService._send_email_message(
-            message=owner_email,
-            smtp_config=smtp_config,
-            inquiry_id=inquiry.id,
-            email_type="owner_notification",
-        )
-        if owner_warning:
-            warning_messages.append(owner_warning)
-        if owner_code:
-            warning_codes.append(owner_code)
-
-        confirmation_email_sent = False
+        messages = [
+            {
+                "email_type": "owner_notification",
+                "message": InquiryService._build_owner_email(
+                    inquiry=inquiry,
+                    submitted_at_utc=submitted_at_utc,
+                    inquiry_from_email=inquiry_from_email,
+                    inquiry_to_email=inquiry_to_email,
+                ),
+            }
+        ]
         if confirmation_enabled:
-            confirmation_email = InquiryService._build_customer_confirmation_email(
-                inquiry=inquiry,
-                submitted_at_utc=submitted_at_utc,
-                inquiry_from_email=inquiry_from_email,
-                reply_to_email=reply_to_email,
-                owner_note=owner_note,
-                confirmation_subject=confirmation_subject,
-            )
-            confirmation_email_sent, confirmation_warning, confirmation_code = InquiryService._send_email_message(
-                message=confirmation_email,
-                smtp_config=smtp_config,
-                inquiry_id=inquiry.id,
-                email_type="customer_confirmation",
+            messages.append(
+                {
+                    "email_type": "customer_confirmation",
+                    "message": InquiryService._build_customer_confirmation_email(
+                        inquiry=inquiry,
+                        submitted_at_utc=submitted_at_utc,
+                        inquiry_from_email=inquiry_from_email,
+                        reply_to_email=reply_to_email,
+                        owner_note=owner_note,
+                        confirmation_subject=confirmation_subject,
+                    ),
+                }
             )
-            if confirmation_warning:
-                warning_messages.append("Inquiry saved, but customer confirmation email could not be sent.")
-            if confirmation_code:
-                warning_codes.append(f"customer_{confirmation_code}")
         else:
             InquiryService._log_event(
                 logging.INFO,
@@ -564,12 +556,64 @@ class InquiryService:
             )
 
         return {
-            "owner_email_sent": owner_email_sent,
-            "confirmation_email_sent": confirmation_email_sent,
+            "smtp_config": smtp_config,
+            "messages": messages,
+            "warning_messages": [],
+            "warning_codes": [],
+        }
+
+    @staticmethod
+    def _send_inquiry_notifications(inquiry, submitted_at_utc):
+        notifications = InquiryService._build_inquiry_notifications(inquiry, submitted_at_utc=submitted_at_utc)
+        warning_messages = list(notifications["warning_messages"])
+        warning_codes = list(notifications["warning_codes"])
+        sent_by_type = {}
+
+        for entry in notifications["messages"]:
+            email_type = entry["email_type"]
+            sent, warning, code = InquiryService._send_email_message(
+                message=entry["message"],
+                smtp_config=notifications["smtp_config"],
+                inquiry_id=inquiry.id,
+                email_type=email_type,
+            )
+            sent_by_type[email_type] = sent
+            if email_type == "customer_confirmation":
+                if warning:
+                    warning_messages.append("Inquiry saved, but customer confirmation email could not be sent.")
+                if code:
+                    warning_codes.append(f"customer_{code}")
+            else:
+                if warning:
+                    warning_messages.append(warning)
+                if code:
+                    warning_codes.append(code)
+
+        return {
+            "owner_email_sent": sent_by_type.get("owner_notification", False),
+            "confirmation_email_sent": sent_by_type.get("customer_confirmation", False),
             "warning_messages": warning_messages,
             "warning_codes": warning_codes,
         }
 
+    @classmethod
+    def _submit_with_outbox(cls, inquiry):
+        submitted_at_utc = cls._utc_timestamp()
+        notifications = {}
+
+        def build_outbox_messages(saved_inquiry):
+            notifications.update(cls._build_inquiry_notifications(saved_inquiry, submitted_at_utc=submitted_at_utc))
+            return notifications["messages"]
+
+        inquiry.save(build_outbox_messages=build_outbox_messages)
+        return {
+            "owner_email_sent": False,
+            "confirmation_email_sent": False,
+            "email_queued": bool(notifications["messages"]),
+            "warning_messages": notifications["warning_messages"],
+            "warning_codes": notifications["warning_codes"],
+        }
+
     @classmethod
     def submit(cls, raw_payload, client_ip="", user_agent=""):
         inquiry = Inquiry.from_payload(raw_payload)
@@ -602,6 +646,7 @@ class InquiryService:
                 return {"inquiry_id": None, "email_sent": False}, abuse_check["status_code"]
             return {"errors": [abuse_check.get("warning") or "Unable to process inquiry."]}, abuse_check["status_code"]
 
+        inquiry_saved = False
         try:
             validation_errors = inquiry.validate()
             if validation_errors:
@@ -611,16 +656,21 @@ class InquiryService:
                     error_count=len(validation_errors),
                     errors=validation_errors,
                 )
+                InquiryAbuseGuard.release_duplicate_claim(abuse_check.get("meta"))
                 return {"errors": validation_errors}, 400
 
-            inquiry.save()
+            if cls._email_delivery_mode() == "outbox":
+                notification_result = cls._submit_with_outbox(inquiry)
+            else:
+                inquiry.save()
+                notification_result = None
+            inquiry_saved = True
             cls._log_event(logging.INFO, "inquiry_saved", inquiry_id=inquiry.id)
-            duplicate_key = abuse_check.get("meta", {}).get("duplicate_key")
-            if duplicate_key:
-                InquiryAbuseGuard.record_successful_submission(duplicate_key)
 
-            submitted_at_utc = cls._utc_timestamp()
-            notification_result = cls._send_inquiry_notifications(inquiry, submitted_at_utc=submitted_at_utc)
+            if notification_result is None:
+                submitted_at_utc = cls._utc_timestamp()
+                notification_result = cls._send_inquiry_notifications(inquiry, submitted_at_utc=submitted_at_utc)
+            email_queued = bool(notification_result.get("email_queued"))
             owner_email_sent = bool(notification_result.get("owner_email_sent"))
             confirmation_email_sent = bool(notification_result.get("confirmation_email_sent"))
             warning_messages = notification_result.get("warning_messages") or []
@@ -636,6 +686,7 @@ class InquiryService:
                 email_sent=owner_email_sent,
                 owner_email_sent=owner_email_sent,
                 confirmation_email_sent=confirmation_email_sent,
+                email_queued=email_queued,
                 warning_codes=warning_codes,
             )
 
@@ -645,6 +696,8 @@ class InquiryService:
                 "owner_email_sent": owner_email_sent,
                 "confirmation_email_sent": confirmation_email_sent,
             }
+            if email_queued:
+                response["email_queued"] = True
             if warning_messages:
                 response["warning"] = warning_messages[0]
             if warning_codes:
@@ -652,6 +705,8 @@ class InquiryService:
                 response["warning_codes"] = warning_codes
             return response, 201
         except Exception as exc:
+            if not inquiry_saved:
+                InquiryAbuseGuard.release_duplicate_claim(abuse_check.get("meta"))
             cls._log_event(
                 logging.ERROR,
                 "inquiry_submit_failed",
@@ -0,0 +1,26 @@
+import base64
+import binascii
+import json
+
+
+class KeysetCursor:
+    # Opaque `after=` tokens for keyset pagination: the sort-key values of the last row on a page,
+    # JSON-encoded and base64url-wrapped so clients treat them as a black box.
+    @staticmethod
+    def encode(*values):
+        raw = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False, default=str)
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(token, expected_length):
+        text = str(token or "").strip()
+        if not text:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+            values = json.loads(raw.decode("utf-8"))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+        if not isinstance(values, list) or len(values) != expected_length:
+            return None
+        return values
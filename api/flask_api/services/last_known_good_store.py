@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class LastKnownGoodStore:
+    # The last successfully built public response bodies, kept in memory and on local disk so the
+    # read endpoints can still answer while MySQL is down, including right after a worker restart.
+    ENABLED_ENV = "PUBLIC_STALE_IF_ERROR_ENABLED"
+    DIR_ENV = "PUBLIC_LAST_KNOWN_GOOD_DIR"
+    MAX_AGE_ENV = "PUBLIC_STALE_IF_ERROR_MAX_AGE_SECONDS"
+    DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600.0
+
+    _lock = threading.Lock()
+    _entries = {}
+
+    @staticmethod
+    def _get_bool_env(name, default):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        return str(raw_value).strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _get_float_env(name, default, minimum=0.0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = float(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def is_enabled(cls):
+        return cls._get_bool_env(cls.ENABLED_ENV, True)
+
+    @classmethod
+    def _directory(cls):
+        configured = (os.getenv(cls.DIR_ENV) or "").strip()
+        return Path(configured or os.path.join(tempfile.gettempdir(), "postcatering-last-known-good"))
+
+    @classmethod
+    def _path_for(cls, key):
+        return cls._directory() / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', str(key))}.json"
+
+    @classmethod
+    def save(cls, key, body_bytes, etag):
+        if not cls.is_enabled():
+            return False
+
+        now = time.time()
+        with cls._lock:
+            current = cls._entries.get(key)
+            cls._entries[key] = (body_bytes, etag, now)
+        path = cls._path_for(key)
+        try:
+            if current is not None and current[1] == etag and path.exists():
+                # Same body as on disk; only refresh its age.
+                os.utime(path, (now, now))
+                return True
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.parent / f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as handle:
+                handle.write(body_bytes)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, path)
+            return True
+        except OSError as exc:
+            cls._log_event(logging.WARNING, "last_known_good_write_failed", key=key, path=str(path), error=str(exc))
+            return False
+
+    @classmethod
+    def load(cls, key):
+        if not cls.is_enabled():
+            return None
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+        if entry is None:
+            path = cls._path_for(key)
+            try:
+                body_bytes = path.read_bytes()
+                saved_at = path.stat().st_mtime
+            except FileNotFoundError:
+                return None
+            except OSError as exc:
+                cls._log_event(logging.WARNING, "last_known_good_read_failed", key=key, path=str(path), error=str(exc))
+                return None
+            entry = (body_bytes, hashlib.sha256(body_bytes).hexdigest(), saved_at)
+            with cls._lock:
+                entry = cls._entries.setdefault(key, entry)
+
+        body_bytes, etag, saved_at = entry
+        max_age_seconds = cls._get_float_env(cls.MAX_AGE_ENV, cls.DEFAULT_MAX_AGE_SECONDS)
+        age_seconds = max(time.time() - saved_at, 0.0)
+        if max_age_seconds > 0 and age_seconds > max_age_seconds:
+            return None
+        return {"body": body_bytes, "etag": etag, "age_seconds": age_seconds}
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
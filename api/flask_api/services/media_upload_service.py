@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from flask_api.services.admin_media_service import AdminMediaService
+
+logger = logging.getLogger(__name__)
+
+
+class HashedUploadFile:
+    # Werkzeug's multipart parser writes each chunk here as it reads the request body, so the
+    # upload lands on disk once, is hashed on the fly, and is cut off as soon as it crosses the cap.
+    def __init__(self, directory, max_bytes):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(
+            mode="w+b", dir=directory, prefix=".upload-", suffix=".part", delete=False
+        )
+        self._digest = hashlib.sha256()
+        self.path = Path(self._file.name)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.committed = False
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    @property
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+    def write(self, data):
+        if self.size + len(data) > self.max_bytes:
+            self.discard()
+            raise RequestEntityTooLarge()
+        self._digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def commit(self, target_path):
+        self._file.close()
+        os.replace(self.path, target_path)
+        self.committed = True
+
+    def discard(self):
+        self._file.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        if self.committed:
+            self._file.close()
+        else:
+            self.discard()
+
+
+class MediaUploadService:
+    INCOMING_DIRNAME = ".incoming"
+    # Originals are stored as <sha256>.<ext> and resized variants derive from that name, so the
+    # bytes behind these paths never change and clients may cache them indefinitely.
+    CONTENT_HASHED_PATTERN = re.compile(r"^(?:_variants/)?[0-9a-f]{64}(?:-\d+w)?\.[A-Za-z0-9]+$")
+    HASH_CHUNK_BYTES = 1024 * 1024
+    DEFAULT_MAX_IMAGE_BYTES = 25 * 1024 * 1024
+    DEFAULT_MAX_VIDEO_BYTES = 512 * 1024 * 1024
+    # Headroom for the multipart envelope and the title/caption form fields.
+    FORM_OVERHEAD_BYTES = 1024 * 1024
+
+    @staticmethod
+    def _get_int_env(name, default, minimum=0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = int(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def is_content_hashed(cls, relative_path):
+        return bool(cls.CONTENT_HASHED_PATTERN.match(str(relative_path or "")))
+
+    @classmethod
+    def hash_file(cls, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(cls.HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def max_bytes_for(cls, media_type):
+        if media_type == "video":
+            return cls._get_int_env("MEDIA_UPLOAD_MAX_VIDEO_BYTES", cls.DEFAULT_MAX_VIDEO_BYTES, minimum=1)
+        return cls._get_int_env("MEDIA_UPLOAD_MAX_IMAGE_BYTES", cls.DEFAULT_MAX_IMAGE_BYTES, minimum=1)
+
+    @classmethod
+    def max_request_bytes(cls):
+        return max(cls.max_bytes_for("image"), cls.max_bytes_for("video")) + cls.FORM_OVERHEAD_BYTES
+
+    @classmethod
+    def stream_factory(cls, target_dir):
+        incoming_dir = Path(target_dir) / cls.INCOMING_DIRNAME
+
+        def open_stream(total_content_length=None, content_type=None, filename=None, content_length=None):
+            max_bytes = cls.max_bytes_for(AdminMediaService.infer_media_type_from_filename(filename))
+            if content_length is not None and int(content_length) > max_bytes:
+                raise RequestEntityTooLarge()
+            return HashedUploadFile(incoming_dir, max_bytes)
+
+        return open_stream
+
+    @classmethod
+    def store(cls, upload_stream, target_dir, extension):
+        upload_stream.flush()
+        filename = f"{upload_stream.hexdigest}{str(extension or '').lower()}"
+        target_path = Path(target_dir) / filename
+        deduplicated = target_path.exists()
+        if deduplicated:
+            # Content-addressed names mean an existing file already holds these exact bytes.
+            upload_stream.discard()
+        else:
+            upload_stream.commit(target_path)
+
+        cls._log_event(
+            logging.INFO,
+            "media_upload_stored",
+            filename=filename,
+            size_bytes=upload_stream.size,
+            deduplicated=deduplicated,
+        )
+        return filename, target_path, deduplicated
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from flask_api.config.mysqlconnection import query_db
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.public_media_cache import PublicMediaCache
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; without it uploads keep serving the original only.
+    Image = None
+    ImageOps = None
+    features = None
+
+logger = logging.getLogger(__name__)
+
+
+class MediaVariantService:
+    VARIANT_SPECS = (("thumb", 320), ("medium", 960), ("full", 1920))
+    SUPPORTED_FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+    VARIANT_DIRNAME = "_variants"
+    SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".avif"}
+
+    _lock = threading.Lock()
+    _executor = None
+    _executor_pid = None
+    _slots = None
+
+    @staticmethod
+    def _get_int_env(name, default, minimum=0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = int(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def is_available(cls):
+        return Image is not None
+
+    @classmethod
+    def output_formats(cls):
+        requested = [
+            value.strip().lower()
+            for value in os.getenv("MEDIA_VARIANT_FORMATS", "webp").split(",")
+            if value.strip().lower() in cls.SUPPORTED_FORMATS
+        ]
+        if not cls.is_available():
+            return []
+        return [value for value in dict.fromkeys(requested) if features.check(value)]
+
+    @classmethod
+    def variant_filename(cls, source_filename, width, output_format):
+        return f"{Path(source_filename).stem}-{int(width)}w.{output_format}"
+
+    @classmethod
+    def generate_variants(cls, source_path, output_dir, url_prefix):
+        source_path = Path(source_path)
+        output_formats = cls.output_formats()
+        if not output_formats or source_path.suffix.lower() not in cls.SOURCE_EXTENSIONS:
+            return None
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        quality = cls._get_int_env("MEDIA_VARIANT_QUALITY", 80, minimum=1)
+        variants = []
+        with Image.open(source_path) as opened:
+            image = ImageOps.exif_transpose(opened)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            source_width, source_height = image.size
+
+            seen_widths = set()
+            for label, max_width in cls.VARIANT_SPECS:
+                # Never upscale; small sources collapse onto a single variant width.
+                width = min(max_width, source_width)
+                if width in seen_widths:
+                    continue
+                seen_widths.add(width)
+                height = max(1, round(source_height * width / source_width))
+                resized = image if width == source_width else image.resize((width, height), Image.Resampling.LANCZOS)
+                for output_format in output_formats:
+                    filename = cls.variant_filename(source_path.name, width, output_format)
+                    target_path = output_dir / filename
+                    temp_path = output_dir / f".{filename}.tmp"
+                    resized.save(temp_path, format=cls.SUPPORTED_FORMATS[output_format], quality=quality)
+                    os.replace(temp_path, target_path)
+                    variants.append(
+                        {
+                            "label": label,
+                            "format": output_format,
+                            "width": width,
+                            "height": height,
+                            "url": f"{url_prefix}/{filename}",
+                        }
+                    )
+
+        return {"source_width": source_width, "source_height": source_height, "variants": variants}
+
+    @staticmethod
+    def save_variants(media_id, image_variants):
+        query_db(
+            """
+      UPDATE slides
+      SET image_variants = %(image_variants)s
+      WHERE id = %(id)s;
+      """,
+            {"id": media_id, "image_variants": json.dumps(image_variants) if image_variants else None},
+            fetch="none",
+        )
+        CacheVersionBus.bump(CacheVersionBus.MEDIA)
+        PublicMediaCache.invalidate()
+
+    @classmethod
+    def process_media(cls, media_id, source_path, url_prefix):
+        source_path = Path(source_path)
+        try:
+            image_variants = cls.generate_variants(
+                source_path,
+                source_path.parent / cls.VARIANT_DIRNAME,
+                f"{url_prefix}/{cls.VARIANT_DIRNAME}",
+            )
+            if image_variants:
+                cls.save_variants(media_id, image_variants)
+        except Exception as exc:
+            cls._log_event(
+                logging.WARNING,
+                "media_variants_failed",
+                media_id=media_id,
+                source=source_path.name,
+                exception_type=type(exc).__name__,
+                error_message=str(exc),
+            )
+            return None
+
+        cls._log_event(
+            logging.INFO,
+            "media_variants_generated",
+            media_id=media_id,
+            source=source_path.name,
+            variant_count=len((image_variants or {}).get("variants") or []),
+        )
+        return image_variants
+
+    @classmethod
+    def _get_executor(cls):
+        with cls._lock:
+            current_pid = os.getpid()
+            if cls._executor is None or cls._executor_pid != current_pid:
+                max_workers = cls._get_int_env("MEDIA_VARIANT_WORKERS", 2, minimum=1)
+                cls._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="media-variants")
+                cls._executor_pid = current_pid
+                # Cap queued plus running jobs so a bulk upload cannot pile up unbounded work.
+                cls._slots = threading.BoundedSemaphore(
+                    max_workers + cls._get_int_env("MEDIA_VARIANT_QUEUE_LIMIT", 16, minimum=0)
+                )
+            return cls._executor, cls._slots
+
+    @classmethod
+    def schedule(cls, media_id, source_path, url_prefix):
+        if not media_id or not cls.output_formats():
+            return False
+        if Path(source_path).suffix.lower() not in cls.SOURCE_EXTENSIONS:
+            return False
+
+        executor, slots = cls._get_executor()
+        if not slots.acquire(blocking=False):
+            cls._log_event(logging.WARNING, "media_variants_queue_full", media_id=media_id)
+            return False
+
+        def run():
+            try:
+                cls.process_media(media_id, source_path, url_prefix)
+            finally:
+                slots.release()
+
+        executor.submit(run)
+        return True
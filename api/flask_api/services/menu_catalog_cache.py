@@ -0,0 +1,15 @@
+import threading
+
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.versioned_cache import VersionedCache
+
+
+class MenuCatalogCache(VersionedCache):
+    ENABLED_ENV = "MENU_CATALOG_CACHE_ENABLED"
+    TTL_ENV = "MENU_CATALOG_CACHE_TTL_SECONDS"
+    DEFAULT_TTL_SECONDS = 30.0
+    VERSION_KEYS = (CacheVersionBus.MENU, CacheVersionBus.SERVICE_PLANS)
+
+    _lock = threading.Lock()
+    _version = 0
+    _entries = {}
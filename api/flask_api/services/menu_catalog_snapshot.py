@@ -0,0 +1,280 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import pymysql
+
+from flask_api.config.mysqlconnection import db_transaction, query_db
+from flask_api.services.cache_version_bus import CacheVersionBus
+
+logger = logging.getLogger(__name__)
+
+
+class MenuCatalogSnapshot:
+    # The public catalog is built once per change and stored with a version, so every worker serves it
+    # from one primary-key read instead of re-running the catalog queries after each admin write.
+    ENABLED_ENV = "MENU_CATALOG_SNAPSHOT_ENABLED"
+    MISSING_TABLE_ERROR_CODE = 1146
+    DEADLOCK_ERROR_CODE = 1213
+    PUBLISH_ATTEMPTS = 3
+    SOURCE_VERSION_KEYS = (CacheVersionBus.MENU, CacheVersionBus.SERVICE_PLANS)
+
+    _lock = threading.Lock()
+    _local = {}
+
+    @staticmethod
+    def _get_bool_env(name, default):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        return str(raw_value).strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def is_enabled(cls):
+        return cls._get_bool_env(cls.ENABLED_ENV, True)
+
+    @classmethod
+    def _is_missing_table(cls, exc):
+        return isinstance(exc, pymysql.err.ProgrammingError) and exc.args[:1] == (cls.MISSING_TABLE_ERROR_CODE,)
+
+    @classmethod
+    def _remember(cls, catalog_key, version, catalog):
+        with cls._lock:
+            current = cls._local.get(catalog_key)
+            if current is None or current[0] <= version:
+                cls._local[catalog_key] = (version, catalog)
+
+    @classmethod
+    def get_local_version(cls, catalog_key):
+        with cls._lock:
+            current = cls._local.get(catalog_key)
+        return current[0] if current else None
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._local.clear()
+
+    @classmethod
+    def load(cls, catalog_key, build):
+        if not cls.is_enabled():
+            return build(), None
+
+        with cls._lock:
+            known_version, known_catalog = cls._local.get(catalog_key, (None, None))
+        # The counter total this worker last polled; a reload triggered by a bump must not settle for
+        # a snapshot built before that bump.
+        required_source_version = CacheVersionBus.get_seen_total(cls.SOURCE_VERSION_KEYS)
+        try:
+            # The body only comes back when the stored version differs from the one this worker holds.
+            row = query_db(
+                """
+        SELECT
+          version,
+          source_version,
+          CASE WHEN version = %(known_version)s THEN NULL ELSE catalog_json END AS catalog_json
+        FROM menu_catalog_snapshots
+        WHERE catalog_key = %(catalog_key)s;
+        """,
+                {"catalog_key": catalog_key, "known_version": known_version},
+                fetch="one",
+            )
+        except pymysql.err.ProgrammingError as exc:
+            if not cls._is_missing_table(exc):
+                raise
+            cls._log_event(
+                logging.WARNING, "menu_catalog_snapshot_unavailable", catalog_key=catalog_key, error=str(exc)
+            )
+            return build(), None
+
+        if row and required_source_version is not None and int(row["source_version"]) < required_source_version:
+            cls._log_event(
+                logging.INFO,
+                "menu_catalog_snapshot_lagging",
+                catalog_key=catalog_key,
+                source_version=int(row["source_version"]),
+                required_source_version=required_source_version,
+            )
+            return cls.publish(catalog_key, build)
+        if row and row.get("catalog_json") is not None:
+            version = int(row["version"])
+            catalog = json.loads(row["catalog_json"])
+            cls._remember(catalog_key, version, catalog)
+            return catalog, version
+        if row and known_version is not None and int(row["version"]) == known_version:
+            return known_catalog, known_version
+        # No snapshot yet, or the last publish failed and left it marked stale.
+        return cls.publish(catalog_key, build)
+
+    @classmethod
+    def _read_version(cls, catalog_key):
+        row = query_db(
+            "SELECT version FROM menu_catalog_snapshots WHERE catalog_key = %(catalog_key)s;",
+            {"catalog_key": catalog_key},
+            fetch="one",
+        )
+        if row:
+            return int(row["version"])
+        # Seed the row on its own commit so the locking read below only ever takes a record lock; a
+        # FOR UPDATE on a missing row takes gap locks that deadlock two first-time publishers.
+        query_db(
+            """
+      INSERT IGNORE INTO menu_catalog_snapshots (catalog_key, version, catalog_json)
+      VALUES (%(catalog_key)s, 0, NULL);
+      """,
+            {"catalog_key": catalog_key},
+            fetch="none",
+        )
+        return 0
+
+    @classmethod
+    def _read_source_version(cls):
+        if not CacheVersionBus.is_enabled():
+            return 0
+        # Read before the build, so the stored total never claims a write the build could have missed.
+        return sum(CacheVersionBus.read_versions(cls.SOURCE_VERSION_KEYS).values())
+
+    @classmethod
+    def _swap(cls, catalog_key, expected_version, catalog_json, source_version):
+        with db_transaction() as connection:
+            row = query_db(
+                "SELECT version FROM menu_catalog_snapshots WHERE catalog_key = %(catalog_key)s FOR UPDATE;",
+                {"catalog_key": catalog_key},
+                fetch="one",
+                connection=connection,
+                auto_commit=False,
+            )
+            if not row or int(row["version"]) != expected_version:
+                return None
+            query_db(
+                """
+        UPDATE menu_catalog_snapshots
+        SET
+          version = version + 1,
+          source_version = %(source_version)s,
+          catalog_json = %(catalog_json)s,
+          built_at = CURRENT_TIMESTAMP
+        WHERE catalog_key = %(catalog_key)s;
+        """,
+                {"catalog_key": catalog_key, "catalog_json": catalog_json, "source_version": source_version},
+                fetch="none",
+                connection=connection,
+                auto_commit=False,
+            )
+        return expected_version + 1
+
+    @classmethod
+    def _forget(cls, catalog_key):
+        cls._mark_stale(catalog_key)
+        with cls._lock:
+            cls._local.pop(catalog_key, None)
+
+    @classmethod
+    def publish(cls, catalog_key, build):
+        if not cls.is_enabled():
+            return build(), None
+
+        started_at = time.perf_counter()
+        for attempt in range(1, cls.PUBLISH_ATTEMPTS + 1):
+            expected_version = cls._read_version(catalog_key)
+            source_version = cls._read_source_version()
+            # Built outside any lock so admin writes and other publishers never wait on it; the version
+            # check in _swap keeps a build that raced a newer publish from replacing it.
+            catalog = build()
+            if not catalog:
+                # Nothing to publish (empty menu tables); drop the old body so readers stop serving it.
+                cls._forget(catalog_key)
+                return catalog, None
+            catalog_json = json.dumps(catalog, ensure_ascii=False, separators=(",", ":"))
+            try:
+                version = cls._swap(catalog_key, expected_version, catalog_json, source_version)
+            except pymysql.err.OperationalError as exc:
+                if exc.args[:1] != (cls.DEADLOCK_ERROR_CODE,):
+                    raise
+                version = None
+            if version is not None:
+                break
+            # Another publish landed after this build started; its rows may predate ours, so rebuild.
+            cls._log_event(
+                logging.INFO, "menu_catalog_snapshot_publish_raced", catalog_key=catalog_key, attempt=attempt
+            )
+        else:
+            # Still racing after every attempt: leave the snapshot stale so the next reader rebuilds it.
+            cls._forget(catalog_key)
+            return catalog, None
+
+        cls._remember(catalog_key, version, catalog)
+        cls._log_event(
+            logging.INFO,
+            "menu_catalog_snapshot_published",
+            catalog_key=catalog_key,
+            version=version,
+            bytes=len(catalog_json.encode("utf-8")),
+            duration_ms=round((time.perf_counter() - started_at) * 1000, 2),
+        )
+        return catalog, version
+
+    @classmethod
+    def refresh(cls, catalog_key, build):
+        if not cls.is_enabled():
+            return None
+        try:
+            _catalog, version = cls.publish(catalog_key, build)
+            return version
+        except Exception as exc:
+            cls._log_event(
+                logging.ERROR, "menu_catalog_snapshot_publish_failed", catalog_key=catalog_key, error=str(exc)
+            )
+            # With the body cleared, the next reader on any worker rebuilds the snapshot instead of
+            # serving the pre-write catalog until someone publishes again.
+            try:
+                cls._mark_stale(catalog_key)
+            except Exception as stale_exc:
+                cls._log_event(
+                    logging.ERROR,
+                    "menu_catalog_snapshot_mark_stale_failed",
+                    catalog_key=catalog_key,
+                    error=str(stale_exc),
+                )
+            return None
+
+    @classmethod
+    def mark_all_stale(cls, connection=None):
+        # Runs inside the admin write's transaction. Without it, a worker that sees the bumped counter
+        # before this request's after_request publish would reload the unchanged snapshot and cache
+        # the pre-write catalog for a full TTL.
+        if not cls.is_enabled():
+            return
+        try:
+            query_db(
+                "UPDATE menu_catalog_snapshots SET version = version + 1, catalog_json = NULL;",
+                fetch="none",
+                connection=connection,
+                auto_commit=connection is None,
+            )
+        except pymysql.err.ProgrammingError as exc:
+            if not cls._is_missing_table(exc):
+                raise
+
+    @classmethod
+    def _mark_stale(cls, catalog_key, connection=None):
+        query_db(
+            """
+      UPDATE menu_catalog_snapshots
+      SET version = version + 1, catalog_json = NULL
+      WHERE catalog_key = %(catalog_key)s;
+      """,
+            {"catalog_key": catalog_key},
+            fetch="none",
+            connection=connection,
+            auto_commit=connection is None,
+        )
+
+
+CacheVersionBus.subscribe((CacheVersionBus.MENU, CacheVersionBus.SERVICE_PLANS), MenuCatalogSnapshot.mark_all_stale)
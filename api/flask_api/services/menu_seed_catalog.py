@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+import threading
+from copy import deepcopy
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class MenuSeedCatalog:
+    # The seed payload file as a catalog source: parsed once, re-read only when its inode, size or
+    # mtime changes, with derived values (normalized catalog, serialized body) kept per file version.
+    PATH_ENV = "MENU_SEED_PAYLOAD_PATH"
+    DEFAULT_PATH = Path(__file__).resolve().parents[2] / "sql" / "menu_seed_payload.json"
+
+    _lock = threading.Lock()
+    _stamp = None
+    _payload = None
+    _derived = {}
+    _unreadable_stamp = None
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def get_path(cls):
+        configured = (os.getenv(cls.PATH_ENV) or "").strip()
+        return Path(configured) if configured else cls.DEFAULT_PATH
+
+    @staticmethod
+    def _file_stamp(path):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        # Inode catches atomic replaces that keep the same size and a coarse mtime.
+        return (str(path), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def _parse(raw_bytes):
+        raw = json.loads(raw_bytes)
+        return {
+            "menu_options": raw.get("MENU_OPTIONS", {}),
+            "formal_plan_options": raw.get("FORMAL_PLAN_OPTIONS", []),
+            "menu": raw.get("MENU", {}),
+        }
+
+    @classmethod
+    def _current(cls):
+        path = cls.get_path()
+        stamp = cls._file_stamp(path)
+        with cls._lock:
+            if stamp == cls._stamp or (stamp is not None and stamp == cls._unreadable_stamp):
+                return cls._stamp, cls._payload
+            if stamp is None:
+                cls._stamp, cls._payload, cls._derived = None, None, {}
+                return None, None
+            try:
+                payload = cls._parse(path.read_bytes())
+            except (OSError, ValueError) as exc:
+                # Usually a copy caught half-written; keep serving the last good parse until it settles.
+                cls._unreadable_stamp = stamp
+                cls._log_event(logging.WARNING, "menu_seed_payload_unreadable", path=str(path), error=str(exc))
+                return cls._stamp, cls._payload
+            cls._stamp, cls._payload, cls._derived = stamp, payload, {}
+            cls._log_event(logging.INFO, "menu_seed_payload_loaded", path=str(path), bytes=stamp[3])
+            return stamp, payload
+
+    @classmethod
+    def load_payload(cls):
+        _stamp, payload = cls._current()
+        # Callers such as the admin sync may reshape what they get; the cached parse stays untouched.
+        return deepcopy(payload) if payload is not None else None
+
+    @classmethod
+    def derive(cls, name, build):
+        stamp, payload = cls._current()
+        if payload is None:
+            return None
+        with cls._lock:
+            if cls._stamp == stamp and name in cls._derived:
+                return cls._derived[name]
+        value = build(payload)
+        with cls._lock:
+            if cls._stamp == stamp:
+                cls._derived[name] = value
+        return value
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._stamp, cls._payload, cls._derived = None, None, {}
+            cls._unreadable_stamp = None
@@ -1,15 +1,23 @@
-import json
 import os
 import re
+import time
+import unicodedata
 from copy import deepcopy
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from pathlib import Path
 
 from flask_api.config.mysqlconnection import connect_to_mysql, db_transaction, query_db, query_db_many
 from flask_api.services.admin_service_plan_service import AdminServicePlanService
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.menu_catalog_cache import MenuCatalogCache
+from flask_api.services.menu_catalog_snapshot import MenuCatalogSnapshot
+from flask_api.services.menu_seed_catalog import MenuSeedCatalog
+from flask_api.services.schema_migration_service import SchemaMigrationService
 
 
 class MenuService:
+    CATALOG_SNAPSHOT_KEY = "public"
+
     SIMPLIFIED_TABLES = (
         "menu_item_type_groups",
         "menu_group_conflicts",
@@ -110,22 +118,7 @@ class MenuService:
 
     @staticmethod
     def _load_seed_payload():
-        seed_path = Path(__file__).resolve().parents[2] / "sql" / "menu_seed_payload.json"
-        if not seed_path.exists():
-            return None
-        with seed_path.open("r", encoding="utf-8") as fp:
-            raw = json.load(fp)
-        return {
-            "menu_options": raw.get("MENU_OPTIONS", {}),
-            "formal_plan_options": raw.get("FORMAL_PLAN_OPTIONS", []),
-            "menu": raw.get("MENU", {}),
-        }
-
-    @staticmethod
-    def _load_sql_file(path):
-        if not path.exists():
-            return None
-        return path.read_text(encoding="utf-8")
+        return MenuSeedCatalog.load_payload()
 
     @staticmethod
     def _get_schema_paths():
@@ -140,80 +133,15 @@ class MenuService:
             sql_root / "migrations" / "20260316_service_package_constraint_families.sql",
             sql_root / "migrations" / "20260316_service_package_specific_menu_groups.sql",
             sql_root / "migrations" / "20260316_service_package_drop_descriptions.sql",
+            sql_root / "migrations" / "20261017_slides_image_variants.sql",
+            sql_root / "migrations" / "20261017_admin_audit_keyset_indexes.sql",
+            sql_root / "migrations" / "20261017_admin_audit_payload_format.sql",
+            sql_root / "migrations" / "20261017_menu_catalog_snapshot_source_version.sql",
         ]
 
-    @staticmethod
-    def _split_sql_statements(sql_text):
-        statements = []
-        current = []
-        in_single_quote = False
-        in_double_quote = False
-
-        for char in sql_text:
-            if char == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-            elif char == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
-
-            if char == ";" and not in_single_quote and not in_double_quote:
-                stmt = "".join(current).strip()
-                if stmt:
-                    statements.append(stmt)
-                current = []
-            else:
-                current.append(char)
-
-        tail = "".join(current).strip()
-        if tail:
-            statements.append(tail)
-        return statements
-
-    @staticmethod
-    def _is_ignorable_schema_error(exc, normalized_statement):
-        error_code = getattr(exc, "args", [None])[0]
-        if normalized_statement.startswith("alter table"):
-            return error_code in {1060, 1061, 1091, 1826}
-        if normalized_statement.startswith("insert into slides"):
-            return error_code == 1062
-        return False
-
     @classmethod
     def _apply_schema(cls):
-        statement_batches = []
-        for path in cls._get_schema_paths():
-            sql_text = cls._load_sql_file(path)
-            if not sql_text:
-                if path.name == "schema.sql":
-                    raise FileNotFoundError("api/sql/schema.sql not found.")
-                continue
-            statements = cls._split_sql_statements(sql_text)
-            if statements:
-                statement_batches.append(statements)
-
-        if not statement_batches:
-            return 0
-
-        connection = connect_to_mysql()
-        executed = 0
-        try:
-            with connection.cursor() as cursor:
-                for statements in statement_batches:
-                    for statement in statements:
-                        normalized = " ".join(statement.strip().split()).lower()
-                        try:
-                            cursor.execute(statement)
-                            executed += 1
-                        except Exception as exc:
-                            if cls._is_ignorable_schema_error(exc, normalized):
-                                continue
-                            raise
-            connection.commit()
-            return executed
-        except Exception:
-            connection.rollback()
-            raise
-        finally:
-            connection.close()
+        return SchemaMigrationService.apply(cls._get_schema_paths())
 
     @classmethod
     def _truncate_simplified_tables(cls):
@@ -236,6 +164,13 @@ class MenuService:
         slug = re.sub(r"[^a-z0-9]+", "-", str(value or "").strip().lower()).strip("-")
         return slug[:120] if slug else "item"
 
+    @staticmethod
+    def _item_name_match_key(value):
+        # uq_menu_items_name compares with the column's accent- and case-insensitive collation, so names
+        # must be matched the same way or the batched upsert silently folds rows the plan kept apart.
+        decomposed = unicodedata.normalize("NFKD", str(value or "").strip())
+        return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold().rstrip()
+
     @staticmethod
     def _parse_price_decimal(value):
         text = str(value or "").strip()
@@ -543,24 +478,18 @@ class MenuService:
 
     @classmethod
     def _build_service_plan_catalog(cls):
-        try:
-            catering_response, catering_status = AdminServicePlanService.list_service_plan_sections(
-                catalog_key="catering",
-                include_inactive=False,
-            )
-            formal_response, formal_status = AdminServicePlanService.list_service_plan_sections(
-                catalog_key="formal",
-                include_inactive=False,
-            )
-        except Exception:
-            return None
-
-        if catering_status >= 400 or formal_status >= 400:
+        # Database errors propagate: a catalog quietly built from the static fallbacks would be published
+        # as the snapshot and saved as last-known-good. Only uninstalled service-plan tables fall back.
+        catalogs_response, catalogs_status = AdminServicePlanService.list_public_service_plan_catalogs(
+            catalog_keys=("catering", "formal"),
+        )
+        if catalogs_status >= 400:
             return None
 
+        catalogs = catalogs_response.get("catalogs") or {}
         return {
-            "catering_sections": cls._build_public_catering_sections(catering_response.get("sections") or []),
-            "formal_plan_options": cls._build_public_formal_plan_options(formal_response.get("sections") or []),
+            "catering_sections": cls._build_public_catering_sections(catalogs.get("catering") or []),
+            "formal_plan_options": cls._build_public_formal_plan_options(catalogs.get("formal") or []),
         }
 
     @classmethod
@@ -702,7 +631,7 @@ class MenuService:
             normalized_name = str(name or "").strip()
             if not normalized_name:
                 return
-            bucket_key = normalized_name.lower()
+            bucket_key = cls._item_name_match_key(normalized_name)
             current = merged.setdefault(
                 bucket_key,
                 {
@@ -868,124 +797,194 @@ class MenuService:
 
         return type_ids, group_ids
 
+    @staticmethod
+    def _load_existing_menu_items(connection=None):
+        return query_db(
+            """
+      SELECT id, item_key, item_name, tray_price_half, tray_price_full, is_active
+      FROM menu_items
+      ORDER BY id ASC;
+      """,
+            connection=connection,
+            auto_commit=False,
+        )
+
+    @staticmethod
+    def _load_existing_assignments(connection=None):
+        rows = query_db(
+            """
+      SELECT mitg.menu_item_id, t.type_key, g.group_key
+      FROM menu_item_type_groups mitg
+      JOIN menu_types t ON t.id = mitg.menu_type_id
+      JOIN menu_groups g ON g.id = mitg.menu_group_id;
+      """,
+            connection=connection,
+            auto_commit=False,
+        )
+        return {(row["menu_item_id"], row["type_key"]): row["group_key"] for row in rows or []}
+
     @classmethod
-    def _generate_unique_item_key(cls, item_name, provided_key=None, connection=None, exclude_row_id=None):
-        base_key = cls._slug_key(provided_key or item_name) or "item"
-        candidate = base_key
-        suffix = 2
-
-        while True:
-            payload = {"item_key": candidate}
-            where_clause = "item_key = %(item_key)s"
-            if exclude_row_id:
-                payload["exclude_row_id"] = exclude_row_id
-                where_clause += " AND id <> %(exclude_row_id)s"
-
-            existing = query_db(
-                f"SELECT id FROM menu_items WHERE {where_clause} LIMIT 1;",
-                payload,
-                fetch="one",
-                connection=connection,
-                auto_commit=False,
-            )
-            if not existing:
-                return candidate[:128]
+    def _plan_simplified_items(cls, merged_rows, existing_rows):
+        existing_by_name = {}
+        key_owners = {}
+        for existing in existing_rows or []:
+            existing_by_name.setdefault(cls._item_name_match_key(existing.get("item_name")), existing)
+            if existing.get("item_key"):
+                key_owners[existing["item_key"]] = existing["id"]
+
+        planned = []
+        for index, row in enumerate(merged_rows):
+            item_name = str(row.get("name") or "").strip()
+            if not item_name:
+                continue
 
-            candidate = f"{base_key}-{suffix}"
-            suffix += 1
+            existing = existing_by_name.get(cls._item_name_match_key(item_name))
+            owner = existing["id"] if existing else f"new:{index}"
+            # Keys currently stored on other rows stay reserved for the whole sync, so a batched
+            # upsert can never hit uq_menu_items_key regardless of the order rows are written in.
+            base_key = cls._slug_key(row.get("key") or item_name) or "item"
+            item_key = base_key[:128]
+            suffix = 2
+            while key_owners.get(item_key, owner) != owner:
+                item_key = f"{base_key}-{suffix}"[:128]
+                suffix += 1
+            key_owners[item_key] = owner
+
+            values = {
+                "id": existing["id"] if existing else None,
+                "item_key": item_key,
+                "item_name": item_name,
+                "tray_price_half": cls._serialize_price(row.get("half_tray_price")),
+                "tray_price_full": cls._serialize_price(row.get("full_tray_price")),
+                "is_active": 1,
+            }
+            if existing:
+                changes = [
+                    field
+                    for field in ("item_key", "item_name", "tray_price_half", "tray_price_full", "is_active")
+                    if (None if existing.get(field) is None else str(existing.get(field)))
+                    != (None if values[field] is None else str(values[field]))
+                ]
+                action = "update" if changes else "unchanged"
+            else:
+                changes = []
+                action = "insert"
+
+            assignments = {}
+            for type_key in row.get("menu_types", []):
+                group_key = (row.get("type_groups") or {}).get(type_key)
+                if type_key in cls._menu_type_keys() and group_key in cls._menu_group_keys():
+                    assignments[type_key] = group_key
+            planned.append({"action": action, "changes": changes, "values": values, "assignments": assignments})
+        return planned
+
+    @classmethod
+    def _menu_type_keys(cls):
+        return {menu_type["type_key"] for menu_type in cls.MENU_TYPES}
+
+    @classmethod
+    def _menu_group_keys(cls):
+        return {group["group_key"] for group in cls.MENU_GROUPS}
+
+    @staticmethod
+    def _summarize_simplified_sync(planned, existing_assignments):
+        desired_assignments = {}
+        for entry in planned:
+            item_ref = entry["values"]["id"] or f"new:{entry['values']['item_key']}"
+            for type_key, group_key in entry["assignments"].items():
+                desired_assignments[(item_ref, type_key)] = group_key
+
+        return {
+            "items_to_insert": [entry["values"]["item_name"] for entry in planned if entry["action"] == "insert"],
+            "items_to_update": [
+                {"id": entry["values"]["id"], "name": entry["values"]["item_name"], "changes": entry["changes"]}
+                for entry in planned
+                if entry["action"] == "update"
+            ],
+            "items_unchanged": sum(1 for entry in planned if entry["action"] == "unchanged"),
+            "assignments_to_add": sum(1 for key in desired_assignments if key not in existing_assignments),
+            "assignments_to_change": sum(
+                1
+                for key, group_key in desired_assignments.items()
+                if key in existing_assignments and existing_assignments[key] != group_key
+            ),
+            "assignments_to_remove": sum(1 for key in existing_assignments if key not in desired_assignments),
+        }
 
     @classmethod
-    def sync_simplified_from_payload(cls, payload=None):
+    def sync_simplified_from_payload(cls, payload=None, dry_run=False):
+        started_at = time.perf_counter()
+        timings_ms = {}
+
+        def record_phase(name, phase_started_at):
+            timings_ms[name] = round((time.perf_counter() - phase_started_at) * 1000, 2)
+            return time.perf_counter()
+
         source_payload = payload or cls._load_seed_payload()
         if not source_payload:
             return {"ok": False, "error": "No payload available for simplified migration."}
 
         general_rows, formal_rows = cls._extract_simplified_items_from_payload(source_payload)
         merged_rows = cls._merge_simplified_rows(general_rows=general_rows, formal_rows=formal_rows)
+        phase_started_at = record_phase("parse_payload", started_at)
 
         with db_transaction() as connection:
+            existing_items = cls._load_existing_menu_items(connection=connection)
+            existing_assignments = cls._load_existing_assignments(connection=connection)
+            phase_started_at = record_phase("preload", phase_started_at)
+
+            planned = cls._plan_simplified_items(merged_rows, existing_items)
+            diff = cls._summarize_simplified_sync(planned, existing_assignments)
+            phase_started_at = record_phase("plan", phase_started_at)
+
+            if dry_run:
+                timings_ms["total"] = round((time.perf_counter() - started_at) * 1000, 2)
+                return {
+                    "ok": True,
+                    "dry_run": True,
+                    "item_count": len(merged_rows),
+                    "assignment_count": sum(len(entry["assignments"]) for entry in planned),
+                    "diff": diff,
+                    "timings_ms": timings_ms,
+                }
+
             type_ids, group_ids = cls._ensure_reference_tables(connection=connection)
             query_db("DELETE FROM menu_item_type_groups;", fetch="none", connection=connection, auto_commit=False)
 
-            assignment_rows = []
-            for row in merged_rows:
-                item_name = str(row.get("name") or "").strip()
-                if not item_name:
-                    continue
-
-                existing = query_db(
-                    """
-          SELECT id
-          FROM menu_items
-          WHERE LOWER(TRIM(item_name)) = LOWER(TRIM(%(item_name)s))
-          LIMIT 1;
-          """,
-                    {"item_name": item_name},
-                    fetch="one",
+            item_write_rows = [entry["values"] for entry in planned if entry["action"] != "unchanged"]
+            query_db_many(
+                """
+        INSERT INTO menu_items (id, item_key, item_name, tray_price_half, tray_price_full, is_active)
+        VALUES (%(id)s, %(item_key)s, %(item_name)s, %(tray_price_half)s, %(tray_price_full)s, %(is_active)s)
+        ON DUPLICATE KEY UPDATE
+          item_key = VALUES(item_key),
+          item_name = VALUES(item_name),
+          tray_price_half = VALUES(tray_price_half),
+          tray_price_full = VALUES(tray_price_full),
+          is_active = VALUES(is_active),
+          updated_at = CURRENT_TIMESTAMP;
+        """,
+                item_write_rows,
+                connection=connection,
+                auto_commit=False,
+            )
+            item_ids = {entry["values"]["item_key"]: entry["values"]["id"] for entry in planned}
+            if any(entry["action"] == "insert" for entry in planned):
+                key_rows = query_db(
+                    "SELECT id, item_key FROM menu_items WHERE item_key IS NOT NULL;",
                     connection=connection,
                     auto_commit=False,
                 )
+                item_ids.update({row["item_key"]: row["id"] for row in key_rows or []})
+            phase_started_at = record_phase("write_items", phase_started_at)
 
-                half_serialized = cls._serialize_price(row.get("half_tray_price"))
-                full_serialized = cls._serialize_price(row.get("full_tray_price"))
-
-                if existing:
-                    row_id = existing["id"]
-                    item_key = cls._generate_unique_item_key(
-                        item_name=item_name,
-                        provided_key=row.get("key"),
-                        connection=connection,
-                        exclude_row_id=row_id,
-                    )
-                    query_db(
-                        """
-            UPDATE menu_items
-            SET
-              item_key = %(item_key)s,
-              item_name = %(item_name)s,
-              tray_price_half = %(tray_price_half)s,
-              tray_price_full = %(tray_price_full)s,
-              is_active = 1,
-              updated_at = CURRENT_TIMESTAMP
-            WHERE id = %(id)s;
-            """,
-                        {
-                            "id": row_id,
-                            "item_key": item_key,
-                            "item_name": item_name,
-                            "tray_price_half": half_serialized,
-                            "tray_price_full": full_serialized,
-                        },
-                        fetch="none",
-                        connection=connection,
-                        auto_commit=False,
-                    )
-                else:
-                    item_key = cls._generate_unique_item_key(
-                        item_name=item_name,
-                        provided_key=row.get("key"),
-                        connection=connection,
-                    )
-                    row_id = query_db(
-                        """
-            INSERT INTO menu_items (item_key, item_name, tray_price_half, tray_price_full, is_active)
-            VALUES (%(item_key)s, %(item_name)s, %(tray_price_half)s, %(tray_price_full)s, 1);
-            """,
-                        {
-                            "item_key": item_key,
-                            "item_name": item_name,
-                            "tray_price_half": half_serialized,
-                            "tray_price_full": full_serialized,
-                        },
-                        fetch="none",
-                        connection=connection,
-                        auto_commit=False,
-                    )
-
-                for type_key in row.get("menu_types", []):
+            assignment_rows = []
+            for entry in planned:
+                row_id = item_ids.get(entry["values"]["item_key"])
+                for type_key, group_key in entry["assignments"].items():
                     type_id = type_ids.get(type_key)
-                    group_id = group_ids.get((row.get("type_groups") or {}).get(type_key))
-                    if not type_id or not group_id:
+                    group_id = group_ids.get(group_key)
+                    if not row_id or not type_id or not group_id:
                         continue
                     assignment_rows.append(
                         {
@@ -1009,11 +1008,19 @@ class MenuService:
                 connection=connection,
                 auto_commit=False,
             )
+            record_phase("write_assignments", phase_started_at)
+            CacheVersionBus.bump(CacheVersionBus.MENU, connection=connection)
 
+        MenuCatalogCache.invalidate()
+        timings_ms["total"] = round((time.perf_counter() - started_at) * 1000, 2)
         return {
             "ok": True,
+            "dry_run": False,
             "item_count": len(merged_rows),
             "assignment_count": len(assignment_rows),
+            "items_written": len(item_write_rows),
+            "diff": diff,
+            "timings_ms": timings_ms,
         }
 
     @staticmethod
@@ -1277,14 +1284,28 @@ class MenuService:
         }
 
     @classmethod
-    def run_menu_admin_task(cls, apply_schema=False, reset=False, seed=True):
+    def run_menu_admin_task(cls, apply_schema=False, reset=False, seed=True, dry_run=False):
+        if dry_run:
+            # Plan the seed against current rows without applying schema, resetting, or writing.
+            payload = cls._load_seed_payload()
+            if not payload:
+                return {"error": "Menu seed payload not found.", "steps": []}, 500
+            return {
+                "ok": True,
+                "steps": ["planned_simplified_seed"],
+                "seed": cls.sync_simplified_from_payload(payload=payload, dry_run=True),
+            }, 200
+
         steps = []
+        schema_report = None
         if apply_schema:
-            count = cls._apply_schema()
-            steps.append(f"applied_schema_statements:{count}")
+            schema_report = cls._apply_schema()
+            steps.append(f"applied_schema_migrations:{schema_report['applied']}")
 
         if reset:
             cls._truncate_simplified_tables()
+            CacheVersionBus.bump(CacheVersionBus.MENU)
+            MenuCatalogCache.invalidate()
             steps.append("reset_simplified_tables")
 
         if seed:
@@ -1302,22 +1323,64 @@ class MenuService:
         else:
             steps.append("simplified_seed_skipped")
 
-        return {"ok": True, "steps": steps}, 200
+        if reset or migration_result.get("ok"):
+            snapshot_version = cls.publish_catalog_snapshot()
+            if snapshot_version is not None:
+                steps.append(f"published_catalog_snapshot:v{snapshot_version}")
+
+        body = {"ok": True, "steps": steps}
+        if schema_report is not None:
+            body["schema"] = schema_report
+        if seed and migration_result.get("ok"):
+            body["seed"] = migration_result
+        return body, 200
+
+    @staticmethod
+    def get_catalog_source():
+        return (os.getenv("MENU_DATA_SOURCE") or "db").strip().lower()
 
     @classmethod
-    def get_catalog(cls):
-        source = (os.getenv("MENU_DATA_SOURCE") or "db").strip().lower()
+    def _build_public_catalog(cls):
+        payload = cls._build_catalog_payload_from_simplified_tables()
+        if not payload:
+            return None
+        return {"source": "simplified-db", **cls._normalize_menu_payload_for_api(payload)}
 
-        if source == "db":
-            payload = cls._build_catalog_payload_from_simplified_tables()
-            if payload:
-                return {"source": "simplified-db", **cls._normalize_menu_payload_for_api(payload)}, 200
+    @classmethod
+    def publish_catalog_snapshot(cls):
+        # Already published here, so the request hook does not build it a second time.
+        CacheVersionBus.pop_request_bumps()
+        return MenuCatalogSnapshot.refresh(cls.CATALOG_SNAPSHOT_KEY, cls._build_public_catalog)
 
-            return {
-                "error": "Simplified menu tables are empty. Run admin menu sync endpoint or script with seed enabled."
-            }, 500
+    @classmethod
+    def _build_seed_catalog(cls, payload):
+        return {"source": "seed-file", **cls._normalize_menu_payload_for_api(payload)}
+
+    @classmethod
+    def get_seed_catalog_body(cls, serialize):
+        return MenuSeedCatalog.derive("body", lambda payload: serialize(cls._build_seed_catalog(payload)))
 
-        fallback = cls._load_seed_payload()
-        if fallback:
-            return {"source": "seed-file", **cls._normalize_menu_payload_for_api(fallback)}, 200
-        return {"error": "Menu seed payload not found."}, 500
+    @classmethod
+    def get_catalog(cls):
+        source = cls.get_catalog_source()
+        if source != "db":
+            # The seed file keeps its own parse per file version, so there is nothing to cache here.
+            catalog = MenuSeedCatalog.derive("catalog", cls._build_seed_catalog)
+            if catalog:
+                return catalog, 200
+            return {"error": "Menu seed payload not found."}, 500
+
+        cache_key = f"catalog:{source}"
+        cached = MenuCatalogCache.get(cache_key)
+        if cached is not None:
+            return cached, 200
+
+        cache_version = MenuCatalogCache.get_version()
+        catalog, _snapshot_version = MenuCatalogSnapshot.load(cls.CATALOG_SNAPSHOT_KEY, cls._build_public_catalog)
+        if catalog:
+            MenuCatalogCache.set(cache_key, catalog, cache_version)
+            return catalog, 200
+
+        return {
+            "error": "Simplified menu tables are empty. Run admin menu sync endpoint or script with seed enabled."
+        }, 500
@@ -0,0 +1,16 @@
+import threading
+
+from flask_api.services.cache_version_bus import CacheVersionBus
+from flask_api.services.versioned_cache import VersionedCache
+
+
+class PublicMediaCache(VersionedCache):
+    ENABLED_ENV = "PUBLIC_MEDIA_CACHE_ENABLED"
+    TTL_ENV = "PUBLIC_MEDIA_CACHE_TTL_SECONDS"
+    DEFAULT_TTL_SECONDS = 30.0
+    VERSION_KEYS = (CacheVersionBus.MEDIA,)
+
+    # Separate state so media writes do not evict the menu catalog and vice versa.
+    _lock = threading.Lock()
+    _version = 0
+    _entries = {}
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+from flask_api.config.mysqlconnection import connect_to_mysql
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaMigrationError(RuntimeError):
+    pass
+
+
+class SchemaMigrationService:
+    # Each file in the manifest is applied once and recorded here with a checksum of its contents,
+    # so deploys only pay for (and take metadata locks for) files that are new or have changed.
+    LEDGER_DDL = """
+      CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(191) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        online_safe TINYINT(1) NOT NULL DEFAULT 0,
+        statement_count INT NOT NULL DEFAULT 0,
+        duration_ms INT NOT NULL DEFAULT 0,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (version)
+      );
+    """
+    RUNNER_LOCK_NAME = "post_catering_schema_migrations"
+    # Files whose ALTERs run in place without blocking writes (ADD INDEX, INSTANT ADD COLUMN) say so
+    # in a header comment; everything else is treated as needing a quiet window.
+    ONLINE_SAFE_DIRECTIVE = re.compile(r"^--\s*migration:\s*online-safe\s*$", re.IGNORECASE | re.MULTILINE)
+    IGNORABLE_ALTER_ERROR_CODES = {1060, 1061, 1091, 1826}
+    DUPLICATE_ENTRY_ERROR_CODE = 1062
+
+    @staticmethod
+    def _get_int_env(name, default, minimum=0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = int(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @staticmethod
+    def checksum(sql_text):
+        # Line endings and trailing whitespace vary between checkouts and must not read as edits.
+        normalized = "\n".join(line.rstrip() for line in str(sql_text or "").splitlines()).strip()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def is_online_safe(cls, sql_text):
+        return bool(cls.ONLINE_SAFE_DIRECTIVE.search(str(sql_text or "")))
+
+    @staticmethod
+    def split_statements(sql_text):
+        statements = []
+        current = []
+        quote = None
+        index = 0
+        text = str(sql_text or "")
+        length = len(text)
+        while index < length:
+            char = text[index]
+            if quote:
+                current.append(char)
+                if char == "\\" and quote != "`" and index + 1 < length:
+                    current.append(text[index + 1])
+                    index += 2
+                    continue
+                if char == quote:
+                    quote = None
+                index += 1
+                continue
+
+            if char in ("'", '"', "`"):
+                quote = char
+            elif char == "#" or (text.startswith("--", index) and (index + 2 >= length or text[index + 2].isspace())):
+                newline = text.find("\n", index)
+                index = length if newline == -1 else newline
+                continue
+            elif text.startswith("/*", index):
+                end = text.find("*/", index + 2)
+                index = length if end == -1 else end + 2
+                current.append(" ")
+                continue
+            elif char == ";":
+                statement = "".join(current).strip()
+                if statement:
+                    statements.append(statement)
+                current = []
+                index += 1
+                continue
+            current.append(char)
+            index += 1
+
+        tail = "".join(current).strip()
+        if tail:
+            statements.append(tail)
+        return statements
+
+    @classmethod
+    def _is_ignorable_error(cls, exc, normalized_statement):
+        error_code = getattr(exc, "args", [None])[0]
+        if normalized_statement.startswith("alter table"):
+            return error_code in cls.IGNORABLE_ALTER_ERROR_CODES
+        if normalized_statement.startswith("insert into slides"):
+            return error_code == cls.DUPLICATE_ENTRY_ERROR_CODE
+        return False
+
+    @classmethod
+    def load_migrations(cls, paths):
+        migrations = []
+        for path in paths:
+            if not path.exists():
+                if path.name == "schema.sql":
+                    raise FileNotFoundError("api/sql/schema.sql not found.")
+                continue
+            sql_text = path.read_text(encoding="utf-8")
+            migrations.append(
+                {
+                    "version": path.name,
+                    "sql_text": sql_text,
+                    "checksum": cls.checksum(sql_text),
+                    "online_safe": cls.is_online_safe(sql_text),
+                }
+            )
+        return migrations
+
+    @classmethod
+    def _fetch_ledger(cls, cursor):
+        cursor.execute(cls.LEDGER_DDL)
+        cursor.execute("SELECT version, checksum FROM schema_migrations;")
+        return {row["version"]: row["checksum"] for row in cursor.fetchall() or []}
+
+    @staticmethod
+    def _plan(migrations, ledger):
+        for migration in migrations:
+            applied_checksum = ledger.get(migration["version"])
+            if applied_checksum is None:
+                migration["state"] = "pending"
+            elif applied_checksum != migration["checksum"]:
+                migration["state"] = "changed"
+            else:
+                migration["state"] = "applied"
+        return migrations
+
+    @staticmethod
+    def _describe(migration, status, **fields):
+        return {
+            "version": migration["version"],
+            "status": status,
+            "online_safe": migration["online_safe"],
+            **fields,
+        }
+
+    @classmethod
+    def _execute_migration(cls, cursor, migration):
+        executed = 0
+        for statement in cls.split_statements(migration["sql_text"]):
+            normalized = " ".join(statement.split()).lower()
+            try:
+                cursor.execute(statement)
+                executed += 1
+            except Exception as exc:
+                if cls._is_ignorable_error(exc, normalized):
+                    continue
+                raise
+        return executed
+
+    @classmethod
+    def _record(cls, cursor, migration, statement_count, duration_ms):
+        cursor.execute(
+            """
+        INSERT INTO schema_migrations (version, checksum, online_safe, statement_count, duration_ms)
+        VALUES (%(version)s, %(checksum)s, %(online_safe)s, %(statement_count)s, %(duration_ms)s)
+        ON DUPLICATE KEY UPDATE
+          checksum = VALUES(checksum),
+          online_safe = VALUES(online_safe),
+          statement_count = VALUES(statement_count),
+          duration_ms = VALUES(duration_ms),
+          applied_at = CURRENT_TIMESTAMP;
+        """,
+            {
+                "version": migration["version"],
+                "checksum": migration["checksum"],
+                "online_safe": 1 if migration["online_safe"] else 0,
+                "statement_count": statement_count,
+                "duration_ms": int(round(duration_ms)),
+            },
+        )
+
+    @classmethod
+    def _acquire_runner_lock(cls, cursor):
+        lock_wait_seconds = cls._get_int_env("DB_MIGRATION_LOCK_WAIT_TIMEOUT_SECONDS", 30)
+        if lock_wait_seconds:
+            # A DDL statement queued behind a long transaction blocks every later query on that table;
+            # give up instead of stalling live traffic for MySQL's default of a year.
+            cursor.execute("SET SESSION lock_wait_timeout = %s;", (lock_wait_seconds,))
+        cursor.execute(
+            "SELECT GET_LOCK(%s, %s) AS acquired;",
+            (cls.RUNNER_LOCK_NAME, cls._get_int_env("DB_MIGRATION_RUNNER_LOCK_TIMEOUT_SECONDS", 60)),
+        )
+        row = cursor.fetchone() or {}
+        if int(row.get("acquired") or 0) != 1:
+            raise SchemaMigrationError("Another schema migration run holds the migration lock.")
+
+    @staticmethod
+    def _summarize(results, started_at):
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return {
+            "migrations": results,
+            "applied": counts.get("applied", 0) + counts.get("reapplied", 0),
+            "counts": counts,
+            "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        }
+
+    @classmethod
+    def get_status(cls, paths):
+        started_at = time.perf_counter()
+        migrations = cls.load_migrations(paths)
+        connection = connect_to_mysql()
+        try:
+            with connection.cursor() as cursor:
+                ledger = cls._fetch_ledger(cursor)
+            connection.commit()
+        finally:
+            connection.close()
+
+        results = [cls._describe(migration, migration["state"]) for migration in cls._plan(migrations, ledger)]
+        return cls._summarize(results, started_at)
+
+    @classmethod
+    def apply(cls, paths, online_only=False, strict_checksums=False, baseline=False):
+        started_at = time.perf_counter()
+        migrations = cls.load_migrations(paths)
+        connection = connect_to_mysql()
+        results = []
+        try:
+            with connection.cursor() as cursor:
+                cls._acquire_runner_lock(cursor)
+                try:
+                    ledger = cls._fetch_ledger(cursor)
+                    connection.commit()
+                    cls._plan(migrations, ledger)
+                    changed = [migration["version"] for migration in migrations if migration["state"] == "changed"]
+                    if strict_checksums and changed:
+                        raise SchemaMigrationError(f"Applied migrations changed on disk: {', '.join(changed)}")
+
+                    deferring = False
+                    for migration in migrations:
+                        if migration["state"] == "applied":
+                            results.append(cls._describe(migration, "up_to_date"))
+                            continue
+                        # Later files may depend on a deferred one, so nothing after it runs either.
+                        if deferring or (online_only and not migration["online_safe"]):
+                            deferring = True
+                            results.append(cls._describe(migration, "deferred"))
+                            continue
+                        if baseline:
+                            cls._record(cursor, migration, 0, 0)
+                            connection.commit()
+                            results.append(cls._describe(migration, "baselined"))
+                            continue
+
+                        migration_started_at = time.perf_counter()
+                        statement_count = cls._execute_migration(cursor, migration)
+                        duration_ms = (time.perf_counter() - migration_started_at) * 1000
+                        cls._record(cursor, migration, statement_count, duration_ms)
+                        connection.commit()
+                        status = "reapplied" if migration["state"] == "changed" else "applied"
+                        results.append(
+                            cls._describe(
+                                migration,
+                                status,
+                                statement_count=statement_count,
+                                duration_ms=round(duration_ms, 1),
+                            )
+                        )
+                        cls._log_event(
+                            logging.INFO if status == "applied" else logging.WARNING,
+                            "schema_migration_applied",
+                            version=migration["version"],
+                            status=status,
+                            online_safe=migration["online_safe"],
+                            statement_count=statement_count,
+                            duration_ms=round(duration_ms, 1),
+                        )
+                finally:
+                    cursor.execute("SELECT RELEASE_LOCK(%s);", (cls.RUNNER_LOCK_NAME,))
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        return cls._summarize(results, started_at)
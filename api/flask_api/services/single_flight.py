@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightTimeout(TimeoutError):
+    pass
+
+
+class _Flight:
+    def __init__(self, leader_ident=None):
+        self.leader_ident = leader_ident
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # When a cached catalog or media list expires under load, the first caller rebuilds it and the
+    # concurrent callers for the same key wait for that result instead of each hitting MySQL.
+    WAIT_TIMEOUT_ENV = "SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS"
+    DEFAULT_WAIT_TIMEOUT_SECONDS = 30.0
+
+    _lock = threading.Lock()
+    _flights = {}
+    _stats = {}
+
+    @staticmethod
+    def _get_float_env(name, default, minimum=0.0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = float(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @staticmethod
+    def _log_event(level, event, **fields):
+        logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+    @classmethod
+    def _key_stats(cls, key):
+        # Caller holds _lock.
+        stats = cls._stats.get(key)
+        if stats is None:
+            stats = cls._stats[key] = {
+                "builds": 0,
+                "errors": 0,
+                "coalesced": 0,
+                "wait_time_total_ms": 0.0,
+                "wait_time_max_ms": 0.0,
+                "wait_timeouts": 0,
+                "deadline_exceeded": 0,
+                "background_refreshes": 0,
+                "stale_served": 0,
+            }
+        return stats
+
+    @classmethod
+    def _lead(cls, key, flight, build):
+        started_at = time.perf_counter()
+        try:
+            flight.result = build()
+        except BaseException as exc:
+            flight.error = exc
+        finally:
+            with cls._lock:
+                if cls._flights.get(key) is flight:
+                    cls._flights.pop(key)
+                stats = cls._key_stats(key)
+                stats["builds"] += 1
+                if flight.error is not None:
+                    stats["errors"] += 1
+            flight.done.set()
+            cls._log_event(
+                logging.DEBUG,
+                "single_flight_build",
+                key=key,
+                duration_ms=round((time.perf_counter() - started_at) * 1000, 3),
+                ok=flight.error is None,
+            )
+        return flight
+
+    @classmethod
+    def run(cls, key, build, deadline_seconds=None):
+        # With a deadline the build runs on a background thread, so a caller can give up on a slow
+        # database and serve something else while the result still lands in the cache for later requests.
+        current_ident = threading.get_ident()
+        in_background = False
+        with cls._lock:
+            flight = cls._flights.get(key)
+            if flight is None:
+                in_background = bool(deadline_seconds)
+                flight = cls._flights[key] = _Flight(leader_ident=None if in_background else current_ident)
+                leading = True
+            elif flight.leader_ident == current_ident:
+                # Re-entered from inside its own build; waiting here would deadlock.
+                return build()
+            else:
+                leading = False
+                cls._key_stats(key)["coalesced"] += 1
+
+        if in_background:
+            cls._start_background(key, flight, build)
+        elif leading:
+            cls._lead(key, flight, build)
+        if not leading or in_background:
+            wait_timeout_seconds = deadline_seconds or cls._get_float_env(
+                cls.WAIT_TIMEOUT_ENV, cls.DEFAULT_WAIT_TIMEOUT_SECONDS
+            )
+            started_at = time.perf_counter()
+            finished = flight.done.wait(wait_timeout_seconds or None)
+            waited_ms = (time.perf_counter() - started_at) * 1000
+            with cls._lock:
+                stats = cls._key_stats(key)
+                if not leading:
+                    stats["wait_time_total_ms"] += waited_ms
+                    stats["wait_time_max_ms"] = max(stats["wait_time_max_ms"], waited_ms)
+                if not finished:
+                    stats["deadline_exceeded" if deadline_seconds else "wait_timeouts"] += 1
+            if not finished and deadline_seconds:
+                raise SingleFlightTimeout(f"{key} was not built within {deadline_seconds:.2f}s.")
+            if not finished:
+                # A stuck leader must not hold every request for this key hostage; build without it.
+                cls._log_event(logging.WARNING, "single_flight_wait_timeout", key=key, waited_ms=round(waited_ms, 3))
+                return build()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    @classmethod
+    def _start_background(cls, key, flight, build):
+        def run_build():
+            flight.leader_ident = threading.get_ident()
+            cls._lead(key, flight, build)
+            if flight.error is not None:
+                cls._log_event(logging.WARNING, "single_flight_refresh_failed", key=key, error=str(flight.error))
+
+        threading.Thread(target=run_build, name=f"single-flight-{key}", daemon=True).start()
+
+    @classmethod
+    def refresh_in_background(cls, key, build):
+        # The caller keeps serving its stale value; at most one refresh per key runs at a time.
+        with cls._lock:
+            stats = cls._key_stats(key)
+            stats["stale_served"] += 1
+            if key in cls._flights:
+                return False
+            flight = cls._flights[key] = _Flight()
+            stats["background_refreshes"] += 1
+
+        cls._start_background(key, flight, build)
+        return True
+
+    @classmethod
+    def get_stats(cls):
+        with cls._lock:
+            keys = {
+                key: {**stats, "wait_time_total_ms": round(stats["wait_time_total_ms"], 3)}
+                for key, stats in sorted(cls._stats.items())
+            }
+            in_flight = sorted(cls._flights)
+        totals = {
+            name: sum(stats[name] for stats in keys.values())
+            for name in (
+                "builds",
+                "errors",
+                "coalesced",
+                "wait_timeouts",
+                "deadline_exceeded",
+                "background_refreshes",
+                "stale_served",
+            )
+        }
+        return {**totals, "in_flight": in_flight, "keys": keys}
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._flights.clear()
+            cls._stats.clear()
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+
+class VersionedCache:
+    # Per-worker value cache: a version bump (local write or a cache_versions change seen by
+    # CacheVersionBus) drops every entry, and a TTL bounds staleness otherwise. Subclasses set the
+    # env names and VERSION_KEYS and declare their own _lock/_version/_entries so caches evict independently.
+    ENABLED_ENV = None
+    TTL_ENV = None
+    DEFAULT_TTL_SECONDS = 30.0
+    VERSION_KEYS = ()
+    # When true, a TTL of 0 turns the cache off instead of disabling expiry.
+    ZERO_TTL_DISABLES = False
+
+    _lock = threading.Lock()
+    _version = 0
+    _entries = {}
+
+    @staticmethod
+    def _get_bool_env(name, default):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        return str(raw_value).strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _get_float_env(name, default, minimum=0.0):
+        raw_value = os.getenv(name)
+        if raw_value is None:
+            return default
+        try:
+            parsed = float(str(raw_value).strip())
+        except (TypeError, ValueError):
+            return default
+        return max(parsed, minimum)
+
+    @classmethod
+    def is_enabled(cls):
+        if not cls._get_bool_env(cls.ENABLED_ENV, True):
+            return False
+        return not (cls.ZERO_TTL_DISABLES and cls._ttl_seconds() <= 0)
+
+    @classmethod
+    def _ttl_seconds(cls):
+        # Bounds staleness for edits made by another worker or directly in MySQL.
+        return cls._get_float_env(cls.TTL_ENV, cls.DEFAULT_TTL_SECONDS)
+
+    @classmethod
+    def get_version(cls):
+        with cls._lock:
+            return cls._version
+
+    @classmethod
+    def invalidate(cls):
+        with cls._lock:
+            cls._version += 1
+            cls._entries.clear()
+            return cls._version
+
+    @classmethod
+    def has_entries(cls):
+        with cls._lock:
+            return bool(cls._entries)
+
+    @classmethod
+    def get(cls, key):
+        if not cls.is_enabled():
+            return None
+
+        ttl_seconds = cls._ttl_seconds()
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                return None
+            version, stored_at, value = entry
+            if version != cls._version:
+                cls._entries.pop(key, None)
+                return None
+            if ttl_seconds > 0 and time.monotonic() - stored_at >= ttl_seconds:
+                # Expired entries stay behind for get_stale until replaced or invalidated.
+                return None
+            return value
+
+    @classmethod
+    def get_stale(cls, key):
+        # Only TTL expiry leaves a stale value; invalidated entries are gone. Served for at most one more TTL.
+        if not cls.is_enabled():
+            return None
+
+        ttl_seconds = cls._ttl_seconds()
+        if ttl_seconds <= 0:
+            return None
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                return None
+            version, stored_at, value = entry
+            if version != cls._version or time.monotonic() - stored_at >= ttl_seconds * 2:
+                cls._entries.pop(key, None)
+                return None
+            return value
+
+    @classmethod
+    def set(cls, key, value, version):
+        if not cls.is_enabled():
+            return False
+
+        with cls._lock:
+            # A write that landed while the value was being built already bumped the version.
+            if version != cls._version:
+                return False
+            cls._entries[key] = (version, time.monotonic(), value)
+            return True
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
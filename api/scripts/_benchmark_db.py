@@ -0,0 +1,450 @@
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from copy import deepcopy
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+
+# Shared by benchmark_suite.py and load_test.py: a throwaway database to run the real services
+# against, plus a synthetic seed scaled up from sql/menu_seed_payload.json.
+
+API_ROOT = Path(__file__).resolve().parents[1]
+SQLITE_SCHEMA_SOURCES = (
+    API_ROOT / "sql" / "schema.sql",
+    API_ROOT / "sql" / "migrations" / "20260316_catering_packages_refactor.sql",
+)
+
+BENCHMARK_ADMIN_USERNAME = "bench-admin"
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\)[^;]*;", re.DOTALL)
+_INDEX_LINE = re.compile(r"^(UNIQUE )?(?:KEY|INDEX) (\w+) \((.*)\)$")
+_PREFIX_LENGTH = re.compile(r"(\w+)\(\d+\)")
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s")
+_VALUES_FUNCTION = re.compile(r"\bVALUES\((\w+)\)")
+_WRITE_LIMIT = re.compile(r"\s+LIMIT\s+\d+\s*;?\s*$", re.IGNORECASE)
+
+
+def _split_definitions(body):
+    definitions = []
+    depth = 0
+    current = []
+    for char in body:
+        if char == "," and depth == 0:
+            definitions.append(" ".join("".join(current).split()))
+            current = []
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current.append(char)
+    definitions.append(" ".join("".join(current).split()))
+    return [definition for definition in definitions if definition]
+
+
+def _sqlite_create_table(table, body):
+    columns = []
+    indexes = []
+    autoincrement_column = None
+    for line in _split_definitions(body):
+        index_match = _INDEX_LINE.match(line)
+        if index_match:
+            unique, name, index_columns = index_match.groups()
+            index_columns = _PREFIX_LENGTH.sub(r"\1", index_columns)
+            indexes.append(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {table}__{name} ON {table} ({index_columns})"
+            )
+            continue
+        if line.startswith("PRIMARY KEY"):
+            if autoincrement_column is None:
+                columns.append(line)
+            continue
+        if " AUTO_INCREMENT" in line:
+            autoincrement_column = line.split()[0]
+            columns.append(f"{autoincrement_column} INTEGER PRIMARY KEY AUTOINCREMENT")
+            continue
+        line = re.sub(r"ENUM\([^)]*\)", "TEXT", line)
+        line = line.replace(" UNSIGNED", "").replace(" ON UPDATE CURRENT_TIMESTAMP", "")
+        columns.append(line)
+    return [f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})", *indexes]
+
+
+def sqlite_schema_statements():
+    statements = []
+    seen_tables = set()
+    for path in SQLITE_SCHEMA_SOURCES:
+        for table, body in _CREATE_TABLE.findall(path.read_text(encoding="utf-8")):
+            if table not in seen_tables:
+                seen_tables.add(table)
+                statements.extend(_sqlite_create_table(table, body))
+    return statements
+
+
+@lru_cache(maxsize=512)
+def translate_sql(query):
+    text = query.replace("%%", "%")
+    text = _VALUES_FUNCTION.sub(r"excluded.\1", text)
+    text = text.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+    text = text.replace("INSERT IGNORE", "INSERT OR IGNORE")
+    text = text.replace("FOR UPDATE", "")
+    text = text.replace("UTC_TIMESTAMP()", "CURRENT_TIMESTAMP").replace("NOW()", "CURRENT_TIMESTAMP")
+    text = text.replace("LAST_INSERT_ID()", "last_insert_rowid()")
+    text = text.replace("JSON_ARRAYAGG(", "json_group_array(").replace("JSON_OBJECT(", "json_object(")
+    text = text.replace("JSON_ARRAY(", "json_array(")
+    if text.lstrip().upper().startswith(("DELETE", "UPDATE")):
+        text = _WRITE_LIMIT.sub(";", text)
+    return _PLACEHOLDER.sub(r":\1", text).replace("%s", "?")
+
+
+class _SqliteCursor:
+    def __init__(self, connection):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self._cursor.close()
+
+    @staticmethod
+    def _params(params):
+        if isinstance(params, dict):
+            return params
+        return tuple(params or ())
+
+    def _prepare(self, query):
+        self._connection.stand_in.simulate_round_trip()
+        statement = translate_sql(query)
+        if not self._connection.raw.in_transaction and not statement.lstrip().upper().startswith("SELECT"):
+            # Reads run in autocommit; a write takes the database write lock for the rest of the transaction.
+            self._connection.raw.execute("BEGIN IMMEDIATE")
+        return statement
+
+    def execute(self, query, params=None):
+        self._cursor.execute(self._prepare(query), self._params(params))
+        self.lastrowid = self._cursor.lastrowid
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    def executemany(self, query, rows):
+        self._cursor.executemany(self._prepare(query), [self._params(row) for row in rows])
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    def fetchall(self):
+        return [dict(row) for row in self._cursor.fetchall()]
+
+
+class _SqliteConnection:
+    # Enough of the PyMySQL connection surface for query_db, db_transaction and the pool.
+    def __init__(self, stand_in):
+        self.stand_in = stand_in
+        self.raw = sqlite3.connect(
+            stand_in.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self.raw.row_factory = sqlite3.Row
+        self.raw.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self):
+        return _SqliteCursor(self)
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self.raw.execute("SELECT 1")
+        return True
+
+    def close(self):
+        self.raw.close()
+
+
+class SqliteStandIn:
+    # A WAL-mode SQLite file in a temporary directory: every connect() is a separate connection, so the
+    # pool, request connections, worker threads and gunicorn worker processes behave as they do against
+    # MySQL. The optional sleep per statement stands in for the network round trip SQLite does not have.
+    def __init__(self, round_trip_ms=0.0, path=None):
+        sqlite3.register_adapter(Decimal, str)
+        sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode()))
+        sqlite3.register_converter("TIMESTAMP", self._parse_timestamp)
+        sqlite3.register_converter("DATETIME", self._parse_timestamp)
+        self.round_trip_seconds = max(float(round_trip_ms or 0.0), 0.0) / 1000
+        self._directory = None
+        if path:
+            # Attach to a database another process already built and seeded.
+            self.path = str(path)
+            return
+
+        self._directory = tempfile.TemporaryDirectory(prefix="post-catering-bench-")
+        self.path = str(Path(self._directory.name) / "bench.sqlite3")
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        connection.execute("PRAGMA journal_mode = WAL")
+        for statement in sqlite_schema_statements():
+            connection.execute(statement)
+        connection.close()
+
+    @staticmethod
+    def _parse_timestamp(value):
+        text = value.decode()
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            return text
+
+    def simulate_round_trip(self):
+        if self.round_trip_seconds:
+            time.sleep(self.round_trip_seconds)
+
+    def connect(self):
+        return _SqliteConnection(self)
+
+    def cleanup(self):
+        from flask_api.config.mysqlconnection import reset_connection_pool
+
+        reset_connection_pool()
+        if self._directory is not None:
+            self._directory.cleanup()
+
+
+def install_sqlite_stand_in(round_trip_ms=0.0, path=None):
+    from flask_api.config import mysqlconnection
+
+    stand_in = SqliteStandIn(round_trip_ms=round_trip_ms, path=path)
+    mysqlconnection.connect_to_mysql = stand_in.connect
+    mysqlconnection.reset_connection_pool()
+    return stand_in
+
+
+def create_sqlite_app():
+    # gunicorn app factory ("_benchmark_db:create_sqlite_app()") for load tests: every worker attaches
+    # to the database the harness seeded, named by BENCHMARK_SQLITE_PATH.
+    install_sqlite_stand_in(
+        round_trip_ms=float(os.getenv("BENCHMARK_ROUND_TRIP_MS", "0") or 0),
+        path=os.environ["BENCHMARK_SQLITE_PATH"],
+    )
+    from flask_api import app
+
+    return app
+
+
+def prepare_mysql_database():
+    # Runs the real schema and migrations. They target the database named in the SQL files, so only
+    # point DB_HOST/DB_PORT at a throwaway server.
+    from flask_api.config.mysqlconnection import reset_connection_pool
+    from flask_api.services.menu_service import MenuService
+
+    MenuService.run_menu_admin_task(apply_schema=True, reset=True, seed=False)
+    reset_connection_pool()
+
+
+def scale_menu_payload(payload, scale):
+    scaled = deepcopy(payload)
+    copies = max(int(scale), 1)
+
+    def variant_name(name, copy_index):
+        return f"{name} (Variant {copy_index})"
+
+    def scale_node(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in ("items", "bullets") and isinstance(value, list):
+                    originals = [entry for entry in value if isinstance(entry, str)]
+                    value.extend(variant_name(name, index) for index in range(2, copies + 1) for name in originals)
+                elif key == "rows" and isinstance(value, list):
+                    originals = [row for row in value if isinstance(row, list) and row]
+                    value.extend(
+                        [variant_name(row[0], index), *row[1:]] for index in range(2, copies + 1) for row in originals
+                    )
+                else:
+                    scale_node(value)
+        elif isinstance(node, list):
+            for entry in node:
+                scale_node(entry)
+
+    scale_node(scaled.get("menu_options"))
+    scale_node(scaled.get("menu"))
+    return scaled
+
+
+def seed_database(scale=5, media_count=200, audit_count=2000, admin_password=None):
+    from werkzeug.security import generate_password_hash
+
+    from flask_api.config.mysqlconnection import query_db, query_db_many
+    from flask_api.services.menu_catalog_cache import MenuCatalogCache
+    from flask_api.services.menu_service import MenuService
+    from flask_api.services.public_media_cache import PublicMediaCache
+
+    for table in (
+        "admin_audit_log",
+        "service_plan_details",
+        "service_plan_constraints",
+        "service_plans",
+        "service_section_menu_groups",
+        "service_plan_sections",
+        "slides",
+        "inquiry_selection_data",
+        "inquiry_email_outbox",
+        "inquiries",
+        "inquiry_abuse_events",
+        "inquiry_abuse_keys",
+        "admin_users",
+    ):
+        query_db(f"DELETE FROM {table};", fetch="none")
+
+    menu_result = MenuService.sync_simplified_from_payload(
+        payload=scale_menu_payload(MenuService._load_seed_payload(), scale)
+    )
+
+    admin_user_id = query_db(
+        """
+      INSERT INTO admin_users (username, password_hash, display_name, access_tier, can_manage_admin_users)
+      VALUES (%(username)s, %(password_hash)s, 'Benchmark Admin', 1, 1);
+      """,
+        {
+            "username": BENCHMARK_ADMIN_USERNAME,
+            # Without a password the account cannot sign in; suites that only set the session skip the hash.
+            "password_hash": generate_password_hash(admin_password) if admin_password else "!",
+        },
+        fetch="none",
+    )
+
+    sections = (
+        ("catering", "catering_packages", "packages", "Catering Packages", 1),
+        ("catering", "catering_menu_options", "include_menu", "Menu Options", 2),
+        ("formal", "formal_packages", "packages", "Formal Dinner Packages", 1),
+    )
+    section_ids = {}
+    for catalog_key, section_key, section_type, title, sort_order in sections:
+        section_ids[section_key] = query_db(
+            """
+        INSERT INTO service_plan_sections (catalog_key, section_key, section_type, public_section_id, title, sort_order)
+        VALUES (%(catalog_key)s, %(section_key)s, %(section_type)s, %(section_key)s, %(title)s, %(sort_order)s);
+        """,
+            {
+                "catalog_key": catalog_key,
+                "section_key": section_key,
+                "section_type": section_type,
+                "title": title,
+                "sort_order": sort_order,
+            },
+            fetch="none",
+        )
+    for sort_order, group_key in enumerate(("entree", "sides_salads"), start=1):
+        query_db(
+            """
+        INSERT INTO service_section_menu_groups (section_id, menu_group_key, sort_order)
+        VALUES (%(section_id)s, %(group_key)s, %(sort_order)s);
+        """,
+            {"section_id": section_ids["catering_menu_options"], "group_key": group_key, "sort_order": sort_order},
+            fetch="none",
+        )
+
+    plans_per_section = 4 * max(int(scale), 1)
+    for section_key, catalog_key in (("catering_packages", "catering"), ("formal_packages", "formal")):
+        for index in range(1, plans_per_section + 1):
+            plan_id = query_db(
+                """
+          INSERT INTO service_plans (
+            section_id, plan_key, title, price_display, price_amount_min, price_amount_max,
+            price_currency, price_unit, selection_mode, sort_order, is_active
+          )
+          VALUES (
+            %(section_id)s, %(plan_key)s, %(title)s, %(price_display)s, %(price_min)s, %(price_max)s,
+            'USD', 'per_person', 'menu_groups', %(sort_order)s, 1
+          );
+          """,
+                {
+                    "section_id": section_ids[section_key],
+                    "plan_key": f"{catalog_key}:bench_plan_{index}",
+                    "title": f"Benchmark Package {index}",
+                    "price_display": f"${20 + index}-${30 + index} per person",
+                    "price_min": Decimal(20 + index),
+                    "price_max": Decimal(30 + index),
+                    "sort_order": index,
+                },
+                fetch="none",
+            )
+            query_db_many(
+                """
+          INSERT INTO service_plan_details (service_plan_id, detail_text, sort_order)
+          VALUES (%(plan_id)s, %(detail_text)s, %(sort_order)s);
+          """,
+                [
+                    {"plan_id": plan_id, "detail_text": f"Detail {detail}", "sort_order": detail}
+                    for detail in range(1, 4)
+                ],
+            )
+            query_db_many(
+                """
+          INSERT INTO service_plan_constraints (service_plan_id, selection_key, min_select, max_select)
+          VALUES (%(plan_id)s, %(selection_key)s, 1, 2);
+          """,
+                [{"plan_id": plan_id, "selection_key": key} for key in ("entree", "sides_salads")],
+            )
+
+    query_db_many(
+        """
+      INSERT INTO slides (title, caption, image_url, media_type, alt_text, display_order, is_slide, is_active)
+      VALUES (%(title)s, %(caption)s, %(image_url)s, 'image', %(title)s, %(display_order)s, %(is_slide)s, 1);
+      """,
+        [
+            {
+                "title": f"Benchmark media {index}",
+                "caption": f"Caption {index}",
+                "image_url": f"/api/assets/slides/bench-{index:05d}.jpg",
+                "display_order": index if index <= 10 else index - 10,
+                "is_slide": 1 if index <= 10 else 0,
+            }
+            for index in range(1, media_count + 1)
+        ],
+    )
+
+    query_db_many(
+        """
+      INSERT INTO admin_audit_log (
+        admin_user_id, action, entity_type, entity_id, change_summary, payload_format, before_json, after_json
+      )
+      VALUES (
+        %(admin_user_id)s, 'update', 'menu_item', %(entity_id)s, %(summary)s, 'diff', %(before)s, %(after)s
+      );
+      """,
+        [
+            {
+                "admin_user_id": admin_user_id,
+                "entity_id": str(index % 50 + 1),
+                "summary": f"Updated menu item {index}",
+                "before": '{"item_name": "Before"}',
+                "after": '{"item_name": "After"}',
+            }
+            for index in range(audit_count)
+        ],
+    )
+
+    MenuCatalogCache.invalidate()
+    PublicMediaCache.invalidate()
+    MenuService.publish_catalog_snapshot()
+    return {
+        "admin_user_id": admin_user_id,
+        "menu_items": menu_result.get("item_count"),
+        "menu_assignments": menu_result.get("assignment_count"),
+        "service_plans": plans_per_section * 2,
+        "media": media_count,
+        "audit_entries": audit_count,
+    }
@@ -0,0 +1,119 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure per-request cost of the in-memory inquiry abuse state as the number of tracked client "
+            "IPs grows. No database is needed; prints JSON."
+        )
+    )
+    parser.add_argument(
+        "--tracked",
+        default="1000,10000,100000",
+        help="Comma-separated tracked-IP counts to pre-populate before timing.",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Timed submissions per tracked-IP count.")
+    parser.add_argument(
+        "--skip-legacy",
+        action="store_true",
+        help="Skip the previous full-scan implementation (slow at 100k tracked IPs).",
+    )
+    return parser.parse_args()
+
+
+class LegacyFullScanStore:
+    # The pre-bucketing state handling: every call trims every tracked key under the lock.
+    def __init__(self):
+        self._ip_events = defaultdict(deque)
+        self._recent_submission_keys = {}
+
+    def _trim(self, now_epoch):
+        cleanup_before = now_epoch - 86400
+        for key in list(self._ip_events.keys()):
+            events = self._ip_events[key]
+            while events and events[0] < cleanup_before:
+                events.popleft()
+            if not events:
+                del self._ip_events[key]
+        for key, timestamp in list(self._recent_submission_keys.items()):
+            if timestamp < cleanup_before:
+                del self._recent_submission_keys[key]
+
+    def reserve_ip_slot(self, client_ip, now_epoch, minute_limit, hour_limit):
+        self._trim(now_epoch)
+        events = self._ip_events[client_ip]
+        while events and events[0] < now_epoch - 3600:
+            events.popleft()
+        minute_count = sum(1 for timestamp in events if timestamp >= now_epoch - 60)
+        if minute_count >= minute_limit or len(events) >= hour_limit:
+            return "rate_limited"
+        events.append(now_epoch)
+        return None
+
+    def populate(self, client_ip, now_epoch):
+        # Seeding through reserve_ip_slot would itself be quadratic here.
+        self._ip_events[client_ip].append(now_epoch)
+
+
+def _measure(store, tracked, requests):
+    started_epoch = time.time()
+    populate = getattr(store, "populate", None)
+    for index in range(tracked):
+        client_ip = f"10.{index // 65536}.{(index // 256) % 256}.{index % 256}"
+        if populate is not None:
+            populate(client_ip, started_epoch)
+        else:
+            store.reserve_ip_slot(client_ip, started_epoch, 3, 12)
+
+    durations_us = []
+    for index in range(requests):
+        client_ip = f"172.16.{(index // 256) % 256}.{index % 256}"
+        begin = time.perf_counter()
+        store.reserve_ip_slot(client_ip, started_epoch + 1, 3, 12)
+        durations_us.append((time.perf_counter() - begin) * 1_000_000)
+
+    ordered = sorted(durations_us)
+    return {
+        "median_us": round(statistics.median(ordered), 2),
+        "p99_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+        "mean_us": round(statistics.fmean(ordered), 2),
+    }
+
+
+def main():
+    _bootstrap_path()
+    from flask_api.services.inquiry_abuse_state import MemoryAbuseStateStore
+
+    args = _parse_args()
+    tracked_counts = [int(value) for value in args.tracked.split(",") if value.strip()]
+    requests = max(args.requests, 1)
+    results = []
+    for tracked in tracked_counts:
+        entry = {
+            "tracked_ips": tracked,
+            "bucketed": _measure(MemoryAbuseStateStore(max_keys=tracked + requests), tracked, requests),
+        }
+        if not args.skip_legacy:
+            entry["legacy_full_scan"] = _measure(LegacyFullScanStore(), tracked, min(requests, 200))
+        results.append(entry)
+
+    print(json.dumps({"requests": requests, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+import argparse
+import json
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare the per-row two-pass reorder (2N UPDATEs) with the set-based CASE reorder (2 UPDATEs) on a "
+            "scratch table with a unique (scope, position) key. Uses in-memory SQLite by default, or a temporary "
+            "table on the configured MySQL database with --backend mysql. Prints JSON."
+        )
+    )
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated row counts to reorder.")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed reorders per strategy and size.")
+    parser.add_argument(
+        "--round-trip-ms",
+        type=float,
+        default=0.2,
+        help="Simulated per-statement round trip, roughly MySQL over loopback TCP (sqlite backend only).",
+    )
+    return parser.parse_args()
+
+
+class _SqliteRunner:
+    placeholder_pattern = re.compile(r"%\((\w+)\)s")
+
+    def __init__(self, round_trip_ms):
+        self.connection = sqlite3.connect(":memory:", isolation_level=None)
+        self.round_trip_seconds = max(round_trip_ms, 0.0) / 1000
+
+    def execute(self, query, params=None):
+        if self.round_trip_seconds:
+            time.sleep(self.round_trip_seconds)
+        self.connection.execute(self.placeholder_pattern.sub(r":\1", query), params or {})
+
+    def begin(self):
+        self.connection.execute("BEGIN")
+
+    def commit(self):
+        self.connection.execute("COMMIT")
+
+    def create_table(self, size):
+        self.connection.execute("DROP TABLE IF EXISTS bench_reorder")
+        self.connection.execute(
+            "CREATE TABLE bench_reorder (id INTEGER PRIMARY KEY, scope_id INTEGER NOT NULL, "
+            "position INTEGER NOT NULL, UNIQUE (scope_id, position))"
+        )
+        self.connection.executemany(
+            "INSERT INTO bench_reorder (id, scope_id, position) VALUES (?, 1, ?)",
+            [(index, index) for index in range(1, size + 1)],
+        )
+
+
+class _MysqlRunner:
+    def __init__(self):
+        from flask_api.config.mysqlconnection import connect_to_mysql
+
+        self.connection = connect_to_mysql()
+
+    def execute(self, query, params=None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(query, params or ())
+
+    def begin(self):
+        self.connection.begin()
+
+    def commit(self):
+        self.connection.commit()
+
+    def create_table(self, size):
+        self.execute("DROP TEMPORARY TABLE IF EXISTS bench_reorder")
+        self.execute(
+            "CREATE TEMPORARY TABLE bench_reorder (id INT PRIMARY KEY, scope_id INT NOT NULL, "
+            "position INT NOT NULL, UNIQUE KEY uq_bench_reorder_scope_position (scope_id, position)) ENGINE=InnoDB"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO bench_reorder (id, scope_id, position) VALUES (%s, 1, %s)",
+                [(index, index) for index in range(1, size + 1)],
+            )
+        self.connection.commit()
+
+
+def _legacy_reorder(runner, ordered_ids):
+    # Mirrors the previous implementation: park every row with one UPDATE each, then write final slots.
+    statements = 0
+    for offset in (1000000, 0):
+        for index, row_id in enumerate(ordered_ids, start=1):
+            runner.execute(
+                "UPDATE bench_reorder SET position = %(position)s WHERE id = %(id)s;",
+                {"position": offset + index, "id": row_id},
+            )
+            statements += 1
+    return statements
+
+
+def _set_based_reorder(runner, ordered_ids):
+    from flask_api.config.mysqlconnection import build_sequence_position_updates
+
+    statements = build_sequence_position_updates("bench_reorder", "position", ordered_ids)
+    for query, params in statements:
+        runner.execute(query, params)
+    return len(statements)
+
+
+def _measure(runner, strategy, size, iterations):
+    runner.create_table(size)
+    ids = list(range(1, size + 1))
+    rng = random.Random(size)
+    durations_ms = []
+    statements = 0
+    for _ in range(max(iterations, 1)):
+        rng.shuffle(ids)
+        begin = time.perf_counter()
+        runner.begin()
+        statements = strategy(runner, ids)
+        runner.commit()
+        durations_ms.append((time.perf_counter() - begin) * 1000)
+
+    return {
+        "statements": statements,
+        "median_ms": round(statistics.median(durations_ms), 3),
+        "p95_ms": round(sorted(durations_ms)[min(len(durations_ms) - 1, int(len(durations_ms) * 0.95))], 3),
+    }
+
+
+def main():
+    _bootstrap_path()
+    # Import up front so module loading is not timed as part of the first set-based reorder.
+    import flask_api.config.mysqlconnection  # noqa: F401
+
+    args = _parse_args()
+    runner = _MysqlRunner() if args.backend == "mysql" else _SqliteRunner(args.round_trip_ms)
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    results = []
+    for size in sizes:
+        legacy = _measure(runner, _legacy_reorder, size, args.iterations)
+        set_based = _measure(runner, _set_based_reorder, size, args.iterations)
+        results.append(
+            {
+                "rows": size,
+                "legacy_per_row": legacy,
+                "set_based_case": set_based,
+                "speedup": round(legacy["median_ms"] / set_based["median_ms"], 1) if set_based["median_ms"] else None,
+            }
+        )
+
+    print(
+        json.dumps(
+            {
+                "backend": args.backend,
+                "round_trip_ms": args.round_trip_ms if args.backend == "sqlite" else None,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare the per-catalog service plan fan-out with the single-pass loader against the configured "
+            "database. Run after menu_admin_sync.py has applied the schema and seeded data."
+        )
+    )
+    parser.add_argument("--iterations", type=int, default=50, help="Timed catalog builds per strategy.")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed builds per strategy before measuring.")
+    return parser.parse_args()
+
+
+def _legacy_fan_out(service_cls, query_db):
+    # Mirrors the previous loader: one section/plan join plus four child queries, once per catalog.
+    sections = []
+    for catalog_key in ("catering", "formal"):
+        rows = query_db(
+            """
+      SELECT s.id AS section_id, p.id
+      FROM service_plan_sections s
+      LEFT JOIN service_plans p ON p.section_id = s.id
+      WHERE s.catalog_key = %(catalog_key)s AND s.is_active = 1 AND (p.id IS NULL OR p.is_active = 1)
+      ORDER BY s.catalog_key ASC, s.sort_order ASC, p.sort_order ASC, p.id ASC;
+      """,
+            {"catalog_key": catalog_key},
+        )
+        section_ids = [row.get("section_id") for row in rows if row.get("section_id")]
+        plan_ids = [row.get("id") for row in rows if row.get("id")]
+        service_cls._fetch_plan_constraints(plan_ids)
+        service_cls._fetch_plan_details(plan_ids)
+        service_cls._fetch_plan_selection_groups(plan_ids)
+        _legacy_fetch_include_keys(query_db, section_ids)
+        sections.extend(section_ids)
+    return sections
+
+
+def _legacy_fetch_include_keys(query_db, section_ids):
+    # The service no longer has a per-section include-key query; the loader aggregates them instead.
+    if not section_ids:
+        return []
+    payload = {f"section_id_{index}": section_id for index, section_id in enumerate(section_ids)}
+    tokens = ", ".join(f"%({token})s" for token in payload)
+    return query_db(
+        f"""
+      SELECT section_id, menu_group_key, sort_order
+      FROM service_section_menu_groups
+      WHERE section_id IN ({tokens})
+      ORDER BY section_id ASC, sort_order ASC, id ASC;
+      """,
+        payload,
+    )
+
+
+def _measure(build, module, iterations, warmup):
+    original_query_db = module.query_db
+    round_trips = {"count": 0}
+
+    def counting_query_db(*args, **kwargs):
+        round_trips["count"] += 1
+        return original_query_db(*args, **kwargs)
+
+    module.query_db = counting_query_db
+    try:
+        for _ in range(warmup):
+            build()
+        round_trips["count"] = 0
+        durations_ms = []
+        for _ in range(iterations):
+            started_at = time.perf_counter()
+            build()
+            durations_ms.append((time.perf_counter() - started_at) * 1000)
+    finally:
+        module.query_db = original_query_db
+
+    ordered = sorted(durations_ms)
+    return {
+        "round_trips_per_build": round(round_trips["count"] / iterations, 2),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+def main():
+    _bootstrap_path()
+    from flask_api.services import admin_service_plan_service
+    from flask_api.services.admin_service_plan_service import AdminServicePlanService
+
+    args = _parse_args()
+    iterations = max(args.iterations, 1)
+    warmup = max(args.warmup, 0)
+
+    legacy = _measure(
+        lambda: _legacy_fan_out(AdminServicePlanService, admin_service_plan_service.query_db),
+        admin_service_plan_service,
+        iterations,
+        warmup,
+    )
+    single_pass = _measure(
+        AdminServicePlanService.list_public_service_plan_catalogs,
+        admin_service_plan_service,
+        iterations,
+        warmup,
+    )
+    print(
+        json.dumps(
+            {
+                "iterations": iterations,
+                "legacy_fan_out": legacy,
+                "single_pass": single_pass,
+                "round_trips_saved_per_build": round(
+                    legacy["round_trips_per_build"] - single_pass["round_trips_per_build"], 2
+                ),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,351 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    for path in (api_root, script_path.parent):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    return api_root
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time the API hot paths (menu catalog, service plan catalogs, inquiry submit, abuse guard, admin lists "
+            "and reorders) against a freshly seeded database. Uses a temporary SQLite stand-in by default; "
+            "--backend mysql resets and seeds the configured MySQL server. Prints JSON and optionally writes it to "
+            "--output so two commits can be compared with --compare."
+        )
+    )
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--scale", type=int, default=5, help="Copies of each seed menu item; also scales plans.")
+    parser.add_argument("--media", type=int, default=200, help="Seeded slide and gallery rows.")
+    parser.add_argument("--audit", type=int, default=2000, help="Seeded admin audit log rows.")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed calls per case.")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls per case before measuring.")
+    parser.add_argument("--cases", default="", help="Comma-separated case names to run (default: all).")
+    parser.add_argument(
+        "--round-trip-ms",
+        type=float,
+        default=0.2,
+        help="Simulated per-statement round trip, roughly MySQL over loopback TCP (sqlite backend only).",
+    )
+    parser.add_argument(
+        "--reset-database",
+        action="store_true",
+        help="Required with --backend mysql: applies the schema and deletes every row on the configured database.",
+    )
+    parser.add_argument("--output", help="Write the results JSON to this path.")
+    parser.add_argument("--compare", help="Results JSON from an earlier run to report deltas against.")
+    return parser.parse_args()
+
+
+class _StubSMTP:
+    sent = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        return False
+
+    def starttls(self):
+        return None
+
+    def login(self, *_args):
+        return None
+
+    def send_message(self, _message):
+        _StubSMTP.sent += 1
+
+
+def _git_revision(api_root):
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=api_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _inquiry_payload(index):
+    return {
+        "full_name": "Benchmark Client",
+        "email": f"bench-{index}-{time.time_ns()}@example.com",
+        "phone": f"(212) 555-{index % 10000:04d}",
+        "event_type": "Wedding",
+        "event_date": (date.today() + timedelta(days=30)).isoformat(),
+        "guest_count": 80,
+        "budget": "$2,500-$5,000",
+        "service_interest": "Catering Packages",
+        "service_selection": {},
+        "desired_menu_items": [{"name": "BBQ Pulled Pork", "category": "entree"}],
+        "message": "Benchmark inquiry.",
+    }
+
+
+def _client_ip(index):
+    return f"10.{(index // 65536) % 256}.{(index // 256) % 256}.{index % 256}"
+
+
+def _expect(status_code, expected, case_name):
+    if status_code not in expected:
+        raise RuntimeError(f"{case_name}: unexpected status {status_code}")
+
+
+def _build_cases(seed):
+    from flask_api import app
+    import flask_api.controllers.main_controller  # noqa: F401
+    from flask_api.config.mysqlconnection import query_db
+    from flask_api.models.inquiry import Inquiry
+    from flask_api.services.admin_service_plan_service import AdminServicePlanService
+    from flask_api.services.inquiry_abuse_guard import InquiryAbuseGuard
+    from flask_api.services.inquiry_service import InquiryService
+    from flask_api.services.menu_catalog_cache import MenuCatalogCache
+    from flask_api.services.menu_catalog_snapshot import MenuCatalogSnapshot
+    from flask_api.services.menu_service import MenuService
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["admin_user_id"] = seed["admin_user_id"]
+    counter = {"value": 0}
+
+    def next_index():
+        counter["value"] += 1
+        return counter["value"]
+
+    def menu_catalog(cold, snapshot_miss=False):
+        def run():
+            if cold:
+                MenuCatalogCache.invalidate()
+            if snapshot_miss:
+                MenuCatalogSnapshot.clear()
+            _body, status_code = MenuService.get_catalog()
+            _expect(status_code, {200}, "menu_catalog")
+
+        return run
+
+    def menu_catalog_publish():
+        if MenuService.publish_catalog_snapshot() is None:
+            raise RuntimeError("menu_catalog_publish: snapshot was not published")
+
+    def service_plan_sections():
+        _body, status_code = AdminServicePlanService.list_service_plan_sections(
+            catalog_key="catering", include_inactive=True
+        )
+        _expect(status_code, {200}, "service_plan_sections")
+
+    def public_service_plan_catalogs():
+        MenuCatalogCache.invalidate()
+        AdminServicePlanService.list_public_service_plan_catalogs()
+
+    def inquiry_submit(mode):
+        def run():
+            index = next_index()
+            with patch.dict(os.environ, {"INQUIRY_EMAIL_DELIVERY_MODE": mode}):
+                _body, status_code = InquiryService.submit(
+                    _inquiry_payload(index), client_ip=_client_ip(index), user_agent="benchmark-suite"
+                )
+            _expect(status_code, {201}, f"inquiry_submit_{mode}")
+
+        return run
+
+    def abuse_guard(backend):
+        def run():
+            index = next_index()
+            payload = _inquiry_payload(index)
+            with patch.dict(os.environ, {"INQUIRY_ABUSE_STATE_BACKEND": backend}):
+                result = InquiryAbuseGuard.evaluate(
+                    inquiry=Inquiry.from_payload(payload),
+                    raw_payload=payload,
+                    client_ip=_client_ip(index),
+                    user_agent="benchmark-suite",
+                )
+            if not result["allow"]:
+                raise RuntimeError(f"abuse_guard_{backend}: rejected {result.get('warning_code')}")
+
+        return run
+
+    def admin_get(path):
+        def run():
+            response = client.get(path)
+            _expect(response.status_code, {200}, path)
+
+        return run
+
+    gallery_ids = [
+        row["id"] for row in query_db("SELECT id FROM slides WHERE is_slide = 0 ORDER BY display_order ASC, id ASC;")
+    ]
+    section_id = query_db("SELECT id FROM service_plan_sections WHERE section_key = 'catering_packages';", fetch="one")[
+        "id"
+    ]
+    plan_ids = AdminServicePlanService.list_section_plan_ids(section_id)
+
+    def media_reorder():
+        gallery_ids.reverse()
+        response = client.patch("/api/admin/media/reorder", json={"ordered_ids": gallery_ids, "is_slide": False})
+        _expect(response.status_code, {200}, "admin_media_reorder")
+
+    def service_plan_reorder():
+        plan_ids.reverse()
+        response = client.patch(
+            "/api/admin/service-plans/reorder", json={"section_id": section_id, "ordered_plan_ids": plan_ids}
+        )
+        _expect(response.status_code, {200}, "admin_service_plan_reorder")
+
+    return {
+        "menu_catalog_cold": menu_catalog(cold=True),
+        "menu_catalog_snapshot_miss": menu_catalog(cold=True, snapshot_miss=True),
+        "menu_catalog_warm": menu_catalog(cold=False),
+        "menu_catalog_publish": menu_catalog_publish,
+        "service_plan_sections": service_plan_sections,
+        "public_service_plan_catalogs": public_service_plan_catalogs,
+        "inquiry_submit_outbox": inquiry_submit("outbox"),
+        "inquiry_submit_inline_smtp_stub": inquiry_submit("inline"),
+        "abuse_guard_memory": abuse_guard("memory"),
+        "abuse_guard_mysql": abuse_guard("mysql"),
+        "admin_menu_items": admin_get("/api/admin/menu/items"),
+        "admin_media": admin_get("/api/admin/media"),
+        "admin_service_plans": admin_get("/api/admin/service-plans?catalog_key=catering"),
+        "admin_audit": admin_get("/api/admin/audit"),
+        "admin_media_reorder": media_reorder,
+        "admin_service_plan_reorder": service_plan_reorder,
+    }
+
+
+def _measure(run, iterations, warmup):
+    from flask_api.config.mysqlconnection import capture_queries
+
+    for _ in range(max(warmup, 0)):
+        run()
+
+    durations_ms = []
+    query_counts = []
+    row_counts = []
+    for _ in range(max(iterations, 1)):
+        with capture_queries() as stats:
+            begin = time.perf_counter()
+            run()
+            durations_ms.append((time.perf_counter() - begin) * 1000)
+        query_counts.append(stats.count)
+        row_counts.append(stats.rows)
+
+    ordered = sorted(durations_ms)
+    return {
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "queries_per_call": round(statistics.fmean(query_counts), 1),
+        "rows_per_call": round(statistics.fmean(row_counts), 1),
+    }
+
+
+def _compare(baseline, cases):
+    comparison = {}
+    for name, current in cases.items():
+        previous = (baseline.get("cases") or {}).get(name)
+        if not previous:
+            continue
+        previous_ms = previous.get("median_ms") or 0
+        comparison[name] = {
+            "median_ms": [previous_ms, current["median_ms"]],
+            "median_change_pct": (
+                round((current["median_ms"] - previous_ms) / previous_ms * 100, 1) if previous_ms else None
+            ),
+            "queries_per_call": [previous.get("queries_per_call"), current["queries_per_call"]],
+        }
+    return comparison
+
+
+def main():
+    api_root = _bootstrap_path()
+    args = _parse_args()
+    if args.backend == "mysql" and not args.reset_database:
+        print(
+            json.dumps(
+                {"error": "--backend mysql deletes every row on the configured database; pass --reset-database."}
+            )
+        )
+        return 2
+
+    # Keep per-call JSON logs and the background email worker out of the measurements.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("INQUIRY_EMAIL_WORKER_ENABLED", "false")
+    os.environ.setdefault("DB_SLOW_QUERY_MS", "0")
+    os.environ.update(
+        {
+            "SMTP_HOST": "smtp.benchmark.invalid",
+            "SMTP_USERNAME": "bench@example.com",
+            "SMTP_PASSWORD": "benchmark",
+            "INQUIRY_TO_EMAIL": "owner@example.com",
+            "INQUIRY_RATE_LIMIT_PER_IP_PER_MINUTE": "1000000",
+            "INQUIRY_RATE_LIMIT_PER_IP_PER_HOUR": "1000000",
+        }
+    )
+    import _benchmark_db
+
+    stand_in = None
+    if args.backend == "sqlite":
+        stand_in = _benchmark_db.install_sqlite_stand_in(round_trip_ms=args.round_trip_ms)
+    else:
+        _benchmark_db.prepare_mysql_database()
+
+    try:
+        seed = _benchmark_db.seed_database(scale=args.scale, media_count=args.media, audit_count=args.audit)
+        cases = _build_cases(seed)
+        selected = [name.strip() for name in args.cases.split(",") if name.strip()] or list(cases)
+        unknown = sorted(set(selected) - set(cases))
+        if unknown:
+            print(json.dumps({"error": f"Unknown cases: {', '.join(unknown)}", "cases": list(cases)}))
+            return 2
+
+        results = {}
+        with patch("flask_api.services.inquiry_service.smtplib.SMTP", _StubSMTP):
+            for name in selected:
+                results[name] = _measure(cases[name], args.iterations, args.warmup)
+    finally:
+        if stand_in is not None:
+            stand_in.cleanup()
+
+    report = {
+        "meta": {
+            "git_revision": _git_revision(api_root),
+            "created_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "round_trip_ms": args.round_trip_ms if args.backend == "sqlite" else None,
+            "scale": args.scale,
+            "iterations": args.iterations,
+            "seed": seed,
+        },
+        "cases": results,
+    }
+    if args.compare:
+        report["comparison"] = _compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+    return api_root
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Point media rows uploaded before content-addressed storage at <sha256>.<ext> copies of their files "
+            "so they are served with immutable cache headers. Original files are left in place. Prints JSON totals."
+        )
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing anything.")
+    return parser.parse_args()
+
+
+def _link_or_copy(source_path, target_path):
+    temp_path = target_path.with_name(f".{target_path.name}.tmp")
+    try:
+        os.link(source_path, temp_path)
+    except OSError:
+        shutil.copy2(source_path, temp_path)
+    os.replace(temp_path, target_path)
+
+
+def main():
+    api_root = _bootstrap_path()
+    import pymysql
+
+    from flask_api.config.mysqlconnection import query_db
+    from flask_api.services.media_upload_service import MediaUploadService
+    from flask_api.services.public_media_cache import PublicMediaCache
+
+    args = _parse_args()
+    slides_dir = api_root / "flask_api" / "static" / "slides"
+    url_prefix = "/api/assets/slides/"
+    query = """
+      SELECT id, image_url
+      FROM slides
+      WHERE image_url LIKE %(url_prefix)s
+      ORDER BY id ASC;
+    """
+    rows = query_db(query, {"url_prefix": f"{url_prefix}%"})
+    totals = {"processed": 0, "already_hashed": 0, "fingerprinted": 0, "missing_source": 0, "conflicts": 0}
+    for row in rows or []:
+        totals["processed"] += 1
+        source_name = unquote(Path(urlparse(row.get("image_url") or "").path).name)
+        if MediaUploadService.is_content_hashed(source_name):
+            totals["already_hashed"] += 1
+            continue
+        source_path = slides_dir / source_name
+        if not source_path.is_file():
+            totals["missing_source"] += 1
+            continue
+
+        target_name = f"{MediaUploadService.hash_file(source_path)}{source_path.suffix.lower()}"
+        if args.dry_run:
+            totals["fingerprinted"] += 1
+            continue
+        target_path = slides_dir / target_name
+        if not target_path.exists():
+            _link_or_copy(source_path, target_path)
+        try:
+            query_db(
+                """
+          UPDATE slides
+          SET image_url = %(image_url)s
+          WHERE id = %(id)s;
+          """,
+                {"id": row["id"], "image_url": f"{url_prefix}{target_name}"},
+                fetch="none",
+            )
+        except pymysql.err.IntegrityError:
+            # Another row already points at identical bytes; leave this one on its legacy URL.
+            totals["conflicts"] += 1
+            continue
+        totals["fingerprinted"] += 1
+
+    if totals["fingerprinted"] and not args.dry_run:
+        PublicMediaCache.invalidate()
+    print(json.dumps({"dry_run": args.dry_run, **totals}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+    return api_root
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Generate resized WebP/AVIF variants for image media rows that do not have them yet (for example, "
+            "uploads made before the variant pipeline existed). Runs synchronously and prints JSON totals."
+        )
+    )
+    parser.add_argument("--force", action="store_true", help="Regenerate variants for every image row.")
+    return parser.parse_args()
+
+
+def main():
+    api_root = _bootstrap_path()
+    from flask_api.config.mysqlconnection import query_db
+    from flask_api.services.media_variant_service import MediaVariantService
+
+    args = _parse_args()
+    if not MediaVariantService.output_formats():
+        print(json.dumps({"error": "Pillow with WebP/AVIF support is required to generate media variants."}))
+        return 1
+
+    slides_dir = api_root / "flask_api" / "static" / "slides"
+    missing_filter = "" if args.force else "AND image_variants IS NULL"
+    query = f"""
+      SELECT id, image_url
+      FROM slides
+      WHERE media_type = 'image'
+      {missing_filter}
+      ORDER BY id ASC;
+    """
+    rows = query_db(query)
+    totals = {"processed": 0, "generated": 0, "missing_source": 0}
+    for row in rows or []:
+        source_path = slides_dir / unquote(Path(urlparse(row.get("image_url") or "").path).name)
+        totals["processed"] += 1
+        if not source_path.is_file():
+            totals["missing_source"] += 1
+            continue
+        if MediaVariantService.process_media(row["id"], source_path, "/api/assets/slides"):
+            totals["generated"] += 1
+    print(json.dumps(totals))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,487 @@
+import argparse
+import http.cookiejar
+import json
+import math
+import os
+import platform
+import random
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+LANDING_PATHS = ("/api/slides", "/api/gallery", "/api/menus")
+SCENARIOS = ("landing", "inquiry", "admin")
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    for path in (api_root, script_path.parent):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    return api_root
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Drive landing traffic, inquiry bursts and admin editing sessions against the API and report "
+            "throughput and p50/p95/p99 latency per route. Targets the app in-process (one worker, client "
+            "threads), a local gunicorn started by this script, or an already running server. Prints JSON."
+        )
+    )
+    parser.add_argument("--target", choices=("inprocess", "gunicorn", "url"), default="inprocess")
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument(
+        "--reset-database",
+        action="store_true",
+        help="Required with --backend mysql: applies the schema and deletes every row on the configured database.",
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000", help="Server to drive with --target url.")
+    parser.add_argument("--admin-username", help="Admin account for --target url (seeded targets create one).")
+    parser.add_argument("--admin-password", default=os.getenv("LOAD_TEST_ADMIN_PASSWORD"))
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn --workers for --target gunicorn.")
+    parser.add_argument("--threads", type=int, default=2, help="gunicorn --threads for --target gunicorn.")
+    parser.add_argument("--port", type=int, default=0, help="Port for --target gunicorn (default: a free port).")
+    parser.add_argument(
+        "--users",
+        default="landing=6,inquiry=1,admin=1",
+        help="Concurrent virtual users per scenario, e.g. landing=20,admin=2. Omitted scenarios do not run.",
+    )
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds of load.")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of load before measuring starts.")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause between a virtual user's requests.")
+    parser.add_argument(
+        "--revalidate-ratio",
+        type=float,
+        default=0.5,
+        help="Share of repeat landing requests sent with If-None-Match, as returning browsers do.",
+    )
+    parser.add_argument(
+        "--inquiry-ips",
+        type=int,
+        default=20,
+        help="Distinct client IPs behind the inquiry burst; fewer IPs means more rate-limit rejections.",
+    )
+    parser.add_argument("--scale", type=int, default=5, help="Seed scale, as in benchmark_suite.py.")
+    parser.add_argument("--media", type=int, default=200, help="Seeded slide and gallery rows.")
+    parser.add_argument(
+        "--round-trip-ms",
+        type=float,
+        default=0.2,
+        help="Simulated per-statement round trip, roughly MySQL over loopback TCP (sqlite backend only).",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for request mixes.")
+    parser.add_argument("--output", help="Write the results JSON to this path.")
+    return parser.parse_args()
+
+
+def _parse_users(raw_value):
+    users = {}
+    for part in str(raw_value or "").split(","):
+        name, _, count = part.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}'; expected one of {', '.join(SCENARIOS)}.")
+        users[name] = max(int(count or 1), 0)
+    return {name: count for name, count in users.items() if count}
+
+
+class _InProcessClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, json_body=None, headers=None):
+        response = self._client.open(path, method=method, json=json_body, headers=headers or {})
+        return response.status_code, response.headers.get("ETag"), response.get_data()
+
+
+class _HttpClient:
+    def __init__(self, base_url, timeout=30):
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def request(self, method, path, json_body=None, headers=None):
+        request_headers = dict(headers or {})
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+        http_request = urllib.request.Request(
+            f"{self._base_url}{path}", data=data, method=method, headers=request_headers
+        )
+        try:
+            with self._opener.open(http_request, timeout=self._timeout) as response:
+                return response.status, response.headers.get("ETag"), response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers.get("ETag"), exc.read()
+
+
+class _Recorder:
+    def __init__(self, measure_from):
+        self.measure_from = measure_from
+        self.samples = []
+        self.failures = Counter()
+
+    def timed(self, client, route, method, path, json_body=None, headers=None):
+        started_at = time.perf_counter()
+        try:
+            status_code, etag, body = client.request(method, path, json_body=json_body, headers=headers)
+        except OSError as exc:
+            status_code, etag, body = None, None, b""
+            if started_at >= self.measure_from:
+                self.failures[f"{route}: {type(exc).__name__}"] += 1
+        if started_at >= self.measure_from:
+            self.samples.append((route, status_code, (time.perf_counter() - started_at) * 1000))
+        return status_code, etag, body
+
+
+def _inquiry_payload(rng, index):
+    payload = {
+        "full_name": "Load Test Client",
+        "email": f"load-{index}-{rng.randrange(1 << 30)}@example.com",
+        "phone": f"(212) 555-{index % 10000:04d}",
+        "event_type": "Wedding",
+        "event_date": (date.today() + timedelta(days=30)).isoformat(),
+        "guest_count": 80,
+        "budget": "$2,500-$5,000",
+        "service_interest": "Catering Packages",
+        "service_selection": {},
+        "desired_menu_items": [{"name": "BBQ Pulled Pork", "category": "entree"}],
+        "message": "Load test inquiry.",
+    }
+    if index % 10 == 0:
+        # Bots fill the hidden honeypot field; the guard silently accepts and drops these.
+        payload[os.getenv("INQUIRY_INTEGRITY_FIELD", "company_website")] = "https://spam.example.com"
+    return payload
+
+
+def _landing_user(client, recorder, rng, deadline, args, _context):
+    etags = {}
+    while time.perf_counter() < deadline:
+        for path in LANDING_PATHS:
+            headers = {}
+            if path in etags and rng.random() < args.revalidate_ratio:
+                headers["If-None-Match"] = etags[path]
+            status_code, etag, _body = recorder.timed(client, f"GET {path}", "GET", path, headers=headers)
+            if status_code == 200 and etag:
+                etags[path] = etag
+            _think(args)
+
+
+def _inquiry_user(client, recorder, rng, deadline, args, context):
+    previous_payload = None
+    while time.perf_counter() < deadline:
+        index = context["next_index"]()
+        # Every fifth submission resends the previous one to exercise the duplicate window.
+        payload = previous_payload if previous_payload and index % 5 == 0 else _inquiry_payload(rng, index)
+        previous_payload = payload
+        headers = {
+            "X-Forwarded-For": f"198.51.100.{rng.randrange(max(args.inquiry_ips, 1)) % 256}",
+            "User-Agent": "post-catering-load-test",
+        }
+        recorder.timed(client, "POST /api/inquiries", "POST", "/api/inquiries", json_body=payload, headers=headers)
+        _think(args)
+
+
+def _admin_user(client, recorder, rng, deadline, args, context):
+    status_code, _etag, _body = client.request(
+        "POST",
+        "/api/admin/auth/login",
+        json_body={"username": context["admin_username"], "password": context["admin_password"]},
+    )
+    if status_code != 200:
+        raise RuntimeError(f"Admin login failed with status {status_code}.")
+
+    _status, _etag, body = client.request("GET", "/api/admin/media?is_slide=false")
+    gallery_ids = [row["id"] for row in json.loads(body).get("media") or []]
+    _status, _etag, body = client.request("GET", "/api/admin/service-plans?catalog_key=catering")
+    sections = [section for section in json.loads(body).get("sections") or [] if section.get("plans")]
+    section = sections[0] if sections else None
+
+    steps = [
+        ("GET /api/admin/menu/items", "GET", "/api/admin/menu/items", None),
+        ("GET /api/admin/media", "GET", "/api/admin/media", None),
+        ("GET /api/admin/service-plans", "GET", "/api/admin/service-plans?catalog_key=catering", None),
+        ("GET /api/admin/audit", "GET", "/api/admin/audit", None),
+    ]
+    while time.perf_counter() < deadline:
+        for route, method, path, json_body in steps:
+            recorder.timed(client, route, method, path, json_body=json_body)
+            _think(args)
+        if gallery_ids:
+            rng.shuffle(gallery_ids)
+            recorder.timed(
+                client,
+                "PATCH /api/admin/media/reorder",
+                "PATCH",
+                "/api/admin/media/reorder",
+                json_body={"ordered_ids": gallery_ids, "is_slide": False},
+            )
+            _think(args)
+        if section:
+            plan_ids = [plan["id"] for plan in section["plans"]]
+            rng.shuffle(plan_ids)
+            recorder.timed(
+                client,
+                "PATCH /api/admin/service-plans/reorder",
+                "PATCH",
+                "/api/admin/service-plans/reorder",
+                json_body={"section_id": section["id"], "ordered_plan_ids": plan_ids},
+            )
+            _think(args)
+
+
+SCENARIO_RUNNERS = {"landing": _landing_user, "inquiry": _inquiry_user, "admin": _admin_user}
+
+
+def _think(args):
+    if args.think_ms > 0:
+        time.sleep(args.think_ms / 1000)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, max(math.ceil(fraction * len(ordered)) - 1, 0))]
+
+
+def _run_load(make_client, users, args, context):
+    started_at = time.perf_counter()
+    measure_from = started_at + max(args.warmup, 0.0)
+    deadline = measure_from + max(args.duration, 0.1)
+    recorders = []
+    errors = []
+    threads = []
+    for scenario, count in users.items():
+        for user_index in range(count):
+            recorder = _Recorder(measure_from)
+            recorders.append(recorder)
+            rng = random.Random(f"{args.seed}:{scenario}:{user_index}")
+
+            def run(runner=SCENARIO_RUNNERS[scenario], recorder=recorder, rng=rng, scenario=scenario):
+                try:
+                    runner(make_client(), recorder, rng, deadline, args, context)
+                except Exception as exc:
+                    errors.append(f"{scenario}: {type(exc).__name__}: {exc}")
+
+            threads.append(threading.Thread(target=run, name=f"load-{scenario}-{user_index}", daemon=True))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    measured_seconds = min(time.perf_counter(), deadline) - measure_from
+    return recorders, errors, measured_seconds
+
+
+def _summarize(recorders, measured_seconds):
+    by_route = defaultdict(list)
+    statuses = defaultdict(Counter)
+    failures = Counter()
+    for recorder in recorders:
+        failures.update(recorder.failures)
+        for route, status_code, duration_ms in recorder.samples:
+            by_route[route].append(duration_ms)
+            statuses[route][str(status_code)] += 1
+
+    routes = {}
+    total_requests = 0
+    server_errors = 0
+    for route in sorted(by_route):
+        ordered = sorted(by_route[route])
+        total_requests += len(ordered)
+        server_errors += sum(count for status, count in statuses[route].items() if status.startswith("5"))
+        routes[route] = {
+            "requests": len(ordered),
+            "rps": round(len(ordered) / measured_seconds, 1) if measured_seconds > 0 else None,
+            "p50_ms": round(_percentile(ordered, 0.50), 2),
+            "p95_ms": round(_percentile(ordered, 0.95), 2),
+            "p99_ms": round(_percentile(ordered, 0.99), 2),
+            "max_ms": round(ordered[-1], 2),
+            "mean_ms": round(statistics.fmean(ordered), 2),
+            "status_counts": dict(sorted(statuses[route].items())),
+        }
+
+    return {
+        "measured_seconds": round(measured_seconds, 2),
+        "requests": total_requests,
+        "rps": round(total_requests / measured_seconds, 1) if measured_seconds > 0 else None,
+        "server_errors": server_errors,
+        "transport_failures": dict(failures),
+        "routes": routes,
+    }
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _start_gunicorn(api_root, args, app_spec, env):
+    port = args.port or _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--workers",
+        str(max(args.workers, 1)),
+        "--threads",
+        str(max(args.threads, 1)),
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--chdir",
+        str(api_root),
+        "--pythonpath",
+        str(api_root / "scripts"),
+        "--log-level",
+        "warning",
+        app_spec,
+    ]
+    process = subprocess.Popen(command, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    ready_deadline = time.perf_counter() + 30
+    while time.perf_counter() < ready_deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}; is it installed?")
+        try:
+            with urllib.request.urlopen(f"{base_url}/api/menus", timeout=2) as response:
+                if response.status == 200:
+                    return process, base_url
+        except (OSError, urllib.error.HTTPError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become ready within 30 seconds.")
+
+
+def _stop_gunicorn(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def main():
+    api_root = _bootstrap_path()
+    args = _parse_args()
+    try:
+        users = _parse_users(args.users)
+    except ValueError as exc:
+        print(json.dumps({"error": str(exc)}))
+        return 2
+    if not users:
+        print(json.dumps({"error": "--users selects no virtual users."}))
+        return 2
+    if args.target != "url" and args.backend == "mysql" and not args.reset_database:
+        print(
+            json.dumps(
+                {"error": "--backend mysql deletes every row on the configured database; pass --reset-database."}
+            )
+        )
+        return 2
+    if args.target == "url" and "admin" in users and not (args.admin_username and args.admin_password):
+        print(json.dumps({"error": "The admin scenario against --target url needs --admin-username/--admin-password."}))
+        return 2
+
+    # The abuse guard's rejections are part of the workload; its per-request logs are not.
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("INQUIRY_EMAIL_WORKER_ENABLED", "false")
+    context = {"admin_username": args.admin_username, "admin_password": args.admin_password}
+    counter_lock = threading.Lock()
+    counter = {"value": 0}
+
+    def next_index():
+        with counter_lock:
+            counter["value"] += 1
+            return counter["value"]
+
+    context["next_index"] = next_index
+
+    stand_in = None
+    gunicorn_process = None
+    seed = None
+    pool_stats = None
+    try:
+        if args.target != "url":
+            import _benchmark_db
+
+            if args.backend == "sqlite":
+                stand_in = _benchmark_db.install_sqlite_stand_in(round_trip_ms=args.round_trip_ms)
+            else:
+                _benchmark_db.prepare_mysql_database()
+            context["admin_username"] = _benchmark_db.BENCHMARK_ADMIN_USERNAME
+            context["admin_password"] = secrets.token_urlsafe(16)
+            seed = _benchmark_db.seed_database(
+                scale=args.scale, media_count=args.media, admin_password=context["admin_password"]
+            )
+
+        if args.target == "inprocess":
+            from flask_api import app
+
+            make_client = lambda: _InProcessClient(app)  # noqa: E731
+        else:
+            base_url = args.base_url
+            if args.target == "gunicorn":
+                env = dict(os.environ)
+                app_spec = "server:app"
+                if stand_in is not None:
+                    from flask_api.config.mysqlconnection import reset_connection_pool
+
+                    reset_connection_pool()
+                    env["BENCHMARK_SQLITE_PATH"] = stand_in.path
+                    env["BENCHMARK_ROUND_TRIP_MS"] = str(args.round_trip_ms)
+                    app_spec = "_benchmark_db:create_sqlite_app()"
+                gunicorn_process, base_url = _start_gunicorn(api_root, args, app_spec, env)
+            make_client = lambda: _HttpClient(base_url)  # noqa: E731
+
+        recorders, errors, measured_seconds = _run_load(make_client, users, args, context)
+        if args.target == "inprocess":
+            from flask_api.config.mysqlconnection import get_pool_stats
+
+            pool_stats = get_pool_stats()
+    finally:
+        if gunicorn_process is not None:
+            _stop_gunicorn(gunicorn_process)
+        if stand_in is not None:
+            stand_in.cleanup()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+            "python": platform.python_version(),
+            "target": args.target,
+            "backend": args.backend if args.target != "url" else None,
+            "round_trip_ms": args.round_trip_ms if args.target != "url" and args.backend == "sqlite" else None,
+            "workers": args.workers if args.target == "gunicorn" else None,
+            "threads": args.threads if args.target == "gunicorn" else None,
+            "users": users,
+            "duration_seconds": args.duration,
+            "think_ms": args.think_ms,
+            "seed": seed,
+        },
+        **_summarize(recorders, measured_seconds),
+        "scenario_errors": errors,
+    }
+    if pool_stats is not None:
+        report["pool"] = pool_stats
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -28,6 +28,11 @@ def _parse_args():
         action="store_true",
         help="Skip seed operation (default behavior is to seed).",
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the item/assignment diff and timings the seed would produce without writing anything.",
+    )
     return parser.parse_args()
 
 
@@ -40,6 +45,7 @@ def main():
         apply_schema=args.apply_schema,
         reset=args.reset,
         seed=not args.no_seed,
+        dry_run=args.dry_run,
     )
     print(json.dumps({"status": status, **body}, indent=2))
     return 0 if status < 400 else 1
@@ -0,0 +1,66 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Apply pending schema files (api/sql/schema.sql plus the ordered migrations) and record each one in "
+            "the schema_migrations ledger with its checksum and timing. Files already recorded with the same "
+            "checksum are skipped. Prints JSON."
+        )
+    )
+    parser.add_argument("--status", action="store_true", help="Report applied/pending/changed files and exit.")
+    parser.add_argument(
+        "--online-only",
+        action="store_true",
+        help="Apply only files marked '-- migration: online-safe'; defer the first other pending file and the rest.",
+    )
+    parser.add_argument(
+        "--strict-checksums",
+        action="store_true",
+        help="Fail instead of re-applying a recorded file whose contents have changed.",
+    )
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Record pending files as applied without running them (database already matches the files).",
+    )
+    return parser.parse_args()
+
+
+def main():
+    _bootstrap_path()
+    from flask_api.services.menu_service import MenuService
+    from flask_api.services.schema_migration_service import SchemaMigrationError, SchemaMigrationService
+
+    args = _parse_args()
+    paths = MenuService._get_schema_paths()
+    try:
+        if args.status:
+            report = SchemaMigrationService.get_status(paths)
+        else:
+            report = SchemaMigrationService.apply(
+                paths,
+                online_only=args.online_only,
+                strict_checksums=args.strict_checksums,
+                baseline=args.baseline,
+            )
+    except SchemaMigrationError as exc:
+        print(json.dumps({"ok": False, "error": str(exc)}, indent=2))
+        return 1
+    print(json.dumps({"ok": True, **report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
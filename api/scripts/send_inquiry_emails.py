@@ -0,0 +1,44 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _bootstrap_path():
+    script_path = Path(__file__).resolve()
+    api_root = script_path.parents[1]
+    if str(api_root) not in sys.path:
+        sys.path.insert(0, str(api_root))
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Deliver queued inquiry emails from the inquiry_email_outbox table and exit. Intended for cron or a "
+            "systemd timer when INQUIRY_EMAIL_WORKER_ENABLED=false."
+        )
+    )
+    parser.add_argument("--batch-size", type=int, default=20, help="Outbox rows claimed per SMTP session.")
+    parser.add_argument("--max-batches", type=int, default=50, help="Stop after this many batches.")
+    return parser.parse_args()
+
+
+def main():
+    _bootstrap_path()
+    from flask_api.services.inquiry_email_dispatcher import InquiryEmailDispatcher
+
+    args = _parse_args()
+    totals = {"batches": 0, "claimed": 0, "sent": 0, "deferred": 0}
+    for _ in range(max(args.max_batches, 1)):
+        result = InquiryEmailDispatcher.deliver_pending_batch(batch_size=max(args.batch_size, 1))
+        if not result["claimed"]:
+            break
+        totals["batches"] += 1
+        for key in ("claimed", "sent", "deferred"):
+            totals[key] += result[key]
+    print(json.dumps(totals))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
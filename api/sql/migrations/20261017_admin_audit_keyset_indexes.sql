@@ -0,0 +1,41 @@
+-- migration: online-safe
+-- Secondary index changes run in place under InnoDB online DDL; reads and writes continue.
+
+SET @has_admin_audit_entity_created := (
+  SELECT COUNT(*)
+  FROM information_schema.STATISTICS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'admin_audit_log'
+    AND INDEX_NAME = 'idx_admin_audit_entity'
+    AND COLUMN_NAME = 'created_at'
+);
+
+SET @extend_admin_audit_entity_sql := IF(
+  @has_admin_audit_entity_created = 0,
+  'ALTER TABLE admin_audit_log
+   DROP INDEX idx_admin_audit_entity,
+   ADD KEY idx_admin_audit_entity (entity_type, entity_id, created_at, id)',
+  'SELECT 1'
+);
+
+PREPARE extend_admin_audit_entity_stmt FROM @extend_admin_audit_entity_sql;
+EXECUTE extend_admin_audit_entity_stmt;
+DEALLOCATE PREPARE extend_admin_audit_entity_stmt;
+
+SET @has_admin_audit_admin_index := (
+  SELECT COUNT(*)
+  FROM information_schema.STATISTICS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'admin_audit_log'
+    AND INDEX_NAME = 'idx_admin_audit_admin'
+);
+
+SET @add_admin_audit_admin_sql := IF(
+  @has_admin_audit_admin_index = 0,
+  'ALTER TABLE admin_audit_log ADD KEY idx_admin_audit_admin (admin_user_id, created_at, id)',
+  'SELECT 1'
+);
+
+PREPARE add_admin_audit_admin_stmt FROM @add_admin_audit_admin_sql;
+EXECUTE add_admin_audit_admin_stmt;
+DEALLOCATE PREPARE add_admin_audit_admin_stmt;
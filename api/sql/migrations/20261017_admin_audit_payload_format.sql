@@ -0,0 +1,20 @@
+-- migration: online-safe
+-- Column with a constant default; MySQL 8.0.29+ adds it with ALGORITHM=INSTANT.
+
+SET @has_admin_audit_payload_format := (
+  SELECT COUNT(*)
+  FROM information_schema.COLUMNS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'admin_audit_log'
+    AND COLUMN_NAME = 'payload_format'
+);
+
+SET @add_admin_audit_payload_format_sql := IF(
+  @has_admin_audit_payload_format = 0,
+  'ALTER TABLE admin_audit_log ADD COLUMN payload_format VARCHAR(16) NOT NULL DEFAULT ''snapshot'' AFTER change_summary',
+  'SELECT 1'
+);
+
+PREPARE add_admin_audit_payload_format_stmt FROM @add_admin_audit_payload_format_sql;
+EXECUTE add_admin_audit_payload_format_stmt;
+DEALLOCATE PREPARE add_admin_audit_payload_format_stmt;
@@ -0,0 +1,20 @@
+-- migration: online-safe
+-- Column with a constant default; MySQL 8.0.29+ adds it with ALGORITHM=INSTANT.
+
+SET @has_menu_catalog_snapshot_source_version := (
+  SELECT COUNT(*)
+  FROM information_schema.COLUMNS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'menu_catalog_snapshots'
+    AND COLUMN_NAME = 'source_version'
+);
+
+SET @add_menu_catalog_snapshot_source_version_sql := IF(
+  @has_menu_catalog_snapshot_source_version = 0,
+  'ALTER TABLE menu_catalog_snapshots ADD COLUMN source_version BIGINT UNSIGNED NOT NULL DEFAULT 0 AFTER version',
+  'SELECT 1'
+);
+
+PREPARE add_menu_catalog_snapshot_source_version_stmt FROM @add_menu_catalog_snapshot_source_version_sql;
+EXECUTE add_menu_catalog_snapshot_source_version_stmt;
+DEALLOCATE PREPARE add_menu_catalog_snapshot_source_version_stmt;
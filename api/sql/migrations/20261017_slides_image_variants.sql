@@ -0,0 +1,20 @@
+-- migration: online-safe
+-- Nullable trailing-position column; MySQL 8.0.29+ adds it with ALGORITHM=INSTANT.
+
+SET @has_slides_image_variants := (
+  SELECT COUNT(*)
+  FROM information_schema.COLUMNS
+  WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'slides'
+    AND COLUMN_NAME = 'image_variants'
+);
+
+SET @add_slides_image_variants_sql := IF(
+  @has_slides_image_variants = 0,
+  'ALTER TABLE slides ADD COLUMN image_variants JSON NULL AFTER image_url',
+  'SELECT 1'
+);
+
+PREPARE add_slides_image_variants_stmt FROM @add_slides_image_variants_sql;
+EXECUTE add_slides_image_variants_stmt;
+DEALLOCATE PREPARE add_slides_image_variants_stmt;
@@ -6,6 +6,7 @@ CREATE TABLE IF NOT EXISTS slides (
   title VARCHAR(150) NULL,
   caption TEXT NULL,
   image_url VARCHAR(1024) NOT NULL,
+  image_variants JSON NULL,
   media_type ENUM('image', 'video') NOT NULL DEFAULT 'image',
   alt_text VARCHAR(255) NULL,
   display_order INT NOT NULL DEFAULT 0,
@@ -87,12 +88,14 @@ CREATE TABLE IF NOT EXISTS admin_audit_log (
   entity_type VARCHAR(64) NOT NULL,
   entity_id VARCHAR(128) NULL,
   change_summary VARCHAR(255) NULL,
+  payload_format VARCHAR(16) NOT NULL DEFAULT 'snapshot',
   before_json JSON NULL,
   after_json JSON NULL,
   created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (id),
   KEY idx_admin_audit_created (created_at),
-  KEY idx_admin_audit_entity (entity_type, entity_id),
+  KEY idx_admin_audit_entity (entity_type, entity_id, created_at, id),
+  KEY idx_admin_audit_admin (admin_user_id, created_at, id),
   CONSTRAINT fk_admin_audit_user FOREIGN KEY (admin_user_id) REFERENCES admin_users(id) ON DELETE CASCADE
 );
 
@@ -127,6 +130,44 @@ CREATE TABLE IF NOT EXISTS inquiry_selection_data (
   CONSTRAINT fk_inquiry_selection_data_inquiry FOREIGN KEY (inquiry_id) REFERENCES inquiries(id) ON DELETE CASCADE
 );
 
+CREATE TABLE IF NOT EXISTS inquiry_email_outbox (
+  id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+  inquiry_id BIGINT UNSIGNED NOT NULL,
+  email_type VARCHAR(40) NOT NULL,
+  recipient VARCHAR(255) NOT NULL,
+  message_mime MEDIUMTEXT NOT NULL,
+  status ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+  attempts INT UNSIGNED NOT NULL DEFAULT 0,
+  next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  locked_at TIMESTAMP NULL,
+  last_error_code VARCHAR(64) NULL,
+  sent_at TIMESTAMP NULL,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (id),
+  KEY idx_inquiry_email_outbox_status_next (status, next_attempt_at),
+  KEY idx_inquiry_email_outbox_inquiry (inquiry_id),
+  CONSTRAINT fk_inquiry_email_outbox_inquiry FOREIGN KEY (inquiry_id) REFERENCES inquiries(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS inquiry_abuse_events (
+  id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+  event_scope VARCHAR(20) NOT NULL,
+  event_key CHAR(64) NOT NULL DEFAULT '',
+  occurred_at DOUBLE NOT NULL,
+  PRIMARY KEY (id),
+  KEY idx_inquiry_abuse_events_scope_key_time (event_scope, event_key, occurred_at),
+  KEY idx_inquiry_abuse_events_time (occurred_at)
+);
+
+CREATE TABLE IF NOT EXISTS inquiry_abuse_keys (
+  key_scope VARCHAR(20) NOT NULL,
+  key_hash CHAR(64) NOT NULL,
+  last_seen_at DOUBLE NOT NULL,
+  PRIMARY KEY (key_scope, key_hash),
+  KEY idx_inquiry_abuse_keys_last_seen (last_seen_at)
+);
+
 CREATE TABLE IF NOT EXISTS menu_config (
   id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
   config_key VARCHAR(64) NOT NULL,
@@ -137,6 +178,22 @@ CREATE TABLE IF NOT EXISTS menu_config (
   UNIQUE KEY uq_menu_config_key (config_key)
 );
 
+CREATE TABLE IF NOT EXISTS cache_versions (
+  cache_key VARCHAR(64) NOT NULL,
+  version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (cache_key)
+);
+
+CREATE TABLE IF NOT EXISTS menu_catalog_snapshots (
+  catalog_key VARCHAR(64) NOT NULL,
+  version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  source_version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  catalog_json MEDIUMTEXT NULL,
+  built_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (catalog_key)
+);
+
 CREATE TABLE IF NOT EXISTS menu_types (
   id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
   type_key VARCHAR(64) NOT NULL,
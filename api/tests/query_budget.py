@@ -0,0 +1,12 @@
+from contextlib import contextmanager
+
+from flask_api.config.mysqlconnection import capture_queries
+
+
+@contextmanager
+def assert_max_queries(max_queries):
+    with capture_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {index}. {statement}" for index, statement in enumerate(stats.statements, start=1))
+        raise AssertionError(f"Expected at most {max_queries} queries, ran {stats.count}:\n{statements}")
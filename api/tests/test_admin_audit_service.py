@@ -0,0 +1,176 @@
+import json
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.admin_audit_service import AdminAuditService  # noqa: E402
+from flask_api.services.keyset_cursor import KeysetCursor  # noqa: E402
+
+
+def _audit_row(row_id, created_at, **extra):
+    return {
+        "id": row_id,
+        "admin_user_id": 1,
+        "action": "update",
+        "entity_type": "menu_item",
+        "entity_id": "7",
+        "change_summary": f"Change {row_id}",
+        "created_at": created_at,
+        "username": "admin",
+        "display_name": "Admin",
+        **extra,
+    }
+
+
+class AdminAuditServiceTests(unittest.TestCase):
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_list_entries_filters_and_pages_by_created_at_and_id(self, mock_query_db):
+        mock_query_db.return_value = [
+            _audit_row(9, datetime(2026, 10, 2, 12, 0, 0)),
+            _audit_row(8, datetime(2026, 10, 2, 12, 0, 0)),
+            _audit_row(5, datetime(2026, 10, 1, 9, 30, 0)),
+        ]
+        after = KeysetCursor.encode("2026-10-03T08:00:00", 12)
+
+        body, status_code = AdminAuditService.list_entries(
+            filters={"entity_type": "menu_item", "entity_id": "7", "admin_user_id": "1", "to": "2026-10-02"},
+            limit=2,
+            after=after,
+        )
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual([entry["id"] for entry in body["entries"]], [9, 8])
+        self.assertNotIn("before_json", body["entries"][0])
+        self.assertEqual(KeysetCursor.decode(body["next_cursor"], 2), ["2026-10-02T12:00:00", 8])
+
+        query, params = mock_query_db.call_args.args
+        self.assertNotIn("before_json", query)
+        self.assertIn("l.entity_type = %(entity_type)s", query)
+        self.assertIn("l.entity_id = %(entity_id)s", query)
+        self.assertIn("l.created_at < %(after_created_at)s", query)
+        self.assertIn("ORDER BY l.created_at DESC, l.id DESC", query)
+        self.assertEqual(params["page_size"], 3)
+        self.assertEqual(params["admin_user_id"], 1)
+        self.assertEqual(params["after_created_at"], datetime(2026, 10, 3, 8, 0, 0))
+        self.assertEqual(params["after_id"], 12)
+        # A bare end date covers the whole day.
+        self.assertEqual(params["date_to"], datetime(2026, 10, 3))
+
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_list_entries_rejects_invalid_cursor_and_filters(self, mock_query_db):
+        self.assertEqual(AdminAuditService.list_entries(after="not-a-cursor"), ({"error": "Invalid cursor."}, 400))
+        body, status_code = AdminAuditService.list_entries(filters={"from": "last tuesday"})
+        self.assertEqual(status_code, 400)
+        self.assertIn("from", body["error"])
+        mock_query_db.assert_not_called()
+
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_export_walks_keyset_batches_and_streams_ndjson(self, mock_query_db):
+        first_batch = [_audit_row(4, datetime(2026, 10, 2)), _audit_row(3, datetime(2026, 10, 1))]
+        second_batch = [_audit_row(2, datetime(2026, 9, 30), before_json='{"name": "Old"}', after_json=None)]
+        mock_query_db.side_effect = [first_batch, second_batch]
+
+        with patch.object(AdminAuditService, "EXPORT_BATCH_SIZE", 2):
+            chunks, status_code = AdminAuditService.export_entries(filters={"action": "update"})
+            lines = list(chunks)
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual([json.loads(line)["id"] for line in lines], [4, 3, 2])
+        self.assertEqual(json.loads(lines[2])["before_json"], {"name": "Old"})
+        self.assertEqual(mock_query_db.call_count, 2)
+        second_params = mock_query_db.call_args_list[1].args[1]
+        self.assertEqual((second_params["after_created_at"], second_params["after_id"]), (datetime(2026, 10, 1), 3))
+
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_export_csv_writes_header_and_rows(self, mock_query_db):
+        mock_query_db.return_value = [_audit_row(4, datetime(2026, 10, 2))]
+
+        chunks, status_code = AdminAuditService.export_entries(export_format="csv", include_payloads=False)
+        text = "".join(chunks)
+
+        self.assertEqual(status_code, 200)
+        header, row = text.strip().splitlines()
+        self.assertEqual(header.split(",")[:3], ["id", "created_at", "admin_user_id"])
+        self.assertNotIn("before_json", header)
+        self.assertTrue(row.startswith("4,2026-10-02T00:00:00,1,admin"))
+
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_log_diff_stores_only_changed_keys(self, mock_query_db):
+        AdminAuditService.log_diff(
+            admin_user_id=1,
+            action="reorder",
+            entity_type="media",
+            entity_id="gallery",
+            before=AdminAuditService.order_state([4, 5, 6, 7]),
+            after=AdminAuditService.order_state([4, 6, 5, 7]),
+        )
+
+        params = mock_query_db.call_args.args[1]
+        self.assertEqual(params["payload_format"], "diff")
+        self.assertEqual(json.loads(params["before_json"]), {"5": 2, "6": 3})
+        self.assertEqual(json.loads(params["after_json"]), {"5": 3, "6": 2})
+
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_get_entry_reconstructs_full_states_from_live_entity_and_later_diffs(self, mock_query_db):
+        target = _audit_row(
+            10,
+            datetime(2026, 10, 1),
+            payload_format="diff",
+            before_json='{"title": "Old"}',
+            after_json='{"title": "New"}',
+        )
+        later = {"id": 11, "payload_format": "diff", "before_json": '{"caption": "First"}', "created_at": None}
+        mock_query_db.side_effect = [target, [later]]
+        load_current_state = Mock(return_value={"id": 7, "title": "New", "caption": "Second"})
+
+        body, status_code = AdminAuditService.get_entry(10, load_current_state=load_current_state)
+
+        self.assertEqual(status_code, 200)
+        load_current_state.assert_called_once_with("menu_item", "7", "update")
+        self.assertEqual(body["entry"]["after_state"], {"id": 7, "title": "New", "caption": "First"})
+        self.assertEqual(body["entry"]["before_state"], {"id": 7, "title": "Old", "caption": "First"})
+
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_get_entry_reconstruction_stops_at_later_snapshot(self, mock_query_db):
+        target = _audit_row(
+            10,
+            datetime(2026, 10, 1),
+            action="reorder",
+            entity_type="media",
+            entity_id="slides",
+            payload_format="diff",
+            before_json='{"5": 1, "6": 2}',
+            after_json='{"5": 2, "6": 1}',
+        )
+        legacy_snapshot = {
+            "id": 11,
+            "payload_format": "snapshot",
+            "before_json": '[{"id": 6, "display_order": 1}, {"id": 5, "display_order": 2}]',
+            "created_at": None,
+        }
+        mock_query_db.side_effect = [target, [legacy_snapshot]]
+        load_current_state = Mock()
+
+        body, _status_code = AdminAuditService.get_entry(10, load_current_state=load_current_state)
+
+        load_current_state.assert_not_called()
+        self.assertEqual(body["entry"]["after_state"], {"6": 1, "5": 2})
+        self.assertEqual(body["entry"]["before_state"], {"5": 1, "6": 2})
+        later_query, later_params = mock_query_db.call_args.args
+        self.assertIn("(l.action = 'reorder') = %(is_reorder)s", later_query)
+        self.assertTrue(later_params["is_reorder"])
+
+    def test_export_rejects_unknown_format(self):
+        body, status_code = AdminAuditService.export_entries(export_format="xml")
+        self.assertEqual(status_code, 400)
+        self.assertIn("ndjson", body["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import sys
 import unittest
 from pathlib import Path
@@ -10,9 +11,96 @@ if str(API_ROOT) not in sys.path:
     sys.path.insert(0, str(API_ROOT))
 
 from flask_api.services.admin_auth_service import AdminAuthService  # noqa: E402
+from flask_api.services.admin_user_cache import AdminUserCache  # noqa: E402
 
 
 class AdminAuthServiceTests(unittest.TestCase):
+    def setUp(self):
+        AdminUserCache.clear()
+        # Writers bump cross-worker cache counters through the real query_db; keep that off the database.
+        bump_patcher = patch("flask_api.services.cache_version_bus.CacheVersionBus.bump")
+        self.mock_cache_bump = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        transaction_patcher = patch("flask_api.services.admin_auth_service.db_transaction")
+        self.mock_db_transaction = transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        self.mock_db_transaction.return_value.__enter__.return_value = "connection"
+        self.mock_db_transaction.return_value.__exit__.return_value = False
+
+    def test_get_session_user_serves_repeat_lookups_from_cache(self):
+        with patch.object(
+            AdminAuthService,
+            "get_user_by_id",
+            return_value={"id": 4, "username": "manager", "access_tier": 1, "is_active": 1},
+        ) as mock_get_user:
+            first = AdminAuthService.get_session_user(4)
+            first["is_active"] = 0
+            second = AdminAuthService.get_session_user("4")
+
+        mock_get_user.assert_called_once_with(4)
+        self.assertEqual(second["is_active"], 1)
+
+    @patch.dict(os.environ, {"ADMIN_USER_CACHE_TTL_SECONDS": "0"})
+    def test_zero_ttl_disables_session_user_cache(self):
+        with patch.object(
+            AdminAuthService,
+            "get_user_by_id",
+            side_effect=[{"id": 4, "is_active": 1}, {"id": 4, "is_active": 0}],
+        ) as mock_get_user:
+            AdminAuthService.get_session_user(4)
+            session_user = AdminAuthService.get_session_user(4)
+
+        self.assertEqual(mock_get_user.call_count, 2)
+        self.assertEqual(session_user["is_active"], 0)
+        self.assertFalse(AdminUserCache.has_entries())
+
+    def test_update_admin_user_invalidates_cached_session_user(self):
+        active_target = {"id": 4, "username": "manager", "access_tier": 1, "is_active": 1}
+        inactive_target = {**active_target, "is_active": 0}
+        with patch.object(AdminAuthService, "get_user_by_id", return_value=active_target):
+            AdminAuthService.get_session_user(4)
+
+        with patch.object(
+            AdminAuthService,
+            "_resolve_user_management_actor",
+            return_value=({"id": 1, "access_tier": 0, "is_active": 1}, None, 200),
+        ), patch.object(
+            AdminAuthService,
+            "get_user_by_id",
+            side_effect=[active_target, inactive_target, inactive_target],
+        ), patch(
+            "flask_api.services.admin_auth_service.query_db"
+        ):
+            _, status_code = AdminAuthService.update_admin_user(1, 4, {"is_active": False})
+            session_user = AdminAuthService.get_session_user(4)
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(session_user["is_active"], 0)
+        self.mock_cache_bump.assert_called_once_with("admin_users", connection="connection")
+
+    def test_delete_admin_user_invalidates_cached_session_user(self):
+        with patch.object(AdminAuthService, "get_user_by_id", return_value={"id": 4, "is_active": 1}):
+            AdminAuthService.get_session_user(4)
+
+        with patch.object(
+            AdminAuthService,
+            "_resolve_user_management_actor",
+            return_value=({"id": 1, "access_tier": 0, "is_active": 1}, None, 200),
+        ), patch.object(
+            AdminAuthService,
+            "get_user_by_id",
+            side_effect=[{"id": 4, "username": "manager", "access_tier": 1, "is_active": 1}, None],
+        ), patch(
+            "flask_api.services.admin_auth_service.query_db",
+            return_value={"active_remaining": 1},
+        ):
+            _, status_code = AdminAuthService.delete_admin_user(1, 4)
+            session_user = AdminAuthService.get_session_user(4)
+
+        self.assertEqual(status_code, 200)
+        self.assertIsNone(session_user)
+        self.mock_cache_bump.assert_called_once_with("admin_users", connection="connection")
+
     def test_create_admin_user_requires_username_and_password(self):
         with patch.object(
             AdminAuthService,
@@ -283,6 +371,7 @@ class AdminAuthServiceTests(unittest.TestCase):
         self.assertEqual(body["user"]["username"], "admin2")
         self.assertEqual(body["user"]["display_name"], "Admin Two")
         self.assertEqual(mock_query_db.call_count, 1)
+        self.assertEqual(mock_query_db.call_args.kwargs["connection"], "connection")
         update_params = mock_query_db.call_args.args[1]
         self.assertIn("password_hash", update_params)
         self.assertNotEqual(update_params["password_hash"], "new-password-123")
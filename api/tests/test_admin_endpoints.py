@@ -1,5 +1,9 @@
+import hashlib
 import io
+import json
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -12,11 +16,30 @@ if str(API_ROOT) not in sys.path:
 
 from flask_api import app  # noqa: E402
 import flask_api.controllers.main_controller  # noqa: E402,F401
+from flask_api.services.admin_user_cache import AdminUserCache  # noqa: E402
+from flask_api.services.cache_version_bus import CacheVersionBus  # noqa: E402
+from flask_api.services.last_known_good_store import LastKnownGoodStore  # noqa: E402
+from tests.query_budget import assert_max_queries  # noqa: E402
 
 
 class AdminEndpointTests(unittest.TestCase):
     def setUp(self):
+        # Endpoint tests run without MySQL; the cache poll and outbox thread are covered in their own tests.
+        last_known_good_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(last_known_good_dir.cleanup)
+        env_patcher = patch.dict(
+            os.environ,
+            {
+                "CACHE_VERSION_BUS_ENABLED": "false",
+                "INQUIRY_EMAIL_WORKER_ENABLED": "false",
+                "PUBLIC_LAST_KNOWN_GOOD_DIR": last_known_good_dir.name,
+            },
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        LastKnownGoodStore.clear()
         self.client = app.test_client()
+        AdminUserCache.clear()
 
     @patch("flask_api.controllers.main_controller.AdminAuthService.authenticate", return_value=None)
     def test_admin_login_returns_401_when_credentials_invalid(self, _mock_authenticate):
@@ -81,6 +104,8 @@ class AdminEndpointTests(unittest.TestCase):
             "/api/admin/media",
             "/api/admin/media/1",
             "/api/admin/audit",
+            "/api/admin/audit/1",
+            "/api/admin/audit/export",
         ):
             with self.subTest(path=path):
                 response = self.client.open(path, method="OPTIONS")
@@ -90,19 +115,147 @@ class AdminEndpointTests(unittest.TestCase):
         "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
         return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
     )
-    @patch("flask_api.controllers.main_controller.AdminMenuService.list_menu_items")
+    @patch("flask_api.controllers.main_controller.AdminMenuService.list_menu_items_page")
     def test_admin_menu_items_returns_data_when_authenticated(self, mock_list_items, _mock_get_user):
-        mock_list_items.return_value = [{"id": 1, "item_name": "Test Item", "item_key": "test_item", "is_active": True}]
+        mock_list_items.return_value = (
+            {
+                "items": [{"id": 1, "item_name": "Test Item", "item_key": "test_item", "is_active": True}],
+                "next_cursor": "abc",
+            },
+            200,
+        )
         with self.client.session_transaction() as session:
             session["admin_user_id"] = 1
 
-        response = self.client.get("/api/admin/menu/items")
+        response = self.client.get("/api/admin/menu/items?limit=1&after=xyz&include_total=true")
         body = response.get_json()
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(body["items"]), 1)
         self.assertEqual(body["items"][0]["item_name"], "Test Item")
-        mock_list_items.assert_called_once()
+        self.assertEqual(body["next_cursor"], "abc")
+        mock_list_items.assert_called_once_with(search="", is_active=None, limit="1", after="xyz", include_total=True)
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch.dict(os.environ, {"MENU_CATALOG_SNAPSHOT_ENABLED": "false"})
+    @patch("flask_api.controllers.main_controller.MenuService.publish_catalog_snapshot")
+    @patch("flask_api.controllers.main_controller.AdminAuditService.log_diff")
+    @patch("flask_api.controllers.main_controller.AdminMenuService.update_menu_item")
+    @patch("flask_api.controllers.main_controller.AdminMenuService.get_menu_item_detail")
+    def test_admin_menu_write_publishes_catalog_snapshot_once(
+        self, mock_get_detail, mock_update_item, _mock_log_diff, mock_publish, _mock_get_user
+    ):
+        mock_get_detail.return_value = {"id": 5, "item_name": "Jerk Chicken"}
+
+        def update_item(_item_id, _payload):
+            # A request that bumps the catalog counters more than once still publishes a single snapshot.
+            CacheVersionBus.bump(CacheVersionBus.MENU)
+            CacheVersionBus.bump(CacheVersionBus.SERVICE_PLANS, CacheVersionBus.MENU)
+            return {"item": {"id": 5, "item_name": "Jerk Chicken"}}, 200
+
+        mock_update_item.side_effect = update_item
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        response = self.client.patch("/api/admin/menu/items/5", json={"item_name": "Jerk Chicken"})
+        self.assertEqual(response.status_code, 200)
+        mock_publish.assert_called_once_with()
+
+        self.client.get("/api/admin/menu/items/5")
+        mock_publish.assert_called_once_with()
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.controllers.main_controller.AdminAuditService.list_entries")
+    def test_admin_audit_log_passes_filters_and_cursor(self, mock_list_entries, _mock_get_user):
+        mock_list_entries.return_value = ({"entries": [{"id": 3, "action": "update"}], "next_cursor": "abc"}, 200)
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        response = self.client.get("/api/admin/audit?limit=50&after=xyz&entity_type=media&entity_id=4")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["next_cursor"], "abc")
+        kwargs = mock_list_entries.call_args.kwargs
+        self.assertEqual((kwargs["limit"], kwargs["after"], kwargs["include_payloads"]), ("50", "xyz", False))
+        self.assertEqual(kwargs["filters"].get("entity_type"), "media")
+        self.assertEqual(kwargs["filters"].get("entity_id"), "4")
+
+    @patch.dict(os.environ, {"DB_POOL_ENABLED": "false"})
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.config.mysqlconnection.connect_to_mysql")
+    def test_admin_audit_log_runs_one_query_and_reports_server_timing(self, mock_connect, _mock_get_user):
+        cursor = mock_connect.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        with assert_max_queries(1):
+            response = self.client.get("/api/admin/audit?entity_type=media")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db;dur=", response.headers["Server-Timing"])
+        self.assertIn('desc="1 queries, 0 rows"', response.headers["Server-Timing"])
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.services.admin_audit_service.query_db")
+    def test_admin_audit_export_streams_ndjson(self, mock_query_db, _mock_get_user):
+        mock_query_db.return_value = [
+            {
+                "id": 2,
+                "admin_user_id": 1,
+                "action": "reorder",
+                "entity_type": "media",
+                "entity_id": "homepage",
+                "change_summary": "Reordered homepage",
+                "before_json": "[]",
+                "after_json": "[]",
+                "created_at": None,
+                "username": "admin",
+                "display_name": "Admin",
+            }
+        ]
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        response = self.client.get("/api/admin/audit/export?format=ndjson&entity_type=media")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertIn("admin-audit-log.ndjson", response.headers["Content-Disposition"])
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["after_json"], [])
+        response.close()
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch(
+        "flask_api.controllers.main_controller.AdminMenuService.list_menu_items_page",
+        return_value=({"items": [], "next_cursor": None}, 200),
+    )
+    def test_admin_requests_reuse_cached_session_user(self, _mock_list_items, mock_get_user):
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        for _ in range(3):
+            self.assertEqual(self.client.get("/api/admin/menu/items").status_code, 200)
+
+        mock_get_user.assert_called_once_with(1)
 
     @patch(
         "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
@@ -168,16 +321,149 @@ class AdminEndpointTests(unittest.TestCase):
         with self.client.session_transaction() as session:
             session["admin_user_id"] = 1
 
-        response = self.client.post(
-            "/api/admin/media/upload",
-            data={"file": (io.BytesIO(b"test"), "notes.txt")},
-            content_type="multipart/form-data",
-        )
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "flask_api.controllers.main_controller.SLIDES_ASSET_DIR", Path(temp_dir)
+        ):
+            response = self.client.post(
+                "/api/admin/media/upload",
+                data={"file": (io.BytesIO(b"test"), "notes.txt")},
+                content_type="multipart/form-data",
+            )
+            leftover_files = [path.name for path in Path(temp_dir).rglob("*") if path.is_file()]
         self.assertEqual(response.status_code, 400)
         self.assertEqual(
             response.get_json(),
             {"error": "Unsupported file type. Allowed: image and video formats."},
         )
+        self.assertEqual(leftover_files, [])
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.controllers.main_controller.AdminAuditService.log_change")
+    @patch("flask_api.controllers.main_controller.MediaVariantService.schedule", return_value=True)
+    @patch(
+        "flask_api.controllers.main_controller.AdminMediaService.create_media_record",
+        return_value=({"media": {"id": 41, "title": "Hall"}}, 201),
+    )
+    def test_admin_media_upload_schedules_image_variants(
+        self, _mock_create, mock_schedule, _mock_log_change, _mock_get_user
+    ):
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "flask_api.controllers.main_controller.SLIDES_ASSET_DIR", Path(temp_dir)
+        ):
+            response = self.client.post(
+                "/api/admin/media/upload",
+                data={"file": (io.BytesIO(b"jpeg-bytes"), "hall.jpg"), "title": "Hall", "caption": "Setup"},
+                content_type="multipart/form-data",
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.get_json()["variants_pending"])
+        media_id, saved_path, url_prefix = mock_schedule.call_args.args
+        self.assertEqual(media_id, 41)
+        self.assertEqual(saved_path.name, f"{hashlib.sha256(b'jpeg-bytes').hexdigest()}.jpg")
+        self.assertEqual(url_prefix, "/api/assets/slides")
+        self.assertFalse(response.get_json()["deduplicated"])
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.controllers.main_controller.AdminAuditService.log_change")
+    @patch("flask_api.controllers.main_controller.MediaVariantService.schedule", return_value=False)
+    @patch("flask_api.controllers.main_controller.AdminMediaService.create_media_record")
+    def test_admin_media_upload_reuses_identical_content(
+        self, mock_create, _mock_schedule, _mock_log_change, _mock_get_user
+    ):
+        mock_create.return_value = ({"media": {"id": 42, "title": "Reel"}}, 201)
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "flask_api.controllers.main_controller.SLIDES_ASSET_DIR", Path(temp_dir)
+        ):
+            responses = [
+                self.client.post(
+                    "/api/admin/media/upload",
+                    data={"file": (io.BytesIO(b"video-bytes"), name), "title": "Reel", "caption": "Reel"},
+                    content_type="multipart/form-data",
+                )
+                for name in ("reel.mp4", "reel-copy.MP4")
+            ]
+            stored_files = sorted(path.name for path in Path(temp_dir).iterdir() if path.is_file())
+            incoming_files = list((Path(temp_dir) / ".incoming").iterdir())
+
+        expected_name = f"{hashlib.sha256(b'video-bytes').hexdigest()}.mp4"
+        self.assertEqual([response.get_json()["deduplicated"] for response in responses], [False, True])
+        self.assertEqual(stored_files, [expected_name])
+        self.assertEqual(incoming_files, [])
+        self.assertEqual(
+            [call.args[0]["image_url"] for call in mock_create.call_args_list],
+            [f"/api/assets/slides/{expected_name}"] * 2,
+        )
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.controllers.main_controller.AdminMediaService.is_image_url_referenced")
+    @patch(
+        "flask_api.controllers.main_controller.AdminMediaService.create_media_record",
+        return_value=({"error": "Title is required."}, 400),
+    )
+    def test_admin_media_upload_failure_keeps_file_another_row_references(
+        self, _mock_create, mock_is_referenced, _mock_get_user
+    ):
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        remaining = []
+        # A concurrent identical upload may have created its row after this request wrote the same file.
+        for referenced in (True, False):
+            mock_is_referenced.return_value = referenced
+            with tempfile.TemporaryDirectory() as temp_dir, patch(
+                "flask_api.controllers.main_controller.SLIDES_ASSET_DIR", Path(temp_dir)
+            ):
+                response = self.client.post(
+                    "/api/admin/media/upload",
+                    data={"file": (io.BytesIO(b"jpeg-bytes"), "hall.jpg"), "caption": "Setup"},
+                    content_type="multipart/form-data",
+                )
+                remaining.append([path.name for path in Path(temp_dir).iterdir() if path.is_file()])
+            self.assertEqual(response.status_code, 400)
+
+        expected_name = f"{hashlib.sha256(b'jpeg-bytes').hexdigest()}.jpg"
+        self.assertEqual(remaining, [[expected_name], []])
+        mock_is_referenced.assert_called_with(f"/api/assets/slides/{expected_name}")
+
+    @patch(
+        "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
+        return_value={"id": 1, "username": "admin", "display_name": "Admin", "is_active": 1},
+    )
+    @patch("flask_api.controllers.main_controller.AdminMediaService.create_media_record")
+    def test_admin_media_upload_rejects_files_over_the_size_cap(self, mock_create, _mock_get_user):
+        with self.client.session_transaction() as session:
+            session["admin_user_id"] = 1
+
+        with tempfile.TemporaryDirectory() as temp_dir, patch(
+            "flask_api.controllers.main_controller.SLIDES_ASSET_DIR", Path(temp_dir)
+        ), patch.dict("os.environ", {"MEDIA_UPLOAD_MAX_IMAGE_BYTES": "8"}, clear=False):
+            response = self.client.post(
+                "/api/admin/media/upload",
+                data={"file": (io.BytesIO(b"0123456789"), "hall.jpg"), "title": "Hall", "caption": "Setup"},
+                content_type="multipart/form-data",
+            )
+            leftover_files = [path.name for path in Path(temp_dir).rglob("*") if path.is_file()]
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.get_json(), {"error": "Media file exceeds the upload size limit."})
+        self.assertEqual(leftover_files, [])
+        mock_create.assert_not_called()
 
     @patch(
         "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
@@ -386,43 +672,17 @@ class AdminEndpointTests(unittest.TestCase):
     @patch("flask_api.controllers.main_controller.AdminAuditService.log_change")
     @patch(
         "flask_api.controllers.main_controller.AdminServicePlanService.reorder_service_plans",
-        return_value=({"ok": True, "ordered_plan_ids": [12, 11]}, 200),
-    )
-    @patch(
-        "flask_api.controllers.main_controller.AdminServicePlanService.list_service_plan_sections",
-        side_effect=[
-            (
-                {
-                    "sections": [
-                        {
-                            "id": 3,
-                            "title": "Event Catering - Buffet Style",
-                            "plans": [
-                                {"id": 11, "plan_key": "catering:buffet_tier_1", "sort_order": 1},
-                                {"id": 12, "plan_key": "catering:buffet_tier_2", "sort_order": 2},
-                            ],
-                        }
-                    ]
-                },
-                200,
-            ),
-            (
-                {
-                    "sections": [
-                        {
-                            "id": 3,
-                            "title": "Catering Packages",
-                            "plans": [
-                                {"id": 12, "plan_key": "catering:buffet_tier_2", "sort_order": 1},
-                                {"id": 11, "plan_key": "catering:buffet_tier_1", "sort_order": 2},
-                            ],
-                        }
-                    ]
-                },
-                200,
-            ),
-        ],
+        return_value=(
+            {
+                "ok": True,
+                "ordered_plan_ids": [12, 11, 13],
+                "previous_plan_ids": [11, 12, 13],
+                "section_title": "Catering Packages",
+            },
+            200,
+        ),
     )
+    @patch("flask_api.controllers.main_controller.AdminServicePlanService.list_service_plan_sections")
     def test_admin_service_plan_reorder_returns_payload_when_valid(
         self,
         mock_list_sections,
@@ -439,10 +699,15 @@ class AdminEndpointTests(unittest.TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertTrue(body["ok"])
-        self.assertEqual(body["ordered_plan_ids"], [12, 11])
+        self.assertEqual(body["ordered_plan_ids"], [12, 11, 13])
         mock_reorder_plans.assert_called_once_with(3, [12, 11])
-        self.assertEqual(mock_list_sections.call_count, 2)
-        mock_log_change.assert_called_once()
+        mock_list_sections.assert_not_called()
+        log_kwargs = mock_log_change.call_args.kwargs
+        self.assertEqual(log_kwargs["change_summary"], "Reordered service plans for 'Catering Packages'")
+        self.assertEqual(log_kwargs["payload_format"], "diff")
+        # Only the two plans that swapped places are recorded.
+        self.assertEqual(log_kwargs["before"], {"11": 1, "12": 2})
+        self.assertEqual(log_kwargs["after"], {"11": 2, "12": 1})
 
     @patch(
         "flask_api.controllers.main_controller.AdminAuthService.get_user_by_id",
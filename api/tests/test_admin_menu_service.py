@@ -8,9 +8,16 @@ if str(API_ROOT) not in sys.path:
     sys.path.insert(0, str(API_ROOT))
 
 from flask_api.services.admin_menu_service import AdminMenuService  # noqa: E402
+from flask_api.services.menu_catalog_cache import MenuCatalogCache  # noqa: E402
 
 
 class AdminMenuServiceTests(unittest.TestCase):
+    def setUp(self):
+        # Writers bump cross-worker cache counters through the real query_db; keep that off the database.
+        bump_patcher = patch("flask_api.services.cache_version_bus.CacheVersionBus.bump")
+        self.mock_cache_bump = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+
     @patch("flask_api.services.admin_menu_service.query_db")
     def test_list_menu_items_reads_unified_item_and_type_tables(self, mock_query_db):
         mock_query_db.return_value = [
@@ -84,6 +91,53 @@ class AdminMenuServiceTests(unittest.TestCase):
         self.assertIsNone(rows[0]["group_id"])
         self.assertFalse(rows[0]["is_active"])
 
+    @patch("flask_api.services.admin_menu_service.query_db")
+    def test_list_menu_items_page_filters_in_sql_and_returns_keyset_cursor(self, mock_query_db):
+        def item_row(item_id, name, menu_type):
+            return {"id": item_id, "menu_type": menu_type, "item_key": name.lower(), "item_name": name, "is_active": 1}
+
+        mock_query_db.side_effect = [
+            [
+                item_row(1, "Aioli", "regular"),
+                item_row(2, "Beans", "regular"),
+                item_row(2, "Beans", "formal"),
+                item_row(3, "Curry", "regular"),
+            ],
+            {"total": 7},
+        ]
+
+        response_body, status_code = AdminMenuService.list_menu_items_page(
+            search="50%_off", is_active="active", limit=2, include_total=True
+        )
+
+        self.assertEqual(status_code, 200)
+        # limit counts items; Beans is assigned to both menu types and comes back as two entries.
+        self.assertEqual([item["item_name"] for item in response_body["items"]], ["Aioli", "Beans", "Beans"])
+        self.assertEqual(response_body["total"], 7)
+        query, payload = mock_query_db.call_args_list[0].args
+        self.assertIn("is_active = %(is_active)s", query)
+        self.assertIn("LIMIT %(page_size)s", query)
+        self.assertEqual(payload["page_size"], 3)
+        self.assertEqual(payload["search"], "%50\\%\\_off%")
+
+        mock_query_db.reset_mock()
+        mock_query_db.side_effect = [[item_row(3, "Curry", "regular")]]
+        next_body, _ = AdminMenuService.list_menu_items_page(limit=2, after=response_body["next_cursor"])
+
+        next_query, next_payload = mock_query_db.call_args.args
+        self.assertIn("item_name > %(after_name)s", next_query)
+        self.assertEqual((next_payload["after_name"], next_payload["after_id"]), ("Beans", 2))
+        self.assertEqual([item["item_name"] for item in next_body["items"]], ["Curry"])
+        self.assertIsNone(next_body["next_cursor"])
+
+    @patch("flask_api.services.admin_menu_service.query_db")
+    def test_list_menu_items_page_rejects_malformed_cursor(self, mock_query_db):
+        response_body, status_code = AdminMenuService.list_menu_items_page(after="not-a-cursor")
+
+        self.assertEqual(status_code, 400)
+        self.assertEqual(response_body, {"error": "Invalid cursor."})
+        mock_query_db.assert_not_called()
+
     @patch("flask_api.services.admin_menu_service.AdminMenuService._fetch_item_assignments")
     @patch("flask_api.services.admin_menu_service.AdminMenuService._fetch_item_types")
     @patch("flask_api.services.admin_menu_service.AdminMenuService._fetch_item_row")
@@ -262,6 +316,34 @@ class AdminMenuServiceTests(unittest.TestCase):
         _, insert_payload = mock_query_db.call_args[0]
         self.assertEqual(insert_payload["is_active"], 0)
 
+    @patch("flask_api.services.admin_menu_service.AdminMenuService._fetch_raw_item_row")
+    @patch("flask_api.services.admin_menu_service.query_db")
+    @patch("flask_api.services.admin_menu_service.db_transaction")
+    def test_delete_menu_item_invalidates_catalog_cache(self, mock_db_transaction, _mock_query_db, mock_fetch_raw):
+        mock_db_transaction.return_value.__enter__.return_value = "connection"
+        mock_db_transaction.return_value.__exit__.return_value = False
+        mock_fetch_raw.return_value = {"id": 5, "item_name": "Jerk Chicken"}
+        version_before = MenuCatalogCache.get_version()
+
+        _, status = AdminMenuService.delete_menu_item(5)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(MenuCatalogCache.get_version(), version_before + 1)
+        self.mock_cache_bump.assert_called_once_with("menu", connection="connection")
+
+    @patch("flask_api.services.admin_menu_service.AdminMenuService._fetch_raw_item_row", return_value=None)
+    @patch("flask_api.services.admin_menu_service.db_transaction")
+    def test_delete_missing_menu_item_keeps_catalog_cache_version(self, mock_db_transaction, _mock_fetch_raw):
+        mock_db_transaction.return_value.__enter__.return_value = "connection"
+        mock_db_transaction.return_value.__exit__.return_value = False
+        version_before = MenuCatalogCache.get_version()
+
+        _, status = AdminMenuService.delete_menu_item(5)
+
+        self.assertEqual(status, 404)
+        self.assertEqual(MenuCatalogCache.get_version(), version_before)
+        self.mock_cache_bump.assert_not_called()
+
     @patch("flask_api.services.admin_menu_service.AdminMenuService._has_global_item_name_conflict")
     @patch("flask_api.services.admin_menu_service.db_transaction")
     def test_create_menu_item_duplicate_name_returns_specific_error(
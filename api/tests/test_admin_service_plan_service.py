@@ -1,3 +1,4 @@
+import json
 import sys
 import unittest
 from pathlib import Path
@@ -13,6 +14,12 @@ from flask_api.services.admin_service_plan_service import AdminServicePlanServic
 
 
 class AdminServicePlanServiceTests(unittest.TestCase):
+    def setUp(self):
+        # Writers bump cross-worker cache counters through the real query_db; keep that off the database.
+        bump_patcher = patch("flask_api.services.cache_version_bus.CacheVersionBus.bump")
+        self.mock_cache_bump = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+
     def test_build_plan_key_uses_catalog_prefix_and_slug(self):
         self.assertEqual(
             AdminServicePlanService._build_plan_key("catering", title="Tier 1: Casual Buffet"),
@@ -162,6 +169,184 @@ class AdminServicePlanServiceTests(unittest.TestCase):
         self.assertEqual(status_code, 503)
         self.assertIn("Service plan tables are not installed", response_body.get("error", ""))
 
+    @patch("flask_api.services.admin_service_plan_service.query_db")
+    def test_list_public_service_plan_catalogs_loads_both_catalogs_in_one_query(self, mock_query_db):
+        section_fields = {
+            "section_type": "packages",
+            "section_title": "Packages",
+            "section_note": None,
+            "section_sort_order": 1,
+            "section_is_active": 1,
+            "include_keys_json": None,
+        }
+        plan_fields = {
+            "price_display": None,
+            "selection_mode": "custom_options",
+            "sort_order": 1,
+            "is_active": 1,
+        }
+        mock_query_db.return_value = [
+            {
+                **section_fields,
+                **plan_fields,
+                "section_id": 1,
+                "catalog_key": "catering",
+                "section_key": "catering_packages",
+                "public_section_id": "catering_packages",
+                "id": 21,
+                "plan_key": "catering:taco_bar",
+                "title": "Taco Bar",
+                "constraints_json": json.dumps(
+                    [
+                        {"selection_key": "salads", "min_select": 1, "max_select": 2},
+                        {"selection_key": "entree", "min_select": 1, "max_select": 1},
+                    ]
+                ),
+                "details_json": json.dumps(
+                    [
+                        {"id": 8, "detail_text": "Tortillas", "sort_order": 2},
+                        {"id": 7, "detail_text": "Spanish rice", "sort_order": 1},
+                    ]
+                ),
+                "selection_groups_json": json.dumps(
+                    [
+                        {
+                            "id": 4,
+                            "group_key": "entree",
+                            "group_title": "Proteins",
+                            "source_type": "custom_options",
+                            "menu_group_key": None,
+                            "min_select": 1,
+                            "max_select": 1,
+                            "sort_order": 1,
+                            "is_active": 1,
+                            "options": [
+                                {
+                                    "id": 2,
+                                    "option_key": "beef",
+                                    "option_label": "Beef",
+                                    "sort_order": 2,
+                                    "is_active": 1,
+                                },
+                                {
+                                    "id": 1,
+                                    "option_key": "chicken",
+                                    "option_label": "Chicken",
+                                    "sort_order": 1,
+                                    "is_active": 1,
+                                },
+                            ],
+                        }
+                    ]
+                ),
+            },
+            {
+                **section_fields,
+                "section_id": 2,
+                "catalog_key": "catering",
+                "section_key": "catering_menu_options",
+                "public_section_id": "catering_menu_options",
+                "section_type": "include_menu",
+                "section_sort_order": 2,
+                "include_keys_json": json.dumps(
+                    [
+                        {"id": 12, "menu_group_key": "side", "sort_order": 2},
+                        {"id": 11, "menu_group_key": "entree", "sort_order": 1},
+                    ]
+                ),
+                "id": None,
+            },
+            {
+                **section_fields,
+                **plan_fields,
+                "section_id": 3,
+                "catalog_key": "formal",
+                "section_key": "formal_packages",
+                "public_section_id": "formal_packages",
+                "id": 32,
+                "plan_key": "formal:3-course",
+                "title": "Three-Course Dinner",
+                "constraints_json": None,
+                "details_json": None,
+                "selection_groups_json": None,
+            },
+        ]
+
+        response_body, status_code = AdminServicePlanService.list_public_service_plan_catalogs()
+
+        self.assertEqual(status_code, 200)
+        mock_query_db.assert_called_once()
+        query_text, payload = mock_query_db.call_args[0]
+        self.assertIn("JSON_ARRAYAGG", query_text)
+        self.assertIn("s.is_active = 1", query_text)
+        self.assertEqual(payload, {"catalog_key_0": "catering", "catalog_key_1": "formal"})
+
+        catering_sections = response_body["catalogs"]["catering"]
+        formal_sections = response_body["catalogs"]["formal"]
+        self.assertEqual(
+            [section["section_key"] for section in catering_sections], ["catering_packages", "catering_menu_options"]
+        )
+        self.assertEqual(catering_sections[1]["include_keys"], ["entree", "side"])
+        self.assertEqual(catering_sections[1]["plans"], [])
+        taco_bar = catering_sections[0]["plans"][0]
+        self.assertEqual([row["selection_key"] for row in taco_bar["constraints"]], ["entree", "salads"])
+        self.assertEqual([row["detail_text"] for row in taco_bar["details"]], ["Spanish rice", "Tortillas"])
+        self.assertEqual(
+            [option["option_key"] for option in taco_bar["selection_groups"][0]["options"]],
+            ["chicken", "beef"],
+        )
+        self.assertEqual(formal_sections[0]["plans"][0]["plan_key"], "formal:3-course")
+        self.assertEqual(formal_sections[0]["plans"][0]["details"], [])
+
+    def test_decode_plan_children_orders_constraints_case_insensitively(self):
+        constraints, _details, _selection_groups = AdminServicePlanService._decode_plan_children(
+            {
+                "constraints_json": json.dumps(
+                    [
+                        {"id": 3, "selection_key": "salads", "min_select": 1, "max_select": 1},
+                        {"id": 2, "selection_key": "Sides", "min_select": 1, "max_select": 1},
+                        {"id": 1, "selection_key": "Entree", "min_select": 1, "max_select": 1},
+                    ]
+                )
+            }
+        )
+
+        self.assertEqual([row["selection_key"] for row in constraints], ["Entree", "salads", "Sides"])
+
+    @patch(
+        "flask_api.services.admin_service_plan_service.query_db",
+        side_effect=pymysql.err.ProgrammingError(
+            1146,
+            "Table 'post_catering.service_plan_selection_options' doesn't exist",
+        ),
+    )
+    def test_list_public_service_plan_catalogs_returns_503_when_tables_missing(self, _mock_query_db):
+        _response_body, status_code = AdminServicePlanService.list_public_service_plan_catalogs()
+
+        self.assertEqual(status_code, 503)
+
+    @patch("flask_api.services.admin_service_plan_service.MenuCatalogCache.invalidate")
+    @patch("flask_api.services.admin_service_plan_service.update_sequence_positions")
+    @patch(
+        "flask_api.services.admin_service_plan_service.query_db",
+        return_value=[{"id": 11}, {"id": 12}, {"id": 13}],
+    )
+    @patch("flask_api.services.admin_service_plan_service.db_transaction")
+    def test_reorder_service_plans_writes_positions_in_one_set_based_call(
+        self, mock_db_transaction, _mock_query_db, mock_update_positions, _mock_invalidate
+    ):
+        connection = object()
+        mock_db_transaction.return_value.__enter__.return_value = connection
+
+        response_body, status_code = AdminServicePlanService.reorder_service_plans(3, [12, 99, 11])
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(response_body["ordered_plan_ids"], [12, 11, 13])
+        self.assertEqual(response_body["previous_plan_ids"], [11, 12, 13])
+        mock_update_positions.assert_called_once_with(
+            "service_plans", "sort_order", [12, 11, 13], connection=connection
+        )
+
     @patch("flask_api.services.admin_service_plan_service.query_db")
     @patch("flask_api.services.admin_service_plan_service.query_db_many")
     @patch("flask_api.services.admin_service_plan_service.AdminServicePlanService._get_plan_by_key", return_value=None)
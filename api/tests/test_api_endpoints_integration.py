@@ -1,20 +1,45 @@
 import sys
+import tempfile
+import threading
 import unittest
 from datetime import date, timedelta
 from pathlib import Path
 from unittest.mock import ANY, patch
 
+import pymysql
+
 API_ROOT = Path(__file__).resolve().parents[1]
 if str(API_ROOT) not in sys.path:
     sys.path.insert(0, str(API_ROOT))
 
 from flask_api import app  # noqa: E402
+from flask_api.config.mysqlconnection import DatabaseCircuitOpen  # noqa: E402
 import flask_api.controllers.main_controller  # noqa: E402,F401
+from flask_api.services.last_known_good_store import LastKnownGoodStore  # noqa: E402
+from flask_api.services.menu_catalog_cache import MenuCatalogCache  # noqa: E402
+from flask_api.services.public_media_cache import PublicMediaCache  # noqa: E402
+from flask_api.services.single_flight import SingleFlight  # noqa: E402
 
 
 class ApiEndpointIntegrationTests(unittest.TestCase):
     def setUp(self):
+        # Endpoint tests run without MySQL; the cache poll and outbox thread are covered in their own tests.
+        last_known_good_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(last_known_good_dir.cleanup)
+        env_patcher = patch.dict(
+            "os.environ",
+            {
+                "CACHE_VERSION_BUS_ENABLED": "false",
+                "INQUIRY_EMAIL_WORKER_ENABLED": "false",
+                "PUBLIC_LAST_KNOWN_GOOD_DIR": last_known_good_dir.name,
+            },
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        LastKnownGoodStore.clear()
         self.client = app.test_client()
+        MenuCatalogCache.clear()
+        PublicMediaCache.clear()
 
     def test_get_menus_uses_seed_payload_when_menu_data_source_is_seed_file(self):
         with patch.dict("os.environ", {"MENU_DATA_SOURCE": "seed-file"}, clear=False):
@@ -62,7 +87,7 @@ class ApiEndpointIntegrationTests(unittest.TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json(), {"ok": True, "steps": ["seeded_from_payload"]})
-        mock_run_menu_admin_task.assert_called_once_with(apply_schema=True, reset=False, seed=True)
+        mock_run_menu_admin_task.assert_called_once_with(apply_schema=True, reset=False, seed=True, dry_run=False)
 
     @patch("flask_api.controllers.main_controller.MenuService.get_general_groups")
     def test_get_general_menu_groups(self, mock_get_general_groups):
@@ -164,6 +189,173 @@ class ApiEndpointIntegrationTests(unittest.TestCase):
         )
         mock_get_active_slides.assert_called_once_with()
 
+    @patch("flask_api.controllers.main_controller.SlideService.get_active_slides")
+    def test_get_slides_serves_cached_body_with_strong_etag_and_304(self, mock_get_active_slides):
+        mock_get_active_slides.return_value = [{"id": 11, "src": "/api/assets/slides/a.jpg"}]
+
+        first = self.client.get("/api/slides")
+        etag = first.headers.get("ETag")
+        second = self.client.get("/api/slides", headers={"If-None-Match": etag})
+        third = self.client.get("/api/slides", headers={"If-None-Match": '"stale"'})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(etag.startswith('"') and not etag.startswith("W/"))
+        self.assertEqual(first.headers.get("Cache-Control"), "public, no-cache")
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.get_data(), b"")
+        self.assertEqual(second.headers.get("ETag"), etag)
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(third.get_data(), first.get_data())
+        mock_get_active_slides.assert_called_once_with()
+
+    @patch.dict(
+        "os.environ",
+        {"PUBLIC_API_CACHE_MAX_AGE_SECONDS": "60", "PUBLIC_API_STALE_WHILE_REVALIDATE_SECONDS": "300"},
+        clear=False,
+    )
+    @patch("flask_api.controllers.main_controller.GalleryService.get_gallery_items", return_value=[])
+    def test_get_gallery_emits_configured_cache_control(self, _mock_get_gallery_items):
+        response = self.client.get("/api/gallery")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get("Cache-Control"), "public, max-age=60, stale-while-revalidate=300")
+
+    @patch("flask_api.controllers.main_controller.SlideService.get_active_slides")
+    def test_get_slides_rebuilds_body_after_media_cache_invalidation(self, mock_get_active_slides):
+        mock_get_active_slides.side_effect = [[{"id": 1}], [{"id": 2}]]
+
+        first = self.client.get("/api/slides")
+        PublicMediaCache.invalidate()
+        second = self.client.get("/api/slides", headers={"If-None-Match": first.headers.get("ETag")})
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.get_json(), {"slides": [{"id": 2}]})
+        self.assertNotEqual(second.headers.get("ETag"), first.headers.get("ETag"))
+
+    @patch("flask_api.services.slide_service.Slide.get_active_dicts", return_value=[{"id": 1}])
+    def test_get_slides_coalesces_the_rebuild_once_at_the_response_layer(self, _mock_get_active_dicts):
+        SingleFlight.reset()
+        self.addCleanup(SingleFlight.reset)
+
+        self.client.get("/api/slides")
+
+        self.assertEqual(list(SingleFlight.get_stats()["keys"]), ["PublicMediaCache:response:slides"])
+
+    @patch.dict("os.environ", {"PUBLIC_MEDIA_CACHE_TTL_SECONDS": "30"}, clear=False)
+    @patch("flask_api.services.versioned_cache.time.monotonic")
+    @patch("flask_api.controllers.main_controller.SlideService.get_active_slides")
+    def test_get_slides_serves_expired_body_while_refreshing_in_background(self, mock_get_active_slides, mock_now):
+        refreshed = threading.Event()
+
+        def load_slides():
+            if mock_get_active_slides.call_count > 1:
+                refreshed.set()
+            return [{"id": mock_get_active_slides.call_count}]
+
+        mock_get_active_slides.side_effect = load_slides
+        mock_now.return_value = 100.0
+        first = self.client.get("/api/slides")
+
+        mock_now.return_value = 140.0
+        second = self.client.get("/api/slides")
+        self.assertTrue(refreshed.wait(5))
+        for _attempt in range(500):
+            if not SingleFlight.get_stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+        third = self.client.get("/api/slides")
+
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(third.get_json(), {"slides": [{"id": 2}]})
+        self.assertEqual(mock_get_active_slides.call_count, 2)
+
+    @patch("flask_api.controllers.main_controller.SlideService.get_active_slides")
+    def test_get_slides_serves_last_known_good_when_database_fails(self, mock_get_active_slides):
+        mock_get_active_slides.side_effect = [
+            [{"id": 1}],
+            pymysql.err.OperationalError(2003, "Can't connect to MySQL server"),
+        ]
+
+        first = self.client.get("/api/slides")
+        PublicMediaCache.invalidate()
+        second = self.client.get("/api/slides")
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers.get("ETag"), first.headers.get("ETag"))
+        self.assertEqual(second.headers.get("Warning"), '111 - "Revalidation Failed"')
+        self.assertEqual(second.headers.get("Cache-Control"), "public, no-cache")
+
+    @patch.dict("os.environ", {"PUBLIC_READ_DEADLINE_SECONDS": "0.05"}, clear=False)
+    @patch("flask_api.controllers.main_controller.MenuService.get_catalog")
+    def test_get_menus_serves_last_known_good_while_slow_rebuild_finishes(self, mock_get_catalog):
+        release = threading.Event()
+        calls = []
+
+        def load_catalog():
+            calls.append(1)
+            if len(calls) == 2:
+                release.wait(5)
+            return {"version": len(calls)}, 200
+
+        mock_get_catalog.side_effect = load_catalog
+        self.client.get("/api/menus")
+        MenuCatalogCache.invalidate()
+
+        slow = self.client.get("/api/menus")
+        release.set()
+        for _attempt in range(500):
+            if not SingleFlight.get_stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+        rebuilt = self.client.get("/api/menus")
+
+        self.assertEqual(slow.get_json(), {"version": 1})
+        self.assertIn("Revalidation Failed", slow.headers.get("Warning"))
+        self.assertEqual(rebuilt.get_json(), {"version": 2})
+        self.assertIsNone(rebuilt.headers.get("Warning"))
+        self.assertEqual(len(calls), 2)
+
+    @patch(
+        "flask_api.controllers.main_controller.GalleryService.get_gallery_items",
+        side_effect=DatabaseCircuitOpen("circuit open", retry_after_seconds=4),
+    )
+    def test_get_gallery_without_last_known_good_fails_fast_with_retry_after(self, _mock_get_gallery_items):
+        response = self.client.get("/api/gallery")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json(), {"error": "database_unavailable"})
+        self.assertEqual(response.headers.get("Retry-After"), "4")
+
+    @patch("flask_api.controllers.main_controller.MenuService.get_catalog")
+    def test_get_menus_does_not_cache_error_responses(self, mock_get_catalog):
+        mock_get_catalog.return_value = ({"error": "Menu seed payload not found."}, 500)
+
+        self.client.get("/api/menus")
+        response = self.client.get("/api/menus")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIsNone(response.headers.get("ETag"))
+        self.assertEqual(mock_get_catalog.call_count, 2)
+
+    @patch("flask_api.controllers.main_controller.MenuService.get_catalog")
+    def test_get_menus_serves_last_known_good_when_rebuild_fails(self, mock_get_catalog):
+        mock_get_catalog.side_effect = [
+            ({"version": 1}, 200),
+            ({"error": "Simplified menu tables are empty."}, 500),
+            ({"error": "Simplified menu tables are empty."}, 500),
+        ]
+
+        first = self.client.get("/api/menus")
+        MenuCatalogCache.invalidate()
+        second = self.client.get("/api/menus")
+        MenuCatalogCache.invalidate()
+        third = self.client.get("/api/menus")
+
+        self.assertEqual((second.status_code, third.status_code), (200, 200))
+        self.assertEqual(third.get_data(), first.get_data())
+        self.assertEqual(third.headers.get("Warning"), '111 - "Revalidation Failed"')
+
     @patch("flask_api.controllers.main_controller.GalleryService.get_gallery_items")
     def test_get_gallery_returns_media_payload(self, mock_get_gallery_items):
         mock_get_gallery_items.return_value = [
@@ -237,6 +429,7 @@ class ApiEndpointIntegrationTests(unittest.TestCase):
         self.assertIn("email is required.", body["errors"])
         self.assertIn("desired_menu_items is required.", body["errors"])
 
+    @patch.dict("os.environ", {"INQUIRY_EMAIL_DELIVERY_MODE": "inline"}, clear=False)
     @patch("flask_api.services.inquiry_service.Inquiry.update_email_sent", autospec=True)
     @patch(
         "flask_api.services.inquiry_service.InquiryService._send_inquiry_notifications",
@@ -291,6 +484,134 @@ class ApiEndpointIntegrationTests(unittest.TestCase):
         mock_save.assert_called_once()
         mock_update_email_sent.assert_called_once_with(ANY, True)
 
+    @patch.dict(
+        "os.environ",
+        {
+            "INQUIRY_EMAIL_DELIVERY_MODE": "outbox",
+            "SMTP_HOST": "smtp.example.com",
+            "SMTP_USERNAME": "mailer@example.com",
+            "SMTP_PASSWORD": "secret",
+            "INQUIRY_TO_EMAIL": "owner@example.com",
+        },
+        clear=False,
+    )
+    @patch(
+        "flask_api.services.inquiry_service.InquiryService._get_confirmation_email_content",
+        return_value=("Thanks for your inquiry", "We will follow up soon."),
+    )
+    @patch("flask_api.controllers.main_controller.InquiryEmailDispatcher.notify")
+    @patch("flask_api.services.inquiry_service.InquiryService._send_email_message")
+    @patch("flask_api.services.inquiry_service.Inquiry.save", autospec=True)
+    @patch("flask_api.services.inquiry_service.InquiryAbuseGuard.evaluate", return_value={"allow": True})
+    def test_create_inquiry_queues_emails_without_sending_inline(
+        self,
+        _mock_abuse,
+        mock_save,
+        mock_send_email_message,
+        mock_notify,
+        _mock_confirmation_content,
+    ):
+        outbox_messages = []
+
+        def fake_save(inquiry, build_outbox_messages=None):
+            inquiry.id = 988
+            outbox_messages.extend(build_outbox_messages(inquiry))
+            return inquiry.id
+
+        mock_save.side_effect = fake_save
+        payload = {
+            "full_name": "Taylor Client",
+            "email": "taylor@example.com",
+            "phone": "(212) 555-1212",
+            "event_type": "Wedding",
+            "event_date": (date.today() + timedelta(days=14)).isoformat(),
+            "guest_count": 50,
+            "budget": "$2,500-$5,000",
+            "service_interest": "Catering Packages",
+            "service_selection": {},
+            "desired_menu_items": [{"name": "Jerk Chicken", "category": "entree"}],
+            "message": "Please include setup.",
+        }
+
+        response = self.client.post("/api/inquiries", json=payload)
+        body = response.get_json()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(body["inquiry_id"], 988)
+        self.assertTrue(body["email_queued"])
+        self.assertFalse(body["owner_email_sent"])
+        self.assertEqual(
+            [entry["email_type"] for entry in outbox_messages],
+            ["owner_notification", "customer_confirmation"],
+        )
+        self.assertEqual(outbox_messages[0]["message"]["To"], "owner@example.com")
+        mock_send_email_message.assert_not_called()
+        mock_notify.assert_called_once_with()
+
+
+class SlideAssetServingTests(unittest.TestCase):
+    HASHED_NAME = f"{'a' * 64}.mp4"
+
+    def setUp(self):
+        self.client = app.test_client()
+        env_patcher = patch.dict("os.environ", {"INQUIRY_EMAIL_WORKER_ENABLED": "false"})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.asset_dir = Path(temp_dir.name)
+        (self.asset_dir / self.HASHED_NAME).write_bytes(b"0123456789")
+        (self.asset_dir / "legacy.jpg").write_bytes(b"jpeg")
+        (self.asset_dir / ".incoming").mkdir()
+        (self.asset_dir / ".incoming" / ".upload-1.part").write_bytes(b"partial")
+        dir_patch = patch("flask_api.controllers.main_controller.SLIDES_ASSET_DIR", self.asset_dir)
+        dir_patch.start()
+        self.addCleanup(dir_patch.stop)
+
+    def test_range_request_returns_partial_content(self):
+        response = self.client.get(f"/api/assets/slides/{self.HASHED_NAME}", headers={"Range": "bytes=2-5"})
+        self.addCleanup(response.close)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, b"2345")
+        self.assertEqual(response.headers["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(response.headers["Accept-Ranges"], "bytes")
+
+    def test_content_hashed_assets_are_immutable(self):
+        hashed = self.client.get(f"/api/assets/slides/{self.HASHED_NAME}")
+        legacy = self.client.get("/api/assets/slides/legacy.jpg")
+        hashed.close()
+        legacy.close()
+
+        self.assertIn("immutable", hashed.headers["Cache-Control"])
+        self.assertIn("max-age=31536000", hashed.headers["Cache-Control"])
+        self.assertNotIn("immutable", legacy.headers["Cache-Control"])
+        self.assertIn("no-cache", legacy.headers["Cache-Control"])
+
+    def test_x_accel_redirect_mode_hands_file_to_nginx(self):
+        with patch.dict("os.environ", {"MEDIA_ASSET_SERVE_MODE": "x-accel-redirect"}, clear=False):
+            response = self.client.get(f"/api/assets/slides/{self.HASHED_NAME}")
+            missing = self.client.get("/api/assets/slides/missing.mp4")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["X-Accel-Redirect"], f"/_protected/slides/{self.HASHED_NAME}")
+        self.assertEqual(response.mimetype, "video/mp4")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+        self.assertEqual(missing.status_code, 404)
+
+    def test_x_sendfile_mode_sets_sendfile_header(self):
+        with patch.dict("os.environ", {"MEDIA_ASSET_SERVE_MODE": "x-sendfile"}, clear=False):
+            response = self.client.get("/api/assets/slides/legacy.jpg")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Sendfile"], str(self.asset_dir / "legacy.jpg"))
+
+    def test_upload_temp_files_are_not_served(self):
+        response = self.client.get("/api/assets/slides/.incoming/.upload-1.part")
+
+        self.assertEqual(response.status_code, 404)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,213 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api import app  # noqa: E402
+from flask_api.services.admin_user_cache import AdminUserCache  # noqa: E402
+from flask_api.services.cache_version_bus import CacheVersionBus  # noqa: E402
+from flask_api.services.menu_catalog_cache import MenuCatalogCache  # noqa: E402
+from flask_api.services.public_media_cache import PublicMediaCache  # noqa: E402
+from flask_api.services.single_flight import SingleFlight  # noqa: E402
+
+CACHES = (MenuCatalogCache, PublicMediaCache, AdminUserCache)
+
+
+class _CounterTable:
+    """Stands in for query_db against the cache_versions table."""
+
+    def __init__(self, **versions):
+        self.versions = dict(versions)
+        self.calls = []
+
+    def __call__(self, query, data=None, fetch="all", connection=None, auto_commit=True):
+        normalized = " ".join(query.split())
+        self.calls.append({"query": normalized, "data": data, "connection": connection, "auto_commit": auto_commit})
+        if normalized.startswith("SELECT cache_key, version FROM cache_versions"):
+            return [{"cache_key": key, "version": self.versions[key]} for key in data if key in self.versions]
+        if normalized.startswith("INSERT INTO cache_versions"):
+            for key in data:
+                self.versions[key] = self.versions.get(key, 0) + 1
+        return None
+
+
+@patch.dict(os.environ, {"CACHE_VERSION_BUS_ENABLED": "true", "CACHE_VERSION_CHECK_INTERVAL_SECONDS": "0"})
+class CacheVersionBusTests(unittest.TestCase):
+    def setUp(self):
+        CacheVersionBus.reset()
+        subscribers_patcher = patch.object(CacheVersionBus, "_subscribers", [])
+        subscribers_patcher.start()
+        self.addCleanup(subscribers_patcher.stop)
+        for cache in CACHES:
+            cache.clear()
+            self.addCleanup(cache.clear)
+        self.addCleanup(CacheVersionBus.reset)
+
+    def _use_table(self, table):
+        patcher = patch("flask_api.services.cache_version_bus.query_db", side_effect=table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return table
+
+    def _fill(self, cache, key="entry"):
+        cache.set(key, {"cached": True}, cache.get_version())
+
+    def test_bump_increments_every_name_in_one_statement_on_the_callers_connection(self):
+        table = self._use_table(_CounterTable(menu=3))
+
+        CacheVersionBus.bump(CacheVersionBus.SERVICE_PLANS, CacheVersionBus.MENU, connection="connection")
+
+        self.assertEqual(table.versions, {"menu": 4, "service_plans": 1})
+        self.assertEqual(len(table.calls), 1)
+        self.assertEqual(table.calls[0]["connection"], "connection")
+        self.assertFalse(table.calls[0]["auto_commit"])
+
+    def test_bump_runs_subscribers_for_matching_names_on_the_callers_connection(self):
+        self._use_table(_CounterTable())
+        calls = []
+        CacheVersionBus.subscribe((CacheVersionBus.MENU,), calls.append)
+
+        CacheVersionBus.bump(CacheVersionBus.MEDIA, connection="connection")
+        CacheVersionBus.bump(CacheVersionBus.MENU, connection="connection")
+
+        self.assertEqual(calls, ["connection"])
+
+    def test_revalidate_drops_only_caches_whose_counters_moved(self):
+        table = self._use_table(_CounterTable(menu=1, service_plans=1, media=1, admin_users=1))
+        for cache in CACHES:
+            self._fill(cache)
+        CacheVersionBus.revalidate(CACHES)
+        for cache in CACHES:
+            self._fill(cache)
+
+        table.versions["service_plans"] += 1
+        changed = CacheVersionBus.revalidate(CACHES)
+
+        self.assertEqual(changed, ["service_plans"])
+        self.assertIsNone(MenuCatalogCache.get("entry"))
+        self.assertIsNotNone(PublicMediaCache.get("entry"))
+        self.assertIsNotNone(AdminUserCache.get("entry"))
+        self.assertEqual(
+            table.calls[-1]["data"],
+            ("admin_users", "media", "menu", "service_plans"),
+        )
+
+    def test_first_check_treats_everything_as_stale(self):
+        self._use_table(_CounterTable(menu=5))
+        self._fill(MenuCatalogCache)
+
+        changed = CacheVersionBus.revalidate((MenuCatalogCache,))
+
+        self.assertEqual(changed, ["menu", "service_plans"])
+        self.assertIsNone(MenuCatalogCache.get("entry"))
+
+    def test_revalidate_records_counters_while_caches_are_empty(self):
+        table = self._use_table(_CounterTable(menu=1))
+
+        CacheVersionBus.revalidate(CACHES)
+        self._fill(MenuCatalogCache)
+        changed = CacheVersionBus.revalidate(CACHES, force=True)
+
+        self.assertEqual(len(table.calls), 2)
+        self.assertEqual(changed, [])
+        self.assertIsNotNone(MenuCatalogCache.get("entry"))
+
+    @patch.dict(os.environ, {"CACHE_VERSION_CHECK_INTERVAL_SECONDS": "60"})
+    def test_revalidate_polls_at_most_once_per_interval(self):
+        table = self._use_table(_CounterTable(menu=1))
+        self._fill(MenuCatalogCache)
+
+        CacheVersionBus.revalidate((MenuCatalogCache,))
+        self._fill(MenuCatalogCache)
+        table.versions["menu"] += 1
+        changed = CacheVersionBus.revalidate((MenuCatalogCache,))
+
+        self.assertEqual(changed, [])
+        self.assertEqual(len(table.calls), 1)
+        self.assertEqual(CacheVersionBus.revalidate((MenuCatalogCache,), force=True), ["menu"])
+
+    def test_failed_read_keeps_caches_and_logs(self):
+        patcher = patch("flask_api.services.cache_version_bus.query_db", side_effect=RuntimeError("db down"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._fill(PublicMediaCache)
+
+        with self.assertLogs("flask_api.services.cache_version_bus", level="WARNING"):
+            changed = CacheVersionBus.revalidate(CACHES)
+
+        self.assertEqual(changed, [])
+        self.assertIsNotNone(PublicMediaCache.get("entry"))
+
+    def test_bumps_are_collected_per_request(self):
+        self._use_table(_CounterTable())
+
+        with app.test_request_context("/"):
+            CacheVersionBus.bump(CacheVersionBus.MENU)
+            CacheVersionBus.bump(CacheVersionBus.MEDIA)
+            self.assertEqual(CacheVersionBus.pop_request_bumps(), {"menu", "media"})
+            self.assertEqual(CacheVersionBus.pop_request_bumps(), set())
+
+    @patch.dict(os.environ, {"CACHE_VERSION_BUS_ENABLED": "false"})
+    @patch("flask_api.services.cache_version_bus.query_db")
+    def test_disabled_bus_does_not_touch_the_table(self, mock_query_db):
+        self._fill(MenuCatalogCache)
+
+        CacheVersionBus.bump(CacheVersionBus.MENU)
+        self.assertEqual(CacheVersionBus.revalidate(CACHES), [])
+        mock_query_db.assert_not_called()
+
+    @patch("flask_api.services.cache_version_bus.get_circuit_breaker")
+    def test_check_is_not_due_while_the_circuit_is_open_or_probing(self, mock_get_breaker):
+        mock_get_breaker.return_value.is_closed.return_value = False
+        self.assertFalse(CacheVersionBus.is_check_due())
+
+        mock_get_breaker.return_value.is_closed.return_value = True
+        self.assertTrue(CacheVersionBus.is_check_due())
+
+
+@patch.dict(os.environ, {"INQUIRY_EMAIL_WORKER_ENABLED": "false", "MENU_DATA_SOURCE": "seed-file"})
+class CacheVersionRequestHookTests(unittest.TestCase):
+    def setUp(self):
+        CacheVersionBus.reset()
+        self.addCleanup(CacheVersionBus.reset)
+        SingleFlight.reset()
+        self.addCleanup(SingleFlight.reset)
+        self.client = app.test_client()
+
+    @patch("flask_api.services.cache_version_bus.CacheVersionBus.revalidate")
+    def test_assets_and_preflights_do_not_poll(self, mock_revalidate):
+        self.client.options("/api/menus")
+        self.client.get("/api/assets/slides/missing.jpg")
+
+        mock_revalidate.assert_not_called()
+
+    @patch.dict(os.environ, {"CACHE_VERSION_CHECK_DEADLINE_SECONDS": "0.05"})
+    @patch("flask_api.services.cache_version_bus.query_db")
+    def test_slow_poll_does_not_hold_the_request_past_its_deadline(self, mock_query_db):
+        release = threading.Event()
+        mock_query_db.side_effect = lambda *args, **kwargs: release.wait(5) and []
+        self.addCleanup(release.set)
+
+        started_at = time.perf_counter()
+        response = self.client.get("/api/menus")
+        elapsed = time.perf_counter() - started_at
+        release.set()
+        for _attempt in range(500):
+            if not SingleFlight.get_stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 2)
+        self.assertEqual(mock_query_db.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -8,6 +9,9 @@ if str(API_ROOT) not in sys.path:
     sys.path.insert(0, str(API_ROOT))
 
 from flask_api import app  # noqa: E402
+from flask_api.config.mysqlconnection import DatabasePoolTimeout  # noqa: E402
+from flask_api.services.last_known_good_store import LastKnownGoodStore  # noqa: E402
+from flask_api.services.public_media_cache import PublicMediaCache  # noqa: E402
 
 
 class HealthEndpointTests(unittest.TestCase):
@@ -16,6 +20,21 @@ class HealthEndpointTests(unittest.TestCase):
 
     def setUp(self):
         self.client = app.test_client()
+        # Endpoint tests run without MySQL; the cache poll and outbox thread are covered in their own tests.
+        last_known_good_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(last_known_good_dir.cleanup)
+        env_patcher = patch.dict(
+            "os.environ",
+            {
+                "CACHE_VERSION_BUS_ENABLED": "false",
+                "INQUIRY_EMAIL_WORKER_ENABLED": "false",
+                "PUBLIC_LAST_KNOWN_GOOD_DIR": last_known_good_dir.name,
+            },
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        LastKnownGoodStore.clear()
+        PublicMediaCache.clear()
 
     @patch("flask_api.controllers.main_controller.query_db", return_value={"ok": 1})
     def test_health_success_when_database_reachable(self, mock_query_db):
@@ -35,6 +54,27 @@ class HealthEndpointTests(unittest.TestCase):
         self.assertEqual(body, {"ok": False, "database": {"ok": False}, "error": "database_unavailable"})
         mock_query_db.assert_called_once_with("SELECT 1 AS ok;", fetch="one")
 
+    @patch("flask_api.controllers.main_controller.get_pool_stats", return_value={"enabled": True, "in_use": 0})
+    @patch("flask_api.controllers.main_controller.query_db", return_value={"ok": 1})
+    def test_health_details_include_pool_and_single_flight_stats(self, _mock_query_db, _mock_pool_stats):
+        response = self.client.get("/api/health?details=true")
+        body = response.get_json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body["database"], {"ok": True, "pool": {"enabled": True, "in_use": 0}})
+        self.assertIn("coalesced", body["single_flight"])
+
+    @patch(
+        "flask_api.controllers.main_controller.SlideService.get_active_slides",
+        side_effect=DatabasePoolTimeout("pool exhausted"),
+    )
+    def test_pool_checkout_timeout_returns_503(self, _mock_get_active_slides):
+        response = self.client.get("/api/slides")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json(), {"error": "database_unavailable"})
+        self.assertEqual(response.headers.get("Retry-After"), "1")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,7 @@
+import os
 import sys
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
@@ -9,6 +12,11 @@ if str(API_ROOT) not in sys.path:
     sys.path.insert(0, str(API_ROOT))
 
 from flask_api.services.inquiry_abuse_guard import InquiryAbuseGuard  # noqa: E402
+from flask_api.services.inquiry_abuse_state import (  # noqa: E402
+    MemoryAbuseStateStore,
+    MySQLAbuseStateStore,
+    SQLiteAbuseStateStore,
+)
 
 
 def _make_inquiry(**overrides):
@@ -27,9 +35,7 @@ def _make_inquiry(**overrides):
 
 class InquiryAbuseGuardTests(unittest.TestCase):
     def setUp(self):
-        InquiryAbuseGuard._ip_events.clear()
-        InquiryAbuseGuard._recent_submission_keys.clear()
-        InquiryAbuseGuard._blocked_events.clear()
+        InquiryAbuseGuard.reset_state()
 
     def test_integrity_field_is_silent_accept(self):
         inquiry = _make_inquiry()
@@ -58,20 +64,53 @@ class InquiryAbuseGuardTests(unittest.TestCase):
         inquiry = _make_inquiry()
         with patch.dict("os.environ", {"INQUIRY_DUPLICATE_WINDOW_SECONDS": "1200"}, clear=False):
             first = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="5.5.5.5", user_agent="ua")
-            duplicate_key = first.get("meta", {}).get("duplicate_key")
-            InquiryAbuseGuard.record_successful_submission(duplicate_key)
             second = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="5.5.5.5", user_agent="ua")
         self.assertTrue(first["allow"])
+        self.assertIsNotNone(first["meta"]["duplicate_claimed_at"])
         self.assertFalse(second["allow"])
         self.assertTrue(second["silent_accept"])
         self.assertEqual(second["warning_code"], "duplicate_submission_window")
 
+    def test_released_duplicate_claim_lets_a_resend_through(self):
+        inquiry = _make_inquiry()
+        first = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="5.5.5.6", user_agent="ua")
+        InquiryAbuseGuard.release_duplicate_claim(first["meta"])
+        second = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="5.5.5.6", user_agent="ua")
+
+        self.assertTrue(first["allow"])
+        self.assertTrue(second["allow"])
+
+    def test_concurrent_identical_submissions_admit_exactly_one(self):
+        inquiry = _make_inquiry()
+        barrier = threading.Barrier(8)
+        results = []
+
+        def submit(index):
+            barrier.wait()
+            results.append(
+                InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip=f"10.0.0.{index}", user_agent="ua")
+            )
+
+        threads = [threading.Thread(target=submit, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(1 for result in results if result["allow"]), 1)
+        self.assertEqual(
+            sum(1 for result in results if result["warning_code"] == "duplicate_submission_window"),
+            7,
+        )
+
     def test_blocked_domain_rejected(self):
         inquiry = _make_inquiry(email="person@mailinator.com")
         result = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="4.4.4.4", user_agent="ua")
         self.assertFalse(result["allow"])
         self.assertEqual(result["status_code"], 400)
         self.assertEqual(result["warning_code"], "email_domain_blocked")
+        # A rejected payload must not hold the duplicate key against the corrected resend.
+        self.assertEqual(InquiryAbuseGuard.get_state_store().get_stats()["tracked_submissions"], 0)
 
     def test_link_threshold_rejected(self):
         inquiry = _make_inquiry(message="https://a.com https://b.com https://c.com")
@@ -81,5 +120,160 @@ class InquiryAbuseGuardTests(unittest.TestCase):
         self.assertEqual(result["warning_code"], "spam_link_threshold")
 
 
+class MemoryAbuseStateStoreTests(unittest.TestCase):
+    def test_minute_and_hour_windows_slide(self):
+        store = MemoryAbuseStateStore(max_keys=10)
+        self.assertIsNone(store.reserve_ip_slot("1.1.1.1", 1000.0, 2, 3))
+        self.assertIsNone(store.reserve_ip_slot("1.1.1.1", 1010.0, 2, 3))
+        self.assertEqual(store.reserve_ip_slot("1.1.1.1", 1020.0, 2, 3), "rate_limit_minute")
+        self.assertIsNone(store.reserve_ip_slot("1.1.1.1", 1100.0, 2, 3))
+        self.assertEqual(store.reserve_ip_slot("1.1.1.1", 1200.0, 2, 3), "rate_limit_hour")
+        self.assertIsNone(store.reserve_ip_slot("1.1.1.1", 1000.0 + 3700.0, 2, 3))
+
+    def test_idle_keys_expire_from_oldest_end(self):
+        store = MemoryAbuseStateStore(max_keys=10)
+        store.reserve_ip_slot("1.1.1.1", 1000.0, 3, 12)
+        store.reserve_ip_slot("2.2.2.2", 2000.0, 3, 12)
+        self.assertTrue(store.claim_submission("dupe-key", 1000.0, 86400))
+
+        store.reserve_ip_slot("3.3.3.3", 1000.0 + 3601.0, 3, 12)
+
+        self.assertEqual(list(store._ip_windows.keys()), ["2.2.2.2", "3.3.3.3"])
+        self.assertFalse(store.claim_submission("dupe-key", 1000.0 + 3601.0, 86400))
+        self.assertTrue(store.claim_submission("dupe-key", 1000.0 + 86401.0, 86400))
+
+    def test_release_only_frees_the_matching_claim(self):
+        store = MemoryAbuseStateStore()
+        self.assertTrue(store.claim_submission("dupe-key", 1000.0, 900))
+        self.assertTrue(store.claim_submission("dupe-key", 2000.0, 900))
+
+        store.release_submission("dupe-key", 1000.0)
+        self.assertFalse(store.claim_submission("dupe-key", 2001.0, 900))
+        store.release_submission("dupe-key", 2000.0)
+        self.assertTrue(store.claim_submission("dupe-key", 2002.0, 900))
+
+    def test_tracked_keys_are_capped_with_lru_eviction(self):
+        store = MemoryAbuseStateStore(max_keys=2)
+        store.reserve_ip_slot("1.1.1.1", 1000.0, 3, 12)
+        store.reserve_ip_slot("2.2.2.2", 1001.0, 3, 12)
+        store.reserve_ip_slot("1.1.1.1", 1002.0, 3, 12)
+        store.reserve_ip_slot("3.3.3.3", 1003.0, 3, 12)
+
+        self.assertEqual(list(store._ip_windows.keys()), ["1.1.1.1", "3.3.3.3"])
+        self.assertEqual(store.get_stats()["evicted_keys"], 1)
+
+    def test_blocked_events_count_within_alert_window(self):
+        store = MemoryAbuseStateStore()
+        self.assertEqual(store.record_blocked(1000.0, 60), 1)
+        self.assertEqual(store.record_blocked(1030.0, 60), 2)
+        self.assertEqual(store.record_blocked(1100.0, 60), 1)
+
+
+class InquiryAbuseStateStoreTests(unittest.TestCase):
+    def setUp(self):
+        InquiryAbuseGuard.reset_state()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.sqlite_path = os.path.join(temp_dir.name, "abuse.sqlite3")
+
+    def test_sqlite_store_shares_limits_and_duplicates_across_instances(self):
+        worker_a = SQLiteAbuseStateStore(self.sqlite_path)
+        worker_b = SQLiteAbuseStateStore(self.sqlite_path)
+
+        self.assertIsNone(worker_a.reserve_ip_slot("9.9.9.9", 1000.0, 2, 12))
+        self.assertIsNone(worker_b.reserve_ip_slot("9.9.9.9", 1001.0, 2, 12))
+        self.assertEqual(worker_a.reserve_ip_slot("9.9.9.9", 1002.0, 2, 12), "rate_limit_minute")
+        self.assertIsNone(worker_b.reserve_ip_slot("9.9.9.9", 1070.0, 2, 12))
+
+        duplicate_key = "jordan@example.com|2125551212|2026-06-15|catering"
+        self.assertTrue(worker_a.claim_submission(duplicate_key, 1100.0, 900))
+        self.assertFalse(worker_b.claim_submission(duplicate_key, 1101.0, 900))
+        worker_b.release_submission(duplicate_key, 1100.0)
+        self.assertTrue(worker_b.claim_submission(duplicate_key, 1102.0, 900))
+        self.assertEqual(worker_a.record_blocked(1200.0, 60), 1)
+        self.assertEqual(worker_b.record_blocked(1210.0, 60), 2)
+
+    def test_sqlite_claims_race_across_workers_to_a_single_winner(self):
+        duplicate_key = "jordan@example.com|2125551212|2026-06-15|catering"
+        workers = [SQLiteAbuseStateStore(self.sqlite_path) for _ in range(6)]
+        barrier = threading.Barrier(len(workers))
+        claimed = []
+
+        def claim(worker, index):
+            barrier.wait()
+            claimed.append(worker.claim_submission(duplicate_key, 1000.0 + index / 100, 900))
+
+        threads = [threading.Thread(target=claim, args=(worker, index)) for index, worker in enumerate(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(claimed), [False] * (len(workers) - 1) + [True])
+
+    def test_guard_enforces_limits_through_configured_sqlite_backend(self):
+        inquiry = _make_inquiry()
+        env = {
+            "INQUIRY_ABUSE_STATE_BACKEND": "sqlite",
+            "INQUIRY_ABUSE_STATE_SQLITE_PATH": self.sqlite_path,
+            "INQUIRY_RATE_LIMIT_PER_IP_PER_MINUTE": "1",
+        }
+        with patch.dict("os.environ", env, clear=False):
+            first = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="7.7.7.7", user_agent="ua")
+            # A fresh store object stands in for a second gunicorn worker reading the same file.
+            InquiryAbuseGuard.reset_state()
+            second = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="7.7.7.7", user_agent="ua")
+
+        self.assertIsInstance(InquiryAbuseGuard._state_store, SQLiteAbuseStateStore)
+        self.assertTrue(first["allow"])
+        self.assertEqual(second["warning_code"], "rate_limit_minute")
+
+    @patch("flask_api.services.inquiry_abuse_state.query_db")
+    @patch("flask_api.services.inquiry_abuse_state.db_transaction")
+    def test_mysql_store_locks_ip_row_before_counting(self, mock_db_transaction, mock_query_db):
+        mock_db_transaction.return_value.__enter__.return_value = "conn"
+        mock_query_db.side_effect = [None, None, None, {"key_hash": "x"}, {"minute_count": 3, "hour_count": 3}]
+
+        code = MySQLAbuseStateStore().reserve_ip_slot("9.9.9.9", 5000.0, 3, 12)
+
+        self.assertEqual(code, "rate_limit_minute")
+        statements = [" ".join(call.args[0].split()) for call in mock_query_db.call_args_list]
+        self.assertIn("FOR UPDATE", statements[3])
+        self.assertNotIn("9.9.9.9", str(mock_query_db.call_args_list[3].args[1]))
+        self.assertFalse(any(statement.startswith("INSERT INTO inquiry_abuse_events") for statement in statements))
+
+    @patch("flask_api.services.inquiry_abuse_state.query_db")
+    @patch("flask_api.services.inquiry_abuse_state.db_transaction")
+    def test_mysql_claim_only_advances_a_lapsed_key_and_reads_it_back_locked(self, mock_db_transaction, mock_query_db):
+        mock_db_transaction.return_value.__enter__.return_value = "conn"
+        mock_query_db.side_effect = [None, {"last_seen_at": 4000.0}, None, {"last_seen_at": 5000.0}]
+        store = MySQLAbuseStateStore()
+
+        self.assertFalse(store.claim_submission("dupe-key", 5000.0, 900))
+        self.assertTrue(store.claim_submission("dupe-key", 5000.0, 900))
+
+        upsert_sql = " ".join(mock_query_db.call_args_list[0].args[0].split())
+        self.assertIn("IF(last_seen_at <= %(window_start)s, VALUES(last_seen_at), last_seen_at)", upsert_sql)
+        self.assertEqual(mock_query_db.call_args_list[0].args[1]["window_start"], 4100.0)
+        self.assertIn("FOR UPDATE", mock_query_db.call_args_list[1].args[0])
+        self.assertTrue(all(call.kwargs["connection"] == "conn" for call in mock_query_db.call_args_list))
+        self.assertNotIn("dupe-key", str(mock_query_db.call_args_list[0].args[1]))
+
+    @patch("flask_api.services.inquiry_abuse_state.db_transaction", side_effect=RuntimeError("database unavailable"))
+    @patch("flask_api.services.inquiry_abuse_state.query_db", side_effect=RuntimeError("database unavailable"))
+    def test_shared_backend_failure_falls_back_to_worker_local_limits(self, _mock_query_db, _mock_db_transaction):
+        inquiry = _make_inquiry()
+        env = {"INQUIRY_ABUSE_STATE_BACKEND": "mysql", "INQUIRY_RATE_LIMIT_PER_IP_PER_MINUTE": "1"}
+        with patch.dict("os.environ", env, clear=False), self.assertLogs(
+            "flask_api.services.inquiry_abuse_guard", level="WARNING"
+        ) as logs:
+            first = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="6.6.6.6", user_agent="ua")
+            second = InquiryAbuseGuard.evaluate(inquiry, raw_payload={}, client_ip="6.6.6.6", user_agent="ua")
+
+        self.assertIn("inquiry_abuse_state_unavailable", logs.output[0])
+        self.assertTrue(first["allow"])
+        self.assertEqual(second["warning_code"], "rate_limit_minute")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,189 @@
+import smtplib
+import sys
+import unittest
+from email.message import EmailMessage
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api import app  # noqa: E402
+from flask_api.models.inquiry_email_outbox import InquiryEmailOutbox  # noqa: E402
+from flask_api.services.inquiry_email_dispatcher import InquiryEmailDispatcher  # noqa: E402
+
+SMTP_CONFIG = {
+    "smtp_host": "smtp.example.com",
+    "smtp_port": 587,
+    "smtp_username": "mailer@example.com",
+    "smtp_password": "secret",
+    "smtp_use_tls": True,
+}
+
+
+def _build_message(recipient):
+    message = EmailMessage()
+    message["Subject"] = "New inquiry"
+    message["From"] = "mailer@example.com"
+    message["To"] = recipient
+    message.set_content("Hello")
+    return message
+
+
+def _outbox_row(row_id, email_type="owner_notification", attempts=1):
+    return {
+        "id": row_id,
+        "inquiry_id": 40 + row_id,
+        "email_type": email_type,
+        "recipient": "owner@example.com",
+        "message_mime": _build_message("owner@example.com").as_string(),
+        "attempts": attempts,
+    }
+
+
+class InquiryEmailOutboxTests(unittest.TestCase):
+    @patch("flask_api.models.inquiry_email_outbox.query_db_many")
+    def test_enqueue_stores_serialized_messages_on_callers_connection(self, mock_query_db_many):
+        connection = object()
+        InquiryEmailOutbox.enqueue(
+            12,
+            [{"email_type": "owner_notification", "message": _build_message("owner@example.com")}],
+            connection=connection,
+        )
+
+        _, rows = mock_query_db_many.call_args.args
+        self.assertEqual(mock_query_db_many.call_args.kwargs["connection"], connection)
+        self.assertFalse(mock_query_db_many.call_args.kwargs["auto_commit"])
+        self.assertEqual(rows[0]["inquiry_id"], 12)
+        self.assertEqual(rows[0]["recipient"], "owner@example.com")
+        parsed = InquiryEmailOutbox.parse_message(rows[0]["message_mime"])
+        self.assertEqual(parsed["Subject"], "New inquiry")
+        self.assertEqual(parsed.get_content().strip(), "Hello")
+
+
+@patch("flask_api.services.inquiry_email_dispatcher.InquiryService._get_smtp_config", return_value=SMTP_CONFIG)
+@patch("flask_api.services.inquiry_email_dispatcher.InquiryEmailOutbox.mark_failed")
+@patch("flask_api.services.inquiry_email_dispatcher.InquiryEmailOutbox.mark_retry")
+@patch("flask_api.services.inquiry_email_dispatcher.InquiryEmailOutbox.mark_sent")
+@patch("flask_api.services.inquiry_email_dispatcher.InquiryEmailOutbox.claim_batch")
+@patch("flask_api.services.inquiry_email_dispatcher.smtplib.SMTP")
+class InquiryEmailDispatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.connection = object()
+        transaction_patcher = patch("flask_api.services.inquiry_email_dispatcher.db_transaction")
+        mock_db_transaction = transaction_patcher.start()
+        mock_db_transaction.return_value.__enter__.return_value = self.connection
+        self.addCleanup(transaction_patcher.stop)
+        email_sent_patcher = patch("flask_api.services.inquiry_email_dispatcher.Inquiry.set_email_sent")
+        self.mock_set_email_sent = email_sent_patcher.start()
+        self.addCleanup(email_sent_patcher.stop)
+
+    def test_batch_reuses_one_smtp_session(
+        self, mock_smtp, mock_claim, mock_mark_sent, mock_mark_retry, mock_mark_failed, _mock_config
+    ):
+        mock_claim.return_value = [_outbox_row(1), _outbox_row(2, email_type="customer_confirmation")]
+
+        result = InquiryEmailDispatcher.deliver_pending_batch(batch_size=5)
+
+        self.assertEqual(result, {"claimed": 2, "sent": 2, "deferred": 0})
+        mock_smtp.assert_called_once()
+        server = mock_smtp.return_value
+        server.starttls.assert_called_once()
+        server.login.assert_called_once_with("mailer@example.com", "secret")
+        self.assertEqual(server.send_message.call_count, 2)
+        server.quit.assert_called_once()
+        self.assertEqual(mock_mark_sent.call_count, 2)
+        mock_mark_sent.assert_called_with(mock_claim.return_value[1], connection=self.connection)
+        # Only the owner notification flags the inquiry, in the same transaction as its outbox row.
+        self.mock_set_email_sent.assert_called_once_with(41, True, connection=self.connection)
+        mock_mark_retry.assert_not_called()
+        mock_mark_failed.assert_not_called()
+
+    def test_transient_failure_schedules_backoff_and_reconnects(
+        self, mock_smtp, mock_claim, mock_mark_sent, mock_mark_retry, mock_mark_failed, _mock_config
+    ):
+        mock_claim.return_value = [_outbox_row(1, attempts=3), _outbox_row(2)]
+        first_server = MagicMock()
+        first_server.send_message.side_effect = smtplib.SMTPServerDisconnected("gone")
+        second_server = MagicMock()
+        mock_smtp.side_effect = [first_server, second_server]
+
+        with patch.dict(
+            "os.environ",
+            {"INQUIRY_EMAIL_RETRY_BASE_SECONDS": "30", "INQUIRY_EMAIL_RETRY_MAX_SECONDS": "3600"},
+            clear=False,
+        ):
+            result = InquiryEmailDispatcher.deliver_pending_batch(batch_size=5)
+
+        self.assertEqual(result, {"claimed": 2, "sent": 1, "deferred": 1})
+        self.assertEqual(mock_smtp.call_count, 2)
+        mock_mark_retry.assert_called_once_with(mock_claim.return_value[0], 120, "smtp_server_disconnected")
+        mock_mark_sent.assert_called_once_with(mock_claim.return_value[1], connection=self.connection)
+        mock_mark_failed.assert_not_called()
+
+    def test_session_failure_defers_whole_batch_without_reconnecting_per_row(
+        self, mock_smtp, mock_claim, mock_mark_sent, mock_mark_retry, _mock_mark_failed, _mock_config
+    ):
+        mock_claim.return_value = [_outbox_row(1), _outbox_row(2)]
+        mock_smtp.side_effect = smtplib.SMTPConnectError(421, "unavailable")
+
+        result = InquiryEmailDispatcher.deliver_pending_batch(batch_size=5)
+
+        self.assertEqual(result, {"claimed": 2, "sent": 0, "deferred": 2})
+        mock_smtp.assert_called_once()
+        self.assertEqual(mock_mark_retry.call_count, 2)
+        mock_mark_sent.assert_not_called()
+
+    def test_exhausted_or_permanent_failures_are_marked_failed(
+        self, mock_smtp, mock_claim, _mock_mark_sent, mock_mark_retry, mock_mark_failed, _mock_config
+    ):
+        mock_claim.return_value = [_outbox_row(1, attempts=8), _outbox_row(2)]
+        mock_smtp.return_value.send_message.side_effect = [
+            smtplib.SMTPResponseException(451, "try later"),
+            smtplib.SMTPRecipientsRefused({"owner@example.com": (550, b"no such user")}),
+        ]
+
+        with patch.dict("os.environ", {"INQUIRY_EMAIL_MAX_ATTEMPTS": "8"}, clear=False):
+            InquiryEmailDispatcher.deliver_pending_batch(batch_size=5)
+
+        self.assertEqual(mock_mark_failed.call_count, 2)
+        self.assertEqual(mock_mark_failed.call_args_list[1].args[1], "smtp_recipient_refused")
+        mock_mark_retry.assert_not_called()
+
+    def test_empty_queue_does_not_open_smtp_session(
+        self, mock_smtp, mock_claim, _mock_mark_sent, _mock_mark_retry, _mock_mark_failed, _mock_config
+    ):
+        mock_claim.return_value = []
+
+        result = InquiryEmailDispatcher.deliver_pending_batch()
+
+        self.assertEqual(result, {"claimed": 0, "sent": 0, "deferred": 0})
+        mock_smtp.assert_not_called()
+
+
+class InquiryEmailDispatcherWorkerTests(unittest.TestCase):
+    @patch("flask_api.services.inquiry_email_dispatcher.threading.Thread")
+    def test_notify_skips_worker_when_disabled(self, mock_thread):
+        with patch.dict("os.environ", {"INQUIRY_EMAIL_WORKER_ENABLED": "false"}, clear=False):
+            InquiryEmailDispatcher.notify()
+
+        mock_thread.assert_not_called()
+
+    @patch("flask_api.services.inquiry_email_dispatcher.threading.Thread")
+    def test_first_request_starts_worker_once_per_process(self, mock_thread):
+        mock_thread.return_value.is_alive.return_value = True
+        self.addCleanup(InquiryEmailDispatcher.stop, timeout=0)
+        client = app.test_client()
+        with patch.dict(
+            "os.environ", {"INQUIRY_EMAIL_WORKER_ENABLED": "true", "CACHE_VERSION_BUS_ENABLED": "false"}, clear=False
+        ):
+            client.options("/api/menus")
+            client.options("/api/slides")
+
+        mock_thread.assert_called_once()
+        mock_thread.return_value.start.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
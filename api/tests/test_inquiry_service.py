@@ -190,14 +190,14 @@ class InquiryServiceFormattingTests(unittest.TestCase):
 
     @patch("flask_api.services.inquiry_service.Inquiry.from_payload")
     @patch("flask_api.services.inquiry_service.InquiryAbuseGuard.evaluate")
-    @patch("flask_api.services.inquiry_service.InquiryAbuseGuard.record_successful_submission")
-    def test_submit_returns_500_and_does_not_record_duplicate_on_save_failure(
+    @patch("flask_api.services.inquiry_service.InquiryAbuseGuard.release_duplicate_claim")
+    def test_submit_returns_500_and_releases_duplicate_claim_on_save_failure(
         self,
-        mock_record_successful_submission,
+        mock_release_duplicate_claim,
         mock_abuse_evaluate,
         mock_from_payload,
     ):
-        def _save_raises():
+        def _save_raises(**_kwargs):
             raise RuntimeError("db unavailable")
 
         mock_from_payload.return_value = SimpleNamespace(
@@ -217,13 +217,38 @@ class InquiryServiceFormattingTests(unittest.TestCase):
             "warning_code": None,
             "silent_accept": False,
             "alert": False,
-            "meta": {"duplicate_key": "dupe-key"},
+            "meta": {"duplicate_key": "dupe-key", "duplicate_claimed_at": 1000.0},
         }
 
         body, status_code = InquiryService.submit({}, client_ip="1.2.3.4", user_agent="ua")
         self.assertEqual(status_code, 500)
         self.assertEqual(body, {"errors": ["Unable to process inquiry right now. Please try again later."]})
-        mock_record_successful_submission.assert_not_called()
+        mock_release_duplicate_claim.assert_called_once_with(mock_abuse_evaluate.return_value["meta"])
+
+    @patch.dict("os.environ", {"INQUIRY_EMAIL_DELIVERY_MODE": "outbox", "SMTP_HOST": ""}, clear=False)
+    @patch(
+        "flask_api.services.inquiry_service.InquiryService._get_confirmation_email_content",
+        return_value=("Thanks", "Note"),
+    )
+    @patch("flask_api.services.inquiry_service.Inquiry.from_payload")
+    @patch("flask_api.services.inquiry_service.InquiryAbuseGuard.evaluate", return_value={"allow": True})
+    def test_submit_logs_email_skip_with_saved_inquiry_id(self, _mock_abuse_evaluate, mock_from_payload, _mock_content):
+        inquiry = SimpleNamespace(id=None, service_selection={}, desired_menu_items=[], message="", validate=lambda: [])
+
+        def save(build_outbox_messages=None):
+            inquiry.id = 51
+            self.assertEqual(build_outbox_messages(inquiry), [])
+            return inquiry.id
+
+        inquiry.save = save
+        mock_from_payload.return_value = inquiry
+
+        with self.assertLogs("flask_api.services.inquiry_service", level="WARNING") as logs:
+            body, status_code = InquiryService.submit({}, client_ip="1.2.3.4", user_agent="ua")
+
+        self.assertEqual((status_code, body["inquiry_id"]), (201, 51))
+        skipped = next(line for line in logs.output if "inquiry_email_skipped_missing_smtp_config" in line)
+        self.assertIn('"inquiry_id": 51', skipped)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.last_known_good_store import LastKnownGoodStore  # noqa: E402
+
+
+class LastKnownGoodStoreTests(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = Path(temp_dir.name) / "lkg"
+        env_patcher = patch.dict(os.environ, {"PUBLIC_LAST_KNOWN_GOOD_DIR": str(self.directory)})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        LastKnownGoodStore.clear()
+        self.addCleanup(LastKnownGoodStore.clear)
+
+    def _save(self, key, body):
+        return LastKnownGoodStore.save(key, body, hashlib.sha256(body).hexdigest())
+
+    def test_saved_body_survives_a_restart_via_disk(self):
+        body = b'{"slides":[{"id":1}]}'
+        self.assertTrue(self._save("PublicMediaCache:response:slides", body))
+
+        LastKnownGoodStore.clear()
+        loaded = LastKnownGoodStore.load("PublicMediaCache:response:slides")
+
+        self.assertEqual(loaded["body"], body)
+        self.assertEqual(loaded["etag"], hashlib.sha256(body).hexdigest())
+        self.assertLess(loaded["age_seconds"], 60)
+        self.assertEqual([path.name for path in self.directory.iterdir()], ["PublicMediaCache_response_slides.json"])
+
+    def test_newer_body_replaces_file(self):
+        self._save("MenuCatalogCache:response:db", b'{"v":1}')
+        self._save("MenuCatalogCache:response:db", b'{"v":2}')
+        LastKnownGoodStore.clear()
+
+        self.assertEqual(LastKnownGoodStore.load("MenuCatalogCache:response:db")["body"], b'{"v":2}')
+
+    def test_bodies_older_than_max_age_are_not_served(self):
+        self._save("PublicMediaCache:response:gallery", b'{"media":[]}')
+        path = self.directory / "PublicMediaCache_response_gallery.json"
+        old = time.time() - 7200
+        os.utime(path, (old, old))
+        LastKnownGoodStore.clear()
+
+        with patch.dict(os.environ, {"PUBLIC_STALE_IF_ERROR_MAX_AGE_SECONDS": "3600"}):
+            self.assertIsNone(LastKnownGoodStore.load("PublicMediaCache:response:gallery"))
+        self.assertIsNotNone(LastKnownGoodStore.load("PublicMediaCache:response:gallery"))
+
+    def test_unwritable_directory_keeps_memory_copy(self):
+        self.directory.parent.joinpath("lkg").write_text("not a directory")
+
+        with self.assertLogs("flask_api.services.last_known_good_store", level="WARNING"):
+            self.assertFalse(self._save("PublicMediaCache:response:slides", b"{}"))
+        self.assertEqual(LastKnownGoodStore.load("PublicMediaCache:response:slides")["body"], b"{}")
+
+    @patch.dict(os.environ, {"PUBLIC_STALE_IF_ERROR_ENABLED": "false"})
+    def test_disabled_store_keeps_nothing(self):
+        self.assertFalse(self._save("PublicMediaCache:response:slides", b"{}"))
+        self.assertIsNone(LastKnownGoodStore.load("PublicMediaCache:response:slides"))
+        self.assertFalse(self.directory.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
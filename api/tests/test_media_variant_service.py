@@ -0,0 +1,92 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.media_variant_service import Image, MediaVariantService  # noqa: E402
+
+
+@unittest.skipUnless(Image is not None, "Pillow is not installed")
+class MediaVariantGenerationTests(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+
+    def _write_source(self, name, size):
+        source_path = self.root / name
+        Image.new("RGB", size, color=(200, 40, 40)).save(source_path)
+        return source_path
+
+    def test_generates_downscaled_webp_variants(self):
+        source_path = self._write_source("hall.jpg", (2400, 1200))
+
+        with patch.dict("os.environ", {"MEDIA_VARIANT_FORMATS": "webp"}, clear=False):
+            result = MediaVariantService.generate_variants(source_path, self.root / "_variants", "/v")
+
+        self.assertEqual((result["source_width"], result["source_height"]), (2400, 1200))
+        self.assertEqual([variant["width"] for variant in result["variants"]], [320, 960, 1920])
+        self.assertEqual(result["variants"][0]["height"], 160)
+        self.assertEqual(result["variants"][0]["url"], "/v/hall-320w.webp")
+        with Image.open(self.root / "_variants" / "hall-960w.webp") as variant:
+            self.assertEqual(variant.format, "WEBP")
+            self.assertEqual(variant.size, (960, 480))
+
+    def test_small_sources_are_not_upscaled(self):
+        source_path = self._write_source("icon.png", (200, 100))
+
+        with patch.dict("os.environ", {"MEDIA_VARIANT_FORMATS": "webp"}, clear=False):
+            result = MediaVariantService.generate_variants(source_path, self.root / "_variants", "/v")
+
+        self.assertEqual([(variant["label"], variant["width"]) for variant in result["variants"]], [("thumb", 200)])
+
+    @patch("flask_api.services.media_variant_service.MediaVariantService.save_variants")
+    def test_process_media_stores_manifest(self, mock_save_variants):
+        source_path = self._write_source("hall.jpg", (1000, 500))
+
+        with patch.dict("os.environ", {"MEDIA_VARIANT_FORMATS": "webp"}, clear=False):
+            MediaVariantService.process_media(7, source_path, "/api/assets/slides")
+
+        media_id, manifest = mock_save_variants.call_args.args
+        self.assertEqual(media_id, 7)
+        self.assertEqual(manifest["variants"][0]["url"], "/api/assets/slides/_variants/hall-320w.webp")
+
+
+class MediaVariantSchedulingTests(unittest.TestCase):
+    def setUp(self):
+        MediaVariantService._executor = None
+        MediaVariantService._executor_pid = None
+
+    @patch("flask_api.services.media_variant_service.MediaVariantService.output_formats", return_value=["webp"])
+    def test_schedule_rejects_work_beyond_the_queue_limit(self, _mock_formats):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_process(*_args):
+            started.set()
+            release.wait(5)
+
+        env = {"MEDIA_VARIANT_WORKERS": "1", "MEDIA_VARIANT_QUEUE_LIMIT": "0"}
+        with patch.dict("os.environ", env, clear=False), patch.object(
+            MediaVariantService, "process_media", side_effect=slow_process
+        ), self.assertLogs("flask_api.services.media_variant_service", level="WARNING"):
+            self.assertTrue(MediaVariantService.schedule(1, "/tmp/one.jpg", "/api/assets/slides"))
+            started.wait(5)
+            self.assertFalse(MediaVariantService.schedule(2, "/tmp/two.jpg", "/api/assets/slides"))
+            release.set()
+            MediaVariantService._executor.shutdown(wait=True)
+
+    @patch("flask_api.services.media_variant_service.MediaVariantService.output_formats", return_value=["webp"])
+    def test_schedule_skips_formats_that_are_not_resized(self, _mock_formats):
+        self.assertFalse(MediaVariantService.schedule(1, "/tmp/clip.gif", "/api/assets/slides"))
+        self.assertIsNone(MediaVariantService._executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pymysql
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.cache_version_bus import CacheVersionBus  # noqa: E402
+from flask_api.services.menu_catalog_cache import MenuCatalogCache  # noqa: E402
+from flask_api.services.menu_catalog_snapshot import MenuCatalogSnapshot  # noqa: E402
+
+
+class _SnapshotTable:
+    """Stands in for query_db against the menu_catalog_snapshots table."""
+
+    def __init__(self, row=None):
+        self.row = dict(row) if row else None
+        self.statements = []
+
+    def __call__(self, query, data=None, fetch="all", connection=None, auto_commit=True):
+        normalized = " ".join(query.split())
+        self.statements.append(normalized)
+        if normalized.startswith("SELECT version, source_version, CASE"):
+            if self.row is None:
+                return None
+            unchanged = self.row["version"] == data["known_version"]
+            return {
+                "version": self.row["version"],
+                "source_version": self.row.get("source_version", 0),
+                "catalog_json": None if unchanged else self.row["catalog_json"],
+            }
+        if normalized.startswith("SELECT version FROM"):
+            return {"version": self.row["version"]} if self.row else None
+        if normalized.startswith("UPDATE menu_catalog_snapshots SET version = version + 1, catalog_json = NULL;"):
+            if self.row:
+                self.row = {**self.row, "version": self.row["version"] + 1, "catalog_json": None}
+        elif normalized.startswith("INSERT IGNORE INTO menu_catalog_snapshots") and self.row is None:
+            self.row = {"version": 0, "catalog_json": None}
+        elif normalized.startswith("UPDATE menu_catalog_snapshots") and self.row:
+            self.row = {
+                "version": self.row["version"] + 1,
+                "catalog_json": (data or {}).get("catalog_json"),
+                **({"source_version": data["source_version"]} if data and "source_version" in data else {}),
+            }
+        return None
+
+
+@patch.dict(os.environ, {"MENU_CATALOG_SNAPSHOT_ENABLED": "true", "CACHE_VERSION_BUS_ENABLED": "false"})
+class MenuCatalogSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        MenuCatalogSnapshot.clear()
+        self.addCleanup(MenuCatalogSnapshot.clear)
+        CacheVersionBus.reset()
+        self.addCleanup(CacheVersionBus.reset)
+        transaction_patcher = patch("flask_api.services.menu_catalog_snapshot.db_transaction")
+        self.mock_db_transaction = transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        self.mock_db_transaction.return_value.__enter__.return_value = "connection"
+        self.mock_db_transaction.return_value.__exit__.return_value = False
+
+    def _use_table(self, table):
+        patcher = patch("flask_api.services.menu_catalog_snapshot.query_db", side_effect=table)
+        self.mock_query_db = patcher.start()
+        self.addCleanup(patcher.stop)
+        return table
+
+    def _builder(self, catalog):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return catalog
+
+        return build, calls
+
+    def test_load_fetches_body_once_then_only_checks_version(self):
+        table = self._use_table(_SnapshotTable({"version": 7, "catalog_json": json.dumps({"menu": {"a": 1}})}))
+        build, build_calls = self._builder({"menu": {}})
+
+        first, first_version = MenuCatalogSnapshot.load("public", build)
+        second, second_version = MenuCatalogSnapshot.load("public", build)
+
+        self.assertEqual(first, {"menu": {"a": 1}})
+        self.assertIs(second, first)
+        self.assertEqual((first_version, second_version), (7, 7))
+        self.assertEqual(len(table.statements), 2)
+        self.assertEqual(build_calls, [])
+
+    def test_load_picks_up_a_version_published_elsewhere(self):
+        table = self._use_table(_SnapshotTable({"version": 1, "catalog_json": json.dumps({"v": 1})}))
+        build, _build_calls = self._builder({"v": 0})
+        MenuCatalogSnapshot.load("public", build)
+
+        table.row = {"version": 2, "catalog_json": json.dumps({"v": 2})}
+        catalog, version = MenuCatalogSnapshot.load("public", build)
+
+        self.assertEqual((catalog, version), ({"v": 2}, 2))
+        self.assertEqual(MenuCatalogSnapshot.get_local_version("public"), 2)
+
+    def test_load_publishes_when_no_snapshot_exists(self):
+        table = self._use_table(_SnapshotTable())
+        build, build_calls = self._builder({"menu": {"b": 2}})
+
+        catalog, version = MenuCatalogSnapshot.load("public", build)
+
+        self.assertEqual((catalog, version), ({"menu": {"b": 2}}, 1))
+        self.assertEqual(build_calls, [1])
+        # The row is seeded before the locking read, so FOR UPDATE never runs against a missing row.
+        seed_index = next(i for i, statement in enumerate(table.statements) if statement.startswith("INSERT IGNORE"))
+        lock_index = next(i for i, statement in enumerate(table.statements) if statement.endswith("FOR UPDATE;"))
+        self.assertLess(seed_index, lock_index)
+        self.assertEqual(json.loads(table.row["catalog_json"]), {"menu": {"b": 2}})
+
+    def test_publish_builds_outside_the_transaction(self):
+        self._use_table(_SnapshotTable({"version": 2, "catalog_json": "{}"}))
+        events = []
+        self.mock_db_transaction.side_effect = lambda *args, **kwargs: events.append("transaction") or (
+            self.mock_db_transaction.return_value
+        )
+
+        MenuCatalogSnapshot.publish("public", lambda: events.append("build") or {"menu": {}})
+
+        self.assertEqual(events, ["build", "transaction"])
+
+    def test_publish_rebuilds_when_another_publish_lands_first(self):
+        table = self._use_table(_SnapshotTable({"version": 2, "catalog_json": "{}"}))
+        catalogs = iter([{"v": "older"}, {"v": "newer"}])
+
+        def build():
+            catalog = next(catalogs)
+            if catalog["v"] == "older":
+                # Another worker publishes while this build is running.
+                table.row = {"version": 3, "catalog_json": json.dumps({"v": "other"})}
+            return catalog
+
+        catalog, version = MenuCatalogSnapshot.publish("public", build)
+
+        self.assertEqual((catalog, version), ({"v": "newer"}, 4))
+        self.assertEqual(json.loads(table.row["catalog_json"]), {"v": "newer"})
+
+    def test_publish_retries_a_deadlocked_swap(self):
+        table = _SnapshotTable({"version": 2, "catalog_json": "{}"})
+        deadlocks = [pymysql.err.OperationalError(1213, "Deadlock found when trying to get lock")]
+
+        def query(query, *args, **kwargs):
+            if "FOR UPDATE" in query and deadlocks:
+                raise deadlocks.pop()
+            return table(query, *args, **kwargs)
+
+        self._use_table(query)
+        build, build_calls = self._builder({"menu": {}})
+
+        _catalog, version = MenuCatalogSnapshot.publish("public", build)
+
+        self.assertEqual(version, 3)
+        self.assertEqual(len(build_calls), 2)
+
+    def test_publish_bumps_version_and_keeps_local_copy(self):
+        table = self._use_table(_SnapshotTable({"version": 4, "catalog_json": "{}"}))
+        build, _build_calls = self._builder({"menu": {"c": 3}})
+
+        catalog, version = MenuCatalogSnapshot.publish("public", build)
+        statement_count = len(table.statements)
+        loaded, loaded_version = MenuCatalogSnapshot.load("public", build)
+
+        self.assertEqual(version, 5)
+        self.assertIs(loaded, catalog)
+        self.assertEqual(loaded_version, 5)
+        self.assertEqual(len(table.statements), statement_count + 1)
+
+    def test_publish_with_empty_build_clears_the_stored_body(self):
+        table = self._use_table(_SnapshotTable({"version": 3, "catalog_json": json.dumps({"old": True})}))
+        build, _build_calls = self._builder(None)
+
+        catalog, version = MenuCatalogSnapshot.publish("public", build)
+
+        self.assertIsNone(catalog)
+        self.assertIsNone(version)
+        self.assertEqual(table.row, {"version": 4, "catalog_json": None})
+
+    def test_refresh_marks_snapshot_stale_when_publish_fails(self):
+        table = self._use_table(_SnapshotTable({"version": 3, "catalog_json": "{}"}))
+
+        def build():
+            raise pymysql.err.OperationalError(2013, "Lost connection")
+
+        self.assertIsNone(MenuCatalogSnapshot.refresh("public", build))
+        self.assertEqual(table.row, {"version": 4, "catalog_json": None})
+
+    @patch.dict(os.environ, {"CACHE_VERSION_BUS_ENABLED": "false"})
+    def test_worker_reloading_between_write_commit_and_publish_rebuilds(self):
+        table = self._use_table(_SnapshotTable({"version": 3, "catalog_json": json.dumps({"v": "before"})}))
+        MenuCatalogSnapshot.load("public", lambda: {"v": "unused"})
+
+        # The admin write bumps the menu counter and commits; its after_request publish has not run yet.
+        CacheVersionBus.bump(CacheVersionBus.MENU, connection="connection")
+        # Another worker saw the bump, dropped its cache and reloads before that publish lands.
+        catalog, version = MenuCatalogSnapshot.load("public", lambda: {"v": "after"})
+
+        self.assertEqual(catalog, {"v": "after"})
+        self.assertEqual(version, 5)
+        # The snapshot was marked stale inside the write's transaction, not after it.
+        stale_call = self.mock_query_db.call_args_list[1]
+        self.assertIn("catalog_json = NULL", stale_call.args[0])
+        self.assertEqual(stale_call.kwargs["connection"], "connection")
+        self.assertEqual(json.loads(table.row["catalog_json"]), {"v": "after"})
+
+    @patch.dict(os.environ, {"CACHE_VERSION_BUS_ENABLED": "true"})
+    @patch("flask_api.services.cache_version_bus.query_db")
+    def test_load_rebuilds_a_snapshot_older_than_the_polled_counters(self, mock_bus_query_db):
+        table = self._use_table(
+            _SnapshotTable({"version": 3, "source_version": 4, "catalog_json": json.dumps({"v": "before"})})
+        )
+        MenuCatalogSnapshot.load("public", lambda: {"v": "unused"})
+        # This worker's poll saw a write the snapshot does not include yet.
+        mock_bus_query_db.return_value = [
+            {"cache_key": "menu", "version": 3},
+            {"cache_key": "service_plans", "version": 2},
+        ]
+        CacheVersionBus.revalidate((MenuCatalogCache,))
+
+        catalog, version = MenuCatalogSnapshot.load("public", lambda: {"v": "after"})
+
+        self.assertEqual((catalog, version), ({"v": "after"}, 4))
+        self.assertEqual(table.row["source_version"], 5)
+        # Rebuilt once; the stored total now covers what this worker has seen.
+        self.assertEqual(MenuCatalogSnapshot.load("public", lambda: {"v": "again"}), ({"v": "after"}, 4))
+
+    def test_load_builds_directly_when_snapshot_table_is_missing(self):
+        self._use_table(
+            lambda *args, **kwargs: (_ for _ in ()).throw(
+                pymysql.err.ProgrammingError(1146, "Table 'menu_catalog_snapshots' doesn't exist")
+            )
+        )
+        build, build_calls = self._builder({"menu": {}})
+
+        catalog, version = MenuCatalogSnapshot.load("public", build)
+
+        self.assertEqual(catalog, {"menu": {}})
+        self.assertIsNone(version)
+        self.assertEqual(build_calls, [1])
+
+    @patch.dict(os.environ, {"MENU_CATALOG_SNAPSHOT_ENABLED": "false"})
+    @patch("flask_api.services.menu_catalog_snapshot.query_db")
+    def test_disabled_snapshot_builds_without_touching_the_table(self, mock_query_db):
+        build, build_calls = self._builder({"menu": {}})
+
+        self.assertEqual(MenuCatalogSnapshot.load("public", build), ({"menu": {}}, None))
+        self.assertIsNone(MenuCatalogSnapshot.refresh("public", build))
+        self.assertEqual(build_calls, [1])
+        mock_query_db.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
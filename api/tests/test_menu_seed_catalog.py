@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.menu_seed_catalog import MenuSeedCatalog  # noqa: E402
+from flask_api.services.menu_service import MenuService  # noqa: E402
+
+
+class MenuSeedCatalogTests(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "menu_seed_payload.json"
+        self._write({"MENU_OPTIONS": {"tacos": {"title": "Tacos"}}, "FORMAL_PLAN_OPTIONS": [], "MENU": {}})
+        env_patcher = patch.dict(
+            os.environ, {"MENU_SEED_PAYLOAD_PATH": str(self.path), "MENU_DATA_SOURCE": "seed-file"}
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        MenuSeedCatalog.clear()
+        self.addCleanup(MenuSeedCatalog.clear)
+        parse_patcher = patch.object(MenuSeedCatalog, "_parse", side_effect=MenuSeedCatalog._parse)
+        self.mock_parse = parse_patcher.start()
+        self.addCleanup(parse_patcher.stop)
+
+    def _write(self, raw, path=None):
+        (path or self.path).write_text(json.dumps(raw), encoding="utf-8")
+
+    def test_parses_once_and_reuses_derived_values(self):
+        first, first_status = MenuService.get_catalog()
+        second, _second_status = MenuService.get_catalog()
+
+        self.assertEqual(first_status, 200)
+        self.assertIs(second, first)
+        self.assertEqual(first["source"], "seed-file")
+        self.assertEqual(first["menu_options"], {"tacos": {"title": "Tacos"}})
+        self.assertEqual(self.mock_parse.call_count, 1)
+
+        body = MenuService.get_seed_catalog_body(lambda catalog: json.dumps(catalog).encode())
+        self.assertIs(MenuService.get_seed_catalog_body(lambda catalog: self.fail("re-serialized")), body)
+        self.assertEqual(self.mock_parse.call_count, 1)
+
+    def test_reloads_when_file_is_replaced_even_with_same_size_and_mtime(self):
+        catalog, _status = MenuService.get_catalog()
+        stat = self.path.stat()
+
+        replacement = self.path.with_name("replacement.json")
+        self._write({"MENU_OPTIONS": {"tapas": {"title": "Tacos"}}, "FORMAL_PLAN_OPTIONS": [], "MENU": {}}, replacement)
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(replacement, self.path)
+        reloaded, _status = MenuService.get_catalog()
+
+        self.assertEqual(list(catalog["menu_options"]), ["tacos"])
+        self.assertEqual(list(reloaded["menu_options"]), ["tapas"])
+        self.assertEqual(self.mock_parse.call_count, 2)
+
+    def test_unreadable_rewrite_keeps_last_good_parse(self):
+        catalog, _status = MenuService.get_catalog()
+        self.path.write_text('{"MENU_OPTIONS": {', encoding="utf-8")
+
+        with self.assertLogs("flask_api.services.menu_seed_catalog", level="WARNING"):
+            still_served, status = MenuService.get_catalog()
+        MenuService.get_catalog()
+
+        self.assertEqual(status, 200)
+        self.assertIs(still_served, catalog)
+        self.assertEqual(self.mock_parse.call_count, 2)
+
+    def test_missing_file_reports_error(self):
+        self.path.unlink()
+
+        body, status = MenuService.get_catalog()
+
+        self.assertEqual(status, 500)
+        self.assertEqual(body, {"error": "Menu seed payload not found."})
+
+    def test_load_payload_hands_out_independent_copies(self):
+        payload = MenuService._load_seed_payload()
+        payload["menu_options"].clear()
+
+        self.assertEqual(list(MenuService._load_seed_payload()["menu_options"]), ["tacos"])
+        self.assertEqual(self.mock_parse.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
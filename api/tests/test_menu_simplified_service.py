@@ -3,14 +3,25 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+import pymysql
+
 API_ROOT = Path(__file__).resolve().parents[1]
 if str(API_ROOT) not in sys.path:
     sys.path.insert(0, str(API_ROOT))
 
+from flask_api.services.menu_catalog_cache import MenuCatalogCache  # noqa: E402
 from flask_api.services.menu_service import MenuService  # noqa: E402
 
 
 class MenuSimplifiedServiceTests(unittest.TestCase):
+    def setUp(self):
+        MenuCatalogCache.clear()
+        self.addCleanup(MenuCatalogCache.clear)
+        # Writers bump cross-worker cache counters through the real query_db; keep that off the database.
+        bump_patcher = patch("flask_api.services.cache_version_bus.CacheVersionBus.bump")
+        self.mock_cache_bump = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+
     def test_schema_paths_skip_obsolete_service_plan_migrations(self):
         path_names = [path.name for path in MenuService._get_schema_paths()]
         self.assertIn("20260316_catering_packages_refactor.sql", path_names)
@@ -69,14 +80,14 @@ class MenuSimplifiedServiceTests(unittest.TestCase):
         self.assertEqual(float(row["half_tray_price"]), 95.0)
         self.assertEqual(float(row["full_tray_price"]), 95.0)
 
-    @patch("flask_api.services.menu_service.AdminServicePlanService.list_service_plan_sections")
+    @patch("flask_api.services.menu_service.AdminServicePlanService.list_public_service_plan_catalogs")
     @patch("flask_api.services.menu_service.MenuService._list_items_by_type")
     @patch("flask_api.services.menu_service.MenuService._list_groups_by_type")
     def test_build_catalog_uses_service_plan_tables_when_available(
         self,
         mock_list_groups,
         mock_list_items,
-        mock_list_service_plan_sections,
+        mock_list_public_service_plan_catalogs,
     ):
         mock_list_groups.side_effect = [
             [
@@ -139,7 +150,7 @@ class MenuSimplifiedServiceTests(unittest.TestCase):
                 },
             ],
         ]
-        mock_list_service_plan_sections.side_effect = [
+        catering_response, formal_response = [
             (
                 {
                     "sections": [
@@ -243,6 +254,10 @@ class MenuSimplifiedServiceTests(unittest.TestCase):
                 200,
             ),
         ]
+        mock_list_public_service_plan_catalogs.return_value = (
+            {"catalogs": {"catering": catering_response[0]["sections"], "formal": formal_response[0]["sections"]}},
+            200,
+        )
 
         payload = MenuService._build_catalog_payload_from_simplified_tables()
 
@@ -269,6 +284,233 @@ class MenuSimplifiedServiceTests(unittest.TestCase):
         self.assertEqual(payload["menu"]["catering"]["sections"][0]["packages"][0]["details"], ["Spanish rice"])
         self.assertEqual(payload["menu"]["catering"]["sections"][0]["packages"][0]["selectionMode"], "custom_options")
         self.assertEqual(payload["menu"]["catering"]["sections"][1]["includeKeys"], ["entree", "side", "salad"])
+        mock_list_public_service_plan_catalogs.assert_called_once_with(catalog_keys=("catering", "formal"))
+
+    @patch.dict(
+        "os.environ", {"MENU_CATALOG_SNAPSHOT_ENABLED": "true", "CACHE_VERSION_BUS_ENABLED": "false"}, clear=False
+    )
+    @patch("flask_api.services.menu_catalog_snapshot.MenuCatalogSnapshot._mark_stale")
+    @patch("flask_api.services.menu_catalog_snapshot.MenuCatalogSnapshot._swap")
+    @patch("flask_api.services.menu_catalog_snapshot.MenuCatalogSnapshot._read_version", return_value=3)
+    @patch(
+        "flask_api.services.menu_service.AdminServicePlanService.list_public_service_plan_catalogs",
+        side_effect=pymysql.err.OperationalError(2013, "Lost connection to MySQL server during query"),
+    )
+    @patch("flask_api.services.menu_service.MenuService._list_items_by_type", return_value=[])
+    @patch(
+        "flask_api.services.menu_service.MenuService._list_groups_by_type",
+        return_value=[{"key": "entree", "name": "Entree"}],
+    )
+    def test_snapshot_refresh_marks_stale_instead_of_publishing_fallback_plans(
+        self, _mock_groups, _mock_items, _mock_service_plans, _mock_read_version, mock_swap, mock_mark_stale
+    ):
+        with self.assertLogs("flask_api.services.menu_catalog_snapshot", level="ERROR") as logs:
+            version = MenuService.publish_catalog_snapshot()
+
+        self.assertIsNone(version)
+        mock_swap.assert_not_called()
+        mock_mark_stale.assert_called_once_with(MenuService.CATALOG_SNAPSHOT_KEY)
+        self.assertIn("Lost connection", logs.output[0])
+
+    @patch.dict(
+        "os.environ",
+        {"MENU_DATA_SOURCE": "db", "MENU_CATALOG_CACHE_ENABLED": "true", "MENU_CATALOG_SNAPSHOT_ENABLED": "false"},
+        clear=False,
+    )
+    @patch("flask_api.services.menu_service.MenuService._build_catalog_payload_from_simplified_tables")
+    def test_get_catalog_serves_cached_payload_until_invalidated(self, mock_build_payload):
+        mock_build_payload.return_value = {"menuOptions": {"regular": []}}
+
+        first_body, first_status = MenuService.get_catalog()
+        second_body, second_status = MenuService.get_catalog()
+
+        self.assertEqual(first_status, 200)
+        self.assertEqual(second_status, 200)
+        self.assertIs(second_body, first_body)
+        self.assertEqual(first_body["source"], "simplified-db")
+        self.assertEqual(mock_build_payload.call_count, 1)
+
+        MenuCatalogCache.invalidate()
+        MenuService.get_catalog()
+        self.assertEqual(mock_build_payload.call_count, 2)
+
+    @patch.dict(
+        "os.environ",
+        {"MENU_DATA_SOURCE": "db", "MENU_CATALOG_CACHE_ENABLED": "true", "MENU_CATALOG_SNAPSHOT_ENABLED": "false"},
+        clear=False,
+    )
+    @patch("flask_api.services.menu_service.MenuService._build_catalog_payload_from_simplified_tables")
+    def test_get_catalog_does_not_cache_payload_built_before_concurrent_write(self, mock_build_payload):
+        def build_while_admin_writes():
+            MenuCatalogCache.invalidate()
+            return {"menuOptions": {}}
+
+        mock_build_payload.side_effect = build_while_admin_writes
+
+        MenuService.get_catalog()
+        MenuService.get_catalog()
+
+        self.assertEqual(mock_build_payload.call_count, 2)
+
+    @patch.dict("os.environ", {"MENU_DATA_SOURCE": "db", "MENU_CATALOG_SNAPSHOT_ENABLED": "false"}, clear=False)
+    @patch("flask_api.services.menu_service.MenuService._build_catalog_payload_from_simplified_tables", return_value={})
+    def test_get_catalog_does_not_cache_empty_table_error(self, mock_build_payload):
+        MenuService.get_catalog()
+        _, status_code = MenuService.get_catalog()
+
+        self.assertEqual(status_code, 500)
+        self.assertEqual(mock_build_payload.call_count, 2)
+
+    @patch("flask_api.services.menu_service.query_db_many")
+    @patch("flask_api.services.menu_service.query_db")
+    @patch("flask_api.services.menu_service.MenuService._ensure_reference_tables", return_value=({}, {}))
+    @patch("flask_api.services.menu_service.db_transaction")
+    def test_sync_simplified_from_payload_invalidates_catalog_cache(
+        self, mock_db_transaction, _mock_reference_tables, _mock_query_db, _mock_query_db_many
+    ):
+        mock_db_transaction.return_value.__enter__.return_value = "connection"
+        mock_db_transaction.return_value.__exit__.return_value = False
+        version_before = MenuCatalogCache.get_version()
+
+        result = MenuService.sync_simplified_from_payload(payload={"menu": {}})
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(MenuCatalogCache.get_version(), version_before + 1)
+        self.mock_cache_bump.assert_called_once_with("menu", connection="connection")
+
+    def test_plan_simplified_items_matches_names_and_resolves_keys_in_memory(self):
+        existing_rows = [
+            {
+                "id": 4,
+                "item_key": "jerk-chicken",
+                "item_name": "jerk chicken",
+                "tray_price_half": "45.00",
+                "tray_price_full": "85.00",
+                "is_active": 1,
+            },
+            {
+                "id": 9,
+                "item_key": "rice",
+                "item_name": "Rice Pilaf",
+                "tray_price_half": None,
+                "tray_price_full": None,
+                "is_active": 1,
+            },
+        ]
+        merged_rows = [
+            {"name": "Jerk Chicken", "half_tray_price": "45", "full_tray_price": "85", "menu_types": ["regular"]},
+            {"name": "Rice", "menu_types": ["formal"], "type_groups": {"formal": "side"}},
+            {"name": "Rice Pilaf", "key": "rice-pilaf", "menu_types": []},
+        ]
+
+        planned = MenuService._plan_simplified_items(merged_rows, existing_rows)
+
+        self.assertEqual([entry["action"] for entry in planned], ["update", "insert", "update"])
+        self.assertEqual(planned[0]["values"]["id"], 4)
+        self.assertEqual(planned[0]["changes"], ["item_name"])
+        self.assertEqual(planned[1]["values"]["item_key"], "rice-2")
+        self.assertIsNone(planned[1]["values"]["id"])
+        self.assertEqual(planned[1]["assignments"], {"formal": "side"})
+        self.assertEqual(planned[2]["values"]["item_key"], "rice-pilaf")
+        self.assertEqual(planned[2]["changes"], ["item_key"])
+
+    def test_simplified_sync_matches_names_like_the_column_collation(self):
+        existing_rows = [
+            {
+                "id": 7,
+                "item_key": "creme-brulee",
+                "item_name": "Creme Brulee",
+                "tray_price_half": None,
+                "tray_price_full": None,
+                "is_active": 1,
+            }
+        ]
+        merged_rows = MenuService._merge_simplified_rows(
+            general_rows=[{"name": "Crème Brûlée", "group_key": "sides_salads"}],
+            formal_rows=[{"name": "CRÈME BRULÉE", "group_key": "sides"}],
+        )
+
+        planned = MenuService._plan_simplified_items(merged_rows, existing_rows)
+
+        self.assertEqual(len(merged_rows), 1)
+        self.assertEqual(merged_rows[0]["menu_types"], ["formal", "regular"])
+        self.assertEqual([entry["action"] for entry in planned], ["update"])
+        self.assertEqual(planned[0]["values"]["id"], 7)
+        self.assertEqual(planned[0]["values"]["item_name"], "Crème Brûlée")
+
+    @patch("flask_api.services.menu_service.query_db_many")
+    @patch("flask_api.services.menu_service.MenuService._ensure_reference_tables")
+    @patch("flask_api.services.menu_service.MenuService._merge_simplified_rows")
+    @patch("flask_api.services.menu_service.query_db")
+    @patch("flask_api.services.menu_service.db_transaction")
+    def test_sync_simplified_dry_run_reports_diff_without_writing(
+        self, mock_db_transaction, mock_query_db, mock_merge_rows, mock_reference_tables, mock_query_db_many
+    ):
+        mock_db_transaction.return_value.__enter__.return_value = "connection"
+        mock_db_transaction.return_value.__exit__.return_value = False
+        mock_merge_rows.return_value = [
+            {"name": "Jerk Chicken", "menu_types": ["regular"], "type_groups": {"regular": "entree"}},
+            {"name": "Oxtail", "menu_types": ["regular"], "type_groups": {"regular": "signature_protein"}},
+        ]
+        mock_query_db.side_effect = [
+            [{"id": 4, "item_key": "jerk-chicken", "item_name": "Jerk Chicken", "is_active": 1}],
+            [
+                {"menu_item_id": 4, "type_key": "regular", "group_key": "side"},
+                {"menu_item_id": 8, "type_key": "formal", "group_key": "entree"},
+            ],
+        ]
+        version_before = MenuCatalogCache.get_version()
+
+        result = MenuService.sync_simplified_from_payload(payload={"menu": {}}, dry_run=True)
+
+        self.assertTrue(result["dry_run"])
+        self.assertEqual(result["diff"]["items_to_insert"], ["Oxtail"])
+        self.assertEqual(result["diff"]["items_unchanged"], 1)
+        self.assertEqual(result["diff"]["assignments_to_add"], 1)
+        self.assertEqual(result["diff"]["assignments_to_change"], 1)
+        self.assertEqual(result["diff"]["assignments_to_remove"], 1)
+        self.assertIn("preload", result["timings_ms"])
+        mock_reference_tables.assert_not_called()
+        mock_query_db_many.assert_not_called()
+        self.assertEqual(MenuCatalogCache.get_version(), version_before)
+
+    @patch("flask_api.services.menu_service.query_db_many")
+    @patch(
+        "flask_api.services.menu_service.MenuService._ensure_reference_tables",
+        return_value=({"regular": 1}, {"entree": 11}),
+    )
+    @patch("flask_api.services.menu_service.MenuService._merge_simplified_rows")
+    @patch("flask_api.services.menu_service.query_db")
+    @patch("flask_api.services.menu_service.db_transaction")
+    def test_sync_simplified_writes_items_in_one_batched_upsert(
+        self, mock_db_transaction, mock_query_db, mock_merge_rows, _mock_reference_tables, mock_query_db_many
+    ):
+        mock_db_transaction.return_value.__enter__.return_value = "connection"
+        mock_db_transaction.return_value.__exit__.return_value = False
+        mock_merge_rows.return_value = [
+            {"name": f"Item {index}", "menu_types": ["regular"], "type_groups": {"regular": "entree"}}
+            for index in range(500)
+        ]
+        mock_query_db.side_effect = [
+            [],
+            [],
+            None,
+            [{"id": 1000 + index, "item_key": f"item-{index}"} for index in range(500)],
+        ]
+
+        result = MenuService.sync_simplified_from_payload(payload={"menu": {}})
+
+        self.assertEqual(mock_query_db.call_count, 4)
+        self.assertEqual(mock_query_db_many.call_count, 2)
+        item_rows = mock_query_db_many.call_args_list[0].args[1]
+        assignment_rows = mock_query_db_many.call_args_list[1].args[1]
+        self.assertEqual(len(item_rows), 500)
+        self.assertIsNone(item_rows[0]["id"])
+        self.assertEqual(
+            assignment_rows[0], {"menu_item_id": 1000, "menu_type_id": 1, "menu_group_id": 11, "is_active": 1}
+        )
+        self.assertEqual(result["assignment_count"], 500)
+        self.assertEqual(result["items_written"], 500)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+import json
+import os
 import sys
 import unittest
 from pathlib import Path
@@ -23,6 +25,10 @@ def _build_mock_connection():
 
 
 class MysqlConnectionTests(unittest.TestCase):
+    def setUp(self):
+        db.reset_connection_pool()
+        self.addCleanup(db.reset_connection_pool)
+
     def test_query_db_reuses_single_connection_within_request(self):
         app = Flask(__name__)
         mock_connection, _ = _build_mock_connection()
@@ -35,7 +41,35 @@ class MysqlConnectionTests(unittest.TestCase):
                 self.assertEqual(mock_connection.commit.call_count, 2)
                 mock_connection.close.assert_not_called()
                 db.close_request_connection()
-                mock_connection.close.assert_called_once()
+                mock_connection.close.assert_not_called()
+
+            self.assertEqual(db.get_pool_stats()["idle"], 1)
+            with app.test_request_context("/"):
+                db.query_db("SELECT 3")
+                db.close_request_connection()
+            self.assertEqual(mock_connect.call_count, 1)
+
+    def test_app_teardown_returns_request_connection_to_pool(self):
+        app = Flask(__name__)
+        mock_connection, _ = _build_mock_connection()
+
+        @app.teardown_appcontext
+        def teardown(exception):
+            db.close_request_connection(exception=exception)
+
+        @app.route("/")
+        def index():
+            db.query_db("SELECT 1")
+            return "ok"
+
+        with patch.object(db, "connect_to_mysql", return_value=mock_connection):
+            client = app.test_client()
+            self.assertEqual(client.get("/").status_code, 200)
+            self.assertEqual(client.get("/").status_code, 200)
+            stats = db.get_pool_stats()
+
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["created"], 1)
 
     def test_db_transaction_commits_once_for_multiple_queries(self):
         app = Flask(__name__)
@@ -64,13 +98,209 @@ class MysqlConnectionTests(unittest.TestCase):
                 mock_connection.commit.assert_not_called()
                 db.close_request_connection()
 
-    def test_query_db_outside_request_still_opens_and_closes_per_query(self):
+    def test_query_db_outside_request_reuses_pooled_connection(self):
         mock_connection, _ = _build_mock_connection()
         with patch.object(db, "connect_to_mysql", return_value=mock_connection) as mock_connect:
             db.query_db("SELECT 1")
+            db.query_db("SELECT 2")
             mock_connect.assert_called_once()
-            mock_connection.commit.assert_called_once()
-            mock_connection.close.assert_called_once()
+            self.assertEqual(mock_connection.commit.call_count, 2)
+            mock_connection.close.assert_not_called()
+            self.assertEqual(mock_connection.ping.call_count, 2)
+
+        stats = db.get_pool_stats()
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["idle"], 1)
+        self.assertEqual(stats["checkouts"], 2)
+
+    def test_query_db_outside_request_opens_and_closes_per_query_when_pool_disabled(self):
+        mock_connection, _ = _build_mock_connection()
+        with patch.dict(os.environ, {"DB_POOL_ENABLED": "false"}):
+            with patch.object(db, "connect_to_mysql", return_value=mock_connection) as mock_connect:
+                db.query_db("SELECT 1")
+                mock_connect.assert_called_once()
+                mock_connection.commit.assert_called_once()
+                mock_connection.close.assert_called_once()
+
+    def test_query_db_discards_connection_after_operational_error(self):
+        broken_connection, broken_cursor = _build_mock_connection()
+        broken_cursor.execute.side_effect = db.pymysql.err.OperationalError(2013, "Lost connection")
+        healthy_connection, _ = _build_mock_connection()
+
+        with patch.object(db, "connect_to_mysql", side_effect=[broken_connection, healthy_connection]):
+            with self.assertRaises(db.pymysql.err.OperationalError):
+                db.query_db("SELECT 1")
+            broken_connection.close.assert_called_once()
+            self.assertEqual(db.query_db("SELECT 1"), [{"value": 1}])
+
+        self.assertEqual(db.get_pool_stats()["discarded"], 1)
+
+    def test_update_sequence_positions_uses_two_set_based_statements(self):
+        mock_connection, cursor = _build_mock_connection()
+
+        updated = db.update_sequence_positions("slides", "display_order", [9, 4, 7], connection=mock_connection)
+
+        self.assertEqual(updated, 3)
+        self.assertEqual(cursor.execute.call_count, 2)
+        (parked_sql, params), (final_sql, final_params) = [call.args for call in cursor.execute.call_args_list]
+        self.assertEqual(params, {"id_1": 9, "id_2": 4, "id_3": 7})
+        self.assertEqual(final_params, params)
+        self.assertIn("SET display_order = 1000000 + CASE id WHEN %(id_1)s THEN 1", parked_sql)
+        self.assertIn("SET display_order = 0 + CASE id WHEN %(id_1)s THEN 1", final_sql)
+        self.assertIn("WHERE id IN (%(id_1)s, %(id_2)s, %(id_3)s)", final_sql)
+        mock_connection.commit.assert_not_called()
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        pool = db.ConnectionPool(
+            connect=lambda: _build_mock_connection()[0],
+            min_size=0,
+            max_size=1,
+            checkout_timeout_seconds=0.01,
+        )
+        connection = pool.acquire()
+
+        with self.assertRaises(db.DatabasePoolTimeout):
+            pool.acquire()
+
+        pool.release(connection)
+        self.assertIs(pool.acquire(), connection)
+        stats = pool.get_stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["waits"], 0)
+        self.assertEqual(stats["in_use"], 1)
+
+    def test_warms_min_size_connections_on_first_checkout(self):
+        connect = MagicMock(side_effect=lambda: _build_mock_connection()[0])
+        pool = db.ConnectionPool(connect=connect, min_size=3, max_size=5)
+
+        pool.acquire()
+
+        self.assertEqual(connect.call_count, 3)
+        self.assertEqual(pool.get_stats()["idle"], 2)
+        self.assertEqual(pool.get_stats()["in_use"], 1)
+
+    def test_failed_pre_ping_replaces_idle_connection(self):
+        stale_connection, _ = _build_mock_connection()
+        stale_connection.ping.side_effect = db.pymysql.err.OperationalError(2006, "MySQL server has gone away")
+        fresh_connection, _ = _build_mock_connection()
+        pool = db.ConnectionPool(
+            connect=MagicMock(side_effect=[stale_connection, fresh_connection]),
+            min_size=0,
+            max_size=1,
+        )
+        pool.release(pool.acquire())
+
+        self.assertIs(pool.acquire(), fresh_connection)
+        stale_connection.close.assert_called_once()
+        self.assertEqual(pool.get_stats()["ping_failures"], 1)
+        self.assertEqual(pool.get_stats()["size"], 1)
+
+    def test_recycles_connections_past_max_lifetime(self):
+        old_connection, _ = _build_mock_connection()
+        new_connection, _ = _build_mock_connection()
+        pool = db.ConnectionPool(
+            connect=MagicMock(side_effect=[old_connection, new_connection]),
+            min_size=0,
+            max_size=2,
+            max_lifetime_seconds=60,
+            pre_ping=False,
+        )
+
+        with patch.object(db.time, "monotonic", return_value=1000.0):
+            connection = pool.acquire()
+        self.assertIs(connection, old_connection)
+        with patch.object(db.time, "monotonic", return_value=1001.0):
+            pool.release(connection)
+        with patch.object(db.time, "monotonic", return_value=1100.0):
+            self.assertIs(pool.acquire(), new_connection)
+
+        old_connection.close.assert_called_once()
+        old_connection.ping.assert_not_called()
+        self.assertEqual(pool.get_stats()["recycled"], 1)
+
+    def test_query_db_records_request_stats_and_logs_slow_statements(self):
+        app = Flask(__name__)
+        mock_connection, cursor = _build_mock_connection()
+        cursor.fetchall.return_value = [{"id": 1}, {"id": 2}]
+
+        with patch.dict(os.environ, {"DB_POOL_ENABLED": "false", "DB_SLOW_QUERY_MS": "0.000001"}), patch.object(
+            db, "connect_to_mysql", return_value=mock_connection
+        ):
+            with app.test_request_context("/"), self.assertLogs(db.logger, level="WARNING") as logs:
+                with db.capture_queries() as captured:
+                    db.query_db("SELECT id FROM slides WHERE id IN (%(id_1)s, %(id_2)s) AND title = 'x'", {})
+                    db.query_db("SELECT 1", fetch="one")
+                stats = db.get_request_query_stats()
+                db.close_request_connection()
+
+        self.assertEqual((stats.count, stats.rows), (2, 3))
+        self.assertEqual(captured.statements[0], "SELECT id FROM slides WHERE id IN (?, ...) AND title = ?")
+        slow_log = json.loads(logs.records[0].getMessage())
+        self.assertEqual(slow_log["event"], "db_slow_query")
+        self.assertIn("test_mysqlconnection.py", slow_log["call_site"])
+        self.assertIn("test_query_db_records_request_stats_and_logs_slow_statements", slow_log["call_site"])
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        db.reset_connection_pool()
+        self.addCleanup(db.reset_connection_pool)
+
+    def _unreachable(self):
+        return db.pymysql.err.OperationalError(2003, "Can't connect to MySQL server")
+
+    @patch.dict(os.environ, {"DB_POOL_ENABLED": "false", "DB_CIRCUIT_FAILURE_THRESHOLD": "2"})
+    def test_opens_after_repeated_connect_failures_and_fails_fast(self):
+        with patch.object(db, "connect_to_mysql", side_effect=self._unreachable()) as mock_connect:
+            for _attempt in range(2):
+                with self.assertRaises(db.pymysql.err.OperationalError):
+                    db.query_db("SELECT 1")
+            with self.assertRaises(db.DatabaseCircuitOpen) as raised:
+                db.query_db("SELECT 1")
+
+        self.assertEqual(mock_connect.call_count, 2)
+        self.assertGreaterEqual(raised.exception.retry_after_seconds, 1)
+        stats = db.get_circuit_breaker().get_stats()
+        self.assertEqual((stats["state"], stats["opened"], stats["rejected"]), ("open", 1, 1))
+
+    def test_single_probe_after_cool_down_closes_or_reopens(self):
+        breaker = db.CircuitBreaker(failure_threshold=1, open_seconds=30)
+        breaker.record_failure(self._unreachable())
+
+        with patch.object(db.time, "monotonic", return_value=db.time.monotonic() + 31):
+            breaker.before_call()
+            with self.assertRaises(db.DatabaseCircuitOpen):
+                breaker.before_call()
+            breaker.record_failure(self._unreachable())
+            self.assertEqual(breaker.get_stats()["opened"], 2)
+
+        with patch.object(db.time, "monotonic", return_value=db.time.monotonic() + 62):
+            breaker.before_call()
+            breaker.record_success()
+            breaker.before_call()
+        self.assertEqual(breaker.get_stats()["state"], "closed")
+
+    @patch.dict(os.environ, {"DB_POOL_ENABLED": "false", "DB_CIRCUIT_FAILURE_THRESHOLD": "1"})
+    def test_server_side_errors_do_not_trip_the_breaker(self):
+        connection, cursor = _build_mock_connection()
+        cursor.execute.side_effect = db.pymysql.err.OperationalError(1205, "Lock wait timeout exceeded")
+
+        with patch.object(db, "connect_to_mysql", return_value=connection):
+            with self.assertRaises(db.pymysql.err.OperationalError):
+                db.query_db("SELECT 1")
+
+        self.assertEqual(db.get_circuit_breaker().get_stats()["state"], "closed")
+
+    @patch.dict(os.environ, {"DB_CIRCUIT_FAILURE_THRESHOLD": "0"})
+    def test_threshold_zero_disables_the_breaker(self):
+        breaker = db.get_circuit_breaker()
+        for _attempt in range(5):
+            breaker.record_failure(self._unreachable())
+            breaker.before_call()
+
+        self.assertFalse(breaker.get_stats()["enabled"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pymysql
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.menu_service import MenuService  # noqa: E402
+from flask_api.services.schema_migration_service import (  # noqa: E402
+    SchemaMigrationError,
+    SchemaMigrationService,
+)
+
+
+class _FakeCursor:
+    def __init__(self, ledger, lock_acquired=True, fail_on=None, fail_on_error=None):
+        self.ledger = ledger
+        self.lock_acquired = lock_acquired
+        self.fail_on = fail_on
+        self.fail_on_error = fail_on_error
+        self.executed = []
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        return False
+
+    def execute(self, statement, params=None):
+        self.executed.append(statement)
+        normalized = " ".join(statement.split())
+        if self.fail_on and normalized.startswith(self.fail_on):
+            raise self.fail_on_error
+        if normalized.startswith("SELECT GET_LOCK"):
+            self._result = [{"acquired": 1 if self.lock_acquired else 0}]
+        elif normalized.startswith("SELECT version, checksum FROM schema_migrations"):
+            self._result = [{"version": version, "checksum": checksum} for version, checksum in self.ledger.items()]
+        elif normalized.startswith("INSERT INTO schema_migrations"):
+            self.ledger[params["version"]] = params["checksum"]
+            self._result = []
+        return 0
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+    def statements(self):
+        return [
+            " ".join(statement.split())
+            for statement in self.executed
+            if not any(
+                marker in statement for marker in ("schema_migrations", "GET_LOCK", "RELEASE_LOCK", "lock_wait_timeout")
+            )
+        ]
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class SchemaMigrationServiceTests(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.schema = self._write("schema.sql", "CREATE TABLE a (id INT);\nCREATE TABLE b (id INT);\n")
+        self.blocking = self._write("20260101_blocking.sql", "ALTER TABLE a ADD COLUMN c INT;\n")
+        self.online = self._write(
+            "20260102_online.sql", "-- migration: online-safe\nALTER TABLE b ADD KEY idx_b (id);\n"
+        )
+        self.paths = [self.schema, self.blocking, self.online]
+
+    def _write(self, name, text):
+        path = self.root / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def _apply(self, ledger, **kwargs):
+        cursor = _FakeCursor(ledger, **{key: kwargs.pop(key) for key in ("lock_acquired",) if key in kwargs})
+        connection = _FakeConnection(cursor)
+        with patch("flask_api.services.schema_migration_service.connect_to_mysql", return_value=connection):
+            report = SchemaMigrationService.apply(self.paths, **kwargs)
+        return report, cursor, connection
+
+    def _checksum(self, path):
+        return SchemaMigrationService.checksum(path.read_text(encoding="utf-8"))
+
+    def test_split_statements_strips_comments_and_respects_quotes(self):
+        statements = SchemaMigrationService.split_statements(
+            "-- don't split here; really\n"
+            "/* block; comment */ SELECT 'a;b', \"c;d\", 'it''s; fine';\n"
+            "# hash comment;\n"
+            "UPDATE t SET v = 'x\\';y' WHERE id = 1;\n"
+            "SELECT 1 --2;\n"
+        )
+
+        self.assertEqual(
+            statements,
+            [
+                "SELECT 'a;b', \"c;d\", 'it''s; fine'",
+                "UPDATE t SET v = 'x\\';y' WHERE id = 1",
+                "SELECT 1 --2",
+            ],
+        )
+
+    def test_split_statements_parses_every_manifest_file(self):
+        for path in MenuService._get_schema_paths():
+            statements = SchemaMigrationService.split_statements(path.read_text(encoding="utf-8"))
+            self.assertTrue(statements, path.name)
+            for statement in statements:
+                self.assertFalse(statement.startswith(("--", "/*", "#")), f"{path.name}: {statement[:40]}")
+
+    def test_checksum_ignores_line_endings_and_trailing_whitespace(self):
+        self.assertEqual(
+            SchemaMigrationService.checksum("SELECT 1;  \r\nSELECT 2;\r\n"),
+            SchemaMigrationService.checksum("SELECT 1;\nSELECT 2;"),
+        )
+        self.assertNotEqual(SchemaMigrationService.checksum("SELECT 1;"), SchemaMigrationService.checksum("SELECT 2;"))
+
+    def test_online_safe_directive_is_read_from_comment(self):
+        migrations = SchemaMigrationService.load_migrations(self.paths)
+
+        self.assertEqual([migration["online_safe"] for migration in migrations], [False, False, True])
+
+    def test_apply_runs_only_pending_files_and_records_them(self):
+        ledger = {"schema.sql": self._checksum(self.schema)}
+
+        report, cursor, connection = self._apply(ledger)
+
+        self.assertEqual(
+            cursor.statements(),
+            ["ALTER TABLE a ADD COLUMN c INT", "ALTER TABLE b ADD KEY idx_b (id)"],
+        )
+        self.assertEqual([entry["status"] for entry in report["migrations"]], ["up_to_date", "applied", "applied"])
+        self.assertEqual(report["applied"], 2)
+        self.assertEqual(report["migrations"][1]["statement_count"], 1)
+        self.assertIn("duration_ms", report["migrations"][1])
+        self.assertEqual(ledger["20260102_online.sql"], self._checksum(self.online))
+        self.assertTrue(any("RELEASE_LOCK" in statement for statement in cursor.executed))
+        self.assertTrue(connection.closed)
+
+    def test_apply_is_a_no_op_when_everything_is_recorded(self):
+        ledger = {path.name: self._checksum(path) for path in self.paths}
+
+        report, cursor, _connection = self._apply(ledger)
+
+        self.assertEqual(cursor.statements(), [])
+        self.assertEqual(report["applied"], 0)
+        self.assertEqual(report["counts"], {"up_to_date": 3})
+
+    def test_changed_file_is_reapplied_or_rejected_when_strict(self):
+        ledger = {path.name: self._checksum(path) for path in self.paths}
+        ledger["schema.sql"] = "0" * 64
+
+        report, cursor, _connection = self._apply(dict(ledger))
+        self.assertEqual(report["migrations"][0]["status"], "reapplied")
+        self.assertEqual(cursor.statements(), ["CREATE TABLE a (id INT)", "CREATE TABLE b (id INT)"])
+
+        with self.assertRaises(SchemaMigrationError):
+            self._apply(dict(ledger), strict_checksums=True)
+
+    def test_online_only_defers_blocking_file_and_everything_after_it(self):
+        ledger = {"schema.sql": self._checksum(self.schema)}
+
+        report, cursor, _connection = self._apply(ledger, online_only=True)
+
+        self.assertEqual(cursor.statements(), [])
+        self.assertEqual([entry["status"] for entry in report["migrations"]], ["up_to_date", "deferred", "deferred"])
+        self.assertNotIn("20260101_blocking.sql", ledger)
+
+    def test_baseline_records_pending_files_without_running_them(self):
+        ledger = {}
+
+        report, cursor, _connection = self._apply(ledger, baseline=True)
+
+        self.assertEqual(cursor.statements(), [])
+        self.assertEqual(report["counts"], {"baselined": 3})
+        self.assertEqual(set(ledger), {"schema.sql", "20260101_blocking.sql", "20260102_online.sql"})
+
+    def test_apply_refuses_to_run_without_runner_lock(self):
+        with self.assertRaises(SchemaMigrationError):
+            self._apply({}, lock_acquired=False)
+
+    def test_ignorable_alter_errors_do_not_stop_the_file(self):
+        cursor = _FakeCursor(
+            {"schema.sql": self._checksum(self.schema)},
+            fail_on="ALTER TABLE a ADD COLUMN",
+            fail_on_error=pymysql.err.OperationalError(1060, "Duplicate column name 'c'"),
+        )
+        connection = _FakeConnection(cursor)
+        with patch("flask_api.services.schema_migration_service.connect_to_mysql", return_value=connection):
+            report = SchemaMigrationService.apply(self.paths)
+
+        self.assertEqual(report["migrations"][1]["status"], "applied")
+        self.assertEqual(report["migrations"][1]["statement_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from flask_api.services.single_flight import SingleFlight  # noqa: E402
+
+
+class SingleFlightTests(unittest.TestCase):
+    def setUp(self):
+        SingleFlight.reset()
+        self.addCleanup(SingleFlight.reset)
+
+    def _start_leader(self, key, release, result="built"):
+        started = threading.Event()
+        calls = []
+
+        def build():
+            calls.append(threading.get_ident())
+            started.set()
+            release.wait(5)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(SingleFlight.run(key, build))
+            except Exception as exc:
+                errors.append(exc)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        self.assertTrue(started.wait(5))
+        return leader, build, calls, results, errors
+
+    def _wait_for_followers(self, key, count):
+        for _attempt in range(500):
+            if SingleFlight.get_stats()["keys"].get(key, {}).get("coalesced") == count:
+                return
+            threading.Event().wait(0.01)
+        self.fail(f"{count} followers never joined {key}")
+
+    def test_concurrent_callers_share_one_build(self):
+        release = threading.Event()
+        leader, build, calls, results, _errors = self._start_leader("catalog", release)
+        followers = [
+            threading.Thread(target=lambda: results.append(SingleFlight.run("catalog", build))) for _ in range(4)
+        ]
+        for follower in followers:
+            follower.start()
+        self._wait_for_followers("catalog", 4)
+
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(results, ["built"] * 5)
+        self.assertEqual(len(calls), 1)
+        stats = SingleFlight.get_stats()
+        self.assertEqual((stats["builds"], stats["coalesced"]), (1, 4))
+        self.assertEqual(stats["in_flight"], [])
+        self.assertGreater(stats["keys"]["catalog"]["wait_time_max_ms"], 0)
+
+    def test_waiters_receive_the_leaders_error(self):
+        release = threading.Event()
+        leader, build, calls, _results, _errors = self._start_leader("gallery", release, RuntimeError("db down"))
+        follower_errors = []
+
+        def follow():
+            try:
+                SingleFlight.run("gallery", build)
+            except RuntimeError as exc:
+                follower_errors.append(exc)
+
+        follower = threading.Thread(target=follow)
+        follower.start()
+        self._wait_for_followers("gallery", 1)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual([str(exc) for exc in follower_errors], ["db down"])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(SingleFlight.get_stats()["errors"], 1)
+
+        # A failed build is not remembered; the next caller tries again.
+        self.assertEqual(SingleFlight.run("gallery", lambda: "recovered"), "recovered")
+
+    def test_reentrant_call_runs_inline(self):
+        result = SingleFlight.run("slides", lambda: SingleFlight.run("slides", lambda: "inner"))
+
+        self.assertEqual(result, "inner")
+        self.assertEqual(SingleFlight.get_stats()["coalesced"], 0)
+
+    @patch.dict(os.environ, {"SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS": "0.05"})
+    def test_waiter_builds_itself_when_leader_is_stuck(self):
+        release = threading.Event()
+        leader, _build, _calls, _results, _errors = self._start_leader("catalog", release)
+
+        with self.assertLogs("flask_api.services.single_flight", level="WARNING"):
+            result = SingleFlight.run("catalog", lambda: "own")
+        release.set()
+        leader.join(5)
+
+        self.assertEqual(result, "own")
+        self.assertEqual(SingleFlight.get_stats()["wait_timeouts"], 1)
+
+    def test_background_refresh_runs_once_per_key(self):
+        release = threading.Event()
+        done = threading.Event()
+        calls = []
+
+        def build():
+            calls.append(1)
+            release.wait(5)
+            done.set()
+            return "fresh"
+
+        first = SingleFlight.refresh_in_background("slides", build)
+        second = SingleFlight.refresh_in_background("slides", build)
+        release.set()
+        self.assertTrue(done.wait(5))
+        for _attempt in range(500):
+            if not SingleFlight.get_stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual((first, second), (True, False))
+        self.assertEqual(calls, [1])
+        stats = SingleFlight.get_stats()["keys"]["slides"]
+        self.assertEqual((stats["stale_served"], stats["background_refreshes"], stats["builds"]), (2, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -64,6 +64,27 @@ class SlideModelTests(unittest.TestCase):
         self.assertEqual(slides[0]["caption"], "gallery-photo.jpg")
         self.assertEqual(slides[0]["alt"], "gallery-photo.jpg")
 
+    def test_variant_fields_build_srcset_from_stored_manifest(self):
+        fields = Slide.variant_fields(
+            "/api/assets/slides/hall.jpg",
+            '{"variants": ['
+            '{"label": "medium", "format": "webp", "width": 960, "url": "/v/hall-960w.webp"},'
+            '{"label": "thumb", "format": "webp", "width": 320, "url": "/v/hall-320w.webp"},'
+            '{"label": "thumb", "format": "avif", "width": 320, "url": "/v/hall-320w.avif"}'
+            "]}",
+        )
+
+        self.assertEqual(fields["thumbnail_src"], "/v/hall-320w.webp")
+        self.assertEqual(fields["srcset"], "/v/hall-320w.webp 320w, /v/hall-960w.webp 960w")
+        self.assertEqual(fields["srcset_by_format"]["avif"], "/v/hall-320w.avif 320w")
+
+    def test_variant_fields_fall_back_to_original_without_manifest(self):
+        fields = Slide.variant_fields("/api/assets/slides/hall.jpg", None)
+
+        self.assertEqual(fields["thumbnail_src"], "/api/assets/slides/hall.jpg")
+        self.assertEqual(fields["srcset"], "")
+        self.assertEqual(fields["variants"], [])
+
 
 if __name__ == "__main__":
     unittest.main()
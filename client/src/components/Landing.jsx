@@ -47,6 +47,7 @@ const normalizeLandingSlides = (slides) => {
       next.push({
         id: slide?.id ?? `slide-${index}`,
         src,
+        srcset: String(slide?.srcset || "").trim(),
         alt,
         title,
         text: caption,
@@ -132,7 +133,13 @@ const Landing = () => {
               to={`/showcase?media=${encodeURIComponent(String(slide.id ?? slide.src))}`}
               className="carousel-media-link"
               aria-label={`Open ${slide.title || "slide"} in the showcase`}>
-              <img className="d-block carousel-img" src={slide.src} alt={slide.alt} />
+              <img
+                className="d-block carousel-img"
+                src={slide.src}
+                srcSet={slide.srcset || undefined}
+                sizes={slide.srcset ? "100vw" : undefined}
+                alt={slide.alt}
+              />
             </Link>
             <Carousel.Caption className="bg-dark bg-opacity-50 text-white p-3">
               <h3>{slide.title}</h3>
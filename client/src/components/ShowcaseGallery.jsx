@@ -166,6 +166,8 @@ const ShowcaseGallery = () => {
                   <img
                     className="showcase-grid-media"
                     src={item.thumbnail_src || item.src}
+                    srcSet={item.srcset || undefined}
+                    sizes={item.srcset ? "(max-width: 576px) 50vw, (max-width: 992px) 33vw, 25vw" : undefined}
                     alt={item.alt || String(item.title || "").trim() || FALLBACK_LABEL}
                     loading="lazy"
                   />
@@ -210,6 +212,8 @@ const ShowcaseGallery = () => {
                 <img
                   className="showcase-modal-media"
                   src={activeMedia.src}
+                  srcSet={activeMedia.srcset || undefined}
+                  sizes={activeMedia.srcset ? "100vw" : undefined}
                   alt={activeMedia.alt || activeMedia.title || "Showcase media"}
                 />
               )}